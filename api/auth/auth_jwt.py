@@ -9,13 +9,33 @@ from starlette import status
 from starlette.exceptions import HTTPException
 
 import schemas
-from chalicelib.core import authorizers, users, spot
+from chalicelib.core import authorizers, users, spot, auth_cache
 
 logger = logging.getLogger(__name__)
 
 
-def _get_current_auth_context(request: Request, jwt_payload: dict) -> schemas.CurrentContext:
-    user = users.get(user_id=jwt_payload.get("userId", -1), tenant_id=jwt_payload.get("tenantId", -1))
+def _get_authenticated_user(jwt_payload: dict) -> Optional[dict]:
+    """
+    :return: the user of an access-token, None if the token was revoked or the user doesn't exist
+    """
+    user_id = jwt_payload.get("userId", -1)
+    tenant_id = jwt_payload.get("tenantId", -1)
+    user = auth_cache.get_user(user_id=user_id, tenant_id=tenant_id, jwt_iat=jwt_payload["iat"])
+    if user is not None:
+        return user
+    if not users.auth_exists(user_id=user_id, jwt_iat=jwt_payload["iat"]):
+        logger.warning("not users.auth_exists")
+        return None
+    user = users.get(user_id=user_id, tenant_id=tenant_id)
+    if user is not None:
+        auth_cache.set_user(user_id=user_id, tenant_id=tenant_id, jwt_iat=jwt_payload["iat"], user=user)
+    return user
+
+
+def _get_current_auth_context(request: Request, jwt_payload: dict,
+                              user: Optional[dict] = None) -> schemas.CurrentContext:
+    if user is None:
+        user = users.get(user_id=jwt_payload.get("userId", -1), tenant_id=jwt_payload.get("tenantId", -1))
     if user is None:
         logger.warning("User not found.")
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User not found.")
@@ -45,19 +65,17 @@ class JWTAuth(HTTPBearer):
                     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                                         detail="Invalid authentication scheme.")
                 jwt_payload = authorizers.jwt_authorizer(scheme=credentials.scheme, token=credentials.credentials)
-                auth_exists = jwt_payload is not None and users.auth_exists(user_id=jwt_payload.get("userId", -1),
-                                                                            jwt_iat=jwt_payload.get("iat", 100))
-                if jwt_payload is None \
-                        or jwt_payload.get("iat") is None or jwt_payload.get("aud") is None \
-                        or not auth_exists:
+                user = None
+                if jwt_payload is not None \
+                        and jwt_payload.get("iat") is not None and jwt_payload.get("aud") is not None:
+                    user = _get_authenticated_user(jwt_payload=jwt_payload)
+                if user is None:
                     if jwt_payload is not None:
                         logger.debug(jwt_payload)
                         if jwt_payload.get("iat") is None:
                             logger.debug("iat is None")
                         if jwt_payload.get("aud") is None:
                             logger.debug("aud is None")
-                    if not auth_exists:
-                        logger.warning("not users.auth_exists")
 
                     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid token or expired token.")
 
@@ -69,7 +87,7 @@ class JWTAuth(HTTPBearer):
                     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                                         detail="Unauthorized access endpoint reserved for Spot only.")
 
-                return _get_current_auth_context(request=request, jwt_payload=jwt_payload)
+                return _get_current_auth_context(request=request, jwt_payload=jwt_payload, user=user)
 
         logger.warning("Invalid authorization code.")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid authorization code.")
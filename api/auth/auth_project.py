@@ -23,7 +23,9 @@ class ProjectAuthorizer:
         current_project = None
         if self.project_identifier == "projectId" \
                 and (isinstance(value, int) or isinstance(value, str) and value.isnumeric()):
-            current_project = projects.get_project(project_id=value, tenant_id=current_user.tenant_id)
+            # the changes are checked against the DB, a project deleted on another worker may still be cached
+            current_project = projects.get_project(project_id=value, tenant_id=current_user.tenant_id,
+                                                   cached=request.method == "GET")
         elif self.project_identifier == "projectKey":
             current_project = projects.get_by_project_key(project_key=value)
 
@@ -1,6 +1,6 @@
 import json
 import logging
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from decouple import config
@@ -14,6 +14,9 @@ from chalicelib.utils.TimeUTC import TimeUTC
 
 logger = logging.getLogger(__name__)
 
+# Destinations (slack/msteams/webhook integrations, email recipients) notified at the same time
+NOTIFICATIONS_WORKERS = config("ALERTS_NOTIFICATIONS_WORKERS", cast=int, default=8)
+
 
 def get(id):
     with pg_client.PostgresClient() as cur:
@@ -97,6 +100,24 @@ def update(id, data: schemas.AlertSchema):
     return {"data": helper.custom_alert_to_front(__process_circular(a))}
 
 
+def __send_notifications(notification_type, destination_list):
+    BATCH_SIZE = 200
+    for i in range(0, len(destination_list), BATCH_SIZE):
+        notifications_list = destination_list[i:i + BATCH_SIZE]
+        try:
+            if notification_type == "slack":
+                send_to_slack_batch(notifications_list=notifications_list)
+            elif notification_type == "msteams":
+                send_to_msteams_batch(notifications_list=notifications_list)
+            elif notification_type == "email":
+                send_by_email_batch(notifications_list=notifications_list)
+            elif notification_type == "webhook":
+                webhook.trigger_batch(data_list=notifications_list)
+        except Exception as e:
+            logger.error(f"!!!Error while sending {notification_type} notifications batch")
+            logger.error(str(e))
+
+
 def process_notifications(data):
     full = {}
     for n in data:
@@ -115,37 +136,17 @@ def process_notifications(data):
                 elif c["type"] in ["webhook"]:
                     full[c["type"]].append({"data": webhook_data, "destination": c["value"]})
     notifications.create(data)
-    BATCH_SIZE = 200
+    # the destinations are notified concurrently, each one gets its batches in order
+    destinations = {}
     for t in full.keys():
-        for i in range(0, len(full[t]), BATCH_SIZE):
-            notifications_list = full[t][i:min(i + BATCH_SIZE, len(full[t]))]
-            if notifications_list is None or len(notifications_list) == 0:
-                break
-
-            if t == "slack":
-                try:
-                    send_to_slack_batch(notifications_list=notifications_list)
-                except Exception as e:
-                    logger.error("!!!Error while sending slack notifications batch")
-                    logger.error(str(e))
-            elif t == "msteams":
-                try:
-                    send_to_msteams_batch(notifications_list=notifications_list)
-                except Exception as e:
-                    logger.error("!!!Error while sending msteams notifications batch")
-                    logger.error(str(e))
-            elif t == "email":
-                try:
-                    send_by_email_batch(notifications_list=notifications_list)
-                except Exception as e:
-                    logger.error("!!!Error while sending email notifications batch")
-                    logger.error(str(e))
-            elif t == "webhook":
-                try:
-                    webhook.trigger_batch(data_list=notifications_list)
-                except Exception as e:
-                    logger.error("!!!Error while sending webhook notifications batch")
-                    logger.error(str(e))
+        for n in full[t]:
+            destinations.setdefault((t, str(n["destination"])), []).append(n)
+    if len(destinations) == 0:
+        return
+    with ThreadPoolExecutor(max_workers=min(NOTIFICATIONS_WORKERS, len(destinations)),
+                            thread_name_prefix="notifications") as executor:
+        for (t, _), destination_list in destinations.items():
+            executor.submit(__send_notifications, t, destination_list)
 
 
 def send_by_email(notification, destination):
@@ -166,7 +167,6 @@ def send_by_email_batch(notifications_list):
         return
     for n in notifications_list:
         send_by_email(notification=n.get("notification"), destination=n.get("destination"))
-        time.sleep(1)
 
 
 def send_to_slack_batch(notifications_list):
@@ -180,8 +180,13 @@ def send_to_slack_batch(notifications_list):
                                                              "title_link": n["notification"]["buttonUrl"],
                                                              "ts": datetime.now().timestamp()})
     for batch in webhookId_map.keys():
-        Slack.send_batch(tenant_id=webhookId_map[batch]["tenantId"], webhook_id=batch,
-                         attachments=webhookId_map[batch]["batch"])
+        # a failing webhook doesn't prevent the notifications of the other ones
+        try:
+            Slack.send_batch(tenant_id=webhookId_map[batch]["tenantId"], webhook_id=batch,
+                             attachments=webhookId_map[batch]["batch"])
+        except Exception as e:
+            logger.error(f"!!!Error while sending slack notifications to webhook_id={batch}")
+            logger.error(str(e))
 
 
 def send_to_msteams_batch(notifications_list):
@@ -209,8 +214,13 @@ def send_to_msteams_batch(notifications_list):
             }
         )
     for batch in webhookId_map.keys():
-        MSTeams.send_batch(tenant_id=webhookId_map[batch]["tenantId"], webhook_id=batch,
-                           attachments=webhookId_map[batch]["batch"])
+        # a failing webhook doesn't prevent the notifications of the other ones
+        try:
+            MSTeams.send_batch(tenant_id=webhookId_map[batch]["tenantId"], webhook_id=batch,
+                               attachments=webhookId_map[batch]["batch"])
+        except Exception as e:
+            logger.error(f"!!!Error while sending msteams notifications to webhook_id={batch}")
+            logger.error(str(e))
 
 
 def delete(project_id, alert_id):
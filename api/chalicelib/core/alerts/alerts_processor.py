@@ -4,7 +4,7 @@ from pydantic_core._pydantic_core import ValidationError
 
 import schemas
 from chalicelib.core.alerts import alerts, alerts_listener
-from chalicelib.core.alerts.modules import alert_helpers
+from chalicelib.core.alerts.modules import alert_helpers, evaluation
 from chalicelib.core.sessions import sessions_pg as sessions
 from chalicelib.utils import pg_client
 from chalicelib.utils.TimeUTC import TimeUTC
@@ -131,39 +131,33 @@ def Build(a):
     return q, params
 
 
+def __group_key(alert):
+    # the predefined columns of a project compute the same value for the same window
+    if alert["seriesId"] is not None or alert["query"]["left"] not in LeftToDb:
+        return None
+    return (alert["projectId"], alert["query"]["left"], alert["detectionMethod"],
+            alert["change"] if alert["detectionMethod"] != schemas.AlertDetectionMethod.THRESHOLD else None,
+            alert["options"]["currentPeriod"])
+
+
+def __execute(query, params):
+    with pg_client.PostgresClient() as cur:
+        cur.execute(cur.mogrify(query, params))
+        return cur.fetchone()
+
+
 def process():
     logger.info("> processing alerts on PG")
     notifications = []
-    all_alerts = alerts_listener.get_all_alerts()
-    with pg_client.PostgresClient() as cur:
-        for alert in all_alerts:
-            if alert_helpers.can_check(alert):
-                query, params = Build(alert)
-                try:
-                    query = cur.mogrify(query, params)
-                except Exception as e:
-                    logger.error(
-                        f"!!!Error while building alert query for alertId:{alert['alertId']} name: {alert['name']}")
-                    logger.error(e)
-                    continue
-                logger.debug(alert)
-                logger.debug(query)
-                try:
-                    cur.execute(query)
-                    result = cur.fetchone()
-                    if result["valid"]:
-                        logger.info(f"Valid alert, notifying users, alertId:{alert['alertId']} name: {alert['name']}")
-                        notifications.append(alert_helpers.generate_notification(alert, result))
-                except Exception as e:
-                    logger.error(
-                        f"!!!Error while running alert query for alertId:{alert['alertId']} name: {alert['name']}")
-                    logger.error(query)
-                    logger.error(e)
-                    cur = cur.recreate(rollback=True)
-        if len(notifications) > 0:
+    all_alerts = [alert for alert in alerts_listener.get_all_alerts() if alert_helpers.can_check(alert)]
+    for alert, result in evaluation.evaluate(all_alerts, build=Build, execute=__execute, group_key=__group_key):
+        if result["valid"]:
+            logger.info(f"Valid alert, notifying users, alertId:{alert['alertId']} name: {alert['name']}")
+            notifications.append(alert_helpers.generate_notification(alert, result))
+    if len(notifications) > 0:
+        with pg_client.PostgresClient() as cur:
             cur.execute(
                 cur.mogrify(f"""UPDATE public.alerts 
                                 SET options = options||'{{"lastNotification":{TimeUTC.now()}}}'::jsonb 
                                 WHERE alert_id IN %(ids)s;""", {"ids": tuple([n["alertId"] for n in notifications])}))
-    if len(notifications) > 0:
         alerts.process_notifications(notifications)
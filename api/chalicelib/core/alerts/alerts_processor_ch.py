@@ -6,7 +6,7 @@ import schemas
 from chalicelib.utils import pg_client, ch_client, exp_ch_helper
 from chalicelib.utils.TimeUTC import TimeUTC
 from chalicelib.core.alerts import alerts, alerts_listener
-from chalicelib.core.alerts.modules import alert_helpers
+from chalicelib.core.alerts.modules import alert_helpers, evaluation
 from chalicelib.core.sessions import sessions_ch as sessions
 
 logger = logging.getLogger(__name__)
@@ -155,41 +155,26 @@ def Build(a):
     return q, params
 
 
+def __execute(query, params):
+    with ch_client.ClickHouseClient() as ch_cur:
+        result = ch_cur.execute(query=ch_cur.format(query=query, parameters=params))
+        return result[0] if len(result) > 0 else None
+
+
 def process():
     logger.info("> processing alerts on CH")
     notifications = []
-    all_alerts = alerts_listener.get_all_alerts()
-    with pg_client.PostgresClient() as cur, ch_client.ClickHouseClient() as ch_cur:
-        for alert in all_alerts:
-            if alert["query"]["left"] != "CUSTOM":
-                continue
-            if alert_helpers.can_check(alert):
-                query, params = Build(alert)
-                try:
-                    query = ch_cur.format(query=query, parameters=params)
-                except Exception as e:
-                    logger.error(
-                        f"!!!Error while building alert query for alertId:{alert['alertId']} name: {alert['name']}")
-                    logger.error(e)
-                    continue
-                logger.debug(alert)
-                logger.debug(query)
-                try:
-                    result = ch_cur.execute(query=query)
-                    if len(result) > 0:
-                        result = result[0]
-
-                    if result["valid"]:
-                        logger.info("Valid alert, notifying users")
-                        notifications.append(alert_helpers.generate_notification(alert, result))
-                except Exception as e:
-                    logger.error(f"!!!Error while running alert query for alertId:{alert['alertId']}")
-                    logger.error(str(e))
-                    logger.error(query)
-        if len(notifications) > 0:
+    all_alerts = [alert for alert in alerts_listener.get_all_alerts()
+                  if alert["query"]["left"] == "CUSTOM" and alert_helpers.can_check(alert)]
+    # only the series-based alerts are evaluated here, each one has its own query
+    for alert, result in evaluation.evaluate(all_alerts, build=Build, execute=__execute, group_key=lambda a: None):
+        if result["valid"]:
+            logger.info("Valid alert, notifying users")
+            notifications.append(alert_helpers.generate_notification(alert, result))
+    if len(notifications) > 0:
+        with pg_client.PostgresClient() as cur:
             cur.execute(
                 cur.mogrify(f"""UPDATE public.alerts 
                                 SET options = options||'{{"lastNotification":{TimeUTC.now()}}}'::jsonb 
                                 WHERE alert_id IN %(ids)s;""", {"ids": tuple([n["alertId"] for n in notifications])}))
-    if len(notifications) > 0:
         alerts.process_notifications(notifications)
@@ -0,0 +1,105 @@
+import decimal
+import logging
+import operator
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Optional
+
+from decouple import config
+
+logger = logging.getLogger(__name__)
+
+# Alert queries running at the same time, each one holds a database connection
+WORKERS = config("ALERTS_EVALUATION_WORKERS", cast=int, default=4)
+# Number of the slowest evaluations reported after each run
+REPORT_SLOWEST = 5
+
+OPERATORS = {
+    "=": operator.eq,
+    "<": operator.lt,
+    ">": operator.gt,
+    "<=": operator.le,
+    ">=": operator.ge
+}
+
+
+def is_valid(alert, value) -> bool:
+    right = alert["query"]["right"]
+    if isinstance(value, decimal.Decimal):
+        # the threshold was written as a literal in the query, so a numeric value was compared exactly to it
+        right = decimal.Decimal(str(right))
+    return OPERATORS[alert["query"]["operator"]](value, right)
+
+
+def __evaluate_group(group, build: Callable, execute: Callable):
+    """
+    Runs the query of the first alert, its value is compared to the threshold of every alert of the group
+    :return: [(alert, result)], elapsed time in seconds
+    """
+    start = time.perf_counter()
+    try:
+        query, params = build(group[0])
+    except Exception as e:
+        for alert in group:
+            logger.error(f"!!!Error while building alert query for alertId:{alert['alertId']} name: {alert['name']}")
+        logger.error(e)
+        return [], time.perf_counter() - start
+    logger.debug(query)
+    try:
+        row = execute(query, params)
+    except Exception as e:
+        for alert in group:
+            logger.error(f"!!!Error while running alert query for alertId:{alert['alertId']} name: {alert['name']}")
+        logger.error(query)
+        logger.error(e)
+        return [], time.perf_counter() - start
+    value = row["value"] if row is not None and row.get("value") is not None else 0
+    results = []
+    for alert in group:
+        try:
+            results.append((alert, {"value": value, "valid": is_valid(alert, value)}))
+        except Exception as e:
+            logger.error(f"!!!Error while checking alert value for alertId:{alert['alertId']} name: {alert['name']}")
+            logger.error(e)
+    return results, time.perf_counter() - start
+
+
+def evaluate(alerts: list, build: Callable, execute: Callable, group_key: Callable[[dict], Optional[tuple]]):
+    """
+    Evaluates the alerts concurrently, the alerts having the same group key share a single query.
+    :param build: alert -> (query, params)
+    :param execute: (query, params) -> row having the value, called from the worker threads
+    :param group_key: alert -> key of the alerts computing the same value, None for an alert evaluated alone
+    :return: [(alert, result)] of the alerts evaluated successfully, result has the value and if the alert is valid
+    """
+    groups = {}
+    tasks = []
+    for alert in alerts:
+        key = group_key(alert)
+        if key is None:
+            tasks.append([alert])
+        elif key in groups:
+            groups[key].append(alert)
+        else:
+            groups[key] = [alert]
+            tasks.append(groups[key])
+    if len(tasks) == 0:
+        return []
+
+    results = []
+    latencies = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(WORKERS, len(tasks)), thread_name_prefix="alerts") as executor:
+        futures = {executor.submit(__evaluate_group, group, build, execute): group for group in tasks}
+        for future in as_completed(futures):
+            group = futures[future]
+            evaluated, elapsed = future.result()
+            results += evaluated
+            for alert in group:
+                logger.debug(f"alertId:{alert['alertId']} evaluated in {elapsed * 1000:.1f}ms"
+                             f"{f' (query shared by {len(group)} alerts)' if len(group) > 1 else ''}")
+                latencies.append((elapsed, alert["alertId"]))
+    latencies.sort(reverse=True)
+    logger.info(f"{len(alerts)} alerts evaluated with {len(tasks)} queries in {time.perf_counter() - start:.2f}s, "
+                f"slowest: {', '.join([f'alertId:{i} {e * 1000:.0f}ms' for e, i in latencies[:REPORT_SLOWEST]])}")
+    return results
@@ -9,12 +9,15 @@ from fastapi import HTTPException, status
 
 import schemas
 from chalicelib.core import projects
+from chalicelib.utils import http_client
 from chalicelib.utils.TimeUTC import TimeUTC
 
 logger = logging.getLogger(__name__)
 
 ASSIST_KEY = config("ASSIST_KEY")
 ASSIST_URL = config("ASSIST_URL") % ASSIST_KEY
+__assist = http_client.get_service("assist", timeout=config("assistTimeout", cast=int, default=5),
+                                   max_concurrency=config("ASSIST_MAX_CONCURRENCY", cast=int, default=50))
 
 
 def get_live_sessions_ws_user_id(project_id, user_id):
@@ -52,8 +55,7 @@ def get_live_sessions_ws(project_id, body: schemas.LiveSessionsSearchPayloadSche
 def __get_live_sessions_ws(project_id, data):
     project_key = projects.get_project_key(project_id)
     try:
-        results = requests.post(ASSIST_URL + config("assist") + f"/{project_key}",
-                                json=data, timeout=config("assistTimeout", cast=int, default=5))
+        results = __assist.post(ASSIST_URL + config("assist") + f"/{project_key}", json=data)
         if results.status_code != 200:
             logger.error(f"!! issue with the peer-server code:{results.status_code} for __get_live_sessions_ws")
             logger.error(results.text)
@@ -62,6 +64,9 @@ def __get_live_sessions_ws(project_id, data):
     except requests.exceptions.Timeout:
         logger.error("!! Timeout getting Assist response")
         live_peers = {"total": 0, "sessions": []}
+    except http_client.UnavailableError as e:
+        logger.warning(f"!! Assist is unavailable: {e}")
+        live_peers = {"total": 0, "sessions": []}
     except Exception as e:
         logger.error("!! Issue getting Live-Assist response")
         logger.exception(e)
@@ -102,8 +107,7 @@ def __get_agent_token(project_id, project_key, session_id):
 def get_live_session_by_id(project_id, session_id):
     project_key = projects.get_project_key(project_id)
     try:
-        results = requests.get(ASSIST_URL + config("assist") + f"/{project_key}/{session_id}",
-                               timeout=config("assistTimeout", cast=int, default=5))
+        results = __assist.get(ASSIST_URL + config("assist") + f"/{project_key}/{session_id}")
         if results.status_code != 200:
             logger.error(f"!! issue with the peer-server code:{results.status_code} for get_live_session_by_id")
             logger.error(results.text)
@@ -116,6 +120,9 @@ def get_live_session_by_id(project_id, session_id):
     except requests.exceptions.Timeout:
         logger.error("!! Timeout getting Assist response")
         return None
+    except http_client.UnavailableError as e:
+        logger.warning(f"!! Assist is unavailable: {e}")
+        return None
     except Exception as e:
         logger.error("!! Issue getting Assist response")
         logger.exception(e)
@@ -132,8 +139,7 @@ def is_live(project_id, session_id, project_key=None):
     if project_key is None:
         project_key = projects.get_project_key(project_id)
     try:
-        results = requests.get(ASSIST_URL + config("assistList") + f"/{project_key}/{session_id}",
-                               timeout=config("assistTimeout", cast=int, default=5))
+        results = __assist.get(ASSIST_URL + config("assistList") + f"/{project_key}/{session_id}")
         if results.status_code != 200:
             logger.error(f"!! issue with the peer-server code:{results.status_code} for is_live")
             logger.error(results.text)
@@ -142,6 +148,9 @@ def is_live(project_id, session_id, project_key=None):
     except requests.exceptions.Timeout:
         logger.error("!! Timeout getting Assist response")
         return False
+    except http_client.UnavailableError as e:
+        logger.warning(f"!! Assist is unavailable: {e}")
+        return False
     except Exception as e:
         logger.error("!! Issue getting Assist response")
         logger.exception(e)
@@ -160,9 +169,8 @@ def autocomplete(project_id, q: str, key: str = None):
     if key:
         params["key"] = key
     try:
-        results = requests.get(
-            ASSIST_URL + config("assistList") + f"/{project_key}/autocomplete",
-            params=params, timeout=config("assistTimeout", cast=int, default=5))
+        results = __assist.get(
+            ASSIST_URL + config("assistList") + f"/{project_key}/autocomplete", params=params)
         if results.status_code != 200:
             logger.error(f"!! issue with the peer-server code:{results.status_code} for autocomplete")
             logger.error(results.text)
@@ -171,6 +179,9 @@ def autocomplete(project_id, q: str, key: str = None):
     except requests.exceptions.Timeout:
         logger.error("!! Timeout getting Assist response")
         return {"errors": ["Assist request timeout"]}
+    except http_client.UnavailableError as e:
+        logger.warning(f"!! Assist is unavailable: {e}")
+        return {"errors": ["Assist is unavailable"]}
     except Exception as e:
         logger.error("!! Issue getting Assist response")
         logger.exception(e)
@@ -239,8 +250,7 @@ def get_raw_devtools_by_id(project_id, session_id):
 def session_exists(project_id, session_id):
     project_key = projects.get_project_key(project_id)
     try:
-        results = requests.get(ASSIST_URL + config("assist") + f"/{project_key}/{session_id}",
-                               timeout=config("assistTimeout", cast=int, default=5))
+        results = __assist.get(ASSIST_URL + config("assist") + f"/{project_key}/{session_id}")
         if results.status_code != 200:
             logger.error(f"!! issue with the peer-server code:{results.status_code} for session_exists")
             logger.error(results.text)
@@ -252,6 +262,9 @@ def session_exists(project_id, session_id):
     except requests.exceptions.Timeout:
         logger.error("!! Timeout getting Assist response")
         return False
+    except http_client.UnavailableError as e:
+        logger.warning(f"!! Assist is unavailable: {e}")
+        return False
     except Exception as e:
         logger.error("!! Issue getting Assist response")
         logger.exception(e)
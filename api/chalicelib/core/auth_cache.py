@@ -0,0 +1,74 @@
+import threading
+from typing import Optional
+
+from cachetools import TTLCache
+from decouple import config
+
+ENABLED = config("AUTH_CACHE", cast=bool, default=True)
+# Seconds an authentication is reused without checking the DB,
+# it bounds the staleness on the workers that didn't receive the invalidation
+TTL = config("AUTH_CACHE_TTL", cast=int, default=30)
+MAX_SIZE = config("AUTH_CACHE_MAX_SIZE", cast=int, default=10000)
+
+# (user_id, tenant_id, jwt_iat) -> user
+__users = TTLCache(maxsize=MAX_SIZE, ttl=TTL)
+# api_key -> tenant
+__tenants = TTLCache(maxsize=MAX_SIZE, ttl=TTL)
+__lock = threading.Lock()
+
+
+def get_user(user_id: int, tenant_id: int, jwt_iat: int) -> Optional[dict]:
+    """
+    :return: the user of a valid access-token, None if it is not cached
+    """
+    if not ENABLED:
+        return None
+    with __lock:
+        user = __users.get((user_id, tenant_id, jwt_iat))
+    return None if user is None else dict(user)
+
+
+def set_user(user_id: int, tenant_id: int, jwt_iat: int, user: dict):
+    if ENABLED:
+        with __lock:
+            __users[(user_id, tenant_id, jwt_iat)] = dict(user)
+
+
+def get_tenant(api_key: str) -> Optional[dict]:
+    if not ENABLED or api_key is None:
+        return None
+    with __lock:
+        tenant = __tenants.get(api_key)
+    return None if tenant is None else dict(tenant)
+
+
+def set_tenant(api_key: str, tenant: dict):
+    if ENABLED:
+        with __lock:
+            __tenants[api_key] = dict(tenant)
+
+
+def invalidate_user(user_id: int):
+    """
+    To call after a change of the user's tokens, role, permissions or account
+    """
+    with __lock:
+        for key in [k for k in __users.keys() if k[0] == user_id]:
+            __users.pop(key, None)
+
+
+def invalidate_tenant(tenant_id: int):
+    """
+    To call after a change of the tenant's API key, or of a role shared by the tenant's users
+    """
+    with __lock:
+        for key in [k for k in __users.keys() if k[1] == tenant_id]:
+            __users.pop(key, None)
+        for key in [k for k, v in __tenants.items() if v.get("tenantId") == tenant_id]:
+            __tenants.pop(key, None)
+
+
+def clear():
+    with __lock:
+        __users.clear()
+        __tenants.clear()
@@ -3,7 +3,7 @@ import logging
 import jwt
 from decouple import config
 
-from chalicelib.core import tenants
+from chalicelib.core import tenants, auth_cache
 from chalicelib.core import users, spot
 from chalicelib.utils.TimeUTC import TimeUTC
 
@@ -96,7 +96,11 @@ def generate_jwt_refresh(user_id, tenant_id, iat, aud, jwt_jti, for_spot=False):
 
 
 def api_key_authorizer(token):
+    t = auth_cache.get_tenant(api_key=token)
+    if t is not None:
+        return t
     t = tenants.get_by_api_key(token)
     if t is not None:
         t["createdAt"] = TimeUTC.datetime_to_timestamp(t["createdAt"])
+        auth_cache.set_tenant(api_key=token, tenant=t)
     return t
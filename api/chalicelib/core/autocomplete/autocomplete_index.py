@@ -0,0 +1,315 @@
+import heapq
+import logging
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from decouple import config
+
+logger = logging.getLogger(__name__)
+
+INDEX_ENABLED = config("AUTOCOMPLETE_INDEX", cast=bool, default=True)
+# Size bound of all the indexed projects, in estimated bytes
+MAX_SIZE = config("AUTOCOMPLETE_INDEX_MAX_SIZE", cast=int, default=64 * 1024 * 1024)
+# A project with more autocomplete values than this is never indexed, its lookups stay on the database
+MAX_VALUES = config("AUTOCOMPLETE_INDEX_MAX_VALUES", cast=int, default=300_000)
+# Seconds between two incremental refreshes of a project
+REFRESH_INTERVAL = config("AUTOCOMPLETE_INDEX_REFRESH", cast=int, default=60)
+# Seconds after which a project is loaded again from scratch, to drop the values that expired in the database
+MAX_AGE = config("AUTOCOMPLETE_INDEX_MAX_AGE", cast=int, default=6 * 60 * 60)
+
+# Characters having a meaning for string_to_sql_like/ILIKE, such texts are searched by the database
+_UNSUPPORTED = re.compile(r"[*%_^$\\]")
+_SPACES = re.compile(" +")
+
+# Approximate cost of a value: the value and its lowered copy, their slots in the lists and the trigram postings
+_VALUE_OVERHEAD = 2 * 49 + 4 * 8
+_TRIGRAM_OVERHEAD = 120
+
+
+def normalize(text: str) -> Optional[str]:
+    """
+    :return: the lowered text as ILIKE would compare it, None if the text uses wildcards
+    """
+    if text is None or _UNSUPPORTED.search(text):
+        return None
+    return _SPACES.sub(" ", text).lower()
+
+
+def trigrams(text: str):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class _TypeIndex:
+    """
+    Values of one autocomplete type: the lowered values sorted for the prefix lookups,
+    and the ids of the values containing each trigram for the "contains" lookups.
+    Ids are positions in the append-only values list, so they stay valid when values are added.
+    """
+
+    def __init__(self):
+        self.values = []
+        self.lowered = []
+        self.frequencies = []
+        self.ids = {}
+        self.sorted_keys = []
+        self.sorted_ids = []
+        self.postings = {}
+        self.ranked = False
+        self.size = 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def add(self, value: str, weight: int = 1, sort: bool = True):
+        """
+        :return: the estimated size added to the index
+        """
+        if value in self.ids:
+            self.frequencies[self.ids[value]] += weight
+            self.ranked = self.ranked or weight > 0
+            return 0
+        value_id = len(self.values)
+        lowered = _SPACES.sub(" ", value).lower()
+        self.values.append(value)
+        self.lowered.append(lowered)
+        self.frequencies.append(weight)
+        self.ids[value] = value_id
+        self.ranked = self.ranked or weight != 1
+        if sort:
+            position = bisect_left(self.sorted_keys, lowered)
+            self.sorted_keys.insert(position, lowered)
+            self.sorted_ids.insert(position, value_id)
+        size = _VALUE_OVERHEAD + 2 * len(value)
+        for t in trigrams(lowered):
+            if t not in self.postings:
+                self.postings[t] = array("I")
+                size += _TRIGRAM_OVERHEAD
+            self.postings[t].append(value_id)
+            size += 4
+        self.size += size
+        return size
+
+    def sort(self):
+        order = sorted(range(len(self.lowered)), key=self.lowered.__getitem__)
+        self.sorted_keys = [self.lowered[i] for i in order]
+        self.sorted_ids = order
+
+    def set_frequencies(self, frequencies: dict):
+        for value, frequency in frequencies.items():
+            if value in self.ids:
+                self.frequencies[self.ids[value]] = max(self.frequencies[self.ids[value]], frequency)
+                self.ranked = True
+
+    def __rank_key(self, value_id):
+        return -self.frequencies[value_id], self.lowered[value_id]
+
+    def prefix(self, text: str, limit: int):
+        start = bisect_left(self.sorted_keys, text)
+        end = start
+        while end < len(self.sorted_keys) and self.sorted_keys[end].startswith(text):
+            end += 1
+            # without frequencies, the first values are the top ones
+            if not self.ranked and end - start == limit:
+                break
+        if self.ranked:
+            ids = heapq.nsmallest(limit, self.sorted_ids[start:end], key=self.__rank_key)
+        else:
+            ids = self.sorted_ids[start:end]
+        return [self.values[i] for i in ids]
+
+    def contains(self, text: str, limit: int):
+        grams = trigrams(text)
+        if len(grams) == 0:
+            return []
+        candidates = None
+        for posting in sorted((self.postings.get(t, ()) for t in grams), key=len):
+            if len(posting) == 0:
+                return []
+            candidates = set(posting) if candidates is None else candidates.intersection(posting)
+            if len(candidates) == 0:
+                return []
+        ids = heapq.nsmallest(limit, (i for i in candidates if text in self.lowered[i]), key=self.__rank_key)
+        return [self.values[i] for i in ids]
+
+    def values_in(self, values):
+        return [v for v in values if v in self.ids]
+
+
+class _ProjectIndex:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.types = {}
+        self.size = 0
+        self.count = 0
+        self.watermark = None
+        # values read with a timestamp equal to the watermark, skipped when they are read again
+        self.watermark_values = set()
+        self.built_at = time.monotonic()
+        self.refreshed_at = self.built_at
+
+    def add_rows(self, rows, sort: bool = True):
+        with self.lock:
+            for r in rows:
+                key = (r["type"], r["value"])
+                if r["created_at"] == self.watermark and key in self.watermark_values:
+                    continue
+                if self.watermark is None or r["created_at"] > self.watermark:
+                    self.watermark = r["created_at"]
+                    self.watermark_values = set()
+                if r["created_at"] == self.watermark:
+                    self.watermark_values.add(key)
+                type_index = self.types.get(r["type"])
+                if type_index is None:
+                    type_index = self.types[r["type"]] = _TypeIndex()
+                before = len(type_index)
+                self.size += type_index.add(r["value"], weight=r["weight"], sort=sort)
+                self.count += len(type_index) - before
+            if not sort:
+                for type_index in self.types.values():
+                    type_index.sort()
+
+    def prefix(self, typename: str, text: str, limit: int):
+        with self.lock:
+            type_index = self.types.get(typename)
+            return [] if type_index is None else type_index.prefix(text, limit)
+
+    def contains(self, typename: str, text: str, limit: int):
+        with self.lock:
+            type_index = self.types.get(typename)
+            return [] if type_index is None else type_index.contains(text, limit)
+
+    def search(self, typename: str, text: str, value_length: int, limit: int = 5):
+        """
+        Same matches as the ILIKE lookups of the autocomplete queries: the top prefix matches,
+        and the top "contains" matches if the text is longer than 2.
+        The top is ranked by frequency then by lowered value, while the queries order by value in the collation
+        of the database: when more values match than the limit, the kept ones can differ.
+        """
+        values = self.prefix(typename, text, limit)
+        if value_length > 2:
+            values += [v for v in self.contains(typename, text, limit) if v not in values]
+        return values
+
+    def values_in(self, typename: str, values):
+        with self.lock:
+            type_index = self.types.get(typename)
+            return [] if type_index is None else type_index.values_in(values)
+
+    def set_frequencies(self, typename: str, frequencies: dict):
+        with self.lock:
+            type_index = self.types.get(typename)
+            if type_index is not None:
+                type_index.set_frequencies(frequencies)
+
+
+class AutocompleteIndex:
+    """
+    In-memory autocomplete values per project and per type, built from the autocomplete table in the background.
+    A lookup on a project that isn't loaded yet returns None and starts the loading, the caller uses the database.
+    The projects are kept in an LRU bounded by MAX_SIZE.
+
+    :param load: (project_id, watermark, limit) -> rows having type, value, weight and created_at, ordered by
+                 created_at; the rows created at or after the watermark, all of them if the watermark is None
+    """
+
+    def __init__(self, load: Callable, workers: int = 2):
+        self.load = load
+        self.lock = threading.Lock()
+        self.projects: OrderedDict[int, _ProjectIndex] = OrderedDict()
+        self.size = 0
+        self.loading = set()
+        # project_id -> time until which the project isn't loaded again, because it has too many values
+        self.oversized = {}
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="autocomplete-index")
+
+    def get(self, project_id: int) -> Optional[_ProjectIndex]:
+        if not INDEX_ENABLED:
+            return None
+        now = time.monotonic()
+        with self.lock:
+            project = self.projects.get(project_id)
+            if project is not None:
+                self.projects.move_to_end(project_id)
+                if now - project.built_at > MAX_AGE:
+                    self.__submit(project_id, self.__build)
+                elif now - project.refreshed_at > REFRESH_INTERVAL:
+                    self.__submit(project_id, self.__refresh)
+                return project
+            if self.oversized.get(project_id, 0) < now:
+                self.__submit(project_id, self.__build)
+        return None
+
+    def __submit(self, project_id, task):
+        if project_id not in self.loading:
+            self.loading.add(project_id)
+            self.executor.submit(task, project_id)
+
+    def __build(self, project_id):
+        try:
+            rows = self.load(project_id=project_id, watermark=None, limit=MAX_VALUES + 1)
+            if len(rows) > MAX_VALUES:
+                logger.info(f"autocomplete index: project {project_id} has more than {MAX_VALUES} values")
+                with self.lock:
+                    self.oversized[project_id] = time.monotonic() + MAX_AGE
+                    self.__remove(project_id)
+                return
+            project = _ProjectIndex()
+            project.add_rows(rows, sort=False)
+            with self.lock:
+                self.__remove(project_id)
+                self.projects[project_id] = project
+                self.size += project.size
+                self.__evict()
+        except Exception:
+            logger.exception(f"autocomplete index: couldn't load project {project_id}")
+        finally:
+            with self.lock:
+                self.loading.discard(project_id)
+
+    def __refresh(self, project_id):
+        try:
+            project = self.projects.get(project_id)
+            if project is None:
+                return
+            project.refreshed_at = time.monotonic()
+            rows = self.load(project_id=project_id, watermark=project.watermark, limit=MAX_VALUES + 1)
+            before = project.size
+            project.add_rows(rows)
+            with self.lock:
+                if project.count > MAX_VALUES:
+                    self.oversized[project_id] = time.monotonic() + MAX_AGE
+                    self.__remove(project_id)
+                elif self.projects.get(project_id) is project:
+                    self.size += project.size - before
+                    self.__evict()
+        except Exception:
+            logger.exception(f"autocomplete index: couldn't refresh project {project_id}")
+        finally:
+            with self.lock:
+                self.loading.discard(project_id)
+
+    def __remove(self, project_id):
+        project = self.projects.pop(project_id, None)
+        if project is not None:
+            self.size -= project.size
+
+    def __evict(self):
+        while self.size > MAX_SIZE and len(self.projects) > 0:
+            project_id, project = self.projects.popitem(last=False)
+            self.size -= project.size
+            logger.debug(f"autocomplete index: evicted project {project_id}")
+
+    def set_frequencies(self, project_id: int, typename: str, frequencies: dict):
+        """
+        Ranks the given values of the type by their frequency, the other ones keep their weight
+        """
+        with self.lock:
+            project = self.projects.get(project_id)
+        if project is not None:
+            project.set_frequencies(typename, frequencies)
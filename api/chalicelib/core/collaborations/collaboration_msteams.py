@@ -27,7 +27,7 @@ class MSTeams(BaseCollaboration):
     @classmethod
     def say_hello(cls, url):
         try:
-            r = requests.post(
+            r = webhook.WEBHOOKS_CLIENT.post(
                 url=url,
                 json={
                     "@type": "MessageCard",
@@ -52,7 +52,7 @@ class MSTeams(BaseCollaboration):
         if integration is None:
             return {"errors": ["msteams integration not found"]}
         try:
-            r = requests.post(
+            r = webhook.WEBHOOKS_CLIENT.post(
                 url=integration["endpoint"],
                 json=body,
                 timeout=5)
@@ -80,13 +80,19 @@ class MSTeams(BaseCollaboration):
             for j in range(1, len(part), 2):
                 part.insert(j, {"text": "***"})
 
-            r = requests.post(url=integration["endpoint"],
-                              json={
-                                  "@type": "MessageCard",
-                                  "@context": "http://schema.org/extensions",
-                                  "summary": part[0]["activityTitle"],
-                                  "sections": part
-                              })
+            try:
+                r = webhook.WEBHOOKS_CLIENT.post(url=integration["endpoint"],
+                                                 json={
+                                                     "@type": "MessageCard",
+                                                     "@context": "http://schema.org/extensions",
+                                                     "summary": part[0]["activityTitle"],
+                                                     "sections": part
+                                                 })
+            except requests.exceptions.RequestException as e:
+                # unreachable, timed-out or short-circuited: the batches of the other webhooks are still sent
+                logger.warning(f"!! Issue sending msteams batch webhookId:{webhook_id}")
+                logger.warning(e)
+                continue
             if r.status_code != 200:
                 logger.warning("!!!! something went wrong")
                 logger.warning(r.text)
@@ -98,7 +104,7 @@ class MSTeams(BaseCollaboration):
         integration = cls.get_integration(tenant_id=tenant_id, integration_id=integration_id)
         if integration is None:
             return {"errors": ["Microsoft Teams integration not found"]}
-        r = requests.post(
+        r = webhook.WEBHOOKS_CLIENT.post(
             url=integration["endpoint"],
             json={
                 "@type": "MessageCard",
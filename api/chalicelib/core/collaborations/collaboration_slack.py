@@ -24,7 +24,7 @@ class Slack(BaseCollaboration):
 
     @classmethod
     def say_hello(cls, url):
-        r = requests.post(
+        r = webhook.WEBHOOKS_CLIENT.post(
             url=url,
             json={
                 "attachments": [
@@ -46,7 +46,7 @@ class Slack(BaseCollaboration):
         if integration is None:
             return {"errors": ["slack integration not found"]}
         try:
-            r = requests.post(
+            r = webhook.WEBHOOKS_CLIENT.post(
                 url=integration["endpoint"],
                 json=body,
                 timeout=5)
@@ -70,9 +70,15 @@ class Slack(BaseCollaboration):
             return {"errors": ["slack integration not found"]}
         print(f"====> sending slack batch notification: {len(attachments)}")
         for i in range(0, len(attachments), 100):
-            r = requests.post(
-                url=integration["endpoint"],
-                json={"attachments": attachments[i:i + 100]})
+            try:
+                r = webhook.WEBHOOKS_CLIENT.post(
+                    url=integration["endpoint"],
+                    json={"attachments": attachments[i:i + 100]})
+            except requests.exceptions.RequestException as e:
+                # unreachable, timed-out or short-circuited: the batches of the other webhooks are still sent
+                print(f"!! Issue sending slack batch webhookId:{webhook_id}")
+                print(str(e))
+                continue
             if r.status_code != 200:
                 print("!!!! something went wrong while sending to:")
                 print(integration)
@@ -87,7 +93,7 @@ class Slack(BaseCollaboration):
         if integration is None:
             return {"errors": ["slack integration not found"]}
         attachement["ts"] = datetime.now().timestamp()
-        r = requests.post(url=integration["endpoint"], json={"attachments": [attachement], **extra})
+        r = webhook.WEBHOOKS_CLIENT.post(url=integration["endpoint"], json={"attachments": [attachement], **extra})
         return r.text
 
     @classmethod
@@ -3,7 +3,7 @@ from typing import Optional
 
 from fastapi import HTTPException, status
 
-from chalicelib.core import projects
+from chalicelib.core import projects, project_catalog
 from chalicelib.utils import pg_client
 
 MAX_INDEXES = 10
@@ -32,7 +32,7 @@ def __exists_by_name(project_id: int, name: str, exclude_index: Optional[int]) -
     return row["exists"]
 
 
-def get(project_id):
+def __get(project_id):
     with pg_client.PostgresClient() as cur:
         query = cur.mogrify(f"""SELECT {",".join(column_names())}
                                 FROM public.projects
@@ -49,9 +49,34 @@ def get(project_id):
         return results
 
 
-def get_batch(project_ids):
-    if project_ids is None or len(project_ids) == 0:
-        return []
+def get(project_id, cached=True):
+    return project_catalog.get(project_id=project_id, kind=project_catalog.METADATA,
+                               loader=lambda: __get(project_id), cached=cached)
+
+
+async def __get_async(project_id):
+    async with pg_client.AsyncPostgresClient() as cur:
+        query = cur.mogrify(f"""SELECT {",".join(column_names())}
+                                FROM public.projects
+                                WHERE project_id = %(project_id)s 
+                                    AND deleted_at ISNULL
+                                LIMIT 1;""", {"project_id": project_id})
+        await cur.execute(query=query)
+        metas = await cur.fetchone()
+        results = []
+        if metas is not None:
+            for i, k in enumerate(metas.keys()):
+                if metas[k] is not None:
+                    results.append({"key": metas[k], "index": i + 1})
+        return results
+
+
+async def get_async(project_id):
+    return await project_catalog.get_async(project_id=project_id, kind=project_catalog.METADATA,
+                                           loader=lambda: __get_async(project_id))
+
+
+def __get_batch(project_ids):
     with pg_client.PostgresClient() as cur:
         query = cur.mogrify(f"""SELECT project_id, {",".join(column_names())}
                                 FROM public.projects
@@ -61,15 +86,22 @@ def get_batch(project_ids):
         cur.execute(query=query)
         full_metas = cur.fetchall()
     results = {}
-    if full_metas is not None and len(full_metas) > 0:
-        for metas in full_metas:
-            results[str(metas["project_id"])] = []
-            for i, k in enumerate(metas.keys()):
-                if metas[k] is not None and k != "project_id":
-                    results[str(metas["project_id"])].append({"key": metas[k], "index": i + 1})
+    for metas in full_metas:
+        results[metas["project_id"]] = []
+        for i, k in enumerate(metas.keys()):
+            if metas[k] is not None and k != "project_id":
+                results[metas["project_id"]].append({"key": metas[k], "index": i})
     return results
 
 
+def get_batch(project_ids):
+    if project_ids is None or len(project_ids) == 0:
+        return []
+    results = project_catalog.get_batch(project_ids=[int(p) for p in project_ids], kind=project_catalog.METADATA,
+                                        loader=__get_batch)
+    return {str(project_id): metas for project_id, metas in results.items()}
+
+
 regex = re.compile(r'^[a-z0-9_-]+$', re.IGNORECASE)
 
 
@@ -112,9 +144,10 @@ def __edit(project_id, col_index, colname, new_name):
             new_name = row[colname]
             old_name = row['old_' + colname]
             old_metas[col_index]["key"] = new_name
-            projects.rename_metadata_condition(project_id=project_id,
-                                               old_metadata_key=old_name,
-                                               new_metadata_key=new_name)
+        project_catalog.invalidate(project_id)
+        projects.rename_metadata_condition(project_id=project_id,
+                                           old_metadata_key=old_name,
+                                           new_metadata_key=new_name)
     return {"data": old_metas[col_index]}
 
 
@@ -138,6 +171,7 @@ def delete(tenant_id, project_id, index: int):
                                 WHERE project_id = %(project_id)s AND deleted_at ISNULL;""",
                             {"project_id": project_id})
         cur.execute(query=query)
+    project_catalog.invalidate(project_id)
     projects.delete_metadata_condition(project_id=project_id,
                                        metadata_key=old_segments[old_indexes.index(index)]["key"])
     return {"data": get(project_id)}
@@ -158,6 +192,7 @@ def add(tenant_id, project_id, new_name):
                             {"key": new_name, "project_id": project_id})
         cur.execute(query=query)
         col_val = cur.fetchone()[colname]
+    project_catalog.invalidate(project_id)
     return {"data": {"key": col_val, "index": index}}
 
 
@@ -1,18 +1,30 @@
 import json
 import logging
 
+from decouple import config
 from fastapi import HTTPException, status
 
 import schemas
 from chalicelib.core import issues
 from chalicelib.core.errors import errors
 from chalicelib.core.metrics import heatmaps, product_analytics, funnels
+from chalicelib.core.metrics.modules import rollups
 from chalicelib.core.sessions import sessions, sessions_search
 from chalicelib.utils import helper, pg_client
 from chalicelib.utils.TimeUTC import TimeUTC
+from chalicelib.utils.or_cache import query_cache
 
 logger = logging.getLogger(__name__)
 
+# TTL in seconds of the cached ClickHouse results of each card type, 0 to disable the cache
+CARDS_CACHE_TTL = {
+    schemas.MetricType.TIMESERIES: config("CARD_CACHE_TTL_TIMESERIES", cast=int, default=60),
+    schemas.MetricType.TABLE: config("CARD_CACHE_TTL_TABLE", cast=int, default=60),
+    schemas.MetricType.FUNNEL: config("CARD_CACHE_TTL_FUNNEL", cast=int, default=120),
+    schemas.MetricType.PATH_ANALYSIS: config("CARD_CACHE_TTL_PATH_ANALYSIS", cast=int, default=300),
+    schemas.MetricType.HEAT_MAP: config("CARD_CACHE_TTL_HEAT_MAP", cast=int, default=0)
+}
+
 
 def __get_table_of_series(project_id, data: schemas.CardSchema):
     results = []
@@ -80,9 +92,14 @@ def __get_path_analysis_chart(project: schemas.ProjectContext, user_id: int, dat
 def __get_timeseries_chart(project: schemas.ProjectContext, data: schemas.CardTimeSeries, user_id: int = None):
     series_charts = []
     for i, s in enumerate(data.series):
-        series_charts.append(sessions.search2_series(data=s.filter, project_id=project.project_id, density=data.density,
-                                                     metric_type=data.metric_type, metric_of=data.metric_of,
-                                                     metric_value=data.metric_value))
+        # the series without events and with simple session filters are served from the rollups
+        series_chart = rollups.search_series(data=s.filter, project_id=project.project_id, density=data.density,
+                                             metric_of=data.metric_of)
+        if series_chart is None:
+            series_chart = sessions.search2_series(data=s.filter, project_id=project.project_id,
+                                                   density=data.density, metric_type=data.metric_type,
+                                                   metric_of=data.metric_of, metric_value=data.metric_value)
+        series_charts.append(series_chart)
 
     results = [{}] * len(series_charts[0])
     for i in range(len(results)):
@@ -152,6 +169,8 @@ def __get_table_chart(project: schemas.ProjectContext, data: schemas.CardTable,
     return supported.get(data.metric_of, not_supported)(project=project, data=data, user_id=user_id)
 
 
+# The card charts are left out of the async routes: every card type has its own builders over both sessions
+# backends, and the default ClickHouse client has no asyncio support, so their queries would still use a thread
 def get_chart(project: schemas.ProjectContext, data: schemas.CardSchema, user_id: int):
     supported = {
         schemas.MetricType.TIMESERIES: __get_timeseries_chart,
@@ -160,7 +179,22 @@ def get_chart(project: schemas.ProjectContext, data: schemas.CardSchema, user_id
         schemas.MetricType.FUNNEL: __get_funnel_chart,
         schemas.MetricType.PATH_ANALYSIS: __get_path_analysis_chart
     }
-    return supported.get(data.metric_type, not_supported)(project=project, data=data, user_id=user_id)
+    ttl = CARDS_CACHE_TTL.get(data.metric_type, 0)
+    __align_time_range(data=data, bucket=ttl)
+    with query_cache.cached_queries(ttl=ttl):
+        return supported.get(data.metric_type, not_supported)(project=project, data=data, user_id=user_id)
+
+
+def __align_time_range(data: schemas.CardSchema, bucket: int):
+    data.startTimestamp, data.endTimestamp = query_cache.align_time_range(start_timestamp=data.startTimestamp,
+                                                                          end_timestamp=data.endTimestamp,
+                                                                          bucket=bucket)
+    for s in data.series:
+        if s.filter is not None and s.filter.startTimestamp is not None and s.filter.endTimestamp is not None:
+            s.filter.startTimestamp, s.filter.endTimestamp = \
+                query_cache.align_time_range(start_timestamp=s.filter.startTimestamp,
+                                             end_timestamp=s.filter.endTimestamp,
+                                             bucket=bucket)
 
 
 def get_sessions_by_card_id(project: schemas.ProjectContext, user_id, metric_id, data: schemas.CardSessionsSchema):
@@ -1,4 +1,10 @@
 import json
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, Optional
+
+from decouple import config
+from fastapi import HTTPException
 
 import schemas
 from chalicelib.core.metrics import custom_metrics
@@ -6,6 +12,14 @@ from chalicelib.utils import helper
 from chalicelib.utils import pg_client
 from chalicelib.utils.TimeUTC import TimeUTC
 
+logger = logging.getLogger(__name__)
+
+# Shared by all the dashboard loads, so the number of concurrently rendered widgets stays bounded
+# and doesn't exceed the ClickHouse connection pool
+__render_pool = ThreadPoolExecutor(max_workers=config("DASHBOARD_RENDER_WORKERS", cast=int,
+                                                      default=config("CH_MAXCONN", cast=int, default=8)),
+                                   thread_name_prefix="dashboard-render")
+
 
 def create_dashboard(project_id, user_id, data: schemas.CreateDashboardSchema):
     with pg_client.PostgresClient() as cur:
@@ -97,6 +111,46 @@ def get_dashboard(project_id, user_id, dashboard_id):
     return helper.dict_to_camel_case(row)
 
 
+def __render_widget_chart(project: schemas.ProjectContext, user_id, metric_id, data: schemas.CardSessionsSchema):
+    try:
+        return {"metricId": metric_id,
+                "data": custom_metrics.make_chart_from_card(project=project, user_id=user_id, metric_id=metric_id,
+                                                            data=data)}
+    except HTTPException as e:
+        return {"metricId": metric_id, "errors": [e.detail]}
+    except Exception as e:
+        logger.error(f"Error while rendering card:{metric_id} of project:{project.project_id}", exc_info=e)
+        return {"metricId": metric_id, "errors": ["something went wrong"]}
+
+
+def get_dashboard_charts(project: schemas.ProjectContext, user_id, dashboard_id,
+                         data: schemas.CardSessionsSchema) -> Optional[Iterator[dict]]:
+    """
+    Renders the charts of all the cards of a dashboard concurrently,
+    yields each card's result as soon as it is available (not in the dashboard's order).
+    Returns None if the dashboard doesn't exist.
+    """
+    dashboard = get_dashboard(project_id=project.project_id, user_id=user_id, dashboard_id=dashboard_id)
+    if dashboard is None:
+        return None
+    # the same card can be added multiple times to a dashboard
+    metric_ids = list(dict.fromkeys([w["metricId"] for w in dashboard["widgets"]]))
+
+    def __charts():
+        futures = [__render_pool.submit(__render_widget_chart, project=project, user_id=user_id,
+                                        metric_id=metric_id, data=data)
+                   for metric_id in metric_ids]
+        try:
+            for f in as_completed(futures):
+                yield f.result()
+        finally:
+            # the client went away, don't render what wasn't started yet
+            for f in futures:
+                f.cancel()
+
+    return __charts()
+
+
 def delete_dashboard(project_id, user_id, dashboard_id):
     with pg_client.PostgresClient() as cur:
         pg_query = """UPDATE dashboards
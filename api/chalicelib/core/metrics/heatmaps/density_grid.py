@@ -0,0 +1,48 @@
+import math
+
+import numpy as np
+
+# The normalized coordinates of the clicks are percentages of the page
+COORDINATES_MAX = 100
+
+
+def new_grid(size: int) -> np.ndarray:
+    return np.zeros((size, size), dtype=np.float64)
+
+
+def add_cells(grid: np.ndarray, cells: list):
+    """
+    :param cells: rows having the x and y of a cell, and the clicks count in that cell
+    """
+    if len(cells) == 0:
+        return
+    xs = np.fromiter((c["x"] for c in cells), dtype=np.int64, count=len(cells))
+    ys = np.fromiter((c["y"] for c in cells), dtype=np.int64, count=len(cells))
+    clicks = np.fromiter((c["clicks"] for c in cells), dtype=np.float64, count=len(cells))
+    np.add.at(grid, (np.clip(ys, 0, grid.shape[0] - 1), np.clip(xs, 0, grid.shape[1] - 1)), clicks)
+
+
+def smooth(grid: np.ndarray, sigma: float) -> np.ndarray:
+    """
+    Gaussian blur of the grid, sigma in cells; the blur is separable, so the rows then the columns are convolved
+    """
+    if sigma <= 0:
+        return grid
+    radius = max(1, math.ceil(3 * sigma))
+    kernel = np.exp(-np.arange(-radius, radius + 1) ** 2 / (2 * sigma ** 2))
+    kernel /= kernel.sum()
+    grid = np.apply_along_axis(lambda row: np.convolve(row, kernel, mode="same"), 1, grid)
+    return np.apply_along_axis(lambda column: np.convolve(column, kernel, mode="same"), 0, grid)
+
+
+def to_payload(grid: np.ndarray, sigma: float) -> dict:
+    """
+    :return: the grid as rows of cells, the first row is the top of the page
+    """
+    total = int(grid.sum())
+    grid = smooth(grid, sigma)
+    if sigma > 0:
+        grid = np.round(grid, 3)
+        return {"gridSize": grid.shape[0], "total": total, "max": float(grid.max()), "grid": grid.tolist()}
+    grid = grid.astype(np.int64)
+    return {"gridSize": grid.shape[0], "total": total, "max": int(grid.max()), "grid": grid.tolist()}
@@ -2,6 +2,7 @@ import logging
 
 import schemas
 from chalicelib.core import sessions
+from chalicelib.core.metrics.heatmaps import density_grid
 from chalicelib.core.sessions import sessions_mobs
 from chalicelib.utils import pg_client, helper
 from chalicelib.utils import sql_helper as sh
@@ -9,9 +10,12 @@ from chalicelib.utils import sql_helper as sh
 logger = logging.getLogger(__name__)
 
 
-def get_by_url(project_id, data: schemas.GetHeatMapPayloadSchema):
-    if data.url is None or data.url == "":
-        return []
+def __grid_cell(column):
+    return f"LEAST(FLOOR(GREATEST({column}, 0) * %(grid_size)s / {density_grid.COORDINATES_MAX})::int, " \
+           f"%(grid_size)s - 1)"
+
+
+def __get_by_url_query(project_id, data: schemas.GetHeatMapPayloadSchema):
     args = {"startDate": data.startTimestamp, "endDate": data.endTimestamp,
             "project_id": project_id, "url": data.url}
     constraints = ["sessions.project_id = %(project_id)s",
@@ -65,26 +69,72 @@ def get_by_url(project_id, data: schemas.GetHeatMapPayloadSchema):
     #                                 AND mis.type='click_rage'))""")
     #     query_from += """LEFT JOIN events_common.issues USING (timestamp, session_id)
     #                    LEFT JOIN issues AS mis USING (issue_id)"""
+    if data.grid:
+        args["grid_size"] = data.grid_size
+        return f"""SELECT {__grid_cell("normalized_x")} AS x,
+                          {__grid_cell("normalized_y")} AS y,
+                          COUNT(1) AS clicks
+                   FROM {query_from}
+                   WHERE {" AND ".join(constraints)}
+                   GROUP BY x, y;""", args
+    return f"""SELECT normalized_x, normalized_y
+               FROM {query_from}
+               WHERE {" AND ".join(constraints)}
+               LIMIT 500;""", args
+
+
+def __log_by_url_exception(query, data: schemas.GetHeatMapPayloadSchema):
+    logger.warning("--------- HEATMAP 2 SEARCH QUERY EXCEPTION -----------")
+    logger.warning(query.decode('UTF-8') if isinstance(query, bytes) else query)
+    logger.warning("--------- PAYLOAD -----------")
+    logger.warning(data)
+    logger.warning("--------------------")
+
+
+def __get_by_url_result(rows, data: schemas.GetHeatMapPayloadSchema):
+    if data.grid:
+        grid = density_grid.new_grid(data.grid_size)
+        density_grid.add_cells(grid, rows)
+        return density_grid.to_payload(grid, sigma=data.smoothing)
+    return helper.list_to_camel_case(rows)
+
+
+def get_by_url(project_id, data: schemas.GetHeatMapPayloadSchema):
+    if data.url is None or data.url == "":
+        return []
+    query, args = __get_by_url_query(project_id=project_id, data=data)
     with pg_client.PostgresClient() as cur:
-        query = cur.mogrify(f"""SELECT normalized_x, normalized_y
-                                FROM {query_from}
-                                WHERE {" AND ".join(constraints)}
-                                LIMIT 500;""", args)
+        query = cur.mogrify(query, args)
         logger.debug("---------")
         logger.debug(query.decode('UTF-8'))
         logger.debug("---------")
         try:
             cur.execute(query)
         except Exception as err:
-            logger.warning("--------- HEATMAP 2 SEARCH QUERY EXCEPTION -----------")
-            logger.warning(query.decode('UTF-8'))
-            logger.warning("--------- PAYLOAD -----------")
-            logger.warning(data)
-            logger.warning("--------------------")
+            __log_by_url_exception(query=query, data=data)
             raise err
         rows = cur.fetchall()
 
-    return helper.list_to_camel_case(rows)
+    return __get_by_url_result(rows=rows, data=data)
+
+
+async def get_by_url_async(project_id, data: schemas.GetHeatMapPayloadSchema):
+    if data.url is None or data.url == "":
+        return []
+    query, args = __get_by_url_query(project_id=project_id, data=data)
+    async with pg_client.AsyncPostgresClient() as cur:
+        query = cur.mogrify(query, args)
+        logger.debug("---------")
+        logger.debug(query)
+        logger.debug("---------")
+        try:
+            await cur.execute(query)
+        except Exception as err:
+            __log_by_url_exception(query=query, data=data)
+            raise err
+        rows = await cur.fetchall()
+
+    return __get_by_url_result(rows=rows, data=data)
 
 
 def get_x_y_by_url_and_session_id(project_id, session_id, data: schemas.GetHeatMapPayloadSchema):
@@ -1,20 +1,28 @@
+import asyncio
 import logging
+import time
+from datetime import datetime, timedelta, timezone
 
 from decouple import config
 
 import schemas
 from chalicelib.core import events
+from chalicelib.core.metrics.heatmaps import density_grid
 from chalicelib.core.metrics.modules import sessions, sessions_mobs
 from chalicelib.utils import sql_helper as sh
 
 from chalicelib.utils import pg_client, helper, ch_client, exp_ch_helper
+from chalicelib.utils.or_cache import query_cache
 
 logger = logging.getLogger(__name__)
 
+# The clicks of a day are considered complete once this delay (in seconds) passed after the end of the day
+GRID_SETTLE_DELAY = config("HEATMAP_GRID_SETTLE_DELAY", cast=int, default=3 * 60 * 60)
+# TTL in seconds of the cached density grid of a complete day
+GRID_CACHE_TTL = config("HEATMAP_GRID_CACHE_TTL", cast=int, default=7 * 24 * 60 * 60)
 
-def get_by_url(project_id, data: schemas.GetHeatMapPayloadSchema):
-    if data.url is None or data.url == "":
-        return []
+
+def __get_by_url_query(project_id, data: schemas.GetHeatMapPayloadSchema):
     args = {"startDate": data.startTimestamp, "endDate": data.endTimestamp,
             "project_id": project_id, "url": data.url}
     constraints = [
@@ -22,13 +30,13 @@ def get_by_url(project_id, data: schemas.GetHeatMapPayloadSchema):
         "main_events.created_at >= toDateTime(%(startDate)s / 1000)",
         "main_events.created_at <= toDateTime(%(endDate)s / 1000)",
         "main_events.`$event_name` = 'CLICK'",
-        "isNotNull(JSON_VALUE(CAST(main_events.`$properties` AS String), '$.normalized_x'))"
+        f"isNotNull({exp_ch_helper.get_event_property('normalized_x', 'main_events')})"
     ]
 
     if data.operator == schemas.SearchEventOperator.IS:
-        constraints.append("JSON_VALUE(CAST(main_events.`$properties` AS String), '$.url_path') = %(url)s")
+        constraints.append(f"{exp_ch_helper.get_event_property('url_path', 'main_events')} = %(url)s")
     else:
-        constraints.append("JSON_VALUE(CAST(main_events.`$properties` AS String), '$.url_path') ILIKE %(url)s")
+        constraints.append(f"{exp_ch_helper.get_event_property('url_path', 'main_events')} ILIKE %(url)s")
         args["url"] = helper.values_for_operator(data.url, data.operator)
 
     query_from = f"{exp_ch_helper.get_main_events_table(data.startTimestamp)} AS main_events"
@@ -72,49 +80,208 @@ def get_by_url(project_id, data: schemas.GetHeatMapPayloadSchema):
     #                                 AND mis.type='click_rage'))""")
     #     query_from += """ LEFT JOIN experimental.events AS issues_t ON (main_events.session_id=issues_t.session_id)
     #                    LEFT JOIN experimental.issues AS mis ON (issues_t.issue_id=mis.issue_id)"""
+    return f"""SELECT 
+                   {exp_ch_helper.get_event_property("normalized_x", "main_events")} AS normalized_x, 
+                   {exp_ch_helper.get_event_property("normalized_y", "main_events")} AS normalized_y
+               FROM {query_from}
+               WHERE {" AND ".join(constraints)}
+               LIMIT 500;""", args
+
+
+def __log_by_url_exception(query, data: schemas.GetHeatMapPayloadSchema):
+    logger.warning("--------- HEATMAP 2 SEARCH QUERY EXCEPTION CH -----------")
+    logger.warning(query)
+    logger.warning("--------- PAYLOAD -----------")
+    logger.warning(data)
+    logger.warning("--------------------")
+
+
+def get_by_url(project_id, data: schemas.GetHeatMapPayloadSchema):
+    if data.url is None or data.url == "":
+        return []
+    if data.grid:
+        return get_grid_by_url(project_id=project_id, data=data)
+    query, args = __get_by_url_query(project_id=project_id, data=data)
     with ch_client.ClickHouseClient() as cur:
-        query = cur.format(query=f"""SELECT 
-                                JSON_VALUE(CAST(`$properties` AS String), '$.normalized_x') AS normalized_x, 
-                                JSON_VALUE(CAST(`$properties` AS String), '$.normalized_y') AS normalized_y
-                             FROM {query_from}
-                             WHERE {" AND ".join(constraints)}
-                             LIMIT 500;""",
-                           parameters=args)
+        query = cur.format(query=query, parameters=args)
         logger.debug("---------")
         logger.debug(query)
         logger.debug("---------")
         try:
             rows = cur.execute(query=query)
         except Exception as err:
-            logger.warning("--------- HEATMAP 2 SEARCH QUERY EXCEPTION CH -----------")
-            logger.warning(query)
-            logger.warning("--------- PAYLOAD -----------")
-            logger.warning(data)
-            logger.warning("--------------------")
+            __log_by_url_exception(query=query, data=data)
+            raise err
+
+        return helper.list_to_camel_case(rows)
+
+
+async def get_by_url_async(project_id, data: schemas.GetHeatMapPayloadSchema):
+    if data.url is None or data.url == "":
+        return []
+    if data.grid:
+        return await get_grid_by_url_async(project_id=project_id, data=data)
+    query, args = __get_by_url_query(project_id=project_id, data=data)
+    async with ch_client.AsyncClickHouseClient() as cur:
+        query = cur.format(query=query, parameters=args)
+        logger.debug("---------")
+        logger.debug(query)
+        logger.debug("---------")
+        try:
+            rows = await cur.execute(query=query)
+        except Exception as err:
+            __log_by_url_exception(query=query, data=data)
             raise err
 
         return helper.list_to_camel_case(rows)
 
 
+def __grid_cell(column):
+    return f"least(toUInt32(greatest({column}, 0) * %(grid_size)s / {density_grid.COORDINATES_MAX}), " \
+           f"%(grid_size)s - 1)"
+
+
+def __get_grid_query(project_id, data: schemas.GetHeatMapPayloadSchema, days: list):
+    """
+    Clicks count per day and per cell of the grid, for the given days of the range
+    """
+    args = {"startDate": data.startTimestamp, "endDate": data.endTimestamp, "project_id": project_id,
+            "url": data.url, "grid_size": data.grid_size, "days": tuple(days)}
+    # the materialized columns are read instead of parsing the whole properties of each event
+    constraints = [
+        "main_events.project_id = toUInt16(%(project_id)s)",
+        "main_events.created_at >= toDateTime(%(startDate)s / 1000)",
+        "main_events.created_at <= toDateTime(%(endDate)s / 1000)",
+        "toDate(main_events.created_at, 'UTC') IN %(days)s",
+        "main_events.`$event_name` = 'CLICK'"
+    ]
+    if data.operator == schemas.SearchEventOperator.IS:
+        constraints.append(f"{exp_ch_helper.get_event_property('url_path', 'main_events')} = %(url)s")
+    else:
+        constraints.append(f"{exp_ch_helper.get_event_property('url_path', 'main_events')} ILIKE %(url)s")
+        args["url"] = helper.values_for_operator(data.url, data.operator)
+
+    return f"""SELECT day, {__grid_cell("normalized_x")} AS x, {__grid_cell("normalized_y")} AS y, COUNT(1) AS clicks
+               FROM (SELECT toString(toDate(main_events.created_at, 'UTC'))                     AS day,
+                            {exp_ch_helper.get_event_property("normalized_x", "main_events")} AS normalized_x,
+                            {exp_ch_helper.get_event_property("normalized_y", "main_events")} AS normalized_y
+                     FROM {exp_ch_helper.get_main_events_table(data.startTimestamp)} AS main_events
+                     WHERE {" AND ".join(constraints)}) AS click_events
+               WHERE isNotNull(normalized_x) AND isNotNull(normalized_y)
+               GROUP BY day, x, y;""", args
+
+
+def __get_grid_days(data: schemas.GetHeatMapPayloadSchema):
+    """
+    :return: [(day, cacheable)] the UTC days of the range, a day is cacheable if the range covers it entirely
+             and its clicks are complete
+    """
+    days = []
+    start = datetime.fromtimestamp(data.startTimestamp / 1000, tz=timezone.utc)
+    day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    complete_before = time.time() - GRID_SETTLE_DELAY
+    while day.timestamp() * 1000 <= data.endTimestamp:
+        day_end = day + timedelta(days=1)
+        days.append((day.date().isoformat(), day >= start and day_end.timestamp() * 1000 <= data.endTimestamp + 1
+                     and day_end.timestamp() <= complete_before))
+        day = day_end
+    return days
+
+
+def __get_grid_key(project_id, data: schemas.GetHeatMapPayloadSchema, day: str):
+    return query_cache.get_key(query="heatmap_grid", parameters={"project_id": project_id, "url": data.url,
+                                                                  "operator": data.operator.value,
+                                                                  "grid_size": data.grid_size, "day": day})
+
+
+def __get_cached_grid(project_id, data: schemas.GetHeatMapPayloadSchema):
+    """
+    :return: (grid, missing) the grid of the days found in the cache, and the [(day, cacheable)] to query
+    """
+    grid = density_grid.new_grid(data.grid_size)
+    missing = []
+    for day, cacheable in __get_grid_days(data):
+        found, cells = query_cache.get_value(key=__get_grid_key(project_id=project_id, data=data, day=day),
+                                             ttl=GRID_CACHE_TTL) if cacheable else (False, None)
+        if found:
+            density_grid.add_cells(grid, cells)
+        else:
+            missing.append((day, cacheable))
+    return grid, missing
+
+
+def __add_grid_rows(project_id, data: schemas.GetHeatMapPayloadSchema, grid, missing, rows):
+    density_grid.add_cells(grid, rows)
+    cells_by_day = {}
+    for r in rows:
+        cells_by_day.setdefault(r["day"], []).append({"x": r["x"], "y": r["y"], "clicks": r["clicks"]})
+    for day, cacheable in missing:
+        if cacheable:
+            query_cache.set_value(key=__get_grid_key(project_id=project_id, data=data, day=day),
+                                  ttl=GRID_CACHE_TTL, value=cells_by_day.get(day, []))
+
+
+def get_grid_by_url(project_id, data: schemas.GetHeatMapPayloadSchema):
+    """
+    Density grid of all the clicks of the url: the clicks are binned per day in ClickHouse,
+    the grids of the complete days are cached, so a range only queries its days missing from the cache
+    """
+    grid, missing = __get_cached_grid(project_id=project_id, data=data)
+    if len(missing) > 0:
+        query, args = __get_grid_query(project_id=project_id, data=data, days=[d for d, _ in missing])
+        with ch_client.ClickHouseClient() as cur:
+            query = cur.format(query=query, parameters=args)
+            logger.debug("---------")
+            logger.debug(query)
+            logger.debug("---------")
+            try:
+                rows = cur.execute(query=query)
+            except Exception as err:
+                __log_by_url_exception(query=query, data=data)
+                raise err
+        __add_grid_rows(project_id=project_id, data=data, grid=grid, missing=missing, rows=rows)
+    return density_grid.to_payload(grid, sigma=data.smoothing)
+
+
+async def get_grid_by_url_async(project_id, data: schemas.GetHeatMapPayloadSchema):
+    # the cache of the days may be in Redis, its blocking calls are made in a thread
+    grid, missing = await asyncio.to_thread(__get_cached_grid, project_id=project_id, data=data)
+    if len(missing) > 0:
+        query, args = __get_grid_query(project_id=project_id, data=data, days=[d for d, _ in missing])
+        async with ch_client.AsyncClickHouseClient() as cur:
+            query = cur.format(query=query, parameters=args)
+            logger.debug("---------")
+            logger.debug(query)
+            logger.debug("---------")
+            try:
+                rows = await cur.execute(query=query)
+            except Exception as err:
+                __log_by_url_exception(query=query, data=data)
+                raise err
+        await asyncio.to_thread(__add_grid_rows, project_id=project_id, data=data, grid=grid, missing=missing,
+                                rows=rows)
+    return density_grid.to_payload(grid, sigma=data.smoothing)
+
+
 def get_x_y_by_url_and_session_id(project_id, session_id, data: schemas.GetHeatMapPayloadSchema):
     args = {"project_id": project_id, "session_id": session_id, "url": data.url}
     constraints = [
         "main_events.project_id = toUInt16(%(project_id)s)",
         "main_events.session_id = %(session_id)s",
         "main_events.`$event_name`='CLICK'",
-        "isNotNull(JSON_VALUE(CAST(main_events.`$properties` AS String), '$.normalized_x'))"
+        f"isNotNull({exp_ch_helper.get_event_property('normalized_x', 'main_events')})"
     ]
     if data.operator == schemas.SearchEventOperator.IS:
-        constraints.append("JSON_VALUE(CAST(main_events.`$properties` AS String), '$.url_path') = %(url)s")
+        constraints.append(f"{exp_ch_helper.get_event_property('url_path', 'main_events')} = %(url)s")
     else:
-        constraints.append("JSON_VALUE(CAST(main_events.`$properties` AS String), '$.url_path') ILIKE %(url)s")
+        constraints.append(f"{exp_ch_helper.get_event_property('url_path', 'main_events')} ILIKE %(url)s")
         args["url"] = helper.values_for_operator(data.url, data.operator)
 
     query_from = f"{exp_ch_helper.get_main_events_table(0)} AS main_events"
 
     with ch_client.ClickHouseClient() as cur:
-        query = cur.format(query=f"""SELECT main_events.normalized_x AS normalized_x, 
-                                                main_events.normalized_y AS normalized_y
+        query = cur.format(query=f"""SELECT {exp_ch_helper.get_event_property("normalized_x", "main_events")} AS normalized_x, 
+                                           {exp_ch_helper.get_event_property("normalized_y", "main_events")} AS normalized_y
                                FROM {query_from}
                                WHERE {" AND ".join(constraints)};""",
                            parameters=args)
@@ -141,9 +308,9 @@ def get_selectors_by_url_and_session_id(project_id, session_id, data: schemas.Ge
                    "main_events.`$event_name`='CLICK'"]
 
     if data.operator == schemas.SearchEventOperator.IS:
-        constraints.append("JSON_VALUE(CAST(main_events.`$properties` AS String), '$.url_path') = %(url)s")
+        constraints.append(f"{exp_ch_helper.get_event_property('url_path', 'main_events')} = %(url)s")
     else:
-        constraints.append("JSON_VALUE(CAST(main_events.`$properties` AS String), '$.url_path') ILIKE %(url)s")
+        constraints.append(f"{exp_ch_helper.get_event_property('url_path', 'main_events')} ILIKE %(url)s")
         args["url"] = helper.values_for_operator(data.url, data.operator)
 
     query_from = f"{exp_ch_helper.get_main_events_table(0)} AS main_events"
@@ -194,12 +361,13 @@ def __get_1_url(location_condition: schemas.SessionSearchEventSchema2 | None, se
         op = sh.get_sql_operator(location_condition.operator)
         full_args = {**full_args, **sh.multi_values(location_condition.value, value_key=f_k)}
         sub_condition.append(
-            sh.multi_conditions(f'path {op} %({f_k})s', location_condition.value, is_not=False,
+            sh.multi_conditions(f'{exp_ch_helper.get_event_property("url_path")} {op} %({f_k})s',
+                                location_condition.value, is_not=False,
                                 value_key=f_k))
     with ch_client.ClickHouseClient() as cur:
         main_query = cur.format(query=f"""WITH paths AS (
                                      SELECT DISTINCT 
-                                         JSON_VALUE(CAST(`$properties` AS String), '$.url_path') AS url_path
+                                         {exp_ch_helper.get_event_property("url_path")} AS url_path
                                      FROM product_analytics.events
                                      WHERE {" AND ".join(sub_condition)}
                                   )
@@ -208,7 +376,7 @@ def __get_1_url(location_condition: schemas.SessionSearchEventSchema2 | None, se
                                       COUNT(*) AS count
                                   FROM product_analytics.events
                                   INNER JOIN paths 
-                                      ON JSON_VALUE(CAST(product_analytics.events.$properties AS String), '$.url_path') = paths.url_path
+                                      ON {exp_ch_helper.get_event_property("url_path", "product_analytics.events")} = paths.url_path
                                   WHERE `$event_name` = 'CLICK'
                                     AND project_id = %(projectId)s
                                     AND created_at >= toDateTime(%(start_time)s / 1000)
@@ -368,10 +536,10 @@ def get_page_events(session_id, project_id):
         query = cur.format(query=f"""SELECT
                                     event_id as message_id,
                                     toUnixTimestamp(created_at)*1000 AS timestamp,
-                                    JSON_VALUE(CAST(`$properties` AS String), '$.url_host') AS host,
-                                    JSON_VALUE(CAST(`$properties` AS String), '$.url_path') AS path,
-                                    JSON_VALUE(CAST(`$properties` AS String), '$.url_path') AS value,
-                                    JSON_VALUE(CAST(`$properties` AS String), '$.url_path') AS url,
+                                    {exp_ch_helper.get_event_property("url_host")} AS host,
+                                    {exp_ch_helper.get_event_property("url_path")} AS path,
+                                    {exp_ch_helper.get_event_property("url_path")} AS value,
+                                    {exp_ch_helper.get_event_property("url_path")} AS url,
                                     'LOCATION' AS type
                                 FROM product_analytics.events
                                 WHERE session_id = %(session_id)s 
@@ -0,0 +1,272 @@
+import logging
+import time
+from typing import List, Optional
+
+from decouple import config
+
+import schemas
+from chalicelib.core.sessions import sessions, sessions_ch
+from chalicelib.utils import ch_client, helper, metrics_helper
+from chalicelib.utils import sql_helper as sh
+from chalicelib.utils.TimeUTC import TimeUTC
+
+logger = logging.getLogger(__name__)
+
+# Rollups only exist in ClickHouse, they are used when the sessions are searched in ClickHouse
+ENABLED = config("SESSIONS_ROLLUPS", cast=bool, default=True) and sessions is sessions_ch
+# Days of sessions rolled up by the first refresh, at most the retention of the per-minute rollups
+BACKFILL_DAYS = config("SESSIONS_ROLLUPS_BACKFILL", cast=int, default=7)
+# Seconds given to the in-flight inserts of the sessions before they are rolled up
+SETTLE_DELAY = config("SESSIONS_ROLLUPS_SETTLE_DELAY", cast=int, default=60)
+# Seconds during which the API reuses the state of the rollups
+STATE_TTL = 30
+# Same as the TTL of the per-minute rollups table
+MINUTE_RETENTION_DAYS = 10
+DAY = 24 * 60 * 60
+
+STATE_TABLE = "experimental.sessions_rollup_state"
+# granularity in seconds: table, ClickHouse function truncating a DateTime to the granularity, in UTC
+GRANULARITIES = {
+    DAY: ("experimental.sessions_rollup_1d", "toStartOfDay"),
+    60 * 60: ("experimental.sessions_rollup_1h", "toStartOfHour"),
+    60: ("experimental.sessions_rollup_1m", "toStartOfMinute")
+}
+# granularity in seconds: days kept by the TTL of the table, the TTL of 3 months keeps at least 89 days
+RETENTION_DAYS = {
+    DAY: 89,
+    60 * 60: 89,
+    60: MINUTE_RETENTION_DAYS
+}
+DIMENSIONS = ["user_device_type", "user_country", "user_browser", "user_os"]
+
+# The session filters that can be answered from the rollups, with the operators supported for each of them
+__STRING_OPERATORS = [schemas.SearchEventOperator.IS, schemas.SearchEventOperator.IS_NOT,
+                      schemas.SearchEventOperator.IS_ANY, schemas.SearchEventOperator.CONTAINS,
+                      schemas.SearchEventOperator.NOT_CONTAINS, schemas.SearchEventOperator.STARTS_WITH,
+                      schemas.SearchEventOperator.ENDS_WITH]
+__ENUM_OPERATORS = [schemas.SearchEventOperator.IS, schemas.SearchEventOperator.IS_NOT,
+                    schemas.SearchEventOperator.IS_ANY]
+SUPPORTED_FILTERS = {
+    schemas.FilterType.USER_OS: ("user_os", __STRING_OPERATORS),
+    schemas.FilterType.USER_OS_MOBILE: ("user_os", __STRING_OPERATORS),
+    schemas.FilterType.USER_BROWSER: ("user_browser", __STRING_OPERATORS),
+    schemas.FilterType.USER_COUNTRY: ("user_country", __ENUM_OPERATORS),
+    schemas.FilterType.USER_COUNTRY_MOBILE: ("user_country", __ENUM_OPERATORS),
+    schemas.FilterType.PLATFORM: ("user_device_type", __ENUM_OPERATORS)
+}
+
+# Same user identity as the USER_COUNT timeseries
+__USER_KEY = """assumeNotNull(multiIf(s.user_id IS NOT NULL AND s.user_id != '', s.user_id,
+                                     s.user_anonymous_id IS NOT NULL AND s.user_anonymous_id != '',
+                                     s.user_anonymous_id, toString(s.user_uuid)))"""
+
+__state = {"value": None, "read_at": 0}
+
+
+def __sessions_subquery(constraints: List[str]) -> str:
+    # one row per session, the last inserted one, as the sessions search does
+    return f"""SELECT *
+               FROM experimental.sessions AS s
+               WHERE {" AND ".join(constraints)}
+               ORDER BY _timestamp DESC
+               LIMIT 1 BY session_id"""
+
+
+def __get_state() -> Optional[dict]:
+    with ch_client.ClickHouseClient() as cur:
+        rows = cur.execute(query=f"""SELECT toUnixTimestamp(watermark) AS watermark,
+                                            toUnixTimestamp(since)     AS since
+                                     FROM {STATE_TABLE}
+                                     ORDER BY watermark DESC
+                                     LIMIT 1;""")
+    return rows[0] if len(rows) > 0 else None
+
+
+def get_state() -> Optional[dict]:
+    """
+    :return: since: the sessions starting from this time (seconds) are rolled up,
+             watermark: the sessions inserted until this time (seconds) are rolled up; None if nothing is rolled up
+    """
+    now = time.monotonic()
+    if __state["read_at"] < now - STATE_TTL:
+        __state["value"] = __get_state()
+        __state["read_at"] = now
+    return __state["value"]
+
+
+def refresh():
+    """
+    Rolls up the sessions inserted since the last refresh: the per-minute rollups of the minutes having new sessions
+    are computed again from the sessions, then the hours and days having new sessions from the finer rollups.
+    A rollup row is replaced by the newer computation of the same bucket.
+    """
+    if not ENABLED:
+        return
+    state = __get_state()
+    upper = int(time.time()) - SETTLE_DELAY
+    if state is None:
+        # the first refresh rolls up the sessions starting since the beginning of the backfill day
+        since = (upper - min(BACKFILL_DAYS, MINUTE_RETENTION_DAYS - 1) * DAY) // DAY * DAY
+        state = {"since": since, "watermark": since}
+    if upper <= state["watermark"]:
+        return
+    # the hours and days are rolled up from the minutes, so the sessions inserted late for a day
+    # older than the per-minute rollups are left out
+    params = {"watermark": state["watermark"], "upper": upper, "since": state["since"],
+              "minutes_since": max(state["since"], (upper - (MINUTE_RETENTION_DAYS - 1) * DAY) // DAY * DAY)}
+    start = time.perf_counter()
+    with ch_client.ClickHouseClient() as cur:
+        touched = """SELECT DISTINCT s.project_id, {truncate}(s.datetime, 'UTC')
+                     FROM experimental.sessions AS s
+                     WHERE s._timestamp > toDateTime(%(watermark)s)
+                       AND s._timestamp <= toDateTime(%(upper)s)
+                       AND s.datetime >= toDateTime(%(minutes_since)s)"""
+        dimensions = ", ".join(DIMENSIONS)
+        minute_table, truncate = GRANULARITIES[60]
+        sessions_query = __sessions_subquery(
+            ["s.datetime >= toDateTime(%(minutes_since)s)",
+             f"(s.project_id, {truncate}(s.datetime, 'UTC')) IN ({touched.format(truncate=truncate)})"])
+        cur.execute(query=cur.format(query=f"""\
+                INSERT INTO {minute_table} (project_id, bucket, {dimensions}, sessions, users)
+                SELECT s.project_id,
+                       {truncate}(s.datetime, 'UTC') AS minute,
+                       toString(s.user_device_type)    AS device_type,
+                       toString(s.user_country)        AS country,
+                       s.user_browser,
+                       s.user_os,
+                       count()                         AS sessions,
+                       uniqCombinedState({__USER_KEY}) AS users
+                FROM ({sessions_query}) AS s
+                GROUP BY s.project_id, minute, device_type, country, s.user_browser, s.user_os;""",
+                                     parameters=params))
+        finer_table = minute_table
+        for granularity in [60 * 60, DAY]:
+            table, truncate = GRANULARITIES[granularity]
+            cur.execute(query=cur.format(query=f"""\
+                    INSERT INTO {table} (project_id, bucket, {dimensions}, sessions, users)
+                    SELECT project_id,
+                           {truncate}(bucket, 'UTC')     AS coarse_bucket,
+                           {dimensions},
+                           sum(sessions)                 AS total_sessions,
+                           uniqCombinedMergeState(users) AS merged_users
+                    FROM {finer_table} FINAL
+                    WHERE bucket >= toDateTime(%(minutes_since)s)
+                      AND (project_id, {truncate}(bucket, 'UTC')) IN ({touched.format(truncate=truncate)})
+                    GROUP BY project_id, coarse_bucket, {dimensions};""",
+                                         parameters=params))
+            finer_table = table
+        cur.execute(query=f"""INSERT INTO {STATE_TABLE} (watermark, since)
+                              VALUES (toDateTime(%(upper)s), toDateTime(%(since)s));""",
+                    parameters=params)
+    __state["read_at"] = 0
+    logger.info(f"sessions rollups refreshed until {TimeUTC.to_human_readable(upper * 1000)} "
+                f"in {time.perf_counter() - start:.2f}s")
+
+
+def __filters_conditions(filters: list, column_prefix: str, full_args: dict) -> Optional[List[str]]:
+    """
+    :return: the conditions of the session filters on the rollup dimensions, None if a filter isn't supported
+    """
+    conditions = []
+    for i, f in enumerate(filters):
+        if f.type not in SUPPORTED_FILTERS or f.operator not in SUPPORTED_FILTERS[f.type][1]:
+            return None
+        if sh.isAny_opreator(f.operator):
+            # the rolled up dimensions are never null
+            continue
+        if len(f.value) == 0:
+            continue
+        column = SUPPORTED_FILTERS[f.type][0]
+        f_k = f"r_value{i}"
+        values = helper.values_for_operator(value=f.value, op=f.operator)
+        full_args.update(sh.multi_values(values, value_key=f_k))
+        conditions.append(sh.multi_conditions(f"{column_prefix}{column} {sh.get_sql_operator(f.operator)} %({f_k})s",
+                                              values, is_not=sh.is_negation_operator(f.operator), value_key=f_k))
+    return conditions
+
+
+def __get_granularity(start: int, step_size: int, state: dict) -> Optional[int]:
+    """
+    :return: the coarsest granularity in seconds to which the start and the steps are aligned, and that is rolled up
+             and still kept for the start
+    """
+    for granularity in GRANULARITIES:
+        if start % granularity != 0 or step_size % (granularity * 1000) != 0:
+            continue
+        if start < -(-state["since"] // granularity) * granularity:
+            continue
+        # the buckets older than the TTL of the table may be deleted already
+        if start < time.time() - (RETENTION_DAYS[granularity] - 1) * DAY:
+            continue
+        return granularity
+    return None
+
+
+def search_series(data: schemas.SessionsSearchPayloadSchema, project_id: int, density: int,
+                  metric_of: schemas.MetricOfTimeseries) -> Optional[List[dict]]:
+    """
+    Same result as sessions_ch.search2_series for a timeseries of sessions or users count,
+    computed from the rollups for the rolled up part of the range and from the sessions for the rest.
+    :return: None if the series can't be computed from the rollups
+    """
+    if not ENABLED or metric_of not in (schemas.MetricOfTimeseries.SESSION_COUNT,
+                                        schemas.MetricOfTimeseries.USER_COUNT) \
+            or len(data.events) > 0 or data.startTimestamp is None or data.endTimestamp is None:
+        return None
+    full_args = {"project_id": project_id, "startDate": data.startTimestamp, "endDate": data.endTimestamp}
+    rollup_conditions = __filters_conditions(filters=data.filters, column_prefix="r.", full_args=full_args)
+    if rollup_conditions is None:
+        return None
+    state = get_state()
+    if state is None:
+        return None
+    step_size = metrics_helper.get_step_size(endTimestamp=data.endTimestamp, startTimestamp=data.startTimestamp,
+                                             density=density, factor=1)
+    start = data.startTimestamp // 1000
+    if step_size <= 0 or data.startTimestamp % 1000 != 0:
+        return None
+    granularity = __get_granularity(start=start, step_size=step_size, state=state)
+    if granularity is None:
+        return None
+    # the sessions inserted after the watermark are read from the sessions table, from the bucket of the watermark
+    rollup_end = min((data.endTimestamp // 1000 + 1) // granularity, state["watermark"] // granularity) * granularity
+    if rollup_end <= start:
+        return None
+    full_args["rollup_end"] = rollup_end
+    full_args["step_size"] = step_size
+    table = GRANULARITIES[granularity][0]
+    rollup_conditions = ["r.project_id = %(project_id)s",
+                         "r.bucket >= toDateTime(%(startDate)s / 1000)",
+                         "r.bucket < toDateTime(%(rollup_end)s)"] + rollup_conditions
+    sessions_conditions = __filters_conditions(filters=data.filters, column_prefix="s.", full_args=full_args)
+    sessions_conditions = ["s.project_id = %(project_id)s",
+                           "s.datetime >= toDateTime(%(rollup_end)s)",
+                           "s.datetime <= toDateTime(%(endDate)s / 1000)"] + sessions_conditions
+    if metric_of == schemas.MetricOfTimeseries.SESSION_COUNT:
+        value = "sum(sessions)"
+    else:
+        value = "uniqCombinedMerge(users)"
+    query = f"""SELECT %(startDate)s
+                       + intDiv(toUnixTimestamp(bucket) * 1000 - %(startDate)s, %(step_size)s) * %(step_size)s
+                                   AS timestamp,
+                       {value}     AS count
+                FROM (SELECT r.bucket, r.sessions, r.users
+                      FROM {table} AS r FINAL
+                      WHERE {" AND ".join(rollup_conditions)}
+                      UNION ALL
+                      SELECT s.datetime                      AS bucket,
+                             count()                         AS sessions,
+                             uniqCombinedState({__USER_KEY}) AS users
+                      FROM ({__sessions_subquery(sessions_conditions)}) AS s
+                      GROUP BY s.datetime) AS buckets
+                GROUP BY timestamp
+                ORDER BY timestamp;"""
+    with ch_client.ClickHouseClient() as cur:
+        query = cur.format(query=query, parameters=full_args)
+        logger.debug("--------------------")
+        logger.debug(query)
+        logger.debug("--------------------")
+        rows = cur.execute(query=query)
+    return metrics_helper.complete_missing_steps(rows=rows, start_timestamp=data.startTimestamp,
+                                                 end_timestamp=data.endTimestamp, step=step_size,
+                                                 neutral={"count": 0})
@@ -1,9 +1,9 @@
 import logging
 import math
-import warnings
 from collections import defaultdict
 from typing import List
 
+import numpy as np
 from psycopg2.extras import RealDictRow
 
 import schemas
@@ -454,197 +454,190 @@ def get_simple_funnel(filter_d: schemas.CardSeriesFilterSchema, project: schemas
     return stages_list
 
 
-def pearson_corr(x: list, y: list):
-    n = len(x)
-    if n != len(y):
-        raise ValueError(f'x and y must have the same length. Got {len(x)} and {len(y)} instead')
+def __factorize(values) -> np.ndarray:
+    """
+    Maps every hashable value to a dense integer code (in first-seen order), None is mapped to -1
+    """
+    codes = {}
+    out = np.empty(len(values), dtype=np.int64)
+    for i, v in enumerate(values):
+        out[i] = -1 if v is None else codes.setdefault(v, len(codes))
+    return out
+
+
+def get_funnel_columns(rows: List[RealDictRow], n_stages, first_stage=1, last_stage=None) -> dict:
+    """
+    Converts the funnel rows into columns in a single pass:
+
+    reached     ::: boolean matrix (rows x stages), True if the row reached the stage
+    entered     ::: True if the row reached the first stage of the subfunnel
+    transited   ::: True if the row reached the first and the last stage of the subfunnel
+    issue       ::: the code of the issue that happened inside the subfunnel, -1 otherwise
+    session, user_uuid, user_id ::: dense codes of the respective row values, -1 for None
+    issues      ::: the list of issue_ids indexed by code, in order of appearance
+    issues_meta ::: the context and the type of every issue, indexed by code
+    """
+    if last_stage is None:
+        last_stage = n_stages
+    n_rows = len(rows)
+    reached = np.zeros((n_rows, n_stages), dtype=bool)
+    issue = np.full(n_rows, -1, dtype=np.int64)
+    issues = {}
+    issues_meta = []
+    session_ids = [None] * n_rows
+    user_uuids = [None] * n_rows
+    user_ids = [None] * n_rows
+    stage_keys = [f"stage{i}_timestamp" for i in range(1, n_stages + 1)]
+    first_key = stage_keys[first_stage - 1]
+    last_key = stage_keys[last_stage - 1]
+
+    for i, row in enumerate(rows):
+        session_ids[i] = row["session_id"]
+        user_uuids[i] = row["user_uuid"]
+        user_ids[i] = row.get("user_id")
+        for j, k in enumerate(stage_keys):
+            if row[k] is not None:
+                reached[i, j] = True
+
+        first_ts = row[first_key]
+        if first_ts is None or row["issue_type"] is None:
+            continue
+        last_ts = row[last_key]
+        # check that the issue belongs to subfunnel:
+        if last_ts is None or (first_ts < row["issue_timestamp"] < last_ts):
+            issue_id = row["issue_id"]
+            if issue_id not in issues:
+                issues[issue_id] = len(issues)
+                issues_meta.append({"context": row["issue_context"], "issue_type": row["issue_type"]})
+            issue[i] = issues[issue_id]
+
+    entered = reached[:, first_stage - 1]
+    return {"reached": reached,
+            "entered": entered,
+            "transited": entered & reached[:, last_stage - 1],
+            "issue": issue,
+            "session": __factorize(session_ids),
+            "user_uuid": __factorize(user_uuids),
+            "user_id": __factorize(user_ids),
+            "issues": list(issues),
+            "issues_meta": issues_meta}
+
+
+def __count_distinct_by_stage(reached: np.ndarray, codes: np.ndarray) -> dict:
+    seen = np.zeros(int(codes.max(initial=-1)) + 1, dtype=bool)
+    counts = {}
+    for i in range(reached.shape[1]):
+        seen[:] = False
+        seen[codes[reached[:, i] & (codes >= 0)]] = True
+        counts[i + 1] = int(np.count_nonzero(seen))
+    return counts
+
+
+def __count_distinct_by_issue(issue: np.ndarray, codes: np.ndarray, n_issues) -> np.ndarray:
+    mask = (issue >= 0) & (codes >= 0)
+    if not mask.any():
+        return np.zeros(n_issues, dtype=np.int64)
+    width = int(codes.max()) + 1
+    pairs = np.unique(issue[mask] * width + codes[mask])
+    return np.bincount(pairs // width, minlength=n_issues)
+
+
+def count_sessions(rows, n_stages, columns: dict = None):
+    if columns is None:
+        columns = get_funnel_columns(rows, n_stages)
+    return __count_distinct_by_stage(columns["reached"], columns["session"])
+
+
+def count_users(rows, n_stages, user_key="user_uuid", columns: dict = None):
+    if columns is None:
+        columns = get_funnel_columns(rows, n_stages)
+    return __count_distinct_by_stage(columns["reached"], columns[user_key])
+
+
+def get_affected_users_for_all_issues(columns: dict):
+    """
+    :param columns: the output of get_funnel_columns
+    :return: the issues found inside the subfunnel, the number of occurrences, of affected users
+             and of affected sessions of each issue
+    """
+    issues = columns["issues"]
+    issue = columns["issue"]
+    n_issues = len(issues)
+    all_issues = dict(zip(issues, columns["issues_meta"]))
+    n_issues_dict = defaultdict(lambda: 0)
+    n_affected_users_dict = defaultdict(lambda: None)
+    n_affected_sessions_dict = defaultdict(lambda: None)
+    if n_issues == 0:
+        return all_issues, n_issues_dict, n_affected_users_dict, n_affected_sessions_dict
+
+    n_issues_dict.update(zip(issues, np.bincount(issue[issue >= 0], minlength=n_issues).tolist()))
+    n_affected_users_dict.update({issues[i]: c for i, c in
+                                  enumerate(__count_distinct_by_issue(issue, columns["user_uuid"], n_issues).tolist())
+                                  if c > 0})
+    n_affected_sessions_dict.update(zip(issues,
+                                        __count_distinct_by_issue(issue, columns["session"], n_issues).tolist()))
+    return all_issues, n_issues_dict, n_affected_users_dict, n_affected_sessions_dict
+
 
+def __normalized(v: np.ndarray) -> np.ndarray:
+    """
+    The centered and normalized binary vector, with the float operations of the previous list based version
+    """
+    mean = int(np.count_nonzero(v)) / v.size
+    vm = np.where(v, 1 - mean, 0 - mean)
+    # the sums are left to sum(), which is compensated for floats since python 3.12, so the results are identical
+    return vm / math.sqrt(sum((vm * vm).tolist()))
+
+
+def pearson_corr_binary(x: np.ndarray, y: np.ndarray):
+    """
+    Pearson correlation of two boolean vectors.
+    :return: r (None if undefined), confidence (None if undefined), is_sign
+    """
+    n = x.size
     if n < 2:
-        warnings.warn(f'x and y must have length at least 2. Got {n} instead')
         return None, None, False
 
     # If an input is constant, the correlation coefficient is not defined.
-    if all(t == x[0] for t in x) or all(t == y[0] for t in y):
-        warnings.warn("An input array is constant; the correlation coefficent is not defined.")
+    n_x = int(np.count_nonzero(x))
+    n_y = int(np.count_nonzero(y))
+    if n_x in (0, n) or n_y in (0, n):
         return None, None, False
 
     if n == 2:
-        return math.copysign(1, x[1] - x[0]) * math.copysign(1, y[1] - y[0]), 1.0, True
-
-    xmean = sum(x) / len(x)
-    ymean = sum(y) / len(y)
-
-    xm = [el - xmean for el in x]
-    ym = [el - ymean for el in y]
+        return math.copysign(1, int(x[1]) - int(x[0])) * math.copysign(1, int(y[1]) - int(y[0])), 1.0, True
 
-    normxm = math.sqrt((sum([xm[i] * xm[i] for i in range(len(xm))])))
-    normym = math.sqrt((sum([ym[i] * ym[i] for i in range(len(ym))])))
-
-    threshold = 1e-8
-    if normxm < threshold * abs(xmean) or normym < threshold * abs(ymean):
-        # If all the values in x (likewise y) are very close to the mean,
-        # the loss of precision that occurs in the subtraction xm = x - xmean
-        # might result in large errors in r.
-        warnings.warn("An input array is constant; the correlation coefficent is not defined.")
-
-    r = sum(
-        i[0] * i[1] for i in zip([xm[i] / normxm for i in range(len(xm))], [ym[i] / normym for i in range(len(ym))]))
+    r = sum((__normalized(x) * __normalized(y)).tolist())
 
     # Presumably, if abs(r) > 1, then it is only some small artifact of  floating point arithmetic.
     # However, if r < 0, we don't care, as our problem is to find only positive correlations
     r = max(min(r, 1.0), 0.0)
 
     # approximated confidence
-    if n < 31:
-        t_c = T_VALUES[n]
-    elif n < 50:
-        t_c = 2.02
-    else:
-        t_c = 2
     if r >= 0.999:
         confidence = 1
     else:
         confidence = r * math.sqrt(n - 2) / math.sqrt(1 - r ** 2)
 
-    if confidence > SIGNIFICANCE_THRSH:
-        return r, confidence, True
-    else:
-        return r, confidence, False
+    return r, confidence, confidence > SIGNIFICANCE_THRSH
 
 
-# def tuple_or(t: tuple):
-#     x = 0
-#     for el in t:
-#         x |= el # | is for bitwise OR
-#     return x
-#
-# The following function is correct optimization of the previous function because t is a list of 0,1
-def tuple_or(t: tuple):
-    for el in t:
-        if el > 0:
-            return 1
-    return 0
-
-
-def get_transitions_and_issues_of_each_type(rows: List[RealDictRow], all_issues, first_stage, last_stage):
-    """
-    Returns two lists with binary values 0/1:
-
-    transitions ::: if transited from the first stage to the last - 1
-                    else - 0
-    errors      ::: a dictionary WHERE the keys are all unique issues (currently context-wise)
-                    the values are lists
-                    if an issue happened between the first stage to the last - 1
-                    else - 0
-
-    For a small task of calculating a total drop due to issues,
-    we need to disregard the issue type when creating the `errors`-like array.
-    The `all_errors` array can be obtained by logical OR statement applied to all errors by issue
-    The `transitions` array stays the same
+def get_transitions_and_issues_of_each_type(columns: dict):
     """
-    transitions = []
-    n_sess_affected = 0
-    errors = {}
-
-    for row in rows:
-        t = 0
-        first_ts = row[f'stage{first_stage}_timestamp']
-        last_ts = row[f'stage{last_stage}_timestamp']
-        if first_ts is None:
-            continue
-        elif last_ts is not None:
-            t = 1
-        transitions.append(t)
-
-        ic_present = False
-        for error_id in all_issues:
-            if error_id not in errors:
-                errors[error_id] = []
-            ic = 0
-            row_issue_id = row['issue_id']
-            if row_issue_id is not None:
-                if last_ts is None or (first_ts < row['issue_timestamp'] < last_ts):
-                    if error_id == row_issue_id:
-                        ic = 1
-                        ic_present = True
-            errors[error_id].append(ic)
-
-        if ic_present and t:
-            n_sess_affected += 1
-
-    all_errors = [tuple_or(t) for t in zip(*errors.values())]
+    Returns the vectors to correlate, for the rows that reached the first stage of the subfunnel:
 
-    return transitions, errors, all_errors, n_sess_affected
+    transitions ::: True if transited from the first stage to the last
+    issue       ::: the code of the issue that happened between the first stage and the last, -1 otherwise
+    n_sess_affected ::: the number of transited rows having any issue
 
-
-def get_affected_users_for_all_issues(rows, first_stage, last_stage):
+    The vector of an issue is issue == its code.
+    For a small task of calculating a total drop due to issues, we disregard the issue type: issue >= 0
     """
-
-    :param rows:
-    :param first_stage:
-    :param last_stage:
-    :return:
-    """
-    affected_users = defaultdict(lambda: set())
-    affected_sessions = defaultdict(lambda: set())
-    all_issues = {}
-    n_affected_users_dict = defaultdict(lambda: None)
-    n_affected_sessions_dict = defaultdict(lambda: None)
-    n_issues_dict = defaultdict(lambda: 0)
-    issues_by_session = defaultdict(lambda: 0)
-
-    for row in rows:
-
-        # check that the session has reached the first stage of subfunnel:
-        if row[f'stage{first_stage}_timestamp'] is None:
-            continue
-
-        iss = row['issue_type']
-        iss_ts = row['issue_timestamp']
-
-        # check that the issue exists and belongs to subfunnel:
-        if iss is not None and (row[f'stage{last_stage}_timestamp'] is None or
-                                (row[f'stage{first_stage}_timestamp'] < iss_ts < row[f'stage{last_stage}_timestamp'])):
-            if row["issue_id"] not in all_issues:
-                all_issues[row["issue_id"]] = {"context": row['issue_context'], "issue_type": row["issue_type"]}
-            n_issues_dict[row["issue_id"]] += 1
-            if row['user_uuid'] is not None:
-                affected_users[row["issue_id"]].add(row['user_uuid'])
-
-            affected_sessions[row["issue_id"]].add(row['session_id'])
-            issues_by_session[row[f'session_id']] += 1
-
-    if len(affected_users) > 0:
-        n_affected_users_dict.update({
-            iss: len(affected_users[iss]) for iss in affected_users
-        })
-    if len(affected_sessions) > 0:
-        n_affected_sessions_dict.update({
-            iss: len(affected_sessions[iss]) for iss in affected_sessions
-        })
-    return all_issues, n_issues_dict, n_affected_users_dict, n_affected_sessions_dict
-
-
-def count_sessions(rows, n_stages):
-    session_counts = {i: set() for i in range(1, n_stages + 1)}
-    for row in rows:
-        for i in range(1, n_stages + 1):
-            if row[f"stage{i}_timestamp"] is not None:
-                session_counts[i].add(row[f"session_id"])
-
-    session_counts = {i: len(session_counts[i]) for i in session_counts}
-    return session_counts
-
-
-def count_users(rows, n_stages, user_key="user_uuid"):
-    users_in_stages = {i: set() for i in range(1, n_stages + 1)}
-    for row in rows:
-        for i in range(1, n_stages + 1):
-            if row[f"stage{i}_timestamp"] is not None and row[user_key] is not None:
-                users_in_stages[i].add(row[user_key])
-
-    users_count = {i: len(users_in_stages[i]) for i in range(1, n_stages + 1)}
-    return users_count
+    entered = columns["entered"]
+    issue = columns["issue"][entered]
+    transitions = columns["transited"][entered]
+    n_sess_affected = int(np.count_nonzero((issue >= 0) & transitions))
+    return transitions, issue, n_sess_affected
 
 
 def get_stages(stages, rows,
@@ -705,19 +698,18 @@ def get_issues(stages, rows, first_stage=None, last_stage=None, drop_only=False)
     n_critical_issues = 0
     issues_dict = {"significant": [],
                    "insignificant": []}
-    session_counts = count_sessions(rows, n_stages)
+    columns = get_funnel_columns(rows, n_stages, first_stage=first_stage, last_stage=last_stage)
+    del rows
+    session_counts = count_sessions(None, n_stages, columns=columns)
     drop = session_counts[first_stage] - session_counts[last_stage]
 
-    all_issues, n_issues_dict, affected_users_dict, affected_sessions = get_affected_users_for_all_issues(
-        rows, first_stage, last_stage)
-    transitions, errors, all_errors, n_sess_affected = get_transitions_and_issues_of_each_type(rows,
-                                                                                               all_issues,
-                                                                                               first_stage, last_stage)
+    all_issues, n_issues_dict, affected_users_dict, affected_sessions = get_affected_users_for_all_issues(columns)
+    transitions, issue, n_sess_affected = get_transitions_and_issues_of_each_type(columns)
 
-    del rows
+    del columns
 
-    if any(all_errors):
-        total_drop_corr, conf, is_sign = pearson_corr(transitions, all_errors)
+    if (issue >= 0).any():
+        total_drop_corr, _, _ = pearson_corr_binary(transitions, issue >= 0)
         if total_drop_corr is not None and drop is not None:
             total_drop_due_to_issues = int(total_drop_corr * n_sess_affected)
         else:
@@ -727,11 +719,12 @@ def get_issues(stages, rows, first_stage=None, last_stage=None, drop_only=False)
 
     if drop_only:
         return total_drop_due_to_issues
-    for issue_id in all_issues:
 
-        if not any(errors[issue_id]):
+    n_y = np.bincount(issue[issue >= 0], minlength=len(all_issues))
+    for i, issue_id in enumerate(all_issues):
+        if n_y[i] == 0:
             continue
-        r, confidence, is_sign = pearson_corr(transitions, errors[issue_id])
+        r, confidence, is_sign = pearson_corr_binary(transitions, issue == i)
 
         if r is not None and drop is not None and is_sign:
             lost_conversions = int(r * affected_sessions[issue_id])
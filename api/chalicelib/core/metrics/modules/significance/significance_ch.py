@@ -161,7 +161,7 @@ def get_simple_funnel(filter_d: schemas.CardSeriesFilterSchema, project: schemas
         if is_not:
             n_stages_query_not.append(n_stages_query[-1] + " AND " +
                                       (sh.multi_conditions(
-                                          f"JSON_VALUE(CAST(`$properties` AS String), '$.{next_col_name}') {op} %({e_k})s",
+                                          f"{exp_ch_helper.get_event_property(next_col_name)} {op} %({e_k})s",
                                           s.value,
                                           is_not=is_not,
                                           value_key=e_k
@@ -169,7 +169,7 @@ def get_simple_funnel(filter_d: schemas.CardSeriesFilterSchema, project: schemas
         elif not is_any:
             n_stages_query[-1] += " AND " + (
                 sh.multi_conditions(
-                    f"JSON_VALUE(CAST(`$properties` AS String), '$.{next_col_name}') {op} %({e_k})s",
+                    f"{exp_ch_helper.get_event_property(next_col_name)} {op} %({e_k})s",
                     s.value,
                     is_not=is_not,
                     value_key=e_k
@@ -0,0 +1,197 @@
+import asyncio
+import copy
+import logging
+import threading
+import time
+from typing import Callable, Awaitable, Optional
+
+from cachetools import TTLCache
+from decouple import config
+
+logger = logging.getLogger(__name__)
+
+ENABLED = config("PROJECT_CATALOG_CACHE", cast=bool, default=True)
+# Share the versions of the projects between the workers (and instances) through Redis,
+# otherwise an invalidation only reaches the worker handling the change
+REDIS_ENABLED = config("PROJECT_CATALOG_REDIS", cast=bool, default=False)
+# Seconds a version read from Redis is trusted, it bounds the staleness on the other workers
+VERSION_TTL = config("PROJECT_CATALOG_VERSION_TTL", cast=float, default=1)
+MAX_SIZE = config("PROJECT_CATALOG_CACHE_MAX_SIZE", cast=int, default=20000)
+KEY_PREFIX = "or_cache:project_version:"
+
+# The kinds of values cached per project
+PROJECT = "project"
+METADATA = "metadata"
+PROJECT_KEY = "project_key"
+CONDITIONS = "conditions"
+
+
+class _SharedVersions:
+    """
+    The versions of the projects kept in Redis, each one read again after VERSION_TTL seconds;
+    None is returned when Redis can't be reached, nothing is cached then
+    """
+
+    def __init__(self, redis_module):
+        self.client = redis_module.from_url(config("REDIS_STRING"),
+                                            socket_timeout=config("PROJECT_CATALOG_REDIS_TIMEOUT",
+                                                                  cast=float, default=0.2))
+        self.versions = TTLCache(maxsize=MAX_SIZE, ttl=VERSION_TTL, timer=time.monotonic)
+        self.lock = threading.Lock()
+
+    def get(self, project_id: int) -> Optional[int]:
+        with self.lock:
+            version = self.versions.get(project_id)
+        if version is not None:
+            return version
+        try:
+            version = int(self.client.get(f"{KEY_PREFIX}{project_id}") or 0)
+        except Exception as e:
+            logger.warning(f"project-catalog: error while reading the version of {project_id}: {e}")
+            return None
+        with self.lock:
+            self.versions[project_id] = version
+        return version
+
+    def incr(self, project_id: int):
+        try:
+            version = self.client.incr(f"{KEY_PREFIX}{project_id}")
+        except Exception as e:
+            logger.error(f"!! project-catalog: error while invalidating {project_id}: {e}")
+            version = None
+        with self.lock:
+            if version is None:
+                self.versions.pop(project_id, None)
+            else:
+                self.versions[project_id] = version
+
+
+def __get_shared_versions() -> Optional[_SharedVersions]:
+    if not ENABLED or not REDIS_ENABLED:
+        return None
+    try:
+        # redis is not part of every image (e.g.: alerts)
+        import redis
+    except ImportError:
+        logger.warning("project-catalog: redis is not installed, the versions are kept per process")
+        return None
+    return _SharedVersions(redis)
+
+
+shared_versions: Optional[_SharedVersions] = __get_shared_versions()
+# Seconds a value is kept, it bounds the staleness on the other workers when the versions aren't shared
+TTL = config("PROJECT_CATALOG_CACHE_TTL", cast=int, default=300 if shared_versions is not None else 5)
+
+# (project_id, kind) -> (version, value)
+__entries = TTLCache(maxsize=MAX_SIZE, ttl=TTL)
+# project_id -> version, incremented by each invalidation (when the versions aren't shared);
+# a value loaded while the project was invalidated is not stored
+__versions = {}
+__lock = threading.Lock()
+
+
+def __get_version(project_id: int) -> Optional[int]:
+    if shared_versions is not None:
+        return shared_versions.get(project_id)
+    with __lock:
+        return __versions.get(project_id, 0)
+
+
+def __lookup(project_id, kind):
+    project_id = int(project_id)
+    version = __get_version(project_id)
+    if version is None:
+        return None, False, None
+    with __lock:
+        entry = __entries.get((project_id, kind))
+    if entry is not None and entry[0] == version:
+        return version, True, copy.deepcopy(entry[1])
+    return version, False, None
+
+
+def __store(project_id, kind, version, value):
+    # a missing project is not cached: it could be created (or restored) on another worker
+    if version is None or value is None:
+        return
+    project_id = int(project_id)
+    if __get_version(project_id) != version:
+        return
+    with __lock:
+        __entries[(project_id, kind)] = (version, copy.deepcopy(value))
+
+
+def get(project_id: int, kind, loader: Callable, cached: bool = True):
+    """
+    :param loader: returns the value from the DB when it is not cached
+    :param cached: False to read the DB, for the settings pages showing the value being edited
+    """
+    if not ENABLED or not cached:
+        return loader()
+    version, found, value = __lookup(project_id=project_id, kind=kind)
+    if found:
+        return value
+    value = loader()
+    __store(project_id=project_id, kind=kind, version=version, value=value)
+    return value
+
+
+async def get_async(project_id: int, kind, loader: Callable[[], Awaitable]):
+    if not ENABLED:
+        return await loader()
+    # the shared versions are read from Redis, off the event loop
+    version, found, value = await asyncio.to_thread(__lookup, project_id=project_id, kind=kind)
+    if found:
+        return value
+    value = await loader()
+    await asyncio.to_thread(__store, project_id=project_id, kind=kind, version=version, value=value)
+    return value
+
+
+def get_batch(project_ids: list, kind, loader: Callable[[list], dict]) -> dict:
+    """
+    :param loader: returns the values of the given projects as a dict, in a single DB call
+    :return: project_id -> value, for the projects found
+    """
+    if not ENABLED:
+        return loader(project_ids)
+    results = {}
+    missing = {}
+    for project_id in project_ids:
+        version, found, value = __lookup(project_id=project_id, kind=kind)
+        if found:
+            results[project_id] = value
+        else:
+            missing[project_id] = version
+    if len(missing) > 0:
+        loaded = loader(list(missing.keys()))
+        for project_id, version in missing.items():
+            if project_id in loaded:
+                __store(project_id=project_id, kind=kind, version=version, value=loaded[project_id])
+                results[project_id] = loaded[project_id]
+    return results
+
+
+def get_version(project_id: int) -> Optional[int]:
+    """
+    :return: the invalidations count of the project, to key the values derived from its settings or metadata;
+    None if it is unknown (the values shouldn't be cached then)
+    """
+    return __get_version(int(project_id))
+
+
+def invalidate(project_id: int):
+    """
+    To call after any change of the project's settings, metadata or capture conditions
+    """
+    project_id = int(project_id)
+    if shared_versions is not None:
+        shared_versions.incr(project_id)
+    with __lock:
+        __versions[project_id] = __versions.get(project_id, 0) + 1
+        for key in [k for k in __entries.keys() if k[0] == project_id]:
+            __entries.pop(key, None)
+
+
+def clear():
+    with __lock:
+        __entries.clear()
@@ -6,7 +6,7 @@ from typing import Optional, List
 from fastapi import HTTPException, status
 
 import schemas
-from chalicelib.core import users
+from chalicelib.core import users, project_catalog
 from chalicelib.utils import pg_client, helper
 from chalicelib.utils.TimeUTC import TimeUTC
 
@@ -42,7 +42,9 @@ def __update(tenant_id, project_id, changes):
                                 RETURNING project_id,name,gdpr;""",
                             {"project_id": project_id, **changes})
         cur.execute(query=query)
-        return helper.dict_to_camel_case(cur.fetchone())
+        row = cur.fetchone()
+    project_catalog.invalidate(project_id)
+    return helper.dict_to_camel_case(row)
 
 
 def __create(tenant_id, data):
@@ -112,7 +114,7 @@ def get_projects(tenant_id: int, gdpr: bool = False, recorded: bool = False):
         return helper.list_to_camel_case(rows)
 
 
-def get_project(tenant_id, project_id, include_last_session=False, include_gdpr=None):
+def __get_project(tenant_id, project_id, include_last_session=False, include_gdpr=None):
     with pg_client.PostgresClient() as cur:
         extra_select = ""
         if include_last_session:
@@ -137,6 +139,15 @@ def get_project(tenant_id, project_id, include_last_session=False, include_gdpr=
         return helper.dict_to_camel_case(row)
 
 
+def get_project(tenant_id, project_id, include_last_session=False, include_gdpr=None, cached=True):
+    if include_last_session or include_gdpr:
+        return __get_project(tenant_id=tenant_id, project_id=project_id,
+                             include_last_session=include_last_session, include_gdpr=include_gdpr)
+    return project_catalog.get(project_id=project_id, kind=(project_catalog.PROJECT, tenant_id),
+                               loader=lambda: __get_project(tenant_id=tenant_id, project_id=project_id),
+                               cached=cached)
+
+
 def create(tenant_id, user_id, data: schemas.CreateProjectSchema, skip_authorization=False):
     if __exists_by_name(name=data.name, exclude_id=None):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"name already exists.")
@@ -169,6 +180,7 @@ def delete(tenant_id, user_id, project_id):
                                WHERE project_id = %(project_id)s;""",
                             {"project_id": project_id})
         cur.execute(query=query)
+    project_catalog.invalidate(project_id)
     return {"data": {"state": "success"}}
 
 
@@ -217,7 +229,7 @@ def get_by_project_key(project_key):
         return helper.dict_to_camel_case(row)
 
 
-def get_project_key(project_id):
+def __get_project_key(project_id):
     with pg_client.PostgresClient() as cur:
         query = cur.mogrify("""SELECT project_key
                                FROM public.projects
@@ -229,6 +241,11 @@ def get_project_key(project_id):
         return project["project_key"] if project is not None else None
 
 
+def get_project_key(project_id):
+    return project_catalog.get(project_id=project_id, kind=project_catalog.PROJECT_KEY,
+                               loader=lambda: __get_project_key(project_id))
+
+
 def get_capture_status(project_id):
     with pg_client.PostgresClient() as cur:
         query = cur.mogrify("""SELECT sample_rate AS rate, sample_rate=100 AS capture_all
@@ -251,11 +268,11 @@ def update_capture_status(project_id, changes: schemas.SampleRateSchema):
                                     AND deleted_at ISNULL;""",
                             {"project_id": project_id, "sample_rate": sample_rate})
         cur.execute(query=query)
-
+    project_catalog.invalidate(project_id)
     return changes
 
 
-def get_conditions(project_id):
+def __get_conditions(project_id):
     with pg_client.PostgresClient() as cur:
         query = cur.mogrify("""SELECT p.sample_rate AS rate, p.conditional_capture,
                                     COALESCE(
@@ -286,6 +303,11 @@ def get_conditions(project_id):
         return row
 
 
+def get_conditions(project_id, cached=True):
+    return project_catalog.get(project_id=project_id, kind=project_catalog.CONDITIONS,
+                               loader=lambda: __get_conditions(project_id), cached=cached)
+
+
 def validate_conditions(conditions: List[schemas.ProjectConditions]) -> List[str]:
     errors = []
     names = [condition.name for condition in conditions]
@@ -325,7 +347,7 @@ def update_conditions(project_id, changes: schemas.ProjectSettings):
                                 "conditional_capture": changes.conditional_capture
                             })
         cur.execute(query=query)
-
+    project_catalog.invalidate(project_id)
     return update_project_conditions(project_id, changes.conditions)
 
 
@@ -399,7 +421,7 @@ def update_project_conditions(project_id, conditions):
     if conditions is None:
         return
 
-    existing = get_conditions(project_id)["conditions"]
+    existing = __get_conditions(project_id)["conditions"]
     existing_ids = {c.condition_id for c in existing}
 
     to_be_updated = [c for c in conditions if c.condition_id in existing_ids]
@@ -415,6 +437,7 @@ def update_project_conditions(project_id, conditions):
     if to_be_updated:
         update_project_condition(project_id, to_be_updated)
 
+    project_catalog.invalidate(project_id)
     return get_conditions(project_id)
 
 
@@ -446,6 +469,7 @@ def delete_metadata_condition(project_id, metadata_key):
     with pg_client.PostgresClient() as cur:
         query = cur.mogrify(sql, {"project_id": project_id, "metadata_key": metadata_key})
         cur.execute(query)
+    project_catalog.invalidate(project_id)
 
 
 def rename_metadata_condition(project_id, old_metadata_key, new_metadata_key):
@@ -467,5 +491,6 @@ def rename_metadata_condition(project_id, old_metadata_key, new_metadata_key):
         query = cur.mogrify(sql, {"project_id": project_id, "old_metadata_key": old_metadata_key,
                                   "new_metadata_key": new_metadata_key})
         cur.execute(query)
+    project_catalog.invalidate(project_id)
 
 # TODO: make project conditions use metadata-column-name instead of metadata-key
@@ -0,0 +1,118 @@
+import hashlib
+import inspect
+import json
+import logging
+import threading
+from functools import wraps
+from typing import Callable, Optional
+
+from cachetools import TTLCache
+from decouple import config
+from pydantic import BaseModel
+
+from chalicelib.core import project_catalog
+
+logger = logging.getLogger(__name__)
+
+ENABLED = config("QUERY_PARTS_CACHE", cast=bool, default=True)
+MAX_SIZE = config("QUERY_PARTS_CACHE_MAX_SIZE", cast=int, default=2000)
+# The compiled queries depend on the project's metadata columns, they are not kept longer than the catalog's values
+TTL = min(config("QUERY_PARTS_CACHE_TTL", cast=int, default=300), project_catalog.TTL)
+
+# The attributes of the search payload that are bound as query parameters, they are not part of the key
+BOUND_ATTRIBUTES = {"startTimestamp", "endTimestamp", "page", "limit", "cursor", "approximate_total"}
+# The attributes of the search payload normalized by the builders, restored on a hit
+NORMALIZED_ATTRIBUTES = ("events_order",)
+
+# key -> (query_part, full_args, normalized attributes)
+__compiled = TTLCache(maxsize=MAX_SIZE, ttl=TTL)
+__lock = threading.Lock()
+__counters = {"hits": 0, "misses": 0}
+
+
+def __to_key_part(value):
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (list, tuple, set)):
+        return [__to_key_part(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): __to_key_part(v) for k, v in value.items()}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return repr(value)
+
+
+def __get_key(builder, data: BaseModel, arguments: dict, extra_key) -> Optional[str]:
+    """
+    :return: None if the version of the project's metadata is unknown, the query is compiled without caching
+    """
+    version = project_catalog.get_version(arguments["project_id"])
+    if version is None:
+        return None
+    key = {"builder": f"{builder.__module__}.{builder.__qualname__}",
+           "data": data.model_dump_json(exclude=BOUND_ATTRIBUTES),
+           # a missing bound is a missing constraint, not a parameter
+           "bounds": [data.startTimestamp is None, data.endTimestamp is None],
+           "arguments": __to_key_part(arguments),
+           "extra": __to_key_part(extra_key),
+           "version": version}
+    return hashlib.sha1(json.dumps(key, sort_keys=True).encode("UTF-8")).hexdigest()
+
+
+def __bind(data: BaseModel, query_part, full_args: dict, normalized: dict):
+    for k, v in normalized.items():
+        setattr(data, k, v)
+    return {**full_args, "startDate": data.startTimestamp, "endDate": data.endTimestamp}, query_part
+
+
+def cached(extra_key: Optional[Callable] = None):
+    """
+    Compiles a search_query_parts builder once per search: the query_part and the query arguments are cached
+    by everything that shapes the query (filters, events, operators, values, options, project metadata version),
+    the time range is bound to the compiled query on each call.
+    :param extra_key: returns what else shapes the query for the given call arguments (e.g.: the tables names)
+    """
+
+    def decorator(builder):
+        signature = inspect.signature(builder)
+
+        @wraps(builder)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return builder(*args, **kwargs)
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            arguments = dict(arguments.arguments)
+            data = arguments.pop("data")
+            try:
+                key = __get_key(builder=builder, data=data, arguments=arguments,
+                                extra_key=None if extra_key is None else extra_key(data=data, **arguments))
+            except Exception as e:
+                logger.warning(f"query-parts cache: couldn't compute the key of {builder.__qualname__}: {e}")
+                return builder(*args, **kwargs)
+            if key is None:
+                return builder(*args, **kwargs)
+            with __lock:
+                entry = __compiled.get(key)
+                __counters["hits" if entry is not None else "misses"] += 1
+            if entry is not None:
+                return __bind(data, *entry)
+            full_args, query_part = builder(*args, **kwargs)
+            with __lock:
+                __compiled[key] = (query_part, dict(full_args),
+                                   {k: getattr(data, k) for k in NORMALIZED_ATTRIBUTES if hasattr(data, k)})
+            return full_args, query_part
+
+        return wrapper
+
+    return decorator
+
+
+def get_stats():
+    with __lock:
+        return {**__counters, "size": len(__compiled)}
+
+
+def clear():
+    with __lock:
+        __compiled.clear()
@@ -3,7 +3,7 @@ from typing import List, Union
 
 import schemas
 from chalicelib.core import events, metadata
-from . import performance_event, sessions_legacy
+from . import performance_event, sessions_legacy, query_parts_cache
 from chalicelib.utils import pg_client, helper, metrics_helper, ch_client, exp_ch_helper
 from chalicelib.utils import sql_helper as sh
 
@@ -137,7 +137,7 @@ def search2_table(data: schemas.SessionsSearchPayloadSchema, project_id: int, de
     extra_conditions = None
     if metric_of == schemas.MetricOfTable.VISITED_URL:
         extra_event = f"""SELECT DISTINCT ev.session_id, 
-                             JSONExtractString(toString(ev.`$properties`), 'url_path') AS url_path
+                             {exp_ch_helper.get_event_property('url_path', 'ev')} AS url_path
                   FROM {exp_ch_helper.get_main_events_table(data.startTimestamp)} AS ev
                   WHERE ev.created_at >= toDateTime(%(startDate)s / 1000)
                     AND ev.created_at <= toDateTime(%(endDate)s / 1000)
@@ -161,7 +161,7 @@ def search2_table(data: schemas.SessionsSearchPayloadSchema, project_id: int, de
         extra_conditions = list(extra_conditions.values())
     elif metric_of == schemas.MetricOfTable.FETCH:
         extra_event = f"""SELECT DISTINCT ev.session_id, 
-                                JSONExtractString(toString(ev.`$properties`), 'url_path') AS url_path
+                                {exp_ch_helper.get_event_property('url_path', 'ev')} AS url_path
                   FROM {exp_ch_helper.get_main_events_table(data.startTimestamp)} AS ev
                   WHERE ev.created_at >= toDateTime(%(startDate)s / 1000)
                     AND ev.created_at <= toDateTime(%(endDate)s / 1000)
@@ -329,6 +329,8 @@ def json_condition(table_alias, json_column, json_key, op, values, value_key, ch
     if numeric_check:
         extract_func = "JSONExtractFloat" if numeric_type == "float" else "JSONExtractInt"
         condition = f"{extract_func}(toString({table_alias}.`{json_column}`), '{json_key}') {op} %({value_key})s"
+    elif json_column == "$properties":
+        condition = f"{exp_ch_helper.get_event_property(json_key, table_alias)} {op} %({value_key})s"
     else:
         condition = f"JSONExtractString(toString({table_alias}.`{json_column}`), '{json_key}') {op} %({value_key})s"
 
@@ -337,7 +339,13 @@ def json_condition(table_alias, json_column, json_key, op, values, value_key, ch
     return " AND ".join(conditions)
 
 
+def __get_tables(data: schemas.SessionsSearchPayloadSchema, platform, **_):
+    return exp_ch_helper.get_main_events_table(timestamp=data.startTimestamp, platform=platform), \
+        exp_ch_helper.get_main_sessions_table(data.startTimestamp)
+
+
 # this function generates the query and return the generated-query with the dict of query arguments
+@query_parts_cache.cached(extra_key=__get_tables)
 def search_query_parts_ch(data: schemas.SessionsSearchPayloadSchema, error_status, errors_only, favorite_only, issue,
                           project_id, user_id, platform="web", extra_event=None, extra_deduplication=[],
                           extra_conditions=None):
@@ -870,12 +878,13 @@ def search_query_parts_ch(data: schemas.SessionsSearchPayloadSchema, error_statu
                 events_conditions[-1]["condition"] = []
                 if not is_any and event.value not in [None, "*", ""]:
                     event_where.append(
-                        sh.multi_conditions(f"(toString(main1.`$properties`.message) {op} %({e_k})s OR toString(main1.`$properties`.name) {op} %({e_k})s)",
+                        sh.multi_conditions(f"({exp_ch_helper.get_event_property('message', 'main1')} {op} %({e_k})s"
+                                            f" OR {exp_ch_helper.get_event_property('name', 'main1')} {op} %({e_k})s)",
                                             event.value, value_key=e_k))
                     events_conditions[-1]["condition"].append(event_where[-1])
                     events_extra_join += f" AND {event_where[-1]}"
                 if len(event.source) > 0 and event.source[0] not in [None, "*", ""]:
-                    event_where.append(sh.multi_conditions(f"toString(main1.`$properties`.source) = %({s_k})s", event.source, value_key=s_k))
+                    event_where.append(sh.multi_conditions(f"{exp_ch_helper.get_event_property('source', 'main1')} = %({s_k})s", event.source, value_key=s_k))
                     events_conditions[-1]["condition"].append(event_where[-1])
                     events_extra_join += f" AND {event_where[-1]}"
 
@@ -1127,7 +1136,7 @@ def search_query_parts_ch(data: schemas.SessionsSearchPayloadSchema, error_statu
                                 {
                                     "type": f"sub.`$event_name`='{exp_ch_helper.get_event_type(event_type, platform=platform)}'"})
                             events_conditions_not[-1]["condition"] = sh.multi_conditions(
-                                f"sub.`$properties`.url_path {r_op} %({e_k_f})s", f.value, value_key=e_k_f)
+                                f"{exp_ch_helper.get_event_property('url_path', 'sub')} {r_op} %({e_k_f})s", f.value, value_key=e_k_f)
                     elif f.type == schemas.FetchFilterType.FETCH_STATUS_CODE:
                         event_where.append(json_condition(
                             "main", "$properties", 'status', op, f.value, e_k_f, True, True
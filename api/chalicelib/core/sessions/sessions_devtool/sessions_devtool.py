@@ -15,16 +15,12 @@ def get_devtools_keys(project_id, session_id):
 
 
 def get_urls(session_id, project_id, context: schemas.CurrentContext, check_existence: bool = True):
-    results = []
-    for k in get_devtools_keys(project_id=project_id, session_id=session_id):
-        if check_existence and not StorageClient.exists(bucket=config("sessions_bucket"), key=k):
-            continue
-        results.append(StorageClient.get_presigned_url_for_sharing(
-            bucket=config("sessions_bucket"),
-            expires_in=config("PRESIGNED_URL_EXPIRATION", cast=int, default=900),
-            key=k
-        ))
-    return results
+    return StorageClient.get_presigned_urls_for_sharing(
+        bucket=config("sessions_bucket"),
+        expires_in=config("PRESIGNED_URL_EXPIRATION", cast=int, default=900),
+        keys=get_devtools_keys(project_id=project_id, session_id=session_id),
+        check_exists=check_existence
+    )
 
 
 def delete_mobs(project_id, session_ids):
@@ -69,3 +69,18 @@ def get_start_end_timestamp(project_id, user_id):
         )
         r = cur.fetchone()
     return (0, 0) if r is None else (r["min_start_ts"], r["max_start_ts"])
+
+
+async def get_start_end_timestamp_async(project_id, user_id):
+    async with pg_client.AsyncPostgresClient() as cur:
+        await cur.execute(
+            cur.mogrify(
+                """SELECT max(start_ts) AS max_start_ts, min(start_ts) AS min_start_ts                                                
+                    FROM public.user_favorite_sessions INNER JOIN sessions USING(session_id)
+                    WHERE
+                     user_favorite_sessions.user_id = %(userId)s
+                     AND project_id = %(project_id)s;""",
+                {"userId": user_id, "project_id": project_id})
+        )
+        r = await cur.fetchone()
+    return (0, 0) if r is None else (r["min_start_ts"], r["max_start_ts"])
@@ -30,52 +30,40 @@ def __get_mob_keys_deprecated(session_id):
 
 def get_first_url(project_id, session_id, check_existence: bool = True):
     k = __get_mob_keys(project_id=project_id, session_id=session_id)[0]
-    if check_existence and not StorageClient.exists(bucket=config("sessions_bucket"), key=k):
-        return None
-    return StorageClient.get_presigned_url_for_sharing(
+    urls = StorageClient.get_presigned_urls_for_sharing(
         bucket=config("sessions_bucket"),
         expires_in=config("PRESIGNED_URL_EXPIRATION", cast=int, default=900),
-        key=k
+        keys=[k],
+        check_exists=check_existence
     )
+    return urls[0] if len(urls) > 0 else None
 
 
 def get_urls(project_id, session_id, check_existence: bool = True):
-    results = []
-    for k in __get_mob_keys(project_id=project_id, session_id=session_id):
-        if check_existence and not StorageClient.exists(bucket=config("sessions_bucket"), key=k):
-            continue
-        results.append(StorageClient.get_presigned_url_for_sharing(
-            bucket=config("sessions_bucket"),
-            expires_in=config("PRESIGNED_URL_EXPIRATION", cast=int, default=900),
-            key=k
-        ))
-    return results
+    return StorageClient.get_presigned_urls_for_sharing(
+        bucket=config("sessions_bucket"),
+        expires_in=config("PRESIGNED_URL_EXPIRATION", cast=int, default=900),
+        keys=__get_mob_keys(project_id=project_id, session_id=session_id),
+        check_exists=check_existence
+    )
 
 
 def get_urls_depercated(session_id, check_existence: bool = True):
-    results = []
-    for k in __get_mob_keys_deprecated(session_id=session_id):
-        if check_existence and not StorageClient.exists(bucket=config("sessions_bucket"), key=k):
-            continue
-        results.append(StorageClient.get_presigned_url_for_sharing(
-            bucket=config("sessions_bucket"),
-            expires_in=100000,
-            key=k
-        ))
-    return results
+    return StorageClient.get_presigned_urls_for_sharing(
+        bucket=config("sessions_bucket"),
+        expires_in=100000,
+        keys=__get_mob_keys_deprecated(session_id=session_id),
+        check_exists=check_existence
+    )
 
 
 def get_mobile_videos(session_id, project_id, check_existence=False):
-    results = []
-    for k in __get_mobile_video_keys(project_id=project_id, session_id=session_id):
-        if check_existence and not StorageClient.exists(bucket=config("IOS_VIDEO_BUCKET"), key=k):
-            continue
-        results.append(StorageClient.get_presigned_url_for_sharing(
-            bucket=config("IOS_VIDEO_BUCKET"),
-            expires_in=config("PRESIGNED_URL_EXPIRATION", cast=int, default=900),
-            key=k
-        ))
-    return results
+    return StorageClient.get_presigned_urls_for_sharing(
+        bucket=config("IOS_VIDEO_BUCKET"),
+        expires_in=config("PRESIGNED_URL_EXPIRATION", cast=int, default=900),
+        keys=__get_mobile_video_keys(project_id=project_id, session_id=session_id),
+        check_exists=check_existence
+    )
 
 
 def delete_mobs(project_id, session_ids):
@@ -0,0 +1,102 @@
+import base64
+import json
+import logging
+from typing import Callable, Awaitable, Optional
+
+from decouple import config
+from fastapi import HTTPException, status
+
+import schemas
+from chalicelib.utils.or_cache import query_cache
+
+logger = logging.getLogger(__name__)
+
+# Seconds a search total is reused by the next pages of the same search
+TOTAL_CACHE_TTL = config("SEARCH_TOTAL_CACHE_TTL", cast=int, default=120)
+TOTAL_KEY_PREFIX = "search_total:"
+
+
+def encode_cursor(sort_value, session_id) -> str:
+    # the session_id is kept as a string, it doesn't fit in a JS number
+    return base64.urlsafe_b64encode(json.dumps([sort_value, str(session_id)]).encode("UTF-8")).decode("UTF-8")
+
+
+def decode_cursor(cursor: Optional[str]):
+    """
+    :return: (sort_value, session_id) of the last session of the previous page, None for the first page
+    """
+    if cursor is None or len(cursor) == 0:
+        return None
+    try:
+        sort_value, session_id = json.loads(base64.urlsafe_b64decode(cursor.encode("UTF-8")))
+        if not isinstance(sort_value, (int, float)) or isinstance(sort_value, bool):
+            raise ValueError(f"unsupported sort value {sort_value}")
+        return sort_value, int(session_id)
+    except Exception as e:
+        logger.debug(f"invalid search cursor: {cursor}, {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+
+
+def is_keyset(data: schemas.SessionsSearchPayloadSchema, sort: str, sort_keys: dict) -> bool:
+    """
+    :param sort_keys: the sorts supporting the keyset pagination, sort -> expression of the sort-key
+    """
+    if data.cursor is None or data.group_by_user:
+        return False
+    if sort not in sort_keys:
+        logger.debug(f"keyset pagination is not supported for sort:{sort}, using page/limit")
+        return False
+    return True
+
+
+def add_keyset_args(data: schemas.SessionsSearchPayloadSchema, full_args: dict):
+    cursor = decode_cursor(data.cursor)
+    # one extra session to know if there is a next page
+    full_args["sessions_limit_k"] = data.limit + 1
+    if cursor is not None:
+        full_args["cursor_sort"], full_args["cursor_session_id"] = cursor
+    return cursor is not None
+
+
+def get_keyset_condition(data: schemas.SessionsSearchPayloadSchema, sort_key: str) -> str:
+    operator = "<" if data.order == schemas.SortOrderType.DESC else ">"
+    return f"({sort_key}, s.session_id) {operator} (%(cursor_sort)s, %(cursor_session_id)s)"
+
+
+def get_page(data: schemas.SessionsSearchPayloadSchema, sessions: list, get_sort_value: Callable,
+             get_session_id: Callable):
+    """
+    :return: the sessions of the page, and the cursor of the next page or None if it is the last one
+    """
+    if len(sessions) <= data.limit:
+        return sessions, None
+    sessions = sessions[:data.limit]
+    return sessions, encode_cursor(get_sort_value(sessions[-1]), get_session_id(sessions[-1]))
+
+
+def __get_total_key(count_query) -> str:
+    return TOTAL_KEY_PREFIX + query_cache.get_key(query=count_query)
+
+
+def get_total(count_query, count: Callable[[], int]) -> int:
+    """
+    The total of a search is counted once and reused by the next pages
+    :param count_query: the rendered count query, it identifies the search
+    """
+    key = __get_total_key(count_query)
+    found, total = query_cache.get_value(key=key, ttl=TOTAL_CACHE_TTL)
+    if found:
+        return total
+    total = count()
+    query_cache.set_value(key=key, ttl=TOTAL_CACHE_TTL, value=total)
+    return total
+
+
+async def get_total_async(count_query, count: Callable[[], Awaitable[int]]) -> int:
+    key = __get_total_key(count_query)
+    found, total = query_cache.get_value(key=key, ttl=TOTAL_CACHE_TTL)
+    if found:
+        return total
+    total = await count()
+    query_cache.set_value(key=key, ttl=TOTAL_CACHE_TTL, value=total)
+    return total
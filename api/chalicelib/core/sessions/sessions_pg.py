@@ -3,7 +3,7 @@ from typing import List, Union
 
 import schemas
 from chalicelib.core import events, metadata
-from . import performance_event
+from . import performance_event, query_parts_cache
 from chalicelib.utils import pg_client, helper, metrics_helper
 from chalicelib.utils import sql_helper as sh
 
@@ -287,6 +287,7 @@ def __is_valid_event(is_any: bool, event: schemas.SessionSearchEventSchema2):
 
 
 # this function generates the query and return the generated-query with the dict of query arguments
+@query_parts_cache.cached()
 def search_query_parts(data: schemas.SessionsSearchPayloadSchema, error_status, errors_only, favorite_only, issue,
                        project_id, user_id, platform="web", extra_event=None, extra_conditions=None):
     ss_constraints = []
@@ -1,11 +1,19 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from decouple import config
+
 import schemas
 from chalicelib.core import events, metadata, events_mobile, \
-    issues, assist, canvas, user_testing
+    issues, assist, canvas, user_testing, projects
 from . import sessions_mobs, sessions_devtool
 from chalicelib.core.errors.modules import errors_helper
 from chalicelib.utils import pg_client, helper
 from chalicelib.core.modules import MOB_KEY, get_file_key
 
+# Runs the independent lookups of a replay (signed URLs, canvas, user-testing, assist) concurrently
+__lookups_pool = ThreadPoolExecutor(max_workers=config("REPLAY_LOOKUPS_WORKERS", cast=int, default=16),
+                                    thread_name_prefix="replay-lookups")
+
 
 def __is_mobile_session(platform):
     return platform in ('ios', 'android')
@@ -20,6 +28,13 @@ def __group_metadata(session, project_metadata):
     return meta
 
 
+def __get_utx_video(session_id, project_id):
+    if user_testing.has_test_signals(session_id=session_id, project_id=project_id):
+        return user_testing.get_ux_webcam_signed_url(session_id=session_id, project_id=project_id,
+                                                     check_existence=False)
+    return []
+
+
 def get_pre_replay(project_id, session_id):
     return {
         **get_file_key(project_id=project_id, session_id=session_id),
@@ -43,12 +58,10 @@ def get_replay(project_id, session_id, context: schemas.CurrentContext, full_dat
             f"""\
             SELECT
                 s.*,
-                s.session_id::text AS session_id,
                 {MOB_KEY}
-                (SELECT project_key FROM public.projects WHERE project_id = %(project_id)s LIMIT 1) AS project_key
+                s.session_id::text AS session_id
                 {"," if len(extra_query) > 0 else ""}{",".join(extra_query)}
-                {(",json_build_object(" + ",".join([f"'{m}',p.{m}" for m in metadata.column_names()]) + ") AS project_metadata") if group_metadata else ''}
-            FROM public.sessions AS s {"INNER JOIN public.projects AS p USING (project_id)" if group_metadata else ""}
+            FROM public.sessions AS s
             WHERE s.project_id = %(project_id)s
                 AND s.session_id = %(session_id)s;""",
             {"project_id": project_id, "session_id": session_id, "userId": context.user_id}
@@ -57,29 +70,40 @@ def get_replay(project_id, session_id, context: schemas.CurrentContext, full_dat
 
         data = cur.fetchone()
         if data is not None:
+            # the project's key and metadata columns are served by the catalog cache
+            data["project_key"] = projects.get_project_key(project_id)
+            if group_metadata:
+                data["project_metadata"] = {m: None for m in metadata.column_names()}
+                for m in metadata.get(project_id=project_id):
+                    data["project_metadata"][metadata.index_to_colname(m["index"])] = m["key"]
             data = helper.dict_to_camel_case(data)
             if full_data:
+                lookups = {}
                 if __is_mobile_session(data["platform"]):
                     data['mobsUrl'] = []
-                    data['videoURL'] = sessions_mobs.get_mobile_videos(session_id=session_id, project_id=project_id,
-                                                                       check_existence=False)
+                    lookups['videoURL'] = __lookups_pool.submit(sessions_mobs.get_mobile_videos,
+                                                                session_id=session_id, project_id=project_id,
+                                                                check_existence=False)
                 else:
-                    data['mobsUrl'] = sessions_mobs.get_urls_depercated(session_id=session_id, check_existence=False)
-                    data['devtoolsURL'] = sessions_devtool.get_urls(session_id=session_id, project_id=project_id,
-                                                                    context=context, check_existence=False)
-                    data['canvasURL'] = canvas.get_canvas_presigned_urls(session_id=session_id, project_id=project_id)
-                    if user_testing.has_test_signals(session_id=session_id, project_id=project_id):
-                        data['utxVideo'] = user_testing.get_ux_webcam_signed_url(session_id=session_id,
-                                                                                 project_id=project_id,
-                                                                                 check_existence=False)
-                    else:
-                        data['utxVideo'] = []
-
-                data['domURL'] = sessions_mobs.get_urls(session_id=session_id, project_id=project_id,
-                                                        check_existence=False)
+                    lookups['mobsUrl'] = __lookups_pool.submit(sessions_mobs.get_urls_depercated,
+                                                               session_id=session_id, check_existence=False)
+                    lookups['devtoolsURL'] = __lookups_pool.submit(sessions_devtool.get_urls,
+                                                                   session_id=session_id, project_id=project_id,
+                                                                   context=context, check_existence=False)
+                    lookups['canvasURL'] = __lookups_pool.submit(canvas.get_canvas_presigned_urls,
+                                                                 session_id=session_id, project_id=project_id)
+                    lookups['utxVideo'] = __lookups_pool.submit(__get_utx_video,
+                                                                session_id=session_id, project_id=project_id)
+
+                lookups['domURL'] = __lookups_pool.submit(sessions_mobs.get_urls,
+                                                          session_id=session_id, project_id=project_id,
+                                                          check_existence=False)
+                live_lookup = __lookups_pool.submit(assist.is_live, project_id=project_id, session_id=session_id,
+                                                    project_key=data["projectKey"]) if live else None
                 data['metadata'] = __group_metadata(project_metadata=data.pop("projectMetadata"), session=data)
-                data['live'] = live and assist.is_live(project_id=project_id, session_id=session_id,
-                                                       project_key=data["projectKey"])
+                for k, f in lookups.items():
+                    data[k] = f.result()
+                data['live'] = live_lookup is not None and live_lookup.result()
             data["inDB"] = True
             return data
         elif live:
@@ -1,8 +1,11 @@
+import asyncio
 import logging
 
+from starlette.concurrency import run_in_threadpool
+
 import schemas
 from chalicelib.core import metadata, projects
-from . import sessions_favorite, sessions_legacy
+from . import sessions_favorite, sessions_legacy, sessions_pagination
 from chalicelib.utils import pg_client, helper
 
 logger = logging.getLogger(__name__)
@@ -37,19 +40,20 @@ COALESCE((SELECT TRUE
    AND fs.user_id = %(userId)s LIMIT 1), FALSE) AS viewed """
 
 
-# This function executes the query and return result
-def search_sessions(data: schemas.SessionsSearchPayloadSchema, project: schemas.ProjectContext,
-                    user_id, errors_only=False, error_status=schemas.ErrorStatus.ALL,
-                    count_only=False, issue=None, ids_only=False, platform="web"):
-    if data.bookmarked:
-        data.startTimestamp, data.endTimestamp = sessions_favorite.get_start_end_timestamp(project.project_id, user_id)
-    if data.startTimestamp is None:
-        logger.debug(f"No vault sessions found for project:{project.project_id}")
-        return {
-            'total': 0,
-            'sessions': [],
-            'src': 1
-        }
+# The sorts supporting the keyset pagination: sort -> not-null expression of the sort-key
+KEYSET_SORT_KEYS = {
+    "start_ts": "s.start_ts",
+    "duration": "COALESCE(s.duration, 0)",
+    "events_count": "s.events_count",
+    "pages_count": "s.pages_count",
+    "errors_count": "s.errors_count",
+    "issue_score": "s.issue_score",
+    "session_id": "s.session_id"
+}
+
+
+def __get_search_parts(data: schemas.SessionsSearchPayloadSchema, project: schemas.ProjectContext, user_id,
+                       errors_only, error_status, issue, platform):
     full_args, query_part = sessions_legacy.search_query_parts(data=data, error_status=error_status,
                                                                errors_only=errors_only,
                                                                favorite_only=data.bookmarked, issue=issue,
@@ -63,103 +67,142 @@ def search_sessions(data: schemas.SessionsSearchPayloadSchema, project: schemas.
         full_args["sessions_limit"] = 200
         full_args["sessions_limit_s"] = 0
         full_args["sessions_limit_e"] = 200
+    return full_args, query_part
 
-    meta_keys = []
-    with pg_client.PostgresClient() as cur:
-        if errors_only:
-            main_query = cur.mogrify(f"""SELECT DISTINCT er.error_id,
-                                         COALESCE((SELECT TRUE
-                                                     FROM public.user_viewed_errors AS ve
-                                                     WHERE er.error_id = ve.error_id
-                                                       AND ve.user_id = %(userId)s LIMIT 1), FALSE) AS viewed
-                                        {query_part};""", full_args)
-
-        elif count_only:
-            main_query = cur.mogrify(f"""SELECT COUNT(DISTINCT s.session_id) AS count_sessions, 
-                                                COUNT(DISTINCT s.user_uuid) AS count_users
-                                        {query_part};""", full_args)
-        elif data.group_by_user:
-            g_sort = "count(full_sessions)"
-            if data.order is None:
-                data.order = schemas.SortOrderType.DESC.value
-            else:
-                data.order = data.order
-            if data.sort is not None and data.sort != 'sessionsCount':
-                sort = helper.key_to_snake_case(data.sort)
-                g_sort = f"{'MIN' if data.order == schemas.SortOrderType.DESC else 'MAX'}({sort})"
-            else:
-                sort = 'start_ts'
-
-            meta_keys = metadata.get(project_id=project.project_id)
-            main_query = cur.mogrify(f"""SELECT COUNT(*) AS count,
-                                                COALESCE(JSONB_AGG(users_sessions) 
-                                                    FILTER (WHERE rn>%(sessions_limit_s)s AND rn<=%(sessions_limit_e)s), '[]'::JSONB) AS sessions
-                                        FROM (SELECT user_id,
-                                                 count(full_sessions)                                   AS user_sessions_count,
-                                                 jsonb_agg(full_sessions) FILTER (WHERE rn <= 1)        AS last_session,
-                                                 MIN(full_sessions.start_ts)                            AS first_session_ts,
-                                                 ROW_NUMBER() OVER (ORDER BY {g_sort} {data.order}) AS rn
-                                            FROM (SELECT *, ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY {sort} {data.order}) AS rn 
-                                                FROM (SELECT DISTINCT ON(s.session_id) {SESSION_PROJECTION_COLS} 
-                                                                    {"," if len(meta_keys) > 0 else ""}{",".join([f'metadata_{m["index"]}' for m in meta_keys])}
-                                                    {query_part}
-                                                    ) AS filtred_sessions
-                                                ) AS full_sessions
-                                                GROUP BY user_id
-                                            ) AS users_sessions;""",
-                                     full_args)
-        elif ids_only:
-            main_query = cur.mogrify(f"""SELECT DISTINCT ON(s.session_id) s.session_id
-                                             {query_part}
-                                             ORDER BY s.session_id desc
-                                             LIMIT %(sessions_limit)s OFFSET %(sessions_limit_s)s;""",
-                                     full_args)
+
+def __needs_metadata(errors_only, count_only, ids_only):
+    return not (errors_only or count_only or ids_only)
+
+
+def __get_sort(data: schemas.SessionsSearchPayloadSchema):
+    if data.sort is None or data.sort == "session_id":
+        return "session_id"
+    if data.sort == 'datetime':
+        return "start_ts"
+    return helper.key_to_snake_case(data.sort)
+
+
+def __is_keyset(data: schemas.SessionsSearchPayloadSchema, errors_only, count_only, ids_only):
+    return not (errors_only or count_only or ids_only) \
+        and sessions_pagination.is_keyset(data=data, sort=__get_sort(data), sort_keys=KEYSET_SORT_KEYS)
+
+
+def __get_keyset_query(data: schemas.SessionsSearchPayloadSchema, query_part, meta_keys, with_cursor):
+    """
+    Reads only the page after the cursor, the sessions are ordered by (sort-key, session_id)
+    """
+    sort_key = KEYSET_SORT_KEYS[__get_sort(data)]
+    if with_cursor:
+        query_part += f"""
+                          AND {sessions_pagination.get_keyset_condition(data=data, sort_key=sort_key)}"""
+    return f"""SELECT DISTINCT ON({sort_key}, s.session_id) {SESSION_PROJECTION_COLS},
+                      {sort_key} AS sort_key
+                      {"," if len(meta_keys) > 0 else ""}{",".join([f'metadata_{m["index"]}' for m in meta_keys])}
+               {query_part}
+               ORDER BY {sort_key} {data.order}, s.session_id {data.order}
+               LIMIT %(sessions_limit_k)s;"""
+
+
+def __get_total_query(data: schemas.SessionsSearchPayloadSchema, query_part):
+    if data.approximate_total:
+        # the planner's estimate, nothing is read
+        return f"""EXPLAIN (FORMAT JSON) SELECT DISTINCT s.session_id {query_part};"""
+    return f"""SELECT COUNT(DISTINCT s.session_id) AS count {query_part};"""
+
+
+def __get_total_from_row(data: schemas.SessionsSearchPayloadSchema, row):
+    if data.approximate_total:
+        return int(row["QUERY PLAN"][0]["Plan"]["Plan Rows"])
+    return row["count"]
+
+
+def __format_keyset_sessions(data: schemas.SessionsSearchPayloadSchema, sessions, total, meta_keys):
+    sessions, next_cursor = sessions_pagination.get_page(data=data, sessions=sessions,
+                                                         get_sort_value=lambda r: r["sort_key"],
+                                                         get_session_id=lambda r: r["session_id"])
+    for i in range(len(sessions)):
+        sessions[i].pop("sort_key")
+    result = __format_sessions(data=data, sessions={"count": total, "sessions": sessions}, meta_keys=meta_keys)
+    result["nextCursor"] = next_cursor
+    return result
+
+
+def __get_main_query(data: schemas.SessionsSearchPayloadSchema, query_part, meta_keys,
+                     errors_only, count_only, ids_only):
+    if errors_only:
+        return f"""SELECT DISTINCT er.error_id,
+                         COALESCE((SELECT TRUE
+                                     FROM public.user_viewed_errors AS ve
+                                     WHERE er.error_id = ve.error_id
+                                       AND ve.user_id = %(userId)s LIMIT 1), FALSE) AS viewed
+                        {query_part};"""
+
+    elif count_only:
+        return f"""SELECT COUNT(DISTINCT s.session_id) AS count_sessions, 
+                                COUNT(DISTINCT s.user_uuid) AS count_users
+                        {query_part};"""
+    elif data.group_by_user:
+        g_sort = "count(full_sessions)"
+        if data.order is None:
+            data.order = schemas.SortOrderType.DESC.value
         else:
-            if data.order is None:
-                data.order = schemas.SortOrderType.DESC.value
-            else:
-                data.order = data.order
-            sort = 'session_id'
-            if data.sort is not None and data.sort != "session_id":
-                # sort += " " + data.order + "," + helper.key_to_snake_case(data.sort)
-                if data.sort == 'datetime':
-                    sort = 'start_ts'
-                else:
-                    sort = helper.key_to_snake_case(data.sort)
-
-            meta_keys = metadata.get(project_id=project.project_id)
-            main_query = cur.mogrify(f"""SELECT COUNT(full_sessions) AS count, 
-                                                COALESCE(JSONB_AGG(full_sessions) 
-                                                    FILTER (WHERE rn>%(sessions_limit_s)s AND rn<=%(sessions_limit_e)s), '[]'::JSONB) AS sessions
-                                            FROM (SELECT *, ROW_NUMBER() OVER (ORDER BY {sort} {data.order}, issue_score DESC) AS rn
-                                            FROM (SELECT DISTINCT ON(s.session_id) {SESSION_PROJECTION_COLS}
-                                                                {"," if len(meta_keys) > 0 else ""}{",".join([f'metadata_{m["index"]}' for m in meta_keys])}
-                                            {query_part}
-                                            ORDER BY s.session_id desc) AS filtred_sessions
-                                            ORDER BY {sort} {data.order}, issue_score DESC) AS full_sessions;""",
-                                     full_args)
-        logger.debug("--------------------")
-        logger.debug(main_query)
-        logger.debug("--------------------")
-        try:
-            cur.execute(main_query)
-            sessions = cur.fetchone()
-        except Exception as err:
-            logger.warning("--------- SESSIONS SEARCH QUERY EXCEPTION -----------")
-            logger.warning(main_query.decode('UTF-8'))
-            logger.warning("--------- PAYLOAD -----------")
-            logger.warning(data.model_dump_json())
-            logger.warning("--------------------")
-            raise err
-        if errors_only or ids_only:
-            return helper.list_to_camel_case(cur.fetchall())
+            data.order = data.order
+        if data.sort is not None and data.sort != 'sessionsCount':
+            sort = helper.key_to_snake_case(data.sort)
+            g_sort = f"{'MIN' if data.order == schemas.SortOrderType.DESC else 'MAX'}({sort})"
+        else:
+            sort = 'start_ts'
 
-        if count_only:
-            return helper.dict_to_camel_case(sessions)
+        return f"""SELECT COUNT(*) AS count,
+                                COALESCE(JSONB_AGG(users_sessions) 
+                                    FILTER (WHERE rn>%(sessions_limit_s)s AND rn<=%(sessions_limit_e)s), '[]'::JSONB) AS sessions
+                        FROM (SELECT user_id,
+                                 count(full_sessions)                                   AS user_sessions_count,
+                                 jsonb_agg(full_sessions) FILTER (WHERE rn <= 1)        AS last_session,
+                                 MIN(full_sessions.start_ts)                            AS first_session_ts,
+                                 ROW_NUMBER() OVER (ORDER BY {g_sort} {data.order}) AS rn
+                            FROM (SELECT *, ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY {sort} {data.order}) AS rn 
+                                FROM (SELECT DISTINCT ON(s.session_id) {SESSION_PROJECTION_COLS} 
+                                                    {"," if len(meta_keys) > 0 else ""}{",".join([f'metadata_{m["index"]}' for m in meta_keys])}
+                                    {query_part}
+                                    ) AS filtred_sessions
+                                ) AS full_sessions
+                                GROUP BY user_id
+                            ) AS users_sessions;"""
+    elif ids_only:
+        return f"""SELECT DISTINCT ON(s.session_id) s.session_id
+                             {query_part}
+                             ORDER BY s.session_id desc
+                             LIMIT %(sessions_limit)s OFFSET %(sessions_limit_s)s;"""
+    else:
+        if data.order is None:
+            data.order = schemas.SortOrderType.DESC.value
+        else:
+            data.order = data.order
+        sort = __get_sort(data)
 
-        total = sessions["count"]
-        sessions = sessions["sessions"]
+        return f"""SELECT COUNT(full_sessions) AS count, 
+                                COALESCE(JSONB_AGG(full_sessions) 
+                                    FILTER (WHERE rn>%(sessions_limit_s)s AND rn<=%(sessions_limit_e)s), '[]'::JSONB) AS sessions
+                            FROM (SELECT *, ROW_NUMBER() OVER (ORDER BY {sort} {data.order}, issue_score DESC) AS rn
+                            FROM (SELECT DISTINCT ON(s.session_id) {SESSION_PROJECTION_COLS}
+                                                {"," if len(meta_keys) > 0 else ""}{",".join([f'metadata_{m["index"]}' for m in meta_keys])}
+                            {query_part}
+                            ORDER BY s.session_id desc) AS filtred_sessions
+                            ORDER BY {sort} {data.order}, issue_score DESC) AS full_sessions;"""
 
+
+def __log_query_exception(main_query, data: schemas.SessionsSearchPayloadSchema):
+    logger.warning("--------- SESSIONS SEARCH QUERY EXCEPTION -----------")
+    logger.warning(main_query.decode('UTF-8') if isinstance(main_query, bytes) else main_query)
+    logger.warning("--------- PAYLOAD -----------")
+    logger.warning(data.model_dump_json())
+    logger.warning("--------------------")
+
+
+def __format_sessions(data: schemas.SessionsSearchPayloadSchema, sessions, meta_keys):
+    total = sessions["count"]
+    sessions = sessions["sessions"]
     if data.group_by_user:
         for i, s in enumerate(sessions):
             sessions[i] = {**s.pop("last_session")[0], **s}
@@ -180,6 +223,150 @@ def search_sessions(data: schemas.SessionsSearchPayloadSchema, project: schemas.
     }
 
 
+def __search_keyset(data: schemas.SessionsSearchPayloadSchema, full_args, query_part, meta_keys):
+    with_cursor = sessions_pagination.add_keyset_args(data=data, full_args=full_args)
+    with pg_client.PostgresClient() as cur:
+        main_query = cur.mogrify(__get_keyset_query(data=data, query_part=query_part, meta_keys=meta_keys,
+                                                    with_cursor=with_cursor),
+                                 full_args)
+        total_query = cur.mogrify(__get_total_query(data=data, query_part=query_part), full_args)
+        logger.debug("--------------------")
+        logger.debug(main_query)
+        logger.debug("--------------------")
+        try:
+            cur.execute(main_query)
+            sessions = cur.fetchall()
+        except Exception as err:
+            __log_query_exception(main_query=main_query, data=data)
+            raise err
+
+        def count():
+            cur.execute(total_query)
+            return __get_total_from_row(data=data, row=cur.fetchone())
+
+        total = sessions_pagination.get_total(count_query=total_query, count=count)
+
+    return __format_keyset_sessions(data=data, sessions=sessions, total=total, meta_keys=meta_keys)
+
+
+async def __search_keyset_async(data: schemas.SessionsSearchPayloadSchema, full_args, query_part, meta_keys):
+    with_cursor = sessions_pagination.add_keyset_args(data=data, full_args=full_args)
+
+    async def count():
+        # the page and the total are read in parallel
+        async with pg_client.AsyncPostgresClient() as count_cur:
+            await count_cur.execute(total_query)
+            return __get_total_from_row(data=data, row=await count_cur.fetchone())
+
+    async with pg_client.AsyncPostgresClient() as cur:
+        main_query = cur.mogrify(__get_keyset_query(data=data, query_part=query_part, meta_keys=meta_keys,
+                                                    with_cursor=with_cursor),
+                                 full_args)
+        total_query = cur.mogrify(__get_total_query(data=data, query_part=query_part), full_args)
+        logger.debug("--------------------")
+        logger.debug(main_query)
+        logger.debug("--------------------")
+        total = asyncio.create_task(sessions_pagination.get_total_async(count_query=total_query, count=count))
+        try:
+            await cur.execute(main_query)
+            sessions = await cur.fetchall()
+        except Exception as err:
+            total.cancel()
+            __log_query_exception(main_query=main_query, data=data)
+            raise err
+
+    return __format_keyset_sessions(data=data, sessions=sessions, total=await total, meta_keys=meta_keys)
+
+
+# This function executes the query and return result
+def search_sessions(data: schemas.SessionsSearchPayloadSchema, project: schemas.ProjectContext,
+                    user_id, errors_only=False, error_status=schemas.ErrorStatus.ALL,
+                    count_only=False, issue=None, ids_only=False, platform="web"):
+    if data.bookmarked:
+        data.startTimestamp, data.endTimestamp = sessions_favorite.get_start_end_timestamp(project.project_id, user_id)
+    if data.startTimestamp is None:
+        logger.debug(f"No vault sessions found for project:{project.project_id}")
+        return {
+            'total': 0,
+            'sessions': [],
+            'src': 1
+        }
+    full_args, query_part = __get_search_parts(data=data, project=project, user_id=user_id, errors_only=errors_only,
+                                               error_status=error_status, issue=issue, platform=platform)
+    meta_keys = []
+    if __needs_metadata(errors_only=errors_only, count_only=count_only, ids_only=ids_only):
+        meta_keys = metadata.get(project_id=project.project_id)
+    if __is_keyset(data=data, errors_only=errors_only, count_only=count_only, ids_only=ids_only):
+        return __search_keyset(data=data, full_args=full_args, query_part=query_part, meta_keys=meta_keys)
+    with pg_client.PostgresClient() as cur:
+        main_query = cur.mogrify(__get_main_query(data=data, query_part=query_part, meta_keys=meta_keys,
+                                                  errors_only=errors_only, count_only=count_only,
+                                                  ids_only=ids_only),
+                                 full_args)
+        logger.debug("--------------------")
+        logger.debug(main_query)
+        logger.debug("--------------------")
+        try:
+            cur.execute(main_query)
+            sessions = cur.fetchone()
+        except Exception as err:
+            __log_query_exception(main_query=main_query, data=data)
+            raise err
+        if errors_only or ids_only:
+            return helper.list_to_camel_case(cur.fetchall())
+
+        if count_only:
+            return helper.dict_to_camel_case(sessions)
+
+    return __format_sessions(data=data, sessions=sessions, meta_keys=meta_keys)
+
+
+async def search_sessions_async(data: schemas.SessionsSearchPayloadSchema, project: schemas.ProjectContext,
+                                user_id, errors_only=False, error_status=schemas.ErrorStatus.ALL,
+                                count_only=False, issue=None, ids_only=False, platform="web"):
+    if data.bookmarked:
+        data.startTimestamp, data.endTimestamp = await sessions_favorite.get_start_end_timestamp_async(
+            project.project_id, user_id)
+    if data.startTimestamp is None:
+        logger.debug(f"No vault sessions found for project:{project.project_id}")
+        return {
+            'total': 0,
+            'sessions': [],
+            'src': 1
+        }
+    # building the query parts might need a metadata lookup, it is kept off the event-loop
+    full_args, query_part = await run_in_threadpool(__get_search_parts, data=data, project=project,
+                                                    user_id=user_id, errors_only=errors_only,
+                                                    error_status=error_status, issue=issue, platform=platform)
+    meta_keys = []
+    if __needs_metadata(errors_only=errors_only, count_only=count_only, ids_only=ids_only):
+        meta_keys = await metadata.get_async(project_id=project.project_id)
+    if __is_keyset(data=data, errors_only=errors_only, count_only=count_only, ids_only=ids_only):
+        return await __search_keyset_async(data=data, full_args=full_args, query_part=query_part,
+                                           meta_keys=meta_keys)
+    async with pg_client.AsyncPostgresClient() as cur:
+        main_query = cur.mogrify(__get_main_query(data=data, query_part=query_part, meta_keys=meta_keys,
+                                                  errors_only=errors_only, count_only=count_only,
+                                                  ids_only=ids_only),
+                                 full_args)
+        logger.debug("--------------------")
+        logger.debug(main_query)
+        logger.debug("--------------------")
+        try:
+            await cur.execute(main_query)
+            sessions = await cur.fetchone()
+        except Exception as err:
+            __log_query_exception(main_query=main_query, data=data)
+            raise err
+        if errors_only or ids_only:
+            return helper.list_to_camel_case(await cur.fetchall())
+
+        if count_only:
+            return helper.dict_to_camel_case(sessions)
+
+    return __format_sessions(data=data, sessions=sessions, meta_keys=meta_keys)
+
+
 def search_by_metadata(tenant_id, user_id, m_key, m_value, project_id=None):
     if project_id is None:
         all_projects = projects.get_projects(tenant_id=tenant_id)
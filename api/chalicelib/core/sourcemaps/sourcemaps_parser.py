@@ -2,7 +2,12 @@ import requests
 
 from decouple import config
 
+from chalicelib.utils import http_client
+
 SMR_URL = config("sourcemaps_reader").format(config("SMR_KEY", default="smr"))
+__sourcemaps_reader = http_client.get_service("sourcemaps_reader",
+                                              timeout=config("sourcemapTimeout", cast=int, default=5),
+                                              max_concurrency=config("SMR_MAX_CONCURRENCY", cast=int, default=50))
 
 
 def get_original_trace(key, positions, is_url=False):
@@ -14,7 +19,7 @@ def get_original_trace(key, positions, is_url=False):
         "isURL": is_url
     }
     try:
-        r = requests.post(SMR_URL, json=payload, timeout=config("sourcemapTimeout", cast=int, default=5))
+        r = __sourcemaps_reader.post(SMR_URL, json=payload)
         if r.status_code != 200:
             print(f"Issue getting sourcemap status_code:{r.status_code}")
             return None
@@ -22,6 +27,9 @@ def get_original_trace(key, positions, is_url=False):
     except requests.exceptions.Timeout:
         print("Timeout getting sourcemap")
         return None
+    except http_client.UnavailableError as e:
+        print(f"Sourcemaps reader is unavailable: {e}")
+        return None
     except Exception as e:
         print("Issue getting sourcemap")
         print(e)
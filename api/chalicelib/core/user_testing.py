@@ -29,14 +29,11 @@ def has_test_signals(session_id, project_id):
 
 
 def get_ux_webcam_signed_url(session_id, project_id, check_existence: bool = True):
-    results = []
     bucket_name = "uxtesting-records" # config("sessions_bucket")
     k = f'{session_id}/ux_webcam_record.webm'
-    if check_existence and not StorageClient.exists(bucket=bucket_name, key=k):
-        return []
-    results.append(StorageClient.get_presigned_url_for_sharing(
+    return StorageClient.get_presigned_urls_for_sharing(
         bucket=bucket_name,
         expires_in=100000,
-        key=k
-    ))
-    return results
+        keys=[k],
+        check_exists=check_existence
+    )
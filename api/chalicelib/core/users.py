@@ -7,7 +7,7 @@ from fastapi import BackgroundTasks
 from pydantic import BaseModel, model_validator
 
 import schemas
-from chalicelib.core import authorizers
+from chalicelib.core import authorizers, auth_cache
 from chalicelib.core import tenants, spot
 from chalicelib.utils import email_helper
 from chalicelib.utils import helper
@@ -148,6 +148,7 @@ def update(tenant_id, user_id, changes, output=True):
                             WHERE basic_authentication.user_id = %(user_id)s;""",
                                 {"user_id": user_id, **changes})
             cur.execute(query)
+    auth_cache.invalidate_user(user_id)
     if not output:
         return None
     return get(user_id=user_id, tenant_id=tenant_id)
@@ -426,6 +427,7 @@ def delete_member(user_id, tenant_id, id_to_delete):
                                 change_pwd_expire_at= NULL, change_pwd_token= NULL
                            WHERE user_id=%(user_id)s;""",
                         {"user_id": id_to_delete}))
+    auth_cache.invalidate_user(id_to_delete)
     return {"data": get_members(tenant_id=tenant_id)}
 
 
@@ -601,7 +603,8 @@ def change_jwt_iat_jti(user_id):
                             {"user_id": user_id})
         cur.execute(query)
         row = cur.fetchone()
-        return FullLoginJWTs(**row)
+    auth_cache.invalidate_user(user_id)
+    return FullLoginJWTs(**row)
 
 
 def refresh_jwt_iat_jti(user_id):
@@ -616,7 +619,8 @@ def refresh_jwt_iat_jti(user_id):
                             {"user_id": user_id})
         cur.execute(query)
         row = cur.fetchone()
-        return RefreshLoginJWTs(**row)
+    auth_cache.invalidate_user(user_id)
+    return RefreshLoginJWTs(**row)
 
 
 def authenticate(email, password, for_change_password=False) -> dict | bool | None:
@@ -681,6 +685,7 @@ def logout(user_id: int):
                WHERE user_id = %(user_id)s;""",
             {"user_id": user_id})
         cur.execute(query)
+    auth_cache.invalidate_user(user_id)
 
 
 def refresh(user_id: int, tenant_id: int = -1) -> dict:
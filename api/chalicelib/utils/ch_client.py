@@ -1,8 +1,11 @@
+import asyncio
 import logging
 
 import clickhouse_driver
 from decouple import config
 
+from chalicelib.utils.or_cache import query_cache
+
 logger = logging.getLogger(__name__)
 
 settings = {}
@@ -37,9 +40,9 @@ class ClickHouseClient:
 
     def execute(self, query, parameters=None, **args):
         try:
-            results = self.__client.execute(query=query, params=parameters, with_column_types=True, **args)
-            keys = tuple(x for x, y in results[1])
-            return [dict(zip(keys, i)) for i in results[0]]
+            return query_cache.get_or_execute(query=query, parameters=parameters,
+                                              execute=lambda: self.__execute(query=query, parameters=parameters,
+                                                                             **args))
         except Exception as err:
             logger.error("--------- CH EXCEPTION -----------", exc_info=err)
             logger.error("--------- CH QUERY EXCEPTION -----------")
@@ -50,6 +53,27 @@ class ClickHouseClient:
             logger.error("--------------------")
             raise err
 
+    def __execute(self, query, parameters=None, **args):
+        results = self.__client.execute(query=query, params=parameters, with_column_types=True, **args)
+        keys = tuple(x for x, y in results[1])
+        return [dict(zip(keys, i)) for i in results[0]]
+
+    def execute_columns(self, query, parameters=None, **args):
+        """
+        :return: the result as a dict of column_name -> list of values, as decoded by the driver
+        """
+        return query_cache.get_or_execute(query=query, parameters={**(parameters or {}), "__column_oriented": True},
+                                          execute=lambda: self.__execute_columns(query=query, parameters=parameters,
+                                                                                 **args))
+
+    def __execute_columns(self, query, parameters=None, **args):
+        results = self.__client.execute(query=query, params=parameters, with_column_types=True, columnar=True,
+                                        **args)
+        keys = tuple(x for x, y in results[1])
+        if len(results[0]) == 0:
+            return {k: [] for k in keys}
+        return {k: list(c) for k, c in zip(keys, results[0])}
+
     def insert(self, query, params=None, **args):
         return self.__client.execute(query=query, params=params, **args)
 
@@ -65,6 +89,31 @@ class ClickHouseClient:
         pass
 
 
+class AsyncClickHouseClient:
+    """
+    clickhouse_driver has no asyncio support, the queries are executed in a worker thread
+    to keep the same interface as ch_client_exp.AsyncClickHouseClient
+    """
+
+    def __init__(self, database=None):
+        self.__client = ClickHouseClient(database=database)
+
+    async def __aenter__(self):
+        return self
+
+    async def execute(self, query, parameters=None, **args):
+        return await asyncio.to_thread(self.__client.execute, query=query, parameters=parameters, **args)
+
+    async def execute_columns(self, query, parameters=None, **args):
+        return await asyncio.to_thread(self.__client.execute_columns, query=query, parameters=parameters, **args)
+
+    def format(self, query, parameters=None):
+        return self.__client.format(query=query, parameters=parameters)
+
+    async def __aexit__(self, *args):
+        pass
+
+
 async def init():
     logger.info(f">CH_POOL:not defined")
 
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import threading
 import time
@@ -8,6 +9,8 @@ import clickhouse_connect
 from clickhouse_connect.driver.query import QueryContext
 from decouple import config
 
+from chalicelib.utils.or_cache import query_cache
+
 logger = logging.getLogger(__name__)
 
 _CH_CONFIG = {"host": config("ch_host"),
@@ -38,6 +41,11 @@ def transform_result(self, original_function):
             logger.debug(str.encode(self.format(query=kwargs.get("query", ""), parameters=kwargs.get("parameters"))))
         elif len(args) > 0:
             logger.debug(str.encode(args[0]))
+        return query_cache.get_or_execute(query=kwargs.get("query", args[0] if len(args) > 0 else ""),
+                                          parameters=kwargs.get("parameters"),
+                                          execute=lambda: __execute(*args, **kwargs))
+
+    def __execute(*args, **kwargs):
         result = original_function(*args, **kwargs)
         if isinstance(result, clickhouse_connect.driver.query.QueryResult):
             column_names = result.column_names
@@ -49,6 +57,33 @@ def transform_result(self, original_function):
     return wrapper
 
 
+def transform_columns(self, original_function):
+    """
+    Same as transform_result, but the result is kept column-oriented as decoded by the driver:
+    a dict of column_name -> list of values, no row is built
+    """
+
+    @wraps(original_function)
+    def wrapper(query, parameters=None, **kwargs):
+        if parameters:
+            logger.debug(str.encode(self.format(query=query, parameters=parameters)))
+        else:
+            logger.debug(str.encode(query))
+        return query_cache.get_or_execute(query=query, parameters=_columns_cache_parameters(parameters),
+                                          execute=lambda: __execute(query=query, parameters=parameters, **kwargs))
+
+    def __execute(query, parameters=None, **kwargs):
+        result = original_function(query=query, parameters=parameters, column_oriented=True, **kwargs)
+        return dict(zip(result.column_names, result.result_columns))
+
+    return wrapper
+
+
+def _columns_cache_parameters(parameters):
+    # the column-oriented result of a query must not be served to a row-oriented execute of the same query
+    return {**(parameters or {}), "__column_oriented": True}
+
+
 class ClickHouseConnectionPool:
     def __init__(self, min_size, max_size):
         self.min_size = min_size
@@ -144,6 +179,7 @@ class ClickHouseClient:
                 self.__client = CH_pool.get_connection()
 
             self.__client.execute = transform_result(self, self.__client.query)
+            self.__client.execute_columns = transform_columns(self, self.__client.query)
             self.__client.format = self.format
 
     def __enter__(self):
@@ -162,10 +198,119 @@ class ClickHouseClient:
             self.__client.close()
 
 
+async def _make_async_client(database=None):
+    return await clickhouse_connect.get_async_client(**CH_CONFIG,
+                                                     database=database if database else config("ch_database",
+                                                                                               default="default"),
+                                                     settings=settings,
+                                                     executor_threads=config("CH_AIO_THREADS", cast=int,
+                                                                             default=0) or None,
+                                                     **extra_args)
+
+
+class AsyncClickHouseConnectionPool:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.pool = asyncio.Queue()
+        self.lock = asyncio.Lock()
+        self.total_connections = 0
+
+    async def get_connection(self):
+        try:
+            return self.pool.get_nowait()
+        except asyncio.QueueEmpty:
+            async with self.lock:
+                if self.total_connections < self.max_size:
+                    client = await _make_async_client()
+                    self.total_connections += 1
+                    return client
+        # If max_size reached, wait until a connection is available
+        return await self.pool.get()
+
+    def release_connection(self, client):
+        self.pool.put_nowait(client)
+
+    async def close_all(self):
+        async with self.lock:
+            while not self.pool.empty():
+                client = self.pool.get_nowait()
+                await client.close()
+            self.total_connections = 0
+
+
+CH_async_pool: AsyncClickHouseConnectionPool = None
+
+
+class AsyncClickHouseClient:
+    """
+    Non-blocking counterpart of ClickHouseClient to be used from async routes:
+        async with AsyncClickHouseClient() as ch:
+            rows = await ch.execute(query=query, parameters=params)
+    """
+    __client = None
+
+    def __init__(self, database=None):
+        self.__database = database
+
+    async def __aenter__(self):
+        if self.__database is not None or CH_async_pool is None:
+            self.__client = await _make_async_client(database=self.__database)
+        else:
+            self.__client = await CH_async_pool.get_connection()
+        return self
+
+    async def execute(self, query, parameters=None, **args):
+        if parameters:
+            logger.debug(str.encode(self.format(query=query, parameters=parameters)))
+        else:
+            logger.debug(str.encode(query))
+        return await query_cache.get_or_execute_async(query=query, parameters=parameters,
+                                                      execute=lambda: self.__execute(query=query,
+                                                                                     parameters=parameters,
+                                                                                     **args))
+
+    async def __execute(self, query, parameters=None, **args):
+        result = await self.__client.query(query=query, parameters=parameters, **args)
+        column_names = result.column_names
+        return [dict(zip(column_names, row)) for row in result.result_rows]
+
+    async def execute_columns(self, query, parameters=None, **args):
+        """
+        :return: the result as a dict of column_name -> list of values, as decoded by the driver
+        """
+        if parameters:
+            logger.debug(str.encode(self.format(query=query, parameters=parameters)))
+        else:
+            logger.debug(str.encode(query))
+        return await query_cache.get_or_execute_async(query=query,
+                                                      parameters=_columns_cache_parameters(parameters),
+                                                      execute=lambda: self.__execute_columns(query=query,
+                                                                                             parameters=parameters,
+                                                                                             **args))
+
+    async def __execute_columns(self, query, parameters=None, **args):
+        result = await self.__client.query(query=query, parameters=parameters, column_oriented=True, **args)
+        return dict(zip(result.column_names, result.result_columns))
+
+    def format(self, query, parameters=None):
+        if parameters:
+            ctx = QueryContext(query=query, parameters=parameters)
+            return ctx.final_query
+        return query
+
+    async def __aexit__(self, *args):
+        if self.__database is None and CH_async_pool is not None:
+            CH_async_pool.release_connection(self.__client)
+        else:
+            await self.__client.close()
+
+
 async def init():
+    global CH_async_pool
     logger.info(f">use CH_POOL:{config('CH_POOL', default=True)}")
     if config('CH_POOL', cast=bool, default=True):
         make_pool()
+        CH_async_pool = AsyncClickHouseConnectionPool(max_size=config("CH_AIO_MAXCONN", cast=int, default=8))
 
 
 async def terminate():
@@ -176,3 +321,9 @@ async def terminate():
             logger.info("Closed all connexions to CH")
         except Exception as error:
             logger.error("Error while closing all connexions to CH", exc_info=error)
+    if CH_async_pool is not None:
+        try:
+            await CH_async_pool.close_all()
+            logger.info("Closed all async connexions to CH")
+        except Exception as error:
+            logger.error("Error while closing all async connexions to CH", exc_info=error)
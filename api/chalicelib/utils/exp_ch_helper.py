@@ -1,10 +1,14 @@
-from typing import Union
+from typing import Union, Optional
 
 import schemas
 import logging
 
+from decouple import config
+
 logger = logging.getLogger(__name__)
 
+MATERIALIZED_PROPERTIES_ENABLED = config("EXP_MATERIALIZED_PROPERTIES", cast=bool, default=True)
+
 
 def get_main_events_table(timestamp=0, platform="web"):
     if platform == "web":
@@ -33,6 +37,34 @@ def get_main_js_errors_sessions_table(timestamp=0):
     return get_main_events_table(timestamp=timestamp)
 
 
+# The $properties of product_analytics.events frequently filtered on, materialized as typed columns
+# (see the 1.22.0 migration) to skip parsing the JSON of each scanned event; property -> (column, type)
+MATERIALIZED_PROPERTIES = {
+    "source": ("prop_source", "String"),
+    "message": ("prop_message", "String"),
+    "name": ("prop_name", "String"),
+    "error_id": ("prop_error_id", "String"),
+    "url_path": ("prop_url_path", "String"),
+    "label": ("prop_label", "String"),
+    "normalized_x": ("prop_normalized_x", "Nullable(Float64)"),
+    "normalized_y": ("prop_normalized_y", "Nullable(Float64)")
+}
+
+
+def get_event_property(name: str, table_alias: Optional[str] = None) -> str:
+    """
+    :return: the expression of a $properties field of product_analytics.events: its materialized column
+             if it has one, its extraction from the JSON otherwise; both evaluate to the same value
+    """
+    prefix = "" if table_alias is None else f"{table_alias}."
+    column, column_type = MATERIALIZED_PROPERTIES.get(name, (None, "String"))
+    if column is not None and MATERIALIZED_PROPERTIES_ENABLED:
+        return f"{prefix}{column}"
+    if column_type == "String":
+        return f"JSONExtractString(toString({prefix}`$properties`), '{name}')"
+    return f"JSONExtract(toString({prefix}`$properties`), '{name}', '{column_type}')"
+
+
 def get_event_type(event_type: Union[schemas.EventType, schemas.PerformanceEventType], platform="web"):
     defs = {
         schemas.EventType.CLICK: "CLICK",
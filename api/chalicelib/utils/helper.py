@@ -2,6 +2,7 @@ import math
 import random
 import re
 import string
+from functools import lru_cache
 from typing import Union
 from urllib.parse import urlparse
 
@@ -31,15 +32,15 @@ def dict_to_camel_case(variable, delimiter='_', ignore_keys=[]):
         return variable
     elif isinstance(variable, dict):
         aux = {}
-        for key in variable.keys():
+        for key, value in variable.items():
             if key in ignore_keys:
-                aux[key] = variable[key]
-            elif isinstance(variable[key], dict):
-                aux[key_to_camel_case(key, delimiter)] = dict_to_camel_case(variable[key])
-            elif isinstance(variable[key], list):
-                aux[key_to_camel_case(key, delimiter)] = list_to_camel_case(variable[key])
+                aux[key] = value
+            elif isinstance(value, dict):
+                aux[key_to_camel_case(key, delimiter)] = dict_to_camel_case(value)
+            elif isinstance(value, list):
+                aux[key_to_camel_case(key, delimiter)] = list_to_camel_case(value)
             else:
-                aux[key_to_camel_case(key, delimiter)] = variable[key]
+                aux[key_to_camel_case(key, delimiter)] = value
         return aux
     else:
         return variable
@@ -78,6 +79,8 @@ def variable_to_snake_case(variable, delimiter='_', split_number=False):
         return variable
 
 
+# the keys are column names in most cases, the same few hundred are translated for every row
+@lru_cache(maxsize=4096)
 def key_to_camel_case(snake_str, delimiter='_'):
     if snake_str.startswith(delimiter):
         snake_str = snake_str[1:]
@@ -321,18 +324,18 @@ def obfuscate(text, keep_last: int = 4):
 
 
 def cast_session_id_to_string(data):
-    if not isinstance(data, dict) and not isinstance(data, list):
-        return data
+    # the containers are updated in place, only the nested ones need a call
     if isinstance(data, list):
-        for i, item in enumerate(data):
-            data[i] = cast_session_id_to_string(item)
+        for item in data:
+            if isinstance(item, (dict, list)):
+                cast_session_id_to_string(item)
     elif isinstance(data, dict):
-        keys = data.keys()
-        if "sessionId" in keys:
+        if "sessionId" in data:
             data["sessionId"] = str(data["sessionId"])
         else:
-            for key in keys:
-                data[key] = cast_session_id_to_string(data[key])
+            for value in data.values():
+                if isinstance(value, (dict, list)):
+                    cast_session_id_to_string(value)
     return data
 
 
@@ -0,0 +1,173 @@
+import hashlib
+import logging
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import requests
+from decouple import config
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Hosts kept per service, and keep-alive connections kept per host
+POOL_HOSTS = config("HTTP_POOL_HOSTS", cast=int, default=10)
+POOL_CONNECTIONS = config("HTTP_POOL_CONNECTIONS", cast=int, default=20)
+# Consecutive failures opening a circuit,
+# and seconds before a trial call is let through an open circuit
+BREAKER_FAILURES = config("HTTP_BREAKER_FAILURES", cast=int, default=5)
+BREAKER_RESET = config("HTTP_BREAKER_RESET", cast=int, default=30)
+
+
+class UnavailableError(requests.exceptions.ConnectionError):
+    """
+    The call was not sent: the circuit of the target is open, or the service has too many calls in flight
+    """
+
+
+class _Circuit:
+    def __init__(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+        self.requests = 0
+        self.errors = 0
+        self.short_circuited = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+
+class Service:
+    """
+    Outbound calls to a service: keep-alive connections pooled per host, a default timeout,
+    a concurrency limit, and a circuit breaker per host (or per endpoint URL);
+    the calls are made on behalf of different users, no cookie is kept
+    """
+
+    def __init__(self, name: str, timeout: float, max_concurrency: int, circuit_per_url: bool = False):
+        self.name = name
+        self.timeout = timeout
+        self.circuit_per_url = circuit_per_url
+        self.__session = requests.Session()
+        self.__session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_CONNECTIONS)
+        self.__session.mount("http://", adapter)
+        self.__session.mount("https://", adapter)
+        self.__slots = threading.BoundedSemaphore(max_concurrency)
+        self.__circuits = {}
+        self.__lock = threading.Lock()
+
+    def __get_target(self, url) -> str:
+        parts = urlsplit(url)
+        if not self.circuit_per_url:
+            return parts.netloc
+        # the path of a webhook holds its secret, only a digest of it shows in the logs and stats
+        return f"{parts.netloc}/{hashlib.sha1(parts.path.encode('UTF-8')).hexdigest()[:10]}"
+
+    def __get_circuit(self, host) -> _Circuit:
+        circuit = self.__circuits.get(host)
+        if circuit is None:
+            circuit = self.__circuits[host] = _Circuit()
+        return circuit
+
+    def __allow(self, host) -> bool:
+        with self.__lock:
+            circuit = self.__get_circuit(host)
+            if circuit.opened_at is not None:
+                if circuit.trial or time.monotonic() - circuit.opened_at < BREAKER_RESET:
+                    circuit.short_circuited += 1
+                    return False
+                # half-open: a single call checks if the host is back
+                circuit.trial = True
+            return True
+
+    def __record(self, host, elapsed, failed):
+        with self.__lock:
+            circuit = self.__get_circuit(host)
+            circuit.trial = False
+            circuit.requests += 1
+            circuit.latency_total += elapsed
+            circuit.latency_max = max(circuit.latency_max, elapsed)
+            if failed:
+                circuit.errors += 1
+                circuit.failures += 1
+                if circuit.opened_at is not None or circuit.failures >= BREAKER_FAILURES:
+                    if circuit.opened_at is None:
+                        logger.warning(f"!! {self.name}: opening the circuit of {host} "
+                                       f"after {circuit.failures} failures")
+                    circuit.opened_at = time.monotonic()
+            else:
+                if circuit.opened_at is not None:
+                    logger.info(f"{self.name}: closing the circuit of {host}")
+                circuit.failures = 0
+                circuit.opened_at = None
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        A 5xx response counts as a failure of the target, like a timeout or a connection error
+        :raise UnavailableError: if the circuit of the target is open, without calling it
+        """
+        host = self.__get_target(url)
+        if not self.__allow(host):
+            raise UnavailableError(f"{self.name}: the circuit of {host} is open")
+        timeout = kwargs.pop("timeout", None) or self.timeout
+        if not self.__slots.acquire(timeout=timeout[0] if isinstance(timeout, tuple) else timeout):
+            with self.__lock:
+                circuit = self.__get_circuit(host)
+                circuit.trial = False
+                circuit.short_circuited += 1
+            raise UnavailableError(f"{self.name}: too many calls in flight")
+        start = time.monotonic()
+        try:
+            response = self.__session.request(method=method, url=url, timeout=timeout, **kwargs)
+        except Exception:
+            self.__record(host=host, elapsed=time.monotonic() - start, failed=True)
+            raise
+        finally:
+            self.__slots.release()
+        self.__record(host=host, elapsed=time.monotonic() - start, failed=response.status_code >= 500)
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def get_stats(self) -> dict:
+        with self.__lock:
+            return {host: {"requests": c.requests,
+                           "errors": c.errors,
+                           "shortCircuited": c.short_circuited,
+                           "avgLatencyMs": round(c.latency_total * 1000 / c.requests, 1) if c.requests > 0 else 0,
+                           "maxLatencyMs": round(c.latency_max * 1000, 1),
+                           "circuit": "closed" if c.opened_at is None else "open"}
+                    for host, c in self.__circuits.items()}
+
+
+__services = {}
+__services_lock = threading.Lock()
+
+
+def get_service(name: str, timeout: float = 10, max_concurrency: int = 50, circuit_per_url: bool = False) -> Service:
+    """
+    :param circuit_per_url: a circuit per endpoint URL instead of per host, for the services calling many
+    independent endpoints on shared hosts (e.g.: the webhooks of the tenants on hooks.slack.com)
+    :return: the shared client of the service, created with the given options by the first call
+    """
+    with __services_lock:
+        service = __services.get(name)
+        if service is None:
+            service = __services[name] = Service(name=name, timeout=timeout, max_concurrency=max_concurrency,
+                                                 circuit_per_url=circuit_per_url)
+        return service
+
+
+def get_stats() -> dict:
+    """
+    :return: the counters of each service, per target
+    """
+    with __services_lock:
+        services = list(__services.values())
+    return {s.name: s.get_stats() for s in services}
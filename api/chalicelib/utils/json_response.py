@@ -0,0 +1,111 @@
+import asyncio
+import logging
+from functools import wraps
+from typing import Any, Callable
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse, Response
+
+from chalicelib.utils import helper
+
+logger = logging.getLogger(__name__)
+
+
+def session_ids_to_string(data):
+    """
+    Same as helper.cast_session_id_to_string, without updating the data:
+    only the containers holding a session id, and their parents, are copied
+    """
+    if isinstance(data, dict):
+        if "sessionId" in data:
+            return {**data, "sessionId": str(data["sessionId"])}
+        copy = None
+        for key, value in data.items():
+            if isinstance(value, (dict, list, tuple)):
+                new_value = session_ids_to_string(value)
+                if new_value is not value:
+                    if copy is None:
+                        copy = dict(data)
+                    copy[key] = new_value
+        return data if copy is None else copy
+    if isinstance(data, (list, tuple)):
+        copy = None
+        for i, item in enumerate(data):
+            if isinstance(item, (dict, list, tuple)):
+                new_item = session_ids_to_string(item)
+                if new_item is not item:
+                    if copy is None:
+                        copy = list(data)
+                    copy[i] = new_item
+        return data if copy is None else copy
+    return data
+
+
+def __default(obj):
+    # pydantic models, Decimal, sets...: what orjson doesn't support natively goes through FastAPI's encoder
+    return helper.cast_session_id_to_string(jsonable_encoder(obj))
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(session_ids_to_string(content), default=__default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class Rendered(str):
+    """
+    Endpoint result already encoded by render_endpoint.
+    jsonable_encoder returns the str instances as they are, so FastAPI passes it to the response class
+    without walking the content, and the status code and headers of the route still apply.
+    """
+
+    def __new__(cls, content: Any, body: bytes):
+        rendered = super().__new__(cls)
+        rendered.content = content
+        rendered.body = body
+        return rendered
+
+    @classmethod
+    def of(cls, content: Any):
+        if isinstance(content, Response):
+            return content
+        try:
+            return cls(content, dumps(content))
+        except TypeError as e:
+            # e.g. integers bigger than 64 bits, they go through FastAPI's serialization and json
+            logger.debug(f"orjson couldn't render the content: {e}")
+            return content
+
+
+def render_endpoint(call: Callable) -> Callable:
+    """
+    Wraps an endpoint to encode its result with orjson as soon as it returns
+    """
+    if asyncio.iscoroutinefunction(call):
+        @wraps(call)
+        async def endpoint(*args, **kwargs):
+            return Rendered.of(await call(*args, **kwargs))
+    else:
+        @wraps(call)
+        def endpoint(*args, **kwargs):
+            return Rendered.of(call(*args, **kwargs))
+    endpoint.rendered = True
+    return endpoint
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    Casts the session ids to string and encodes the content with orjson, in a single rendering.
+    The content is kept, so the route handler checks it for errors without decoding the body again.
+    """
+
+    def __init__(self, content: Any, *args, **kwargs):
+        self.content = content.content if isinstance(content, Rendered) else content
+        super().__init__(content, *args, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, Rendered):
+            return content.body
+        try:
+            return dumps(content)
+        except TypeError:
+            return super().render(helper.cast_session_id_to_string(content))
@@ -1 +1,2 @@
-from .or_cache import CachedResponse
\ No newline at end of file
+from .or_cache import CachedResponse
+from . import query_cache
\ No newline at end of file
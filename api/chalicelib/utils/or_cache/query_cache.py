@@ -0,0 +1,252 @@
+import hashlib
+import hmac
+import logging
+import pickle
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from cachetools import TLRUCache
+from decouple import config
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENABLED = config("CH_QUERY_CACHE", cast=bool, default=True)
+# Size bound of the in-process tier, in bytes of pickled results
+MEMORY_MAX_SIZE = config("CH_QUERY_CACHE_MAX_SIZE", cast=int, default=64 * 1024 * 1024)
+# A single result bigger than this is never cached
+MAX_ENTRY_SIZE = config("CH_QUERY_CACHE_MAX_ENTRY_SIZE", cast=int, default=4 * 1024 * 1024)
+REDIS_ENABLED = config("CH_QUERY_CACHE_REDIS", cast=bool, default=False)
+# Key signing the payloads of the shared tier, a payload that doesn't match its signature is never unpickled
+REDIS_SECRET = config("CH_QUERY_CACHE_SECRET", default=config("JWT_SECRET", default=""))
+KEY_PREFIX = "or_cache:ch_query:"
+
+# The TTL (in seconds) applied to the queries executed in the current context, None means no caching
+_current_ttl: ContextVar[Optional[int]] = ContextVar("query_cache_ttl", default=None)
+
+__WHITESPACES = re.compile(r"\s+")
+
+
+class _Counters:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = {}
+
+    def incr(self, name, value=1):
+        with self.lock:
+            self.values[name] = self.values.get(name, 0) + value
+
+    def get(self):
+        with self.lock:
+            return dict(self.values)
+
+
+counters = _Counters()
+
+
+class _MemoryTier(TLRUCache):
+    """
+    In-process LRU bounded by the total size of the stored results, each entry has its own expiration time
+    """
+
+    def __init__(self, maxsize):
+        super().__init__(maxsize=maxsize, ttu=lambda _key, value, now: now + value[0], getsizeof=self.__sizeof,
+                         timer=time.monotonic)
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def __sizeof(value):
+        return len(value[1])
+
+    def popitem(self):
+        key, value = super().popitem()
+        counters.incr("memory_evictions")
+        return key, value
+
+    def get_entry(self, key):
+        with self.lock:
+            value = self.get(key)
+        return None if value is None else value[1]
+
+    def set_entry(self, key, ttl, payload):
+        with self.lock:
+            self[key] = (ttl, payload)
+
+
+class _RedisTier:
+    """
+    Optional shared tier, any failure is logged and considered as a miss;
+    the payloads are signed since anyone with access to the Redis could write them
+    """
+
+    def __init__(self, redis_module):
+        self.client = redis_module.from_url(config("REDIS_STRING"),
+                                            socket_timeout=config("CH_QUERY_CACHE_REDIS_TIMEOUT",
+                                                                  cast=float, default=0.2))
+        self.secret = REDIS_SECRET.encode("UTF-8")
+
+    def __sign(self, payload):
+        return hmac.new(self.secret, payload, hashlib.sha256).digest()
+
+    def get_entry(self, key):
+        try:
+            signed = self.client.get(KEY_PREFIX + key)
+        except Exception as e:
+            counters.incr("shared_errors")
+            logger.warning(f"query-cache: error while reading from the shared tier: {e}")
+            return None
+        if signed is None:
+            return None
+        signature, payload = signed[:32], signed[32:]
+        if not hmac.compare_digest(signature, self.__sign(payload)):
+            counters.incr("shared_invalid_signatures")
+            logger.warning(f"!! query-cache: invalid signature for the shared entry {key}, ignored")
+            return None
+        return payload
+
+    def set_entry(self, key, ttl, payload):
+        try:
+            self.client.set(KEY_PREFIX + key, self.__sign(payload) + payload, ex=ttl)
+        except Exception as e:
+            counters.incr("shared_errors")
+            logger.warning(f"query-cache: error while writing to the shared tier: {e}")
+
+
+def __get_shared_tier() -> Optional[_RedisTier]:
+    if not CACHE_ENABLED or not REDIS_ENABLED:
+        return None
+    if len(REDIS_SECRET) == 0:
+        logger.warning("query-cache: CH_QUERY_CACHE_SECRET is not set, the shared tier is disabled")
+        return None
+    try:
+        # redis is not part of every image (e.g.: alerts), the cache stays in-process without it
+        import redis
+    except ImportError:
+        logger.warning("query-cache: redis is not installed, the shared tier is disabled")
+        return None
+    return _RedisTier(redis)
+
+
+memory_tier = _MemoryTier(maxsize=MEMORY_MAX_SIZE)
+shared_tier: Optional[_RedisTier] = __get_shared_tier()
+
+
+@contextmanager
+def cached_queries(ttl: int):
+    """
+    Every ClickHouse query executed inside this context is served from/stored into the cache for ttl seconds
+    """
+    token = _current_ttl.set(ttl if CACHE_ENABLED and ttl is not None and ttl > 0 else None)
+    try:
+        yield
+    finally:
+        _current_ttl.reset(token)
+
+
+def get_key(query, parameters=None) -> str:
+    query = query.decode("UTF-8") if isinstance(query, bytes) else query
+    query = __WHITESPACES.sub(" ", query).strip()
+    if parameters:
+        query += "|" + repr(sorted(parameters.items(), key=lambda x: x[0]))
+    return hashlib.sha1(query.encode("UTF-8")).hexdigest()
+
+
+def align_time_range(start_timestamp: int, end_timestamp: int, bucket: int, now: int = None):
+    """
+    Aligns a range that ends around now (e.g.: last 7 days) to time-buckets of bucket seconds,
+    so that requests issued during the same bucket render the same query and share the same key.
+    Absolute ranges ending in the past are kept as is.
+    :return: start_timestamp, end_timestamp in milliseconds
+    """
+    if bucket is None or bucket <= 0:
+        return start_timestamp, end_timestamp
+    bucket *= 1000
+    now = int(time.time() * 1000) if now is None else now
+    if end_timestamp < now - bucket:
+        return start_timestamp, end_timestamp
+    end = end_timestamp - end_timestamp % bucket
+    return max(0, start_timestamp - (end_timestamp - end)), end
+
+
+def __lookup(key, ttl):
+    payload = memory_tier.get_entry(key)
+    if payload is not None:
+        counters.incr("memory_hits")
+        return True, pickle.loads(payload)
+    counters.incr("memory_misses")
+    if shared_tier is not None:
+        payload = shared_tier.get_entry(key)
+        if payload is not None:
+            counters.incr("shared_hits")
+            memory_tier.set_entry(key, ttl, payload)
+            return True, pickle.loads(payload)
+        counters.incr("shared_misses")
+    return False, None
+
+
+def __store(key, ttl, result):
+    payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(payload) > MAX_ENTRY_SIZE:
+        counters.incr("skipped_too_big")
+        return
+    memory_tier.set_entry(key, ttl, payload)
+    if shared_tier is not None:
+        shared_tier.set_entry(key, ttl, payload)
+
+
+def get_or_execute(query, parameters, execute: Callable):
+    ttl = _current_ttl.get()
+    if ttl is None:
+        return execute()
+
+    key = get_key(query=query, parameters=parameters)
+    found, result = __lookup(key=key, ttl=ttl)
+    if found:
+        return result
+    result = execute()
+    __store(key=key, ttl=ttl, result=result)
+    return result
+
+
+async def get_or_execute_async(query, parameters, execute: Callable):
+    """
+    Same as get_or_execute, but execute returns an awaitable
+    """
+    ttl = _current_ttl.get()
+    if ttl is None:
+        return await execute()
+
+    key = get_key(query=query, parameters=parameters)
+    found, result = __lookup(key=key, ttl=ttl)
+    if found:
+        return result
+    result = await execute()
+    __store(key=key, ttl=ttl, result=result)
+    return result
+
+
+def get_value(key: str, ttl: int):
+    """
+    Reads a value stored by set_value, outside the queries caching
+    :return: found, value
+    """
+    if not CACHE_ENABLED:
+        return False, None
+    return __lookup(key=key, ttl=ttl)
+
+
+def set_value(key: str, ttl: int, value):
+    if CACHE_ENABLED and ttl is not None and ttl > 0:
+        __store(key=key, ttl=ttl, result=value)
+
+
+def get_stats():
+    return {**counters.get(), "memory_size": memory_tier.currsize, "memory_entries": len(memory_tier)}
+
+
+def clear():
+    with memory_tier.lock:
+        memory_tier.clear()
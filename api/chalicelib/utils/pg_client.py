@@ -4,7 +4,10 @@ from threading import Semaphore
 
 import psycopg2
 import psycopg2.extras
+import psycopg_pool
 from decouple import config
+from psycopg import AsyncConnection, AsyncClientCursor
+from psycopg.rows import dict_row
 from psycopg2 import pool
 
 logger = logging.getLogger(__name__)
@@ -185,16 +188,86 @@ class PostgresClient:
         return self.__enter__()
 
 
+class ORPYAsyncConnection(AsyncConnection):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, row_factory=dict_row, **kwargs)
+
+
+postgreSQL_async_pool: psycopg_pool.AsyncConnectionPool = None
+
+
+async def make_async_pool():
+    global postgreSQL_async_pool
+    if postgreSQL_async_pool is not None:
+        return postgreSQL_async_pool
+    async_config = {"host": _PG_CONFIG["host"],
+                    "dbname": _PG_CONFIG["database"],
+                    "user": _PG_CONFIG["user"],
+                    "password": _PG_CONFIG["password"],
+                    "port": _PG_CONFIG["port"],
+                    "application_name": "AIO" + _PG_CONFIG["application_name"]}
+    if PG_CONFIG.get("options") is not None:
+        async_config["options"] = PG_CONFIG["options"]
+    postgreSQL_async_pool = psycopg_pool.AsyncConnectionPool(kwargs=async_config,
+                                                             connection_class=ORPYAsyncConnection,
+                                                             min_size=config("PG_AIO_MINCONN", cast=int, default=1),
+                                                             max_size=config("PG_AIO_MAXCONN", cast=int, default=5),
+                                                             open=False)
+    await postgreSQL_async_pool.open()
+    logger.info("Async connection pool created successfully")
+    return postgreSQL_async_pool
+
+
+class AsyncPostgresClient:
+    """
+    Async counterpart of PostgresClient, using the async pool;
+    the cursor binds parameters client-side, so cur.mogrify is available (and returns str)
+    """
+    connection = None
+    cursor = None
+
+    async def __aenter__(self):
+        self.connection = await postgreSQL_async_pool.getconn()
+        self.cursor = AsyncClientCursor(self.connection, row_factory=dict_row)
+        return self.cursor
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if exc_type is None:
+                await self.connection.commit()
+            else:
+                await self.connection.rollback()
+            await self.cursor.close()
+        except Exception as error:
+            logger.error("Error while committing/closing async PG-connection", exc_info=error)
+            raise error
+        finally:
+            await postgreSQL_async_pool.putconn(self.connection)
+
+
 async def init():
     logger.info(f">use PG_POOL:{config('PG_POOL', default=True)}")
     make_pool()
 
 
+async def init_async():
+    await make_async_pool()
+
+
 async def terminate():
     global postgreSQL_pool
+    global postgreSQL_async_pool
     if postgreSQL_pool is not None:
         try:
             postgreSQL_pool.closeall()
             logger.info("Closed all connexions to PostgreSQL")
         except (Exception, psycopg2.DatabaseError) as error:
             logger.error("Error while closing all connexions to PostgreSQL", exc_info=error)
+    if postgreSQL_async_pool is not None:
+        try:
+            await postgreSQL_async_pool.close()
+            postgreSQL_async_pool = None
+            logger.info("Closed all async connexions to PostgreSQL")
+        except Exception as error:
+            logger.error("Error while closing all async connexions to PostgreSQL", exc_info=error)
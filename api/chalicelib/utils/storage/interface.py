@@ -1,4 +1,19 @@
+import threading
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+from cachetools import TLRUCache
+from decouple import config
+
+# Shared by the batch calls, bounds the number of concurrent requests sent to the object storage
+_requests_pool = ThreadPoolExecutor(max_workers=config("STORAGE_REQUESTS_WORKERS", cast=int, default=16),
+                                    thread_name_prefix="storage")
+_SIGNATURES_CACHE = config("PRESIGNED_URL_CACHE", cast=bool, default=True)
+# A signed URL is reused during half of its validity, so the shared URLs are always valid for at least expires_in/2
+_signatures = TLRUCache(maxsize=config("PRESIGNED_URL_CACHE_SIZE", cast=int, default=10000),
+                        ttu=lambda _key, _value, now: now + _key[2] / 2, timer=time.monotonic)
+_signatures_lock = threading.Lock()
 
 
 class ObjectStorage(ABC):
@@ -26,3 +41,35 @@ class ObjectStorage(ABC):
     def tag_for_deletion(self, bucket, key):
         # Adds the special tag 'to_delete_in_days' to the file to mark it for deletion
         pass
+
+    def exists_batch(self, bucket, keys) -> dict:
+        """
+        Checks the existence of the keys concurrently
+        :return: key -> True if the object exists in the bucket
+        """
+        keys = list(dict.fromkeys(keys))
+        if len(keys) <= 1:
+            return {k: self.exists(bucket, k) for k in keys}
+        return dict(zip(keys, _requests_pool.map(lambda k: self.exists(bucket, k), keys)))
+
+    def get_presigned_urls_for_sharing(self, bucket, expires_in, keys, check_exists=False) -> list:
+        """
+        Returns the pre-signed URLs of the keys in the same order, without the missing keys if check_exists;
+        the URLs are signed locally and reused until half of their validity
+        """
+        if check_exists:
+            existing = self.exists_batch(bucket, keys)
+            keys = [k for k in keys if existing[k]]
+        if not _SIGNATURES_CACHE:
+            return [self.get_presigned_url_for_sharing(bucket=bucket, expires_in=expires_in, key=k) for k in keys]
+        urls = []
+        for k in keys:
+            cache_key = (bucket, k, expires_in)
+            with _signatures_lock:
+                url = _signatures.get(cache_key)
+            if url is None:
+                url = self.get_presigned_url_for_sharing(bucket=bucket, expires_in=expires_in, key=k)
+                with _signatures_lock:
+                    _signatures[cache_key] = url
+            urls.append(url)
+        return urls
@@ -1,3 +1,6 @@
+import logging
+import os
+
 import boto3
 import botocore
 from botocore.client import Config
@@ -6,6 +9,8 @@ from decouple import config
 from requests.models import PreparedRequest
 from chalicelib.utils.storage.interface import ObjectStorage
 
+logger = logging.getLogger(__name__)
+
 
 class AmazonS3Storage(ObjectStorage):
     if not config("S3_HOST", default=False):
@@ -36,6 +41,23 @@ class AmazonS3Storage(ObjectStorage):
                 raise
         return True
 
+    def exists_batch(self, bucket, keys):
+        """
+        Keys sharing a prefix are checked with a single LIST, the HEAD requests are used if the listing
+        is truncated or not allowed
+        """
+        keys = list(dict.fromkeys(keys))
+        prefix = os.path.commonprefix(keys)
+        if len(keys) > 1 and len(prefix) > 0:
+            try:
+                response = self.client.list_objects_v2(Bucket=bucket, Prefix=prefix, MaxKeys=1000)
+                if not response.get("IsTruncated"):
+                    found = {o["Key"] for o in response.get("Contents", [])}
+                    return {k: k in found for k in keys}
+            except botocore.exceptions.ClientError as e:
+                logger.debug(f"Listing {bucket}/{prefix} failed, checking the keys one by one: {e}")
+        return super().exists_batch(bucket, keys)
+
     def get_presigned_url_for_sharing(self, bucket, expires_in, key, check_exists=False):
         if check_exists and not self.exists(bucket, key):
             return None
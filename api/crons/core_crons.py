@@ -1,3 +1,29 @@
+import logging
+
+from apscheduler.triggers.interval import IntervalTrigger
+from decouple import config
+
+from chalicelib.core.sessions import query_parts_cache
+from chalicelib.utils import http_client
+from chalicelib.utils.or_cache import query_cache
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two logs of the counters of the worker's caches and outbound clients, 0 disables it
+STATS_LOG_PERIOD = config("STATS_LOG_PERIOD", cast=int, default=300)
+
+
+async def stats_log_cron() -> None:
+    logger.info(f"ch-query-cache: {query_cache.get_stats()}")
+    logger.info(f"query-parts-cache: {query_parts_cache.get_stats()}")
+    for service, targets in http_client.get_stats().items():
+        logger.info(f"http-client {service}: {targets}")
+
+
 cron_jobs = [
 
 ]
+
+if STATS_LOG_PERIOD > 0:
+    cron_jobs.append({"func": stats_log_cron, "trigger": IntervalTrigger(seconds=STATS_LOG_PERIOD),
+                      "misfire_grace_time": 20, "max_instances": 1})
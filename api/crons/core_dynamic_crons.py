@@ -1,8 +1,11 @@
+import asyncio
+
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 
 from chalicelib.core import telemetry
 from chalicelib.core import weekly_report, jobs, health
+from chalicelib.core.metrics.modules import rollups
 
 
 async def run_scheduled_jobs() -> None:
@@ -17,6 +20,11 @@ async def telemetry_cron() -> None:
     telemetry.compute()
 
 
+async def sessions_rollups_cron() -> None:
+    # the ClickHouse queries of the refresh would block the event loop of the scheduler
+    await asyncio.to_thread(rollups.refresh)
+
+
 async def health_cron() -> None:
     health.cron()
 
@@ -35,5 +43,7 @@ cron_jobs = [
     {"func": health_cron, "trigger": IntervalTrigger(hours=0, minutes=30, start_date="2023-04-01 0:0:0", jitter=300),
      "misfire_grace_time": 60 * 60, "max_instances": 1},
     {"func": weekly_health_cron, "trigger": CronTrigger(day_of_week="sun", hour=5),
-     "misfire_grace_time": 60 * 60, "max_instances": 1}
+     "misfire_grace_time": 60 * 60, "max_instances": 1},
+    {"func": sessions_rollups_cron, "trigger": IntervalTrigger(minutes=1),
+     "misfire_grace_time": 20, "max_instances": 1}
 ]
@@ -471,7 +471,8 @@ def reset_password_handler(background_tasks: BackgroundTasks, data: schemas.Forg
 
 @app.get('/{projectId}/metadata', tags=["metadata"])
 def get_metadata(projectId: int, context: schemas.CurrentContext = Depends(OR_context)):
-    return {"data": metadata.get(project_id=projectId)}
+    # the settings page shows what is being edited, possibly on another worker
+    return {"data": metadata.get(project_id=projectId, cached=False)}
 
 
 # @app.post('/{projectId}/metadata/list', tags=["metadata"])
@@ -534,7 +535,7 @@ def update_conditions(projectId: int, data: schemas.ProjectSettings = Body(...),
 
 @app.get('/{projectId}/conditions', tags=["projects"])
 def get_conditions(projectId: int, context: schemas.CurrentContext = Depends(OR_context)):
-    return {"data": projects.get_conditions(project_id=projectId)}
+    return {"data": projects.get_conditions(project_id=projectId, cached=False)}
 
 
 @app.get('/announcements', tags=["announcements"])
@@ -672,6 +672,10 @@ class SessionsSearchPayloadSchema(_TimedSchema, _PaginatedSchema):
     events_order: Optional[SearchEventOrder] = Field(default=SearchEventOrder.THEN)
     group_by_user: bool = Field(default=False)
     bookmarked: bool = Field(default=False)
+    # keyset pagination: empty for the first page, then the nextCursor of the previous page; page is ignored
+    cursor: Optional[str] = Field(default=None)
+    # with a cursor, the total can be estimated instead of counted
+    approximate_total: bool = Field(default=False)
 
     @model_validator(mode="before")
     @classmethod
@@ -1416,6 +1420,11 @@ class GetHeatMapPayloadSchema(_TimedSchema):
     click_rage: bool = Field(default=False)
     operator: Literal[SearchEventOperator.IS, SearchEventOperator.STARTS_WITH,
     SearchEventOperator.CONTAINS, SearchEventOperator.ENDS_WITH] = Field(default=SearchEventOperator.STARTS_WITH)
+    # density grid of all the clicks instead of a sample of click points
+    grid: bool = Field(default=False)
+    grid_size: int = Field(default=100, ge=10, le=500)
+    # gaussian smoothing of the grid, in cells
+    smoothing: float = Field(default=0, ge=0, le=10)
 
 
 class GetClickMapPayloadSchema(GetHeatMapPayloadSchema):
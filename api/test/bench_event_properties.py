@@ -0,0 +1,98 @@
+"""
+Error search and heatmap queries filtering on the $properties of product_analytics.events: the fields
+extracted from the JSON of each scanned event, against the materialized columns of the 1.22.0 migration
+
+    python3 -m test.bench_event_properties --project-id 1 --days 7 --repeat 5
+
+Run it from the api (or ee/api) directory against a ClickHouse holding events, the migration applied.
+"""
+import argparse
+import time
+
+from decouple import config
+
+from chalicelib.utils import ch_client, exp_ch_helper
+from chalicelib.utils.TimeUTC import TimeUTC
+
+
+def errors_query():
+    prop = exp_ch_helper.get_event_property
+    return f"""SELECT {prop('error_id')} AS error_id,
+                      any({prop('name')})    AS name,
+                      any({prop('message')}) AS message,
+                      COUNT(DISTINCT session_id) AS sessions
+               FROM product_analytics.events
+               WHERE project_id = toUInt16(%(project_id)s)
+                 AND `$event_name` = 'ERROR'
+                 AND created_at >= toDateTime(%(startDate)s / 1000)
+                 AND created_at < toDateTime(%(endDate)s / 1000)
+                 AND {prop('source')} = 'js_exception'
+                 AND {prop('message')} != 'Script error.'
+               GROUP BY error_id
+               ORDER BY sessions DESC, error_id
+               LIMIT 50;"""
+
+
+def heatmap_query():
+    prop = exp_ch_helper.get_event_property
+    return f"""SELECT floor({prop('normalized_x')} / 2) AS x, floor({prop('normalized_y')} / 2) AS y,
+                      COUNT(1) AS clicks
+               FROM product_analytics.events
+               WHERE project_id = toUInt16(%(project_id)s)
+                 AND `$event_name` = 'CLICK'
+                 AND created_at >= toDateTime(%(startDate)s / 1000)
+                 AND created_at < toDateTime(%(endDate)s / 1000)
+                 AND {prop('url_path')} = %(url)s
+                 AND isNotNull({prop('normalized_x')})
+               GROUP BY x, y
+               ORDER BY x, y;"""
+
+
+def top_url_query():
+    return f"""SELECT {exp_ch_helper.get_event_property('url_path')} AS url_path
+               FROM product_analytics.events
+               WHERE project_id = toUInt16(%(project_id)s)
+                 AND `$event_name` = 'CLICK'
+                 AND created_at >= toDateTime(%(startDate)s / 1000)
+                 AND created_at < toDateTime(%(endDate)s / 1000)
+               GROUP BY url_path
+               ORDER BY COUNT(1) DESC
+               LIMIT 1;"""
+
+
+def timed(cur, query, params, repeat):
+    query = cur.format(query=query, parameters=params)
+    rows = cur.execute(query=query)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cur.execute(query=query)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, rows
+
+
+def run(project_id, days, repeat):
+    params = {"project_id": project_id, "startDate": TimeUTC.now(-days), "endDate": TimeUTC.now()}
+    with ch_client.ClickHouseClient(database=config("ch_database", default="default")) as cur:
+        exp_ch_helper.MATERIALIZED_PROPERTIES_ENABLED = True
+        url = cur.execute(query=cur.format(query=top_url_query(), parameters=params))
+        params["url"] = url[0]["url_path"] if len(url) > 0 else ""
+        print(f"project {project_id}, last {days} days, heatmap of '{params['url']}'")
+        for name, build in [("error search", errors_query), ("heatmap", heatmap_query)]:
+            results = {}
+            for materialized in (False, True):
+                exp_ch_helper.MATERIALIZED_PROPERTIES_ENABLED = materialized
+                results[materialized] = timed(cur, build(), params, repeat)
+            assert results[False][1] == results[True][1], f"{name}: the results differ"
+            for materialized, label in [(False, "JSON extraction"), (True, "materialized columns")]:
+                print(f"{name:<14} {label:<22} {results[materialized][0] * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--project-id", type=int, default=1)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(project_id=args.project_id, days=args.days, repeat=args.repeat)
@@ -0,0 +1,96 @@
+"""
+Serialization cost of a search_sessions response: jsonable_encoder and the JSONResponse decode/re-encode
+done by ORRoute before, against the single orjson rendering of the endpoint result
+
+    python3 -m test.bench_json_response --sessions 5000
+
+Run it from the api directory, the sessions are synthetic rows with the columns of the sessions search.
+"""
+import argparse
+import json
+import random
+import string
+import time
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from chalicelib.utils import helper
+from chalicelib.utils.json_response import ORJSONResponse, Rendered
+
+
+def __random_string(k):
+    return "".join(random.choices(string.ascii_letters + string.digits, k=k))
+
+
+def synthetic_sessions(count):
+    sessions = []
+    for _ in range(count):
+        sessions.append({"project_id": 1,
+                         "session_id": random.randint(2 ** 60, 2 ** 63),
+                         "user_uuid": __random_string(36),
+                         "user_id": random.choice([None, __random_string(12)]),
+                         "user_os": random.choice(["Mac OS X", "Windows", "Linux", "iOS", "Android"]),
+                         "user_browser": random.choice(["Chrome", "Firefox", "Safari", "Edge"]),
+                         "user_device": random.choice([None, "iPhone", "Pixel 7"]),
+                         "user_device_type": random.choice(["desktop", "mobile"]),
+                         "user_country": random.choice(["FR", "US", "DE", "IN"]),
+                         "user_city": __random_string(8),
+                         "user_state": __random_string(8),
+                         "start_ts": random.randint(1_700_000_000_000, 1_800_000_000_000),
+                         "duration": random.randint(0, 3_600_000),
+                         "events_count": random.randint(0, 500),
+                         "pages_count": random.randint(0, 50),
+                         "errors_count": random.randint(0, 10),
+                         "user_anonymous_id": random.choice([None, __random_string(16)]),
+                         "platform": "web",
+                         "issue_score": random.randint(0, 1000),
+                         "timezone": "UTC+02:00",
+                         "issue_types": random.sample(["click_rage", "dead_click", "js_exception", "bad_request"],
+                                                      k=random.randint(0, 3)),
+                         "favorite": random.random() > 0.9,
+                         "viewed": random.random() > 0.5,
+                         "metadata": {f"metadata_{i}": __random_string(10) for i in range(3)}})
+    return sessions
+
+
+def legacy_render(content):
+    response = JSONResponse(content=jsonable_encoder(content))
+    body = json.loads(response.body.decode('utf8'))
+    return response.render(helper.cast_session_id_to_string(body))
+
+
+def single_pass_render(content):
+    return ORJSONResponse(content=jsonable_encoder(Rendered.of(content))).body
+
+
+def best_of(repeat, f, *args):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(sessions, repeat):
+    rows = synthetic_sessions(sessions)
+    camel_time = best_of(repeat, lambda: helper.list_to_camel_case([dict(r) for r in rows]))
+    content = {"data": {"total": len(rows), "sessions": helper.list_to_camel_case(rows)}}
+    legacy_body = legacy_render(content)
+    body = single_pass_render(content)
+    assert json.loads(legacy_body) == json.loads(body)
+    print(f"{sessions} sessions, {len(body) / 1024 / 1024:.2f} MB")
+    print(f"{'list_to_camel_case':<20} {camel_time * 1000:8.1f} ms")
+    for name, render in [("legacy", legacy_render), ("single pass", single_pass_render)]:
+        elapsed = best_of(repeat, render, content)
+        print(f"{name:<20} {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(sessions=args.sessions, repeat=args.repeat)
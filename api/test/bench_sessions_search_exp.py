@@ -0,0 +1,118 @@
+"""
+Decoding cost of a page of the ClickHouse sessions search: the map of toString values with the metadata
+rendered as a string, parsed back with literal_eval and validated row by row, against the typed
+column-oriented result validated in a single call
+
+    python3 -m test.bench_sessions_search_exp --pages 200 --page-size 200
+
+Run it from the ee/api directory, the pages are synthetic results shaped as returned by each driver path.
+"""
+import argparse
+import ast
+import random
+import string
+import time
+import uuid
+
+import schemas
+from chalicelib.core.sessions import sessions_search_exp
+from chalicelib.utils import helper
+
+
+def __random_string(k):
+    return "".join(random.choices(string.ascii_letters + string.digits, k=k))
+
+
+def synthetic_columns(count, metadata_keys):
+    """
+    A page as returned by execute_columns: native values, metadata as a dict
+    """
+    return {"total": [count * 10] * count,
+            "projectId": [1] * count,
+            "sessionId": [random.randint(2 ** 60, 2 ** 63) for _ in range(count)],
+            "userUuid": [uuid.uuid4() for _ in range(count)],
+            "userId": [random.choice([None, __random_string(12)]) for _ in range(count)],
+            "userOs": [random.choice(["Mac OS X", "Windows", "Linux", "iOS", "Android"]) for _ in range(count)],
+            "userBrowser": [random.choice(["Chrome", "Firefox", "Safari", "Edge"]) for _ in range(count)],
+            "userDevice": [random.choice(["", "iPhone", "Pixel 7"]) for _ in range(count)],
+            "userDeviceType": [random.choice(["desktop", "mobile"]) for _ in range(count)],
+            "userCountry": [random.choice(["FR", "US", "DE", "IN"]) for _ in range(count)],
+            "userCity": [__random_string(8) for _ in range(count)],
+            "userState": [__random_string(8) for _ in range(count)],
+            "startTs": [random.randint(1_700_000_000_000, 1_800_000_000_000) for _ in range(count)],
+            "duration": [random.randint(0, 3_600_000) for _ in range(count)],
+            "eventsCount": [random.randint(0, 500) for _ in range(count)],
+            "pagesCount": [random.randint(0, 50) for _ in range(count)],
+            "errorsCount": [random.randint(0, 10) for _ in range(count)],
+            "userAnonymousId": [random.choice([None, __random_string(16)]) for _ in range(count)],
+            "platform": ["web"] * count,
+            "timezone": ["UTC+02:00"] * count,
+            "issueScore": [random.randint(0, 1000) for _ in range(count)],
+            "viewed": [random.randint(0, 1) for _ in range(count)],
+            "metadata": [{k: __random_string(10) for k in metadata_keys} for _ in range(count)],
+            "sort_key": list(range(count))}
+
+
+def to_legacy_page(columns):
+    """
+    The same page as returned by the former query: one map of strings per session
+    """
+    sessions = []
+    for i in range(len(columns["total"])):
+        details = {}
+        for key, _ in sessions_search_exp.SESSION_LIST_COLS_CH:
+            value = columns[key][i]
+            details[helper.key_to_snake_case(key)] = None if value is None else str(value).lower() \
+                if isinstance(value, bool) else str(value)
+        details["viewed"] = "true" if columns["viewed"][i] else "false"
+        details["metadata"] = str(columns["metadata"][i])
+        sessions.append(details)
+    return [{"count": columns["total"][0], "sessions": sessions}]
+
+
+def legacy_decode(page):
+    page = page[0]
+    sessions = [dict(s) for s in page["sessions"]]
+    for i in range(len(sessions)):
+        sessions[i]["metadata"] = ast.literal_eval(sessions[i]["metadata"])
+        sessions[i] = schemas.SessionModel.parse_obj(helper.dict_to_camel_case(sessions[i]))
+    return {"total": page["count"], "sessions": sessions, "src": 2}
+
+
+def typed_decode(columns):
+    return sessions_search_exp.format_sessions_columns(columns)
+
+
+def best_of(repeat, f, pages):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for p in pages:
+            f(p)
+        elapsed = (time.perf_counter() - start) / len(pages)
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(pages, page_size, metadata_keys, repeat):
+    keys = [f"metadata_{i}" for i in range(metadata_keys)]
+    typed_pages = [synthetic_columns(page_size, keys) for _ in range(pages)]
+    legacy_pages = [to_legacy_page(p) for p in typed_pages]
+    for typed, legacy in zip(typed_pages[:5], legacy_pages[:5]):
+        assert [s.model_dump() for s in typed_decode(typed)["sessions"]] \
+               == [s.model_dump() for s in legacy_decode(legacy)["sessions"]]
+    print(f"{pages} pages of {page_size} sessions, {metadata_keys} metadata")
+    for name, decode, data in [("literal_eval", legacy_decode, legacy_pages),
+                               ("typed columns", typed_decode, typed_pages)]:
+        elapsed = best_of(repeat, decode, data)
+        print(f"{name:<20} {elapsed * 1000:8.2f} ms/page")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--metadata", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(pages=args.pages, page_size=args.page_size, metadata_keys=args.metadata, repeat=args.repeat)
@@ -0,0 +1,37 @@
+from decimal import Decimal
+
+import pytest
+
+from chalicelib.core.alerts.modules import evaluation
+
+
+def alert(operator, right):
+    return {"alertId": 1, "name": "a", "query": {"operator": operator, "right": right}}
+
+
+class TestAlertsEvaluation:
+    @pytest.mark.parametrize("operator, value, right, valid", [
+        ("=", Decimal("0.1"), 0.1, True),
+        ("=", Decimal("0.3"), 0.1 + 0.2, False),
+        (">=", Decimal("0.1"), 0.1, True),
+        ("<", Decimal("0.1"), 0.1, False),
+        (">", Decimal("2.5"), 2, True),
+        ("=", 3, 3, True),
+        ("<=", 0.5, 0.5, True)
+    ])
+    def test_same_as_the_sql_comparison(self, operator, value, right, valid):
+        assert evaluation.is_valid(alert(operator, right), value) is valid
+
+    def test_grouped_alerts_share_the_numeric_value(self):
+        alerts = [{**alert(">", 0.1), "alertId": 1}, {**alert("=", 0.1), "alertId": 2},
+                  {**alert("<", 0.1), "alertId": 3}]
+        queries = []
+
+        def execute(query, params):
+            queries.append(query)
+            return {"value": Decimal("0.1")}
+
+        results = evaluation.evaluate(alerts, build=lambda a: ("SELECT", {}), execute=execute,
+                                      group_key=lambda a: ("group",))
+        assert len(queries) == 1
+        assert {a["alertId"]: r["valid"] for a, r in results} == {1: False, 2: True, 3: False}
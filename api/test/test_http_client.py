@@ -0,0 +1,125 @@
+import http.client
+import urllib.request
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from chalicelib.utils import http_client
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeTarget:
+    """
+    Replaces the network: answers each call with the next status code, or raises it if it is an exception
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.answers = []
+
+    def __call__(self, method, url, **kwargs):
+        self.calls.append(url)
+        answer = self.answers.pop(0) if len(self.answers) > 0 else 200
+        if isinstance(answer, Exception):
+            raise answer
+        return FakeResponse(answer)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def target(monkeypatch):
+    fake = FakeTarget()
+    monkeypatch.setattr(requests.Session, "request", lambda session, method, url, **kwargs: fake(method, url))
+    return fake
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = Clock()
+    monkeypatch.setattr(http_client.time, "monotonic", fake)
+    return fake
+
+
+def open_circuit(service, target, url):
+    target.answers = [requests.exceptions.ConnectTimeout("timeout")] * http_client.BREAKER_FAILURES
+    for _ in range(http_client.BREAKER_FAILURES):
+        with pytest.raises(requests.exceptions.ConnectTimeout):
+            service.get(url)
+
+
+class TestHttpClient:
+    def test_circuit_opens_after_consecutive_failures(self, target, clock):
+        service = http_client.Service(name="test", timeout=1, max_concurrency=10)
+        open_circuit(service, target, "http://assist/a")
+        calls = len(target.calls)
+        with pytest.raises(http_client.UnavailableError):
+            service.get("http://assist/b")
+        assert len(target.calls) == calls
+        stats = service.get_stats()["assist"]
+        assert stats["circuit"] == "open"
+        assert stats["shortCircuited"] == 1
+
+    def test_success_resets_the_failures(self, target, clock):
+        service = http_client.Service(name="test", timeout=1, max_concurrency=10)
+        target.answers = [500] * (http_client.BREAKER_FAILURES - 1) + [200, 500]
+        for _ in range(http_client.BREAKER_FAILURES + 1):
+            service.get("http://assist/a")
+        assert service.get_stats()["assist"]["circuit"] == "closed"
+
+    def test_half_open_trial_closes_the_circuit(self, target, clock):
+        service = http_client.Service(name="test", timeout=1, max_concurrency=10)
+        open_circuit(service, target, "http://assist/a")
+        clock.now += http_client.BREAKER_RESET
+        assert service.get("http://assist/a").status_code == 200
+        assert service.get_stats()["assist"]["circuit"] == "closed"
+        assert service.get("http://assist/a").status_code == 200
+
+    def test_failed_trial_opens_the_circuit_again(self, target, clock):
+        service = http_client.Service(name="test", timeout=1, max_concurrency=10)
+        open_circuit(service, target, "http://assist/a")
+        clock.now += http_client.BREAKER_RESET
+        target.answers = [503]
+        assert service.get("http://assist/a").status_code == 503
+        with pytest.raises(http_client.UnavailableError):
+            service.get("http://assist/a")
+        # the reset delay starts again from the failed trial
+        clock.now += http_client.BREAKER_RESET - 1
+        with pytest.raises(http_client.UnavailableError):
+            service.get("http://assist/a")
+        clock.now += 1
+        assert service.get("http://assist/a").status_code == 200
+
+    def test_circuit_per_url(self, target, clock):
+        service = http_client.Service(name="test", timeout=1, max_concurrency=10, circuit_per_url=True)
+        open_circuit(service, target, "https://hooks.slack.com/services/T1/B1/secret1")
+        with pytest.raises(http_client.UnavailableError):
+            service.post("https://hooks.slack.com/services/T1/B1/secret1")
+        # another tenant's webhook on the same host
+        assert service.post("https://hooks.slack.com/services/T2/B2/secret2").status_code == 200
+        # the secret of the webhooks stays out of the stats
+        assert all("secret" not in key for key in service.get_stats().keys())
+
+    def test_no_cookie_is_kept(self):
+        service = http_client.Service(name="test", timeout=1, max_concurrency=10)
+        headers = http.client.HTTPMessage()
+        headers["Set-Cookie"] = "sid=tenant1; Path=/"
+        response = SimpleNamespace(info=lambda: headers)
+        request = urllib.request.Request("https://hooks.slack.com/services/T1/B1/secret1")
+        jar = requests.cookies.RequestsCookieJar()
+        jar.extract_cookies(response, request)
+        assert len(jar) == 1
+        session = service._Service__session
+        session.cookies.extract_cookies(response, request)
+        assert len(session.cookies) == 0
@@ -0,0 +1,163 @@
+import asyncio
+import time
+
+import pytest
+
+from chalicelib.core import project_catalog
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.down = False
+        self.delay = 0
+
+    def get(self, key):
+        time.sleep(self.delay)
+        if self.down:
+            raise ConnectionError("redis is down")
+        return self.values.get(key)
+
+    def incr(self, key):
+        if self.down:
+            raise ConnectionError("redis is down")
+        self.values[key] = int(self.values.get(key, 0)) + 1
+        return self.values[key]
+
+
+class FakeRedisModule:
+    def __init__(self):
+        self.client = FakeRedis()
+
+    def from_url(self, *_, **__):
+        return self.client
+
+
+class Loader:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+@pytest.fixture(autouse=True)
+def empty_catalog(monkeypatch):
+    monkeypatch.setattr(project_catalog, "ENABLED", True)
+    monkeypatch.setattr(project_catalog, "shared_versions", None)
+    project_catalog.clear()
+    yield
+    project_catalog.clear()
+
+
+@pytest.fixture
+def shared_versions(monkeypatch):
+    redis_module = FakeRedisModule()
+    versions = project_catalog._SharedVersions(redis_module)
+    monkeypatch.setattr(project_catalog, "shared_versions", versions)
+    return versions
+
+
+class TestProjectCatalog:
+    def test_hit(self):
+        loader = Loader({"name": "p"})
+        assert project_catalog.get(1, project_catalog.PROJECT, loader) == {"name": "p"}
+        assert project_catalog.get(1, project_catalog.PROJECT, loader) == {"name": "p"}
+        assert loader.calls == 1
+
+    def test_returns_copies(self):
+        project_catalog.get(1, project_catalog.PROJECT, Loader({"name": "p"}))["name"] = "changed"
+        assert project_catalog.get(1, project_catalog.PROJECT, Loader(None)) == {"name": "p"}
+
+    def test_invalidation(self):
+        project_catalog.get(1, project_catalog.METADATA, Loader([{"key": "a", "index": 1}]))
+        project_catalog.get(2, project_catalog.METADATA, Loader([]))
+        version = project_catalog.get_version(1)
+        project_catalog.invalidate(1)
+        assert project_catalog.get_version(1) == version + 1
+        loader = Loader([{"key": "b", "index": 1}])
+        assert project_catalog.get(1, project_catalog.METADATA, loader) == [{"key": "b", "index": 1}]
+        assert loader.calls == 1
+        # the other projects are kept
+        loader = Loader(None)
+        assert project_catalog.get(2, project_catalog.METADATA, loader) == []
+        assert loader.calls == 0
+
+    def test_none_is_not_cached(self):
+        project_catalog.get(1, project_catalog.PROJECT, Loader(None))
+        loader = Loader({"name": "p"})
+        assert project_catalog.get(1, project_catalog.PROJECT, loader) == {"name": "p"}
+        assert loader.calls == 1
+
+    def test_uncached_read(self):
+        project_catalog.get(1, project_catalog.CONDITIONS, Loader({"conditions": []}))
+        loader = Loader({"conditions": [{"name": "c"}]})
+        assert project_catalog.get(1, project_catalog.CONDITIONS, loader, cached=False) == {
+            "conditions": [{"name": "c"}]}
+        assert loader.calls == 1
+
+    def test_batch(self):
+        project_catalog.get(1, project_catalog.METADATA, Loader([]))
+        requested = []
+
+        def loader(project_ids):
+            requested.extend(project_ids)
+            return {2: [{"key": "a", "index": 1}]}
+
+        assert project_catalog.get_batch([1, 2, 3], project_catalog.METADATA, loader) == {
+            1: [], 2: [{"key": "a", "index": 1}]}
+        assert requested == [2, 3]
+
+    def test_invalidation_from_another_worker(self, shared_versions):
+        project_catalog.get(1, project_catalog.METADATA, Loader([]))
+        # another worker changes the metadata
+        shared_versions.client.incr(f"{project_catalog.KEY_PREFIX}1")
+        loader = Loader([{"key": "a", "index": 1}])
+        assert project_catalog.get(1, project_catalog.METADATA, loader) == []
+        # once the version is read again
+        shared_versions.versions.clear()
+        assert project_catalog.get(1, project_catalog.METADATA, loader) == [{"key": "a", "index": 1}]
+        assert loader.calls == 1
+
+    def test_shared_invalidation_is_immediate_locally(self, shared_versions):
+        project_catalog.get(1, project_catalog.METADATA, Loader([]))
+        project_catalog.invalidate(1)
+        assert shared_versions.client.values[f"{project_catalog.KEY_PREFIX}1"] == 1
+        loader = Loader([{"key": "a", "index": 1}])
+        assert project_catalog.get(1, project_catalog.METADATA, loader) == [{"key": "a", "index": 1}]
+
+    def test_nothing_cached_without_redis(self, shared_versions):
+        shared_versions.client.down = True
+        loader = Loader([])
+        project_catalog.get(1, project_catalog.METADATA, loader)
+        project_catalog.get(1, project_catalog.METADATA, loader)
+        assert loader.calls == 2
+        assert project_catalog.get_version(1) is None
+
+    def test_async_lookup_does_not_block(self, shared_versions):
+        shared_versions.client.delay = 0.2
+
+        async def loader():
+            return []
+
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            await asyncio.sleep(0)
+            value = await project_catalog.get_async(1, project_catalog.METADATA, loader)
+            task.cancel()
+            return value, ticks
+
+        value, ticks = asyncio.run(run())
+        assert value == []
+        # the event loop kept running while redis was read
+        assert ticks >= 5
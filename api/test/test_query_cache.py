@@ -0,0 +1,117 @@
+import pytest
+
+from chalicelib.utils.or_cache import query_cache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+
+class FakeRedisModule:
+    def __init__(self):
+        self.client = FakeRedis()
+
+    def from_url(self, *_, **__):
+        return self.client
+
+
+class Execute:
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.result
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(query_cache, "CACHE_ENABLED", True)
+    monkeypatch.setattr(query_cache, "shared_tier", None)
+    query_cache.clear()
+    yield
+    query_cache.clear()
+
+
+@pytest.fixture
+def shared_tier(monkeypatch):
+    monkeypatch.setattr(query_cache, "REDIS_SECRET", "secret")
+    redis_module = FakeRedisModule()
+    tier = query_cache._RedisTier(redis_module)
+    monkeypatch.setattr(query_cache, "shared_tier", tier)
+    return redis_module.client
+
+
+class TestQueryCache:
+    def test_not_cached_outside_context(self):
+        execute = Execute([{"a": 1}])
+        assert query_cache.get_or_execute("SELECT 1", None, execute) == [{"a": 1}]
+        assert query_cache.get_or_execute("SELECT 1", None, execute) == [{"a": 1}]
+        assert execute.calls == 2
+
+    def test_memory_hit(self):
+        execute = Execute([{"a": 1}])
+        with query_cache.cached_queries(ttl=60):
+            first = query_cache.get_or_execute("SELECT 1", {"p": 1}, execute)
+            second = query_cache.get_or_execute("SELECT  1\n", {"p": 1}, execute)
+        assert first == second == [{"a": 1}]
+        assert execute.calls == 1
+
+    def test_parameters_are_part_of_the_key(self):
+        execute = Execute([])
+        with query_cache.cached_queries(ttl=60):
+            query_cache.get_or_execute("SELECT 1", {"p": 1}, execute)
+            query_cache.get_or_execute("SELECT 1", {"p": 2}, execute)
+        assert execute.calls == 2
+
+    def test_too_big_results_are_not_cached(self, monkeypatch):
+        monkeypatch.setattr(query_cache, "MAX_ENTRY_SIZE", 10)
+        execute = Execute(["x" * 100])
+        with query_cache.cached_queries(ttl=60):
+            query_cache.get_or_execute("SELECT 1", None, execute)
+            query_cache.get_or_execute("SELECT 1", None, execute)
+        assert execute.calls == 2
+
+    def test_shared_hit_fills_memory(self, shared_tier):
+        with query_cache.cached_queries(ttl=60):
+            query_cache.get_or_execute("SELECT 1", None, Execute([{"a": 1}]))
+        assert len(shared_tier.values) == 1
+        # another process: empty memory tier, same shared tier
+        query_cache.clear()
+        execute = Execute(None)
+        with query_cache.cached_queries(ttl=60):
+            assert query_cache.get_or_execute("SELECT 1", None, execute) == [{"a": 1}]
+        assert execute.calls == 0
+        assert query_cache.memory_tier.get_entry(query_cache.get_key("SELECT 1")) is not None
+
+    def test_tampered_shared_entry_is_a_miss(self, shared_tier):
+        with query_cache.cached_queries(ttl=60):
+            query_cache.get_or_execute("SELECT 1", None, Execute([{"a": 1}]))
+        query_cache.clear()
+        key = next(iter(shared_tier.values))
+        shared_tier.values[key] = shared_tier.values[key][:32] + b"tampered"
+        execute = Execute([{"a": 2}])
+        with query_cache.cached_queries(ttl=60):
+            assert query_cache.get_or_execute("SELECT 1", None, execute) == [{"a": 2}]
+        assert execute.calls == 1
+
+    def test_values(self, shared_tier):
+        assert query_cache.get_value(key="k", ttl=60) == (False, None)
+        query_cache.set_value(key="k", ttl=60, value=42)
+        assert query_cache.get_value(key="k", ttl=60) == (True, 42)
+
+    def test_align_time_range(self):
+        now = 1_700_000_123_456
+        start, end = query_cache.align_time_range(now - 7 * 86_400_000, now, bucket=60, now=now)
+        assert end == now - now % 60_000
+        assert end - start == 7 * 86_400_000
+        # absolute ranges in the past are kept as is
+        assert query_cache.align_time_range(1000, 2000, bucket=60, now=now) == (1000, 2000)
@@ -0,0 +1,76 @@
+import pytest
+
+import schemas
+from chalicelib.core import project_catalog
+from chalicelib.core.sessions import query_parts_cache, sessions_ch
+
+DAY = 24 * 60 * 60 * 1000
+
+
+def payload(start_timestamp, end_timestamp):
+    return schemas.SessionsSearchPayloadSchema(
+        startTimestamp=start_timestamp, endTimestamp=end_timestamp,
+        filters=[{"type": "userBrowser", "value": ["Chrome", "Firefox"], "operator": "is"},
+                 {"type": "duration", "value": [1000, 60000], "operator": "is"}],
+        events=[{"type": "location", "value": ["/checkout"], "operator": "contains"},
+                {"type": "click", "value": ["buy"], "operator": "is"}],
+        events_order="then")
+
+
+def compile_parts(data):
+    return sessions_ch.search_query_parts_ch(data=data, error_status=None, errors_only=False, favorite_only=False,
+                                             issue=None, project_id=1, user_id=1)
+
+
+def compile_uncached(data):
+    query_parts_cache.ENABLED = False
+    try:
+        return compile_parts(data)
+    finally:
+        query_parts_cache.ENABLED = True
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(query_parts_cache, "ENABLED", True)
+    monkeypatch.setattr(project_catalog, "shared_versions", None)
+    query_parts_cache.clear()
+    yield
+    query_parts_cache.clear()
+
+
+class TestQueryPartsCache:
+    def test_hit_is_the_same_as_a_miss(self):
+        start = 1_700_000_000_000
+        compile_parts(payload(start, start + DAY))
+        before = query_parts_cache.get_stats()
+        # another time range: the compiled query is reused
+        hit = compile_parts(payload(start + DAY, start + 2 * DAY))
+        assert query_parts_cache.get_stats()["hits"] == before["hits"] + 1
+        assert hit == compile_uncached(payload(start + DAY, start + 2 * DAY))
+
+    def test_filters_are_part_of_the_key(self):
+        start = 1_700_000_000_000
+        compile_parts(payload(start, start + DAY))
+        before = query_parts_cache.get_stats()
+        data = payload(start, start + DAY)
+        data.filters[0].value = ["Safari"]
+        expected = payload(start, start + DAY)
+        expected.filters[0].value = ["Safari"]
+        assert compile_parts(data) == compile_uncached(expected)
+        assert query_parts_cache.get_stats()["hits"] == before["hits"]
+
+    def test_invalidation_of_the_project(self):
+        start = 1_700_000_000_000
+        compile_parts(payload(start, start + DAY))
+        project_catalog.invalidate(1)
+        before = query_parts_cache.get_stats()
+        compile_parts(payload(start, start + DAY))
+        assert query_parts_cache.get_stats()["hits"] == before["hits"]
+
+    def test_not_cached_when_the_version_is_unknown(self, monkeypatch):
+        monkeypatch.setattr(project_catalog, "get_version", lambda project_id: None)
+        start = 1_700_000_000_000
+        compile_parts(payload(start, start + DAY))
+        compile_parts(payload(start, start + DAY))
+        assert query_parts_cache.get_stats()["size"] == 0
@@ -0,0 +1,128 @@
+import math
+import random
+from collections import defaultdict
+
+import pytest
+
+from chalicelib.core.metrics.modules.significance import significance
+
+ISSUE_TYPES = ["click_rage", "dead_click", "bad_request", "crash"]
+
+
+def baseline_pearson_corr(x: list, y: list):
+    # the list based version that was replaced, without its warnings
+    n = len(x)
+    if n < 2:
+        return None, None, False
+    if all(t == x[0] for t in x) or all(t == y[0] for t in y):
+        return None, None, False
+    if n == 2:
+        return math.copysign(1, x[1] - x[0]) * math.copysign(1, y[1] - y[0]), 1.0, True
+    xmean = sum(x) / len(x)
+    ymean = sum(y) / len(y)
+    xm = [el - xmean for el in x]
+    ym = [el - ymean for el in y]
+    normxm = math.sqrt((sum([xm[i] * xm[i] for i in range(len(xm))])))
+    normym = math.sqrt((sum([ym[i] * ym[i] for i in range(len(ym))])))
+    r = sum(
+        i[0] * i[1] for i in zip([xm[i] / normxm for i in range(len(xm))], [ym[i] / normym for i in range(len(ym))]))
+    r = max(min(r, 1.0), 0.0)
+    if r >= 0.999:
+        confidence = 1
+    else:
+        confidence = r * math.sqrt(n - 2) / math.sqrt(1 - r ** 2)
+    return r, confidence, confidence > significance.SIGNIFICANCE_THRSH
+
+
+def baseline_issues(rows, first_stage, last_stage):
+    # the row by row computation that was replaced
+    def reached(row, stage):
+        return row[f"stage{stage}_timestamp"] is not None
+
+    def in_subfunnel(row):
+        last_ts = row[f"stage{last_stage}_timestamp"]
+        return last_ts is None or row[f"stage{first_stage}_timestamp"] < row["issue_timestamp"] < last_ts
+
+    all_issues, n_issues = {}, defaultdict(lambda: 0)
+    affected_users, affected_sessions = defaultdict(set), defaultdict(set)
+    transitions, errors, n_sess_affected = [], defaultdict(list), 0
+    entered = [r for r in rows if reached(r, first_stage)]
+    for row in entered:
+        if row["issue_type"] is not None and in_subfunnel(row):
+            all_issues.setdefault(row["issue_id"], {"context": row["issue_context"], "issue_type": row["issue_type"]})
+            n_issues[row["issue_id"]] += 1
+            if row["user_uuid"] is not None:
+                affected_users[row["issue_id"]].add(row["user_uuid"])
+            affected_sessions[row["issue_id"]].add(row["session_id"])
+    for row in entered:
+        t = 1 if reached(row, last_stage) else 0
+        transitions.append(t)
+        present = False
+        for issue_id in all_issues:
+            ic = 1 if row["issue_id"] == issue_id and in_subfunnel(row) else 0
+            present = present or ic == 1
+            errors[issue_id].append(ic)
+        if present and t:
+            n_sess_affected += 1
+    all_errors = [max(t) for t in zip(*errors.values())]
+    total_drop = 0
+    if any(all_errors):
+        corr, _, _ = baseline_pearson_corr(transitions, all_errors)
+        if corr is not None:
+            total_drop = int(corr * n_sess_affected)
+    issues = {"significant": [], "insignificant": []}
+    n_critical = 0
+    for issue_id in all_issues:
+        r, _, is_sign = baseline_pearson_corr(transitions, errors[issue_id])
+        lost_conversions = int(r * len(affected_sessions[issue_id])) if r is not None and is_sign else None
+        if r is None:
+            r = 0
+        issues["significant" if is_sign else "insignificant"].append({
+            "affected_sessions": len(affected_sessions[issue_id]),
+            "lost_conversions": lost_conversions,
+            "affected_users": len(affected_users[issue_id]) if issue_id in affected_users else None,
+            "conversion_impact": round(r * 100),
+            "issue_id": issue_id})
+        if is_sign:
+            n_critical += n_issues[issue_id]
+    return n_critical, {k: v[:20] for k, v in issues.items()}, total_drop
+
+
+def random_rows(rand: random.Random, n_stages):
+    rows = []
+    for _ in range(rand.randint(1, 40)):
+        ts = 1000
+        row = {"session_id": rand.randint(1, 30), "user_uuid": rand.choice([None, "u1", "u2", "u3"]),
+               "user_id": None, "issue_type": None, "issue_timestamp": None, "issue_id": None,
+               "issue_context": None}
+        reached = True
+        for i in range(1, n_stages + 1):
+            reached = reached and (i == 1 or rand.random() < 0.6)
+            ts += rand.randint(1, 10)
+            row[f"stage{i}_timestamp"] = ts if reached else None
+        if rand.random() < 0.5:
+            issue = rand.randint(0, 5)
+            row["issue_type"] = ISSUE_TYPES[issue % len(ISSUE_TYPES)]
+            row["issue_id"] = f"issue{issue}"
+            row["issue_context"] = f"context{issue}"
+            row["issue_timestamp"] = 1000 + rand.randint(0, 10 * n_stages)
+        rows.append(row)
+    return rows
+
+
+class TestSignificance:
+    @pytest.mark.parametrize("seed", range(4))
+    def test_same_results_as_the_baseline(self, seed):
+        rand = random.Random(seed)
+        keys = ["affected_sessions", "lost_conversions", "affected_users", "conversion_impact", "issue_id"]
+        for _ in range(500):
+            n_stages = rand.randint(2, 4)
+            first_stage = rand.randint(1, n_stages - 1)
+            last_stage = rand.randint(first_stage + 1, n_stages)
+            rows = random_rows(rand, n_stages)
+            expected = baseline_issues(rows, first_stage, last_stage)
+            n_critical, issues, total_drop = significance.get_issues(list(range(n_stages)), rows,
+                                                                     first_stage=first_stage,
+                                                                     last_stage=last_stage)
+            issues = {k: [{key: i[key] for key in keys} for i in v] for k, v in issues.items()}
+            assert (n_critical, issues, total_drop) == expected
@@ -1,16 +1,12 @@
 import logging
-import queue
 import time
 from contextlib import asynccontextmanager
 
-import psycopg_pool
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from decouple import config
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from psycopg import AsyncConnection
-from psycopg.rows import dict_row
 from starlette import status
 from starlette.responses import StreamingResponse, JSONResponse
 
@@ -32,12 +28,6 @@ print(f">Loglevel set to: {loglevel}")
 logging.basicConfig(level=loglevel)
 
 
-class ORPYAsyncConnection(AsyncConnection):
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, row_factory=dict_row, **kwargs)
-
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
@@ -46,7 +36,6 @@ async def lifespan(app: FastAPI):
     ap_logger.setLevel(loglevel)
 
     app.schedule = AsyncIOScheduler()
-    app.queue_system = queue.Queue()
     await pg_client.init()
     await ch_client.init()
     await events_queue.init()
@@ -59,30 +48,19 @@ async def lifespan(app: FastAPI):
     for job in app.schedule.get_jobs():
         ap_logger.info({"Name": str(job.id), "Run Frequency": str(job.trigger), "Next Run": str(job.next_run_time)})
 
-    database = {
-        "host": config("pg_host", default="localhost"),
-        "dbname": config("pg_dbname", default="orpy"),
-        "user": config("pg_user", default="orpy"),
-        "password": config("pg_password", default="orpy"),
-        "port": config("pg_port", cast=int, default=5432),
-        "application_name": "AIO" + config("APP_NAME", default="PY"),
-    }
-
-    database = psycopg_pool.AsyncConnectionPool(kwargs=database, connection_class=ORPYAsyncConnection,
-                                                min_size=config("PG_AIO_MINCONN", cast=int, default=1),
-                                                max_size=config("PG_AIO_MAXCONN", cast=int, default=5), )
-    app.state.postgresql = database
+    await pg_client.init_async()
+    app.state.postgresql = pg_client.postgreSQL_async_pool
 
     # App listening
     yield
 
     # Shutdown
-    await database.close()
     logging.info(">>>>> shutting down <<<<<")
     app.schedule.shutdown(wait=True)
     await traces.process_traces_queue()
     await events_queue.terminate()
     await pg_client.terminate()
+    await ch_client.terminate()
 
 
 app = FastAPI(root_path=config("root_path", default="/api"), docs_url=config("docs_url", default=""),
@@ -13,6 +13,7 @@ ACTIONS = {
     "PROJECTS_STATS": core_dynamic_crons.health_cron,
     "FIX_PROJECTS_STATS": core_dynamic_crons.weekly_health_cron,
     "ASSIST_STATS": ee_crons.assist_events_aggregates_cron,
+    "SESSIONS_ROLLUPS": core_dynamic_crons.sessions_rollups_cron,
 }
 
 
@@ -26,7 +26,9 @@ class ProjectAuthorizer:
                 and (isinstance(value, int) or (isinstance(value, str) and value.isnumeric())) \
                 and projects.is_authorized(project_id=value, tenant_id=current_user.tenant_id,
                                            user_id=user_id):
-            current_project = projects.get_project(tenant_id=current_user.tenant_id, project_id=value)
+            # the changes are checked against the DB, a project deleted on another worker may still be cached
+            current_project = projects.get_project(tenant_id=current_user.tenant_id, project_id=value,
+                                                   cached=request.method == "GET")
         elif self.project_identifier == "projectKey":
             current_project = projects.get_by_project_key(project_key=value)
             if current_project is not None \
@@ -1,6 +1,7 @@
 import logging
 from datetime import datetime
 
+from decouple import config
 from fastapi import HTTPException
 
 from chalicelib.utils import pg_client, helper
@@ -14,6 +15,13 @@ event_type_mapping = {
 }
 
 
+# Hours of events aggregated per transaction
+CHUNK_HOURS = config("ASSIST_STATS_CHUNK_HOURS", cast=int, default=24)
+# Hours before the last run that are aggregated again, to include the events stored late
+LOOKBACK_HOURS = config("ASSIST_STATS_LOOKBACK_HOURS", cast=int, default=1)
+HOUR = 60 * 60 * 1000
+
+
 def insert_aggregated_data():
     try:
         logging.debug("Assist Stats: Inserting aggregated data")
@@ -24,73 +32,21 @@ def insert_aggregated_data():
             logging.debug("Assist Stats: First run, inserting data for last 7 days")
             start_timestamp = end_timestamp - (7 * 24 * 60 * 60 * 1000)
 
-        offset = 0
-        chunk_size = 1000
-
-        while True:
-            constraints = [
-                "timestamp BETWEEN %(start_timestamp)s AND %(end_timestamp)s"
-            ]
-
-            params = {
-                "limit": chunk_size,
-                "offset": offset,
-                "start_timestamp": start_timestamp + 1,
-                "end_timestamp": end_timestamp,
-                "step_size": f"{60} seconds",
-            }
-
-            logging.debug(f"Assist Stats: Fetching data from {start_timestamp} to {end_timestamp}")
-            aggregated_data = __get_all_events_hourly_averages(constraints, params)
-
-            if not aggregated_data:  # No more data to insert
-                logging.debug("Assist Stats: No more data to insert")
-                break
-
-            logging.debug(f"Assist Stats: Inserting {len(aggregated_data)} rows")
-
-            for data in aggregated_data:
-                sql = """
-                    INSERT INTO assist_events_aggregates 
-                    (timestamp, project_id, agent_id, assist_avg, call_avg, control_avg, assist_total, call_total, control_total)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                params = (
-                    data['time'],
-                    data['project_id'],
-                    data['agent_id'],
-                    data['assist_avg'],
-                    data['call_avg'],
-                    data['control_avg'],
-                    data['assist_total'],
-                    data['call_total'],
-                    data['control_total']
-                )
-
-                with pg_client.PostgresClient() as cur:
-                    cur.execute(sql, params)
-
-            offset += chunk_size
-
-        # get the first timestamp from the table assist_events based on start_timestamp
-        sql = f"""
-            SELECT MAX(timestamp) as first_timestamp
-                FROM assist_events
-            WHERE timestamp > %(start_timestamp)s AND duration > 0
-            GROUP BY timestamp
-            ORDER BY timestamp DESC LIMIT 1
-        """
-        with pg_client.PostgresClient() as cur:
-            cur.execute(sql, params)
-            result = cur.fetchone()
-            first_timestamp = result['first_timestamp'] if result else None
-
-        # insert the first timestamp into assist_events_aggregates_logs
-        if first_timestamp is not None:
-            sql = "INSERT INTO assist_events_aggregates_logs (time) VALUES (%s)"
-            params = (first_timestamp,)
-            with pg_client.PostgresClient() as cur:
-                cur.execute(sql, params)
+        # whole hours are aggregated and upserted, so re-aggregating an hour that was already inserted is safe
+        window_start = (start_timestamp // HOUR - LOOKBACK_HOURS) * HOUR
+        last_hour_end = (end_timestamp // HOUR + 1) * HOUR
+        while window_start is not None and window_start < last_hour_end:
+            window_end = min(window_start + CHUNK_HOURS * HOUR, last_hour_end)
+            logging.debug(f"Assist Stats: Aggregating data from {window_start} to {window_end}")
+            # the aggregates and the watermark are committed together
+            with pg_client.PostgresClient(long_query=True) as cur:
+                rows = __upsert_hourly_aggregates(cur=cur, start_timestamp=window_start, end_timestamp=window_end)
+                __set_last_run_end_timestamp(cur=cur, timestamp=min(window_end, end_timestamp))
+                if rows == 0:
+                    # skip the hours without events
+                    window_end = __next_event_hour(cur=cur, timestamp=window_end)
+            logging.debug(f"Assist Stats: Upserted {rows} rows")
+            window_start = window_end
 
     except Exception as e:
         logging.error(f"Error inserting aggregated data -: {e}")
@@ -113,18 +69,30 @@ def __last_run_end_timestamp_from_aggregates():
     return last_run_time
 
 
-def __get_all_events_hourly_averages(constraints, params):
-    sql = f"""
-        WITH time_series AS (
-            SELECT
-                EXTRACT(epoch FROM generate_series(
-                    date_trunc('hour', to_timestamp(%(start_timestamp)s/1000)),
-                    date_trunc('hour', to_timestamp(%(end_timestamp)s/1000)) + interval '1 hour',
-                    interval %(step_size)s
-                ))::bigint as unix_time
-        )
+def __set_last_run_end_timestamp(cur, timestamp):
+    cur.execute(cur.mogrify("""DELETE FROM assist_events_aggregates_logs WHERE time < %(timestamp)s;
+                               INSERT INTO assist_events_aggregates_logs (time) VALUES (%(timestamp)s);""",
+                            {"timestamp": timestamp}))
+
+
+def __next_event_hour(cur, timestamp):
+    cur.execute(cur.mogrify("""SELECT (MIN(timestamp) / %(hour)s) * %(hour)s AS next_hour
+                               FROM assist_events
+                               WHERE timestamp >= %(timestamp)s;""",
+                            {"timestamp": timestamp, "hour": HOUR}))
+    return cur.fetchone()["next_hour"]
+
+
+def __upsert_hourly_aggregates(cur, start_timestamp, end_timestamp):
+    """
+    Aggregates the events of [start_timestamp, end_timestamp) per hour, project and agent,
+    and inserts the result in a single statement, the hours that were already aggregated are replaced
+    """
+    sql = """
+        INSERT INTO assist_events_aggregates
+            (timestamp, project_id, agent_id, assist_avg, call_avg, control_avg, assist_total, call_total, control_total)
         SELECT
-            time_series.unix_time * 1000 as time,
+            (timestamp / %(hour)s) * %(hour)s AS hour,
             project_id,
             agent_id,
             ROUND(AVG(CASE WHEN event_type = 'assist' THEN duration ELSE 0 END)) as assist_avg,
@@ -133,20 +101,21 @@ def __get_all_events_hourly_averages(constraints, params):
             ROUND(SUM(CASE WHEN event_type = 'assist' THEN duration ELSE 0 END)) as assist_total,
             ROUND(SUM(CASE WHEN event_type = 'call' THEN duration ELSE 0 END)) as call_total,
             ROUND(SUM(CASE WHEN event_type = 'control' THEN duration ELSE 0 END)) as control_total
-        FROM
-            time_series
-            LEFT JOIN assist_events ON time_series.unix_time = EXTRACT(epoch FROM DATE_TRUNC('hour', to_timestamp(assist_events.timestamp/1000)))
-        WHERE
-            {' AND '.join(f'{constraint}' for constraint in constraints)}
-        GROUP BY time, project_id, agent_id
-        ORDER BY time
-        LIMIT %(limit)s OFFSET %(offset)s;
+        FROM assist_events
+        WHERE timestamp >= %(start_timestamp)s AND timestamp < %(end_timestamp)s
+          AND agent_id IS NOT NULL
+        GROUP BY hour, project_id, agent_id
+        ON CONFLICT (timestamp, project_id, agent_id) DO UPDATE
+            SET assist_avg    = EXCLUDED.assist_avg,
+                call_avg      = EXCLUDED.call_avg,
+                control_avg   = EXCLUDED.control_avg,
+                assist_total  = EXCLUDED.assist_total,
+                call_total    = EXCLUDED.call_total,
+                control_total = EXCLUDED.control_total;
     """
-    with pg_client.PostgresClient() as cur:
-        query = cur.mogrify(sql, params)
-        cur.execute(query)
-        rows = cur.fetchall()
-    return rows
+    cur.execute(cur.mogrify(sql, {"start_timestamp": start_timestamp, "end_timestamp": end_timestamp,
+                                  "hour": HOUR}))
+    return cur.rowcount
 
 
 def get_averages(
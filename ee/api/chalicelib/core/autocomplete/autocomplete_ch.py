@@ -1,6 +1,7 @@
 import logging
 import schemas
 from chalicelib.core import countries, events, metadata
+from chalicelib.core.autocomplete import autocomplete_index
 from chalicelib.utils import ch_client
 from chalicelib.utils import helper, exp_ch_helper
 from chalicelib.utils.event_filter_definition import Event
@@ -10,6 +11,33 @@ logger = logging.getLogger(__name__)
 TABLE = "experimental.autocomplete"
 
 
+def __load_index_rows(project_id, watermark, limit):
+    # rows that aren't merged yet count the occurrences of the value
+    with ch_client.ClickHouseClient() as cur:
+        query = f"""SELECT type, value, COUNT(1) AS weight, MAX(_timestamp) AS created_at
+                    FROM {TABLE}
+                    WHERE project_id = %(project_id)s
+                        {"AND _timestamp >= %(watermark)s" if watermark is not None else ""}
+                    GROUP BY type, value
+                    ORDER BY created_at
+                    LIMIT %(limit)s;"""
+        return cur.execute(query=query, parameters={"project_id": project_id, "watermark": watermark, "limit": limit})
+
+
+INDEX = autocomplete_index.AutocompleteIndex(load=__load_index_rows)
+
+
+def __get_autocomplete_table_from_index(index, autocomplete_events, value, text):
+    results = []
+    for e in autocomplete_events:
+        if e == schemas.FilterType.USER_COUNTRY:
+            values = index.values_in(e.value.upper(), countries.get_country_code_autocomplete(value))
+        else:
+            values = index.search(e.value.upper(), text, value_length=len(value))
+        results += [{"type": e.value, "value": v} for v in values]
+    return results
+
+
 def __get_autocomplete_table(value, project_id):
     autocomplete_events = [schemas.FilterType.REV_ID,
                            schemas.EventType.CLICK,
@@ -24,6 +52,10 @@ def __get_autocomplete_table(value, project_id):
                            schemas.EventType.LOCATION,
                            schemas.EventType.INPUT]
     autocomplete_events.sort()
+    index = INDEX.get(project_id)
+    text = autocomplete_index.normalize(value)
+    if index is not None and text is not None:
+        return __get_autocomplete_table_from_index(index, autocomplete_events, value, text)
     sub_queries = []
     c_list = []
     for e in autocomplete_events:
@@ -113,8 +145,26 @@ def __generic_query(typename, value_length=None):
                 LIMIT 10;"""
 
 
+def __generic_search_index(project_id, typename, text):
+    """
+    :return: the rows of __generic_query from the autocomplete index, None if the index can't be used
+    """
+    index = INDEX.get(project_id)
+    normalized = autocomplete_index.normalize(text)
+    if index is None or normalized is None:
+        return None
+    if typename == schemas.FilterType.USER_COUNTRY:
+        values = sorted(index.values_in(typename.upper(), countries.get_country_code_autocomplete(text)))
+    else:
+        values = index.search(typename.upper(), normalized, value_length=len(text),
+                              limit=5 if len(text) > 2 else 10)
+    return [{"value": v, "type": typename.upper()} for v in values]
+
+
 def __generic_autocomplete(event: Event):
     def f(project_id, value, key=None, source=None):
+        if (rows := __generic_search_index(project_id, event.ui_type, value)) is not None:
+            return rows
         with ch_client.ClickHouseClient() as cur:
             query = __generic_query(event.ui_type, value_length=len(value))
             params = {"project_id": project_id, "value": helper.string_to_sql_like(value),
@@ -127,6 +177,8 @@ def __generic_autocomplete(event: Event):
 
 def generic_autocomplete_metas(typename):
     def f(project_id, text):
+        if (rows := __generic_search_index(project_id, typename, text)) is not None:
+            return rows
         with ch_client.ClickHouseClient() as cur:
             params = {"project_id": project_id, "value": helper.string_to_sql_like(text),
                       "svalue": helper.string_to_sql_like("^" + text)}
@@ -299,6 +351,7 @@ def is_top_supported(event_type):
 
 @CachedResponse(table="or_cache.autocomplete_top_values", ttl=5 * 60)
 def get_top_values(project_id, event_type, event_key=None):
+    typename = event_type.upper()
     with ch_client.ClickHouseClient() as cur:
         if schemas.FilterType.has_value(event_type):
             if event_type == schemas.FilterType.METADATA \
@@ -336,4 +389,7 @@ def get_top_values(project_id, event_type, event_key=None):
                         FROM raw;"""
         params = {"project_id": project_id}
         results = cur.execute(query=query, parameters=params)
-        return helper.list_to_camel_case(results)
+    if typename != schemas.FilterType.METADATA.upper():
+        # the most used values come first in the autocomplete too
+        INDEX.set_frequencies(project_id, typename, {r["value"]: r["row_count"] for r in results})
+    return helper.list_to_camel_case(results)
@@ -6,7 +6,7 @@ import requests
 # from confluent_kafka.admin import AdminClient
 from decouple import config
 
-from chalicelib.utils import pg_client, ch_client
+from chalicelib.utils import pg_client, http_client, ch_client
 from chalicelib.utils.TimeUTC import TimeUTC
 
 logger = logging.getLogger(__name__)
@@ -18,6 +18,8 @@ def app_connection_string(name, port, path):
     return f"http://{name}.{namespace}.{conn_string}:{port}/{path}"
 
 
+__health_checks = http_client.get_service("health_checks", timeout=2)
+
 HEALTH_ENDPOINTS = {
     "alerts": app_connection_string("alerts-openreplay", 8888, "health"),
     "assets": app_connection_string("assets-openreplay", 8888, "metrics"),
@@ -77,7 +79,7 @@ def __check_be_service(service_name):
             "details": {"errors": ["server health-check failed"]},
         }
         try:
-            results = requests.get(HEALTH_ENDPOINTS.get(service_name), timeout=2)
+            results = __health_checks.get(HEALTH_ENDPOINTS.get(service_name))
             if results.status_code != 200:
                 logger.error(
                     f"!! issue with the {service_name}-health code:{results.status_code}"
@@ -89,6 +91,9 @@ def __check_be_service(service_name):
             logger.error(f"!! Timeout getting {service_name}-health")
             # fail_response["details"]["errors"].append("timeout")
             return fail_response
+        except http_client.UnavailableError as e:
+            logger.error(f"!! {service_name}-health is unavailable: {e}")
+            return fail_response
         except Exception as e:
             logger.error(f"!! Issue getting {service_name}-health response")
             logger.exception(e)
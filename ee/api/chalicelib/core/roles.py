@@ -2,7 +2,7 @@ from typing import Optional
 
 from fastapi import HTTPException, status
 import schemas
-from chalicelib.core import users, projects
+from chalicelib.core import users, projects, auth_cache
 from chalicelib.utils import pg_client, helper
 from chalicelib.utils.TimeUTC import TimeUTC
 
@@ -75,7 +75,7 @@ def update(tenant_id, user_id, role_id, data: schemas.RolePayloadSchema):
                                     {"role_id": role_id, **{f"project_id_{i}": p for i, p in enumerate(n_projects)}})
                 cur.execute(query=query)
             row["projects"] = data.projects
-
+    auth_cache.invalidate_tenant(tenant_id)
     return helper.dict_to_camel_case(row)
 
 
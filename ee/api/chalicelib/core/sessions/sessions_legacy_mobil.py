@@ -4,7 +4,7 @@ from typing import List, Union
 
 import schemas
 from chalicelib.core import events, metadata, projects
-from chalicelib.core.sessions import performance_event, sessions_favorite, sessions_legacy
+from chalicelib.core.sessions import performance_event, sessions_favorite, sessions_legacy, query_parts_cache
 from chalicelib.utils import pg_client, helper, ch_client, exp_ch_helper
 from chalicelib.utils import sql_helper as sh
 
@@ -232,7 +232,13 @@ def __is_valid_event(is_any: bool, event: schemas.SessionSearchEventSchema2):
                         event.filters is None or len(event.filters) == 0))
 
 
+def __get_tables(data: schemas.SessionsSearchPayloadSchema, platform, **_):
+    return exp_ch_helper.get_main_events_table(timestamp=data.startTimestamp, platform=platform), \
+        exp_ch_helper.get_main_sessions_table(data.startTimestamp)
+
+
 # this function generates the query and return the generated-query with the dict of query arguments
+@query_parts_cache.cached(extra_key=__get_tables)
 def search_query_parts_ch(data: schemas.SessionsSearchPayloadSchema, error_status, errors_only, favorite_only, issue,
                           project_id, user_id, platform="web", extra_event=None, extra_deduplication=[],
                           extra_conditions=None):
@@ -1,9 +1,15 @@
 import ast
+import asyncio
 import logging
+from typing import List
+
+from pydantic import TypeAdapter
+from starlette.concurrency import run_in_threadpool
 
 import schemas
 from chalicelib.core import metadata, projects
-from . import sessions_favorite, sessions_search_legacy, sessions_ch as sessions, sessions_legacy_mobil
+from . import sessions_favorite, sessions_search_legacy, sessions_ch as sessions, sessions_legacy_mobil, \
+    sessions_pagination
 from chalicelib.utils import pg_client, helper, ch_client, exp_ch_helper
 
 logger = logging.getLogger(__name__)
@@ -32,45 +38,54 @@ coalesce(issue_score,0) AS issue_score,
 s.issue_types AS issue_types 
 """
 
-SESSION_PROJECTION_COLS_CH_MAP = """\
-'project_id',        toString(%(project_id)s),
-'session_id',        toString(s.session_id),
-'user_uuid',         toString(s.user_uuid),
-'user_id',           toString(s.user_id),
-'user_os',           toString(s.user_os),
-'user_browser',      toString(s.user_browser),
-'user_device',       toString(s.user_device),
-'user_device_type',  toString(s.user_device_type),
-'user_country',      toString(s.user_country),
-'user_city',         toString(s.user_city),
-'user_state',        toString(s.user_state),
-'start_ts',          toString(toUnixTimestamp(s.datetime)*1000),
-'duration',          toString(s.duration),
-'events_count',      toString(s.events_count),
-'pages_count',       toString(s.pages_count),
-'errors_count',      toString(s.errors_count),
-'user_anonymous_id', toString(s.user_anonymous_id),
-'platform',          toString(s.platform),
-'timezone',          toString(s.timezone),
-'issue_score',       toString(coalesce(issue_score,0)),
-'viewed',            toString(viewed_sessions.session_id > 0)
-"""
+# (attribute of SessionModel, typed ClickHouse expression) of the sessions list,
+# the aliases are camelCase to not shadow the columns used by the query_part
+SESSION_LIST_COLS_CH = (
+    ("projectId", "%(project_id)s"),
+    ("sessionId", "s.session_id"),
+    ("userUuid", "s.user_uuid"),
+    ("userId", "s.user_id"),
+    ("userOs", "s.user_os"),
+    ("userBrowser", "s.user_browser"),
+    ("userDevice", "s.user_device"),
+    ("userDeviceType", "s.user_device_type"),
+    ("userCountry", "s.user_country"),
+    ("userCity", "s.user_city"),
+    ("userState", "s.user_state"),
+    ("startTs", "toUnixTimestamp(s.datetime)*1000"),
+    ("duration", "s.duration"),
+    ("eventsCount", "s.events_count"),
+    ("pagesCount", "s.pages_count"),
+    ("errorsCount", "s.errors_count"),
+    ("userAnonymousId", "s.user_anonymous_id"),
+    ("platform", "s.platform"),
+    ("timezone", "s.timezone"),
+    ("issueScore", "coalesce(issue_score,0)"),
+    ("viewed", "viewed_sessions.session_id > 0")
+)
+SESSION_LIST_PROJECTION_CH = ",\n".join([f"{expression} AS {key}" for key, expression in SESSION_LIST_COLS_CH])
+# Columns decoded by the driver into types that SessionModel doesn't accept as they are
+__SESSION_LIST_CASTS = {"sessionId": str, "userUuid": str, "viewed": bool}
+__sessions_adapter = TypeAdapter(List[schemas.SessionModel])
+# The sorts supporting the keyset pagination: sort -> not-null numeric expression of the sort-key
+KEYSET_SORT_KEYS = {
+    "datetime": "toUnixTimestamp(s.datetime)",
+    "duration": "s.duration",
+    "events_count": "s.events_count",
+    "pages_count": "s.pages_count",
+    "errors_count": "s.errors_count",
+    "issue_score": "coalesce(s.issue_score,0)",
+    "session_id": "s.session_id"
+}
+VIEWED_SESSIONS_JOIN_CH = """LEFT JOIN (SELECT DISTINCT session_id
+                              FROM experimental.user_viewed_sessions
+                              WHERE user_id = %(userId)s AND project_id=%(project_id)s
+                                AND _timestamp >= toDateTime(%(startDate)s / 1000)) AS viewed_sessions
+                              ON (viewed_sessions.session_id = s.session_id)"""
 
 
-# This function executes the query and return result
-def search_sessions(data: schemas.SessionsSearchPayloadSchema, project: schemas.ProjectContext,
-                    user_id, errors_only=False,
-                    error_status=schemas.ErrorStatus.ALL, count_only=False, issue=None, ids_only=False,
-                    platform="web"):
-    if data.bookmarked:
-        data.startTimestamp, data.endTimestamp = sessions_favorite.get_start_end_timestamp(project.project_id, user_id)
-    if data.startTimestamp is None:
-        logger.debug(f"No vault sessions found for project:{project.project_id}")
-        return {
-            'total': 0,
-            'sessions': [],
-            'src': 2
-        }
+def __get_search_parts(data: schemas.SessionsSearchPayloadSchema, project: schemas.ProjectContext, user_id,
+                       errors_only, error_status, issue, platform):
     if project.platform == "web":
         full_args, query_part = sessions.search_query_parts_ch(data=data, error_status=error_status,
                                                                errors_only=errors_only,
@@ -93,108 +108,133 @@ def search_sessions(data: schemas.SessionsSearchPayloadSchema, project: schemas.
         full_args["sessions_limit"] = 200
         full_args["sessions_limit_s"] = 0
         full_args["sessions_limit_e"] = 200
+    return full_args, query_part
 
-    meta_keys = []
-    with ch_client.ClickHouseClient() as cur:
-        if errors_only:
-            main_query = cur.format(query=f"""SELECT DISTINCT er.error_id,
-                                              COALESCE((SELECT TRUE
-                                                        FROM {exp_ch_helper.get_user_viewed_errors_table()} AS ve
-                                                        WHERE er.error_id = ve.error_id
-                                                            AND ve.user_id = %(userId)s LIMIT 1), FALSE) AS viewed
-                                              {query_part};""", parameters=full_args)
-
-        elif count_only:
-            main_query = cur.format(query=f"""SELECT COUNT(DISTINCT s.session_id) AS count_sessions, 
-                                                     COUNT(DISTINCT s.user_uuid) AS count_users
-                                              {query_part};""",
-                                    parameters=full_args)
-        elif data.group_by_user:
-            g_sort = "count(full_sessions)"
-            if data.order is None:
-                data.order = schemas.SortOrderType.DESC.value
-            else:
-                data.order = data.order
-            if data.sort is not None and data.sort != 'sessionsCount':
-                sort = helper.key_to_snake_case(data.sort)
-                g_sort = f"{'MIN' if data.order == schemas.SortOrderType.DESC else 'MAX'}({sort})"
-            else:
-                sort = 'start_ts'
-
-            meta_keys = metadata.get(project_id=project.project_id)
-            meta_map = ",map(%s) AS 'metadata'" \
-                       % ','.join([f"'{m['key']}',coalesce(metadata_{m['index']},'None')" for m in meta_keys])
-            main_query = cur.mogrify(f"""SELECT COUNT(*) AS count,
-                                                COALESCE(JSONB_AGG(users_sessions) 
-                                                    FILTER (WHERE rn>%(sessions_limit_s)s AND rn<=%(sessions_limit_e)s), '[]'::JSONB) AS sessions
-                                        FROM (SELECT user_id,
-                                                 count(full_sessions)                                   AS user_sessions_count,
-                                                 jsonb_agg(full_sessions) FILTER (WHERE rn <= 1)        AS last_session,
-                                                 MIN(full_sessions.start_ts)                            AS first_session_ts,
-                                                 ROW_NUMBER() OVER (ORDER BY {g_sort} {data.order}) AS rn
-                                            FROM (SELECT *, ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY {sort} {data.order}) AS rn 
-                                                FROM (SELECT DISTINCT ON(s.session_id) {SESSION_PROJECTION_COLS_CH} {meta_map}
-                                                    {query_part}
-                                                    ) AS filtred_sessions
-                                                ) AS full_sessions
-                                                GROUP BY user_id
-                                            ) AS users_sessions;""",
-                                     full_args)
-        elif ids_only:
-            main_query = cur.format(query=f"""SELECT DISTINCT ON(s.session_id) s.session_id AS session_id
-                                              {query_part}
-                                              ORDER BY s.session_id desc
-                                              LIMIT %(sessions_limit)s OFFSET %(sessions_limit_s)s;""",
-                                    parameters=full_args)
+
+def __needs_metadata(errors_only, count_only, ids_only):
+    return not (errors_only or count_only or ids_only)
+
+
+def __get_sort(data: schemas.SessionsSearchPayloadSchema):
+    if data.sort is None or data.sort == "session_id":
+        return "session_id"
+    return helper.key_to_snake_case(data.sort)
+
+
+def __get_metadata_column(meta_keys):
+    return "CAST(map(%s), 'Map(String, String)') AS metadata" \
+        % ','.join([f"'{m['key']}',coalesce(metadata_{m['index']},'None')" for m in meta_keys])
+
+
+def __is_keyset(data: schemas.SessionsSearchPayloadSchema, errors_only, count_only, ids_only):
+    return not (errors_only or count_only or ids_only) \
+        and sessions_pagination.is_keyset(data=data, sort=__get_sort(data), sort_keys=KEYSET_SORT_KEYS)
+
+
+def __get_keyset_query(data: schemas.SessionsSearchPayloadSchema, query_part, meta_keys, with_cursor):
+    """
+    Reads only the page after the cursor, the sessions are ordered by (sort-key, session_id)
+    """
+    sort_key = KEYSET_SORT_KEYS[__get_sort(data)]
+    condition = ""
+    if with_cursor:
+        condition = f"WHERE {sessions_pagination.get_keyset_condition(data=data, sort_key=sort_key)}"
+    return f"""SELECT {SESSION_LIST_PROJECTION_CH},
+                      {__get_metadata_column(meta_keys)},
+                      {sort_key} AS sort_key
+               {query_part}
+               {VIEWED_SESSIONS_JOIN_CH}
+               {condition}
+               ORDER BY sort_key {data.order}, s.session_id {data.order}
+               LIMIT %(sessions_limit_k)s;"""
+
+
+def __get_total_query(data: schemas.SessionsSearchPayloadSchema, query_part):
+    if data.approximate_total:
+        return f"""SELECT uniq(s.session_id) AS count {query_part};"""
+    return f"""SELECT COUNT(DISTINCT s.session_id) AS count {query_part};"""
+
+
+def __get_main_query(data: schemas.SessionsSearchPayloadSchema, query_part, meta_keys,
+                     errors_only, count_only, ids_only):
+    if errors_only:
+        return f"""SELECT DISTINCT er.error_id,
+                          COALESCE((SELECT TRUE
+                                    FROM {exp_ch_helper.get_user_viewed_errors_table()} AS ve
+                                    WHERE er.error_id = ve.error_id
+                                        AND ve.user_id = %(userId)s LIMIT 1), FALSE) AS viewed
+                          {query_part};"""
+
+    elif count_only:
+        return f"""SELECT COUNT(DISTINCT s.session_id) AS count_sessions, 
+                                 COUNT(DISTINCT s.user_uuid) AS count_users
+                          {query_part};"""
+    elif data.group_by_user:
+        g_sort = "count(full_sessions)"
+        if data.order is None:
+            data.order = schemas.SortOrderType.DESC.value
         else:
-            if data.order is None:
-                data.order = schemas.SortOrderType.DESC.value
-            else:
-                data.order = data.order
-            sort = 'session_id'
-            if data.sort is not None and data.sort != "session_id":
-                # sort += " " + data.order + "," + helper.key_to_snake_case(data.sort)
-                sort = helper.key_to_snake_case(data.sort)
-
-            meta_keys = metadata.get(project_id=project.project_id)
-            meta_map = ",'metadata',toString(map(%s))" \
-                       % ','.join([f"'{m['key']}',coalesce(metadata_{m['index']},'None')" for m in meta_keys])
-            main_query = cur.format(query=f"""SELECT any(total) AS count, 
-                                                     groupArray(%(sessions_limit)s)(details) AS sessions
-                                              FROM (SELECT total, details
-                                                    FROM (SELECT COUNT() OVER () AS total,
-                                                          s.{sort} AS sort_key,
-                                                          map({SESSION_PROJECTION_COLS_CH_MAP}{meta_map}) AS details
-                                                      {query_part}
-                                              LEFT JOIN (SELECT DISTINCT session_id
-                                                         FROM experimental.user_viewed_sessions
-                                                         WHERE user_id = %(userId)s AND project_id=%(project_id)s
-                                                           AND _timestamp >= toDateTime(%(startDate)s / 1000)) AS viewed_sessions
-                                                         ON (viewed_sessions.session_id = s.session_id)
-                                              ) AS raw
-                                              ORDER BY sort_key {data.order}
-                                              LIMIT %(sessions_limit)s OFFSET %(sessions_limit_s)s) AS sorted_sessions;""",
-                                    parameters=full_args)
-        logging.debug("--------------------")
-        logging.debug(main_query)
-        logging.debug("--------------------")
-        try:
-            sessions_list = cur.execute(main_query)
-        except Exception as err:
-            logging.warning("--------- SESSIONS-CH SEARCH QUERY EXCEPTION -----------")
-            logging.warning(main_query)
-            logging.warning("--------- PAYLOAD -----------")
-            logging.warning(data.model_dump_json())
-            logging.warning("--------------------")
-            raise err
-        if errors_only or ids_only:
-            return helper.list_to_camel_case(sessions_list)
+            data.order = data.order
+        if data.sort is not None and data.sort != 'sessionsCount':
+            sort = helper.key_to_snake_case(data.sort)
+            g_sort = f"{'MIN' if data.order == schemas.SortOrderType.DESC else 'MAX'}({sort})"
+        else:
+            sort = 'start_ts'
+
+        meta_map = ",map(%s) AS 'metadata'" \
+                   % ','.join([f"'{m['key']}',coalesce(metadata_{m['index']},'None')" for m in meta_keys])
+        return f"""SELECT COUNT(*) AS count,
+                                COALESCE(JSONB_AGG(users_sessions) 
+                                    FILTER (WHERE rn>%(sessions_limit_s)s AND rn<=%(sessions_limit_e)s), '[]'::JSONB) AS sessions
+                        FROM (SELECT user_id,
+                                 count(full_sessions)                                   AS user_sessions_count,
+                                 jsonb_agg(full_sessions) FILTER (WHERE rn <= 1)        AS last_session,
+                                 MIN(full_sessions.start_ts)                            AS first_session_ts,
+                                 ROW_NUMBER() OVER (ORDER BY {g_sort} {data.order}) AS rn
+                            FROM (SELECT *, ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY {sort} {data.order}) AS rn 
+                                FROM (SELECT DISTINCT ON(s.session_id) {SESSION_PROJECTION_COLS_CH} {meta_map}
+                                    {query_part}
+                                    ) AS filtred_sessions
+                                ) AS full_sessions
+                                GROUP BY user_id
+                            ) AS users_sessions;"""
+    elif ids_only:
+        return f"""SELECT DISTINCT ON(s.session_id) s.session_id AS session_id
+                          {query_part}
+                          ORDER BY s.session_id desc
+                          LIMIT %(sessions_limit)s OFFSET %(sessions_limit_s)s;"""
+    else:
+        if data.order is None:
+            data.order = schemas.SortOrderType.DESC.value
+        else:
+            data.order = data.order
+        sort = __get_sort(data)
+
+        # one typed column per attribute, the window count is computed before the LIMIT
+        return f"""SELECT COUNT() OVER () AS total,
+                          {SESSION_LIST_PROJECTION_CH},
+                          {__get_metadata_column(meta_keys)},
+                          s.{sort} AS sort_key
+                   {query_part}
+                   {VIEWED_SESSIONS_JOIN_CH}
+                   ORDER BY sort_key {data.order}
+                   LIMIT %(sessions_limit)s OFFSET %(sessions_limit_s)s;"""
+
+
+def __log_query_exception(main_query, data: schemas.SessionsSearchPayloadSchema):
+    logging.warning("--------- SESSIONS-CH SEARCH QUERY EXCEPTION -----------")
+    logging.warning(main_query)
+    logging.warning("--------- PAYLOAD -----------")
+    logging.warning(data.model_dump_json())
+    logging.warning("--------------------")
+
 
-        if len(sessions_list) > 0:
-            sessions_list = sessions_list[0]
+def __format_sessions(data: schemas.SessionsSearchPayloadSchema, sessions_list):
+    if len(sessions_list) > 0:
+        sessions_list = sessions_list[0]
 
-        total = sessions_list["count"]
-        sessions_list = sessions_list["sessions"]
+    total = sessions_list["count"]
+    sessions_list = sessions_list["sessions"]
 
     if data.group_by_user:
         for i, s in enumerate(sessions_list):
@@ -213,6 +253,198 @@ def search_sessions(data: schemas.SessionsSearchPayloadSchema, project: schemas.
     }
 
 
+def __metadata_to_camel_case(metadata_column):
+    # the metadata keys are the same for all the sessions, each key is converted once
+    keys = {}
+    for m in metadata_column:
+        for k in m.keys():
+            if k not in keys:
+                keys[k] = helper.key_to_camel_case(k)
+    return [{keys[k]: v for k, v in m.items()} for m in metadata_column]
+
+
+def format_sessions_columns(columns: dict, total=None):
+    """
+    Builds the sessions list from the column-oriented result of the typed sessions list query,
+    the values are converted once per column and validated in a single call
+    :param total: the total counted separately, by default it is read from the total column
+    """
+    if total is None:
+        total = columns["total"][0] if len(columns["total"]) > 0 else 0
+    keys = [k for k, _ in SESSION_LIST_COLS_CH] + ["metadata"]
+    values = []
+    for k in keys:
+        if k == "metadata":
+            values.append(__metadata_to_camel_case(columns[k]))
+            continue
+        cast = __SESSION_LIST_CASTS.get(k)
+        values.append(columns[k] if cast is None else [None if v is None else cast(v) for v in columns[k]])
+    sessions_list = __sessions_adapter.validate_python([dict(zip(keys, row)) for row in zip(*values)])
+
+    return {
+        'total': total,
+        'sessions': sessions_list,
+        'src': 2
+    }
+
+
+def __format_keyset_columns(data: schemas.SessionsSearchPayloadSchema, columns: dict, total):
+    next_cursor = None
+    if len(columns["sessionId"]) > data.limit:
+        columns = {k: v[:data.limit] for k, v in columns.items()}
+        next_cursor = sessions_pagination.encode_cursor(columns["sort_key"][-1], columns["sessionId"][-1])
+    result = format_sessions_columns(columns, total=total)
+    result["nextCursor"] = next_cursor
+    return result
+
+
+def __search_keyset(data: schemas.SessionsSearchPayloadSchema, full_args, query_part, meta_keys):
+    with_cursor = sessions_pagination.add_keyset_args(data=data, full_args=full_args)
+    with ch_client.ClickHouseClient() as cur:
+        main_query = cur.format(query=__get_keyset_query(data=data, query_part=query_part, meta_keys=meta_keys,
+                                                         with_cursor=with_cursor),
+                                parameters=full_args)
+        total_query = cur.format(query=__get_total_query(data=data, query_part=query_part), parameters=full_args)
+        logging.debug("--------------------")
+        logging.debug(main_query)
+        logging.debug("--------------------")
+        try:
+            columns = cur.execute_columns(main_query)
+        except Exception as err:
+            __log_query_exception(main_query=main_query, data=data)
+            raise err
+        total = sessions_pagination.get_total(count_query=total_query,
+                                              count=lambda: cur.execute(total_query)[0]["count"])
+
+    return __format_keyset_columns(data=data, columns=columns, total=total)
+
+
+async def __search_keyset_async(data: schemas.SessionsSearchPayloadSchema, full_args, query_part, meta_keys):
+    with_cursor = sessions_pagination.add_keyset_args(data=data, full_args=full_args)
+
+    async def count():
+        # the page and the total are read in parallel
+        async with ch_client.AsyncClickHouseClient() as count_cur:
+            return (await count_cur.execute(total_query))[0]["count"]
+
+    async with ch_client.AsyncClickHouseClient() as cur:
+        main_query = cur.format(query=__get_keyset_query(data=data, query_part=query_part, meta_keys=meta_keys,
+                                                         with_cursor=with_cursor),
+                                parameters=full_args)
+        total_query = cur.format(query=__get_total_query(data=data, query_part=query_part), parameters=full_args)
+        logging.debug("--------------------")
+        logging.debug(main_query)
+        logging.debug("--------------------")
+        total = asyncio.create_task(sessions_pagination.get_total_async(count_query=total_query, count=count))
+        try:
+            columns = await cur.execute_columns(main_query)
+        except Exception as err:
+            total.cancel()
+            __log_query_exception(main_query=main_query, data=data)
+            raise err
+
+    return __format_keyset_columns(data=data, columns=columns, total=await total)
+
+
+def __is_sessions_list(data: schemas.SessionsSearchPayloadSchema, errors_only, count_only, ids_only):
+    return not (errors_only or count_only or ids_only or data.group_by_user)
+
+
+# This function executes the query and return result
+def search_sessions(data: schemas.SessionsSearchPayloadSchema, project: schemas.ProjectContext,
+                    user_id, errors_only=False,
+                    error_status=schemas.ErrorStatus.ALL, count_only=False, issue=None, ids_only=False,
+                    platform="web"):
+    if data.bookmarked:
+        data.startTimestamp, data.endTimestamp = sessions_favorite.get_start_end_timestamp(project.project_id, user_id)
+    if data.startTimestamp is None:
+        logger.debug(f"No vault sessions found for project:{project.project_id}")
+        return {
+            'total': 0,
+            'sessions': [],
+            'src': 2
+        }
+    full_args, query_part = __get_search_parts(data=data, project=project, user_id=user_id, errors_only=errors_only,
+                                               error_status=error_status, issue=issue, platform=platform)
+    meta_keys = []
+    if __needs_metadata(errors_only=errors_only, count_only=count_only, ids_only=ids_only):
+        meta_keys = metadata.get(project_id=project.project_id)
+    if __is_keyset(data=data, errors_only=errors_only, count_only=count_only, ids_only=ids_only):
+        return __search_keyset(data=data, full_args=full_args, query_part=query_part, meta_keys=meta_keys)
+    with ch_client.ClickHouseClient() as cur:
+        main_query = cur.format(query=__get_main_query(data=data, query_part=query_part, meta_keys=meta_keys,
+                                                       errors_only=errors_only, count_only=count_only,
+                                                       ids_only=ids_only),
+                                parameters=full_args)
+        logging.debug("--------------------")
+        logging.debug(main_query)
+        logging.debug("--------------------")
+        try:
+            if __is_sessions_list(data=data, errors_only=errors_only, count_only=count_only, ids_only=ids_only):
+                columns = cur.execute_columns(main_query)
+            else:
+                columns = None
+                sessions_list = cur.execute(main_query)
+        except Exception as err:
+            __log_query_exception(main_query=main_query, data=data)
+            raise err
+    if columns is not None:
+        return format_sessions_columns(columns)
+    if errors_only or ids_only:
+        return helper.list_to_camel_case(sessions_list)
+
+    return __format_sessions(data=data, sessions_list=sessions_list)
+
+
+async def search_sessions_async(data: schemas.SessionsSearchPayloadSchema, project: schemas.ProjectContext,
+                                user_id, errors_only=False,
+                                error_status=schemas.ErrorStatus.ALL, count_only=False, issue=None, ids_only=False,
+                                platform="web"):
+    if data.bookmarked:
+        data.startTimestamp, data.endTimestamp = await sessions_favorite.get_start_end_timestamp_async(
+            project.project_id, user_id)
+    if data.startTimestamp is None:
+        logger.debug(f"No vault sessions found for project:{project.project_id}")
+        return {
+            'total': 0,
+            'sessions': [],
+            'src': 2
+        }
+    # building the query parts might need a metadata lookup, it is kept off the event-loop
+    full_args, query_part = await run_in_threadpool(__get_search_parts, data=data, project=project,
+                                                    user_id=user_id, errors_only=errors_only,
+                                                    error_status=error_status, issue=issue, platform=platform)
+    meta_keys = []
+    if __needs_metadata(errors_only=errors_only, count_only=count_only, ids_only=ids_only):
+        meta_keys = await metadata.get_async(project_id=project.project_id)
+    if __is_keyset(data=data, errors_only=errors_only, count_only=count_only, ids_only=ids_only):
+        return await __search_keyset_async(data=data, full_args=full_args, query_part=query_part,
+                                           meta_keys=meta_keys)
+    async with ch_client.AsyncClickHouseClient() as cur:
+        main_query = cur.format(query=__get_main_query(data=data, query_part=query_part, meta_keys=meta_keys,
+                                                       errors_only=errors_only, count_only=count_only,
+                                                       ids_only=ids_only),
+                                parameters=full_args)
+        logging.debug("--------------------")
+        logging.debug(main_query)
+        logging.debug("--------------------")
+        try:
+            if __is_sessions_list(data=data, errors_only=errors_only, count_only=count_only, ids_only=ids_only):
+                columns = await cur.execute_columns(main_query)
+            else:
+                columns = None
+                sessions_list = await cur.execute(main_query)
+        except Exception as err:
+            __log_query_exception(main_query=main_query, data=data)
+            raise err
+    if columns is not None:
+        return format_sessions_columns(columns)
+    if errors_only or ids_only:
+        return helper.list_to_camel_case(sessions_list)
+
+    return __format_sessions(data=data, sessions_list=sessions_list)
+
+
 def search_by_metadata(tenant_id, user_id, m_key, m_value, project_id=None):
     if project_id is None:
         all_projects = projects.get_projects(tenant_id=tenant_id)
@@ -1,4 +1,4 @@
-from chalicelib.core import license
+from chalicelib.core import license, auth_cache
 from chalicelib.utils import helper
 from chalicelib.utils import pg_client
 
@@ -65,7 +65,9 @@ def generate_new_api_key(tenant_id):
                                 RETURNING api_key;""",
                             {"tenant_id": tenant_id})
         cur.execute(query=query)
-        return helper.dict_to_camel_case(cur.fetchone())
+        row = cur.fetchone()
+    auth_cache.invalidate_tenant(tenant_id)
+    return helper.dict_to_camel_case(row)
 
 
 def edit_tenant(tenant_id, changes):
@@ -76,7 +78,9 @@ def edit_tenant(tenant_id, changes):
                                 RETURNING name, opt_out;""",
                             {"tenant_id": tenant_id, **changes})
         cur.execute(query=query)
-        return helper.dict_to_camel_case(cur.fetchone())
+        row = cur.fetchone()
+    auth_cache.invalidate_tenant(tenant_id)
+    return helper.dict_to_camel_case(row)
 
 
 def tenants_exists_sync(use_pool=True):
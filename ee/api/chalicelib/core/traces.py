@@ -1,6 +1,9 @@
+import asyncio
 import json
+import logging
 import queue
 import re
+import time
 from typing import Optional, List
 
 from apscheduler.triggers.interval import IntervalTrigger
@@ -9,12 +12,18 @@ from fastapi import Request, Response, BackgroundTasks
 from pydantic import BaseModel, Field
 from starlette.background import BackgroundTask
 
-import app as main_app
 import schemas
 from chalicelib.utils import pg_client, helper
 from chalicelib.utils.TimeUTC import TimeUTC
 from schemas import CurrentContext
 
+logger = logging.getLogger(__name__)
+
+# The traces received while the queue is full are dropped
+QUEUE_MAX_SIZE = config("TRACE_QUEUE_MAX_SIZE", cast=int, default=10000)
+# The queue is flushed every TRACE_PERIOD seconds, or as soon as it holds BATCH_SIZE traces
+BATCH_SIZE = config("TRACE_BATCH_SIZE", cast=int, default=500)
+
 IGNORE_ROUTES = [
     {"method": ["*"], "path": "/notifications"},
     {"method": ["*"], "path": "/announcements"},
@@ -64,32 +73,33 @@ class TraceSchema(BaseModel):
 
 
 def __process_trace(trace: TraceSchema):
-    data = trace.model_dump()
-    data["parameters"] = json.dumps(trace.parameters) if trace.parameters is not None and len(
-        trace.parameters.keys()) > 0 else None
-    data["payload"] = json.dumps(trace.payload) if trace.payload is not None and len(trace.payload.keys()) > 0 else None
-    return data
+    return (trace.user_id, trace.tenant_id, trace.created_at, trace.auth, trace.action, trace.method,
+            trace.path_format, trace.endpoint,
+            json.dumps(trace.payload) if trace.payload is not None and len(trace.payload.keys()) > 0 else None,
+            json.dumps(trace.parameters) if trace.parameters is not None and len(
+                trace.parameters.keys()) > 0 else None,
+            trace.status)
+
+
+traces_queue: queue.Queue = queue.Queue(maxsize=QUEUE_MAX_SIZE)
+__flush_lock = asyncio.Lock()
+__flush_task: Optional[asyncio.Task] = None
+__dropped_since_flush = 0
+stats = {"enqueued": 0, "dropped": 0, "written": 0, "failed": 0, "flushes": 0, "last_flush_duration": 0}
+
+
+def get_stats():
+    return {**stats, "queue_size": traces_queue.qsize()}
 
 
 async def write_traces_batch(traces: List[TraceSchema]):
     if len(traces) == 0:
         return
-    params = {}
-    values = []
-    for i, t in enumerate(traces):
-        data = __process_trace(t)
-        for key in data.keys():
-            params[f"{key}_{i}"] = data[key]
-        values.append(
-            f"(%(user_id_{i})s, %(tenant_id_{i})s, %(created_at_{i})s, %(auth_{i})s, %(action_{i})s, %(method_{i})s, %(path_format_{i})s, %(endpoint_{i})s, %(payload_{i})s::jsonb, %(parameters_{i})s::jsonb, %(status_{i})s)")
-
-    with pg_client.PostgresClient() as cur:
-        cur.execute(
-            cur.mogrify(
-                f"""INSERT INTO traces(user_id, tenant_id, created_at, auth, action, method, path_format, endpoint, payload, parameters, status)
-                    VALUES {" , ".join(values)};""",
-                params)
-        )
+    async with pg_client.AsyncPostgresClient() as cur:
+        async with cur.copy("""COPY traces(user_id, tenant_id, created_at, auth, action, method, path_format, endpoint,
+                                            payload, parameters, status) FROM STDIN""") as copy:
+            for t in traces:
+                await copy.write_row(__process_trace(t))
 
 
 async def process_trace(action: str, path_format: str, request: Request, response: Response):
@@ -117,10 +127,16 @@ async def process_trace(action: str, path_format: str, request: Request, respons
                                 status=response.status_code,
                                 path_format=path_format,
                                 created_at=TimeUTC.now())
-    if not hasattr(main_app.app, "queue_system"):
-        main_app.app.queue_system = queue.Queue()
-    q: queue.Queue = main_app.app.queue_system
-    q.put(current_trace)
+    global __flush_task, __dropped_since_flush
+    try:
+        traces_queue.put_nowait(current_trace)
+    except queue.Full:
+        stats["dropped"] += 1
+        __dropped_since_flush += 1
+        return
+    stats["enqueued"] += 1
+    if traces_queue.qsize() >= BATCH_SIZE and not __flush_lock.locked():
+        __flush_task = asyncio.create_task(process_traces_queue())
 
 
 def trace(action: str, path_format: str, request: Request, response: Response):
@@ -138,13 +154,26 @@ def trace(action: str, path_format: str, request: Request, response: Response):
 
 
 async def process_traces_queue():
-    queue_system: queue.Queue = main_app.app.queue_system
-    traces = []
-    while not queue_system.empty():
-        obj = queue_system.get_nowait()
-        traces.append(obj)
-    if len(traces) > 0:
-        await write_traces_batch(traces)
+    global __dropped_since_flush
+    async with __flush_lock:
+        if __dropped_since_flush > 0:
+            logger.warning(f"!!!Traces queue was full, {__dropped_since_flush} traces dropped")
+            __dropped_since_flush = 0
+        start = time.time()
+        while not traces_queue.empty():
+            traces = []
+            while len(traces) < BATCH_SIZE and not traces_queue.empty():
+                traces.append(traces_queue.get_nowait())
+            try:
+                await write_traces_batch(traces)
+                stats["written"] += len(traces)
+            except Exception as e:
+                stats["failed"] += len(traces)
+                logger.error(f"!!!Error while writing {len(traces)} traces", exc_info=e)
+        stats["flushes"] += 1
+        stats["last_flush_duration"] = round(time.time() - start, 3)
+        logger.debug(f"Traces flushed in {stats['last_flush_duration']}s, "
+                     f"{traces_queue.qsize()} traces left in the queue")
 
 
 def get_all(tenant_id, data: schemas.TrailSearchPayloadSchema):
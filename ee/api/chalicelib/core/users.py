@@ -9,7 +9,7 @@ from pydantic import BaseModel, model_validator
 from starlette import status
 
 import schemas
-from chalicelib.core import authorizers
+from chalicelib.core import authorizers, auth_cache
 from chalicelib.core import tenants, roles, spot
 from chalicelib.utils import email_helper
 from chalicelib.utils import helper
@@ -180,6 +180,7 @@ def update(tenant_id, user_id, changes, output=True):
                             WHERE basic_authentication.user_id = %(user_id)s;""",
                                 {"tenant_id": tenant_id, "user_id": user_id, **changes})
             cur.execute(query)
+    auth_cache.invalidate_user(user_id)
     if not output:
         return None
     return get(user_id=user_id, tenant_id=tenant_id)
@@ -516,6 +517,7 @@ def delete_member(user_id, tenant_id, id_to_delete):
                                 change_pwd_expire_at= NULL, change_pwd_token= NULL
                            WHERE user_id=%(user_id)s;""",
                         {"user_id": id_to_delete, "tenant_id": tenant_id}))
+    auth_cache.invalidate_user(id_to_delete)
     return {"data": get_members(tenant_id=tenant_id)}
 
 
@@ -707,7 +709,8 @@ def change_jwt_iat_jti(user_id):
                             {"user_id": user_id})
         cur.execute(query)
         row = cur.fetchone()
-        return FullLoginJWTs(**row)
+    auth_cache.invalidate_user(user_id)
+    return FullLoginJWTs(**row)
 
 
 def refresh_jwt_iat_jti(user_id):
@@ -722,7 +725,8 @@ def refresh_jwt_iat_jti(user_id):
                             {"user_id": user_id})
         cur.execute(query)
         row = cur.fetchone()
-        return RefreshLoginJWTs(**row)
+    auth_cache.invalidate_user(user_id)
+    return RefreshLoginJWTs(**row)
 
 
 def authenticate(email, password, for_change_password=False) -> dict | bool | None:
@@ -879,6 +883,7 @@ def logout(user_id: int):
                WHERE user_id = %(user_id)s;""",
             {"user_id": user_id})
         cur.execute(query)
+    auth_cache.invalidate_user(user_id)
 
 
 def refresh(user_id: int, tenant_id: int = -1) -> dict:
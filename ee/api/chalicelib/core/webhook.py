@@ -2,13 +2,20 @@ import logging
 from typing import Optional
 
 import requests
+from decouple import config
 from fastapi import HTTPException, status
 
 import schemas
-from chalicelib.utils import pg_client, helper
+from chalicelib.utils import pg_client, helper, http_client
 from chalicelib.utils.TimeUTC import TimeUTC
 
 
+# Shared by the webhooks and the collaborations (Slack, MS Teams)
+WEBHOOKS_CLIENT = http_client.get_service("webhooks", timeout=config("WEBHOOK_TIMEOUT", cast=int, default=10),
+                                          max_concurrency=config("WEBHOOK_MAX_CONCURRENCY", cast=int, default=50),
+                                          circuit_per_url=True)
+
+
 def get_by_id(webhook_id):
     with pg_client.PostgresClient() as cur:
         cur.execute(
@@ -178,7 +185,12 @@ def __trigger(hook, data):
         if hook["authHeader"] is not None and len(hook["authHeader"]) > 0:
             headers = {"Authorization": hook["authHeader"]}
 
-        r = requests.post(url=hook["endpoint"], json=data, headers=headers)
+        try:
+            r = WEBHOOKS_CLIENT.post(url=hook["endpoint"], json=data, headers=headers)
+        except requests.exceptions.RequestException as e:
+            # unreachable, timed-out or short-circuited: the other hooks of the batch are still triggered
+            logging.error(f"!! webhook: couldn't trigger webhook_id={hook.get('webhookId')}: {e}")
+            return
         if r.status_code != 200:
             logging.error("=======> webhook: something went wrong for:")
             logging.error(hook)
@@ -8,8 +8,10 @@ rm -rf ./build_alerts.sh
 rm -rf ./build_crons.sh
 rm -rf ./chalicelib/core/announcements.py
 rm -rf ./chalicelib/core/assist.py
+rm -rf ./chalicelib/core/auth_cache.py
 rm -rf ./chalicelib/core/authorizers.py
 rm -rf ./chalicelib/core/autocomplete/autocomplete.py
+rm -rf ./chalicelib/core/autocomplete/autocomplete_index.py
 rm -rf ./chalicelib/core/collaborations/__init__.py
 rm -rf ./chalicelib/core/collaborations/collaboration_base.py
 rm -rf ./chalicelib/core/collaborations/collaboration_msteams.py
@@ -31,6 +33,7 @@ rm -rf ./chalicelib/core/jobs.py
 rm -rf ./chalicelib/core/log_tools
 rm -rf ./chalicelib/core/metadata.py
 rm -rf ./chalicelib/core/mobile.py
+rm -rf ./chalicelib/core/project_catalog.py
 rm -rf ./chalicelib/core/saved_search.py
 rm -rf ./chalicelib/core/sessions/sessions_pg.py
 rm -rf ./chalicelib/core/sessions/sessions_ch.py
@@ -41,6 +44,8 @@ rm -rf ./chalicelib/core/sessions/sessions_metas.py
 rm -rf ./chalicelib/core/sessions/sessions_mobs.py
 rm -rf ./chalicelib/core/sessions/sessions_replay.py
 rm -rf ./chalicelib/core/sessions/sessions_search.py
+rm -rf ./chalicelib/core/sessions/sessions_pagination.py
+rm -rf ./chalicelib/core/sessions/query_parts_cache.py
 rm -rf ./chalicelib/core/sessions/performance_event.py
 rm -rf ./chalicelib/core/sessions/sessions_viewed/sessions_viewed.py
 rm -rf ./chalicelib/core/sessions/unprocessed_sessions.py
@@ -61,6 +66,8 @@ rm -rf ./chalicelib/utils/email_helper.py
 rm -rf ./chalicelib/utils/event_filter_definition.py
 rm -rf ./chalicelib/utils/github_client_v3.py
 rm -rf ./chalicelib/utils/helper.py
+rm -rf ./chalicelib/utils/http_client.py
+rm -rf ./chalicelib/utils/json_response.py
 rm -rf ./chalicelib/utils/html/
 rm -rf ./chalicelib/utils/jira_client.py
 rm -rf ./chalicelib/utils/metrics_helper.py
@@ -104,6 +111,7 @@ rm -rf ./chalicelib/core/alerts/alerts_processor.py
 rm -rf ./chalicelib/core/alerts/alerts_processor_ch.py
 rm -rf ./chalicelib/core/alerts/alerts_listener.py
 rm -rf ./chalicelib/core/alerts/modules/helpers.py
+rm -rf ./chalicelib/core/alerts/modules/evaluation.py
 rm -rf ./chalicelib/core/errors/modules
 rm -rf ./chalicelib/core/errors/errors_pg.py
 rm -rf ./chalicelib/core/errors/errors_ch.py
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 from apscheduler.triggers.cron import CronTrigger
@@ -7,6 +8,7 @@ from decouple import config
 from chalicelib.core import jobs
 from chalicelib.core import telemetry, unlock
 from chalicelib.core import weekly_report as weekly_report_script, health
+from chalicelib.core.metrics.modules import rollups
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +31,11 @@ async def unlock_cron() -> None:
     logger.info(f"valid: {unlock.is_valid()}")
 
 
+async def sessions_rollups_cron() -> None:
+    # the ClickHouse queries of the refresh would block the event loop of the scheduler
+    await asyncio.to_thread(rollups.refresh)
+
+
 async def health_cron() -> None:
     health.cron()
 
@@ -51,7 +58,9 @@ SINGLE_CRONS = [
     {"func": health_cron, "trigger": IntervalTrigger(hours=0, minutes=30, start_date="2023-04-01 0:0:0", jitter=300),
      "misfire_grace_time": 60 * 60, "max_instances": 1},
     {"func": weekly_health_cron, "trigger": CronTrigger(day_of_week="sun", hour=5),
-     "misfire_grace_time": 60 * 60, "max_instances": 1}
+     "misfire_grace_time": 60 * 60, "max_instances": 1},
+    {"func": sessions_rollups_cron, "trigger": IntervalTrigger(minutes=1),
+     "misfire_grace_time": 20, "max_instances": 1}
 ]
 
 if config("LOCAL_CRONS", default=False, cast=bool):
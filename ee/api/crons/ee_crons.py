@@ -1,7 +1,12 @@
+import logging
+
 from apscheduler.triggers.interval import IntervalTrigger
 
 from chalicelib.utils import events_queue
-from chalicelib.core import assist_stats
+from chalicelib.core import assist_stats, traces
+from crons.core_crons import STATS_LOG_PERIOD
+
+logger = logging.getLogger(__name__)
 
 
 async def pg_events_queue() -> None:
@@ -12,9 +17,17 @@ async def assist_events_aggregates_cron() -> None:
     assist_stats.insert_aggregated_data()
 
 
+async def traces_stats_cron() -> None:
+    logger.info(f"traces: {traces.get_stats()}")
+
+
 ee_cron_jobs = [
     {"func": pg_events_queue, "trigger": IntervalTrigger(minutes=5), "misfire_grace_time": 20, "max_instances": 1},
     {"func": assist_events_aggregates_cron,
      "trigger": IntervalTrigger(hours=1, start_date="2023-04-01 0:0:0", jitter=10), "misfire_grace_time": 20,
      "max_instances": 1}
 ]
+
+if STATS_LOG_PERIOD > 0:
+    ee_cron_jobs.append({"func": traces_stats_cron, "trigger": IntervalTrigger(seconds=STATS_LOG_PERIOD),
+                         "misfire_grace_time": 20, "max_instances": 1})
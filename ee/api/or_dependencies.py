@@ -4,6 +4,7 @@ from typing import Callable
 
 from fastapi import HTTPException, Depends
 from fastapi import Security
+from fastapi.datastructures import Default, DefaultPlaceholder
 from fastapi.exceptions import RequestValidationError
 from fastapi.routing import APIRoute
 from fastapi.security import SecurityScopes
@@ -15,6 +16,7 @@ from starlette.responses import Response, JSONResponse
 import schemas
 from chalicelib.core import traces
 from chalicelib.utils import helper
+from chalicelib.utils.json_response import ORJSONResponse, render_endpoint
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +29,18 @@ async def OR_context(request: Request) -> schemas.CurrentContext:
 
 
 class ORRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        # the routes without an explicit response class are rendered by ORJSONResponse
+        if isinstance(kwargs.get("response_class"), DefaultPlaceholder):
+            kwargs["response_class"] = Default(ORJSONResponse)
+        super().__init__(path, endpoint, **kwargs)
+
     def get_route_handler(self) -> Callable:
+        # without a response model, the result is encoded by the endpoint instead of FastAPI's jsonable_encoder
+        if self.response_model is None and isinstance(self.response_class, DefaultPlaceholder) \
+                and self.response_class.value is ORJSONResponse \
+                and not getattr(self.dependant.call, "rendered", False):
+            self.dependant.call = render_endpoint(self.dependant.call)
         original_route_handler = super().get_route_handler()
 
         async def custom_route_handler(request: Request) -> Response:
@@ -48,9 +61,12 @@ class ORRoute(APIRoute):
 
             if isinstance(response, JSONResponse):
                 response: JSONResponse = response
-                body = json.loads(response.body.decode('utf8'))
-                response.body = response.render(helper.cast_session_id_to_string(body))
-                response.headers["Content-Length"] = str(len(response.body))
+                if isinstance(response, ORJSONResponse):
+                    body = response.content
+                else:
+                    body = json.loads(response.body.decode('utf8'))
+                    response.body = response.render(helper.cast_session_id_to_string(body))
+                    response.headers["Content-Length"] = str(len(response.body))
                 if response.status_code == 200 \
                         and body is not None and isinstance(body, dict) \
                         and body.get("errors") is not None:
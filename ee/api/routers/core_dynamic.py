@@ -271,21 +271,21 @@ def get_projects(context: schemas.CurrentContext = Depends(OR_context)):
 
 @app.post('/{projectId}/sessions/search', tags=["sessions"],
           dependencies=[OR_scope(Permissions.SESSION_REPLAY)])
-def search_sessions(projectId: int, data: schemas.SessionsSearchPayloadSchema = \
+async def search_sessions(projectId: int, data: schemas.SessionsSearchPayloadSchema = \
         Depends(contextual_validators.validate_contextual_payload),
-                    context: schemas.CurrentContext = Depends(OR_context)):
-    data = sessions_search.search_sessions(data=data, project=context.project, user_id=context.user_id,
-                                           platform=context.project.platform)
+                          context: schemas.CurrentContext = Depends(OR_context)):
+    data = await sessions_search.search_sessions_async(data=data, project=context.project, user_id=context.user_id,
+                                                       platform=context.project.platform)
     return {'data': data}
 
 
 @app.post('/{projectId}/sessions/search/ids', tags=["sessions"],
           dependencies=[OR_scope(Permissions.SESSION_REPLAY)])
-def session_ids_search(projectId: int, data: schemas.SessionsSearchPayloadSchema = \
+async def session_ids_search(projectId: int, data: schemas.SessionsSearchPayloadSchema = \
         Depends(contextual_validators.validate_contextual_payload),
-                       context: schemas.CurrentContext = Depends(OR_context)):
-    data = sessions_search.search_sessions(data=data, project=context.project, user_id=context.user_id, ids_only=True,
-                                           platform=context.project.platform)
+                             context: schemas.CurrentContext = Depends(OR_context)):
+    data = await sessions_search.search_sessions_async(data=data, project=context.project, user_id=context.user_id,
+                                                       ids_only=True, platform=context.project.platform)
     return {'data': data}
 
 
@@ -438,9 +438,9 @@ def get_live_session_devtools_file(projectId: int, sessionId: Union[int, str],
 
 
 @app.post('/{projectId}/heatmaps/url', tags=["heatmaps"], dependencies=[OR_scope(Permissions.SESSION_REPLAY)])
-def get_heatmaps_by_url(projectId: int, data: schemas.GetHeatMapPayloadSchema = Body(...),
-                        context: schemas.CurrentContext = Depends(OR_context)):
-    return {"data": heatmaps.get_by_url(project_id=projectId, data=data)}
+async def get_heatmaps_by_url(projectId: int, data: schemas.GetHeatMapPayloadSchema = Body(...),
+                              context: schemas.CurrentContext = Depends(OR_context)):
+    return {"data": await heatmaps.get_by_url_async(project_id=projectId, data=data)}
 
 
 @app.post('/{projectId}/sessions/{sessionId}/heatmaps', tags=["heatmaps"],
@@ -1,10 +1,14 @@
+import json
 from typing import Union
 
 import schemas
 from chalicelib.core.metrics import custom_metrics, dashboards
+from chalicelib.utils import helper
 from fastapi import Body, Depends
+from fastapi.encoders import jsonable_encoder
 from or_dependencies import OR_context, OR_scope
 from routers.base import get_routers
+from starlette.responses import StreamingResponse
 
 public_app, app, app_apikey = get_routers(extra_dependencies=[OR_scope(schemas.Permissions.METRICS)])
 
@@ -46,6 +50,19 @@ def pin_dashboard(projectId: int, dashboardId: int, context: schemas.CurrentCont
     return {"data": dashboards.pin_dashboard(project_id=projectId, user_id=context.user_id, dashboard_id=dashboardId)}
 
 
+@app.post('/{projectId}/dashboards/{dashboardId}/charts', tags=["dashboard"])
+def get_dashboard_charts(projectId: int, dashboardId: int, data: schemas.CardSessionsSchema = Body(...),
+                         context: schemas.CurrentContext = Depends(OR_context)):
+    charts = dashboards.get_dashboard_charts(project=context.project, user_id=context.user_id,
+                                             dashboard_id=dashboardId, data=data)
+    if charts is None:
+        return {"errors": ["dashboard not found"]}
+    # one JSON document per line, in the order the cards are rendered
+    return StreamingResponse((json.dumps(helper.cast_session_id_to_string(jsonable_encoder(c))) + "\n"
+                              for c in charts),
+                             media_type="application/x-ndjson")
+
+
 @app.post('/{projectId}/dashboards/{dashboardId}/cards', tags=["cards"])
 def add_card_to_dashboard(projectId: int, dashboardId: int,
                           data: schemas.AddWidgetToDashboardPayloadSchema = Body(...),
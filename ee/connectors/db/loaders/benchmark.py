@@ -0,0 +1,103 @@
+"""
+Load throughput of the to_sql path against the bulk loaders, on the configured database (CLOUD_SERVICE pg or clickhouse)
+
+    python3 -m db.loaders.benchmark --rows 100000 --level normal
+    python3 -m db.loaders.benchmark --rows 20000 --level sessions --table connector_user_sessions
+
+Run it from the connectors directory. The rows are synthetic and are loaded into a copy of the table
+(<table>_benchmark), dropped at the end.
+"""
+import argparse
+import random
+import string
+import time
+
+from decouple import config
+
+from db.api import DBConnection
+from db.models import events_detailed_table_name, events_table_name, sessions_table_name
+from db.utils import ColumnarBatch, columns_by_level, dtypes_by_level, get_df_from_batch
+
+DATABASE = config('CLOUD_SERVICE')
+
+GENERATORS = {"Int64": lambda: random.choice([random.randint(0, 127), random.randint(0, 2 ** 42)]),
+              "string": lambda: "".join(random.choices(string.ascii_letters + "/.:-_",
+                                                       k=random.choice([0, 8, 24, 120]))),
+              "boolean": lambda: random.random() > 0.5}
+
+
+def synthetic_batch(level, rows, density):
+    types = dtypes_by_level[level]
+    columns = columns_by_level[level]
+    batch = ColumnarBatch(level)
+    for i in range(rows):
+        row = {c: GENERATORS[types[c]]() for c in columns if c != 'sessionid' and random.random() < density}
+        row['sessionid'] = i
+        batch.append(row)
+    return batch
+
+
+def create_table(db, table, benchmark_table):
+    with db.engine.connect() as conn:
+        conn.execute(f"DROP TABLE IF EXISTS {benchmark_table}")
+        if DATABASE == 'clickhouse':
+            conn.execute(f"CREATE TABLE {benchmark_table} AS {table} ENGINE = MergeTree ORDER BY tuple()")
+        else:
+            conn.execute(f"CREATE TABLE {benchmark_table} (LIKE {table})")
+
+
+def drop_table(db, benchmark_table):
+    with db.engine.connect() as conn:
+        conn.execute(f"DROP TABLE IF EXISTS {benchmark_table}")
+
+
+def get_loaders():
+    if DATABASE == 'clickhouse':
+        from db.loaders.clickhouse_loader import insert_to_clickhouse, insert_to_clickhouse_to_sql
+        return [("to_sql", insert_to_clickhouse_to_sql), ("native", insert_to_clickhouse)]
+    if DATABASE == 'pg':
+        from db.loaders.postgres_loader import insert_to_postgres, insert_to_postgres_to_sql, update_postgres
+
+        def copy_and_update(db, df, table):
+            insert_to_postgres(db=db, df=df, table=table)
+            update_postgres(db=db, df=df, table=table)
+
+        return [("to_sql", insert_to_postgres_to_sql), ("copy", insert_to_postgres),
+                ("copy+update", copy_and_update)]
+    raise Exception(f"{DATABASE}-database not supported by the benchmark")
+
+
+def run(level, table, rows, density, repeat):
+    db = DBConnection(DATABASE)
+    benchmark_table = f"{table}_benchmark"
+    batch = synthetic_batch(level, rows, density)
+    start = time.perf_counter()
+    df = get_df_from_batch(batch, level=level)
+    print(f"{rows} rows, {level}, DataFrame built in {time.perf_counter() - start:.3f}s")
+    try:
+        for name, loader in get_loaders():
+            best = None
+            for _ in range(repeat):
+                create_table(db, table, benchmark_table)
+                start = time.perf_counter()
+                loader(db=db, df=df, table=benchmark_table)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            print(f"{name:<12} {best:8.3f}s {rows / best:10.0f} rows/s")
+    finally:
+        drop_table(db, benchmark_table)
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--level", default="normal", choices=["normal", "detailed", "sessions"])
+    parser.add_argument("--table", help="table to copy, the configured table of the level by default")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--density", type=float, default=0.3, help="ratio of non-null columns per row")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    default_tables = {"normal": events_table_name, "detailed": events_detailed_table_name,
+                      "sessions": sessions_table_name}
+    run(level=args.level, table=args.table or default_tables[args.level], rows=args.rows, density=args.density,
+        repeat=args.repeat)
@@ -1,4 +1,33 @@
+from clickhouse_driver import Client
 
-def insert_to_clickhouse(db, df, table: str):
+# engine url -> native client, one per process
+_clients = dict()
+
+
+def get_client(db) -> Client:
+    """
+    Native protocol client with the settings of the engine (clickhouse+native://...)
+    """
+    url = str(db.engine.url)
+    if url not in _clients:
+        _clients[url] = Client.from_url(str(db.engine.url.set(drivername='clickhouse')))
+    return _clients[url]
+
+
+def _to_values(series):
+    if series.hasnans:
+        return series.astype(object).where(series.notna(), None).tolist()
+    return series.tolist()
+
+
+def insert_to_clickhouse_to_sql(db, df, table: str):
     df.to_sql(table, db.engine, if_exists='append', index=False)
 
+
+def insert_to_clickhouse(db, df, table: str):
+    """
+    Sends the DataFrame column by column through the native protocol, in a single INSERT
+    """
+    get_client(db).execute(f"INSERT INTO {table} ({','.join(df.columns)}) VALUES",
+                           [_to_values(df[c]) for c in df.columns],
+                           columnar=True, types_check=False)
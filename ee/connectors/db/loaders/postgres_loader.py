@@ -1,3 +1,120 @@
+import io
+import struct
+from itertools import chain, repeat
 
-def insert_to_postgres(db, df, table: str):
+import pandas as pd
+from sqlalchemy import text
+
+# PGCOPY signature, flags and header extension length
+_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('>ii', 0, 0)
+_TRAILER = struct.pack('>h', -1)
+_NULL = struct.pack('>i', -1)
+_field_count = struct.Struct('>h').pack
+_length = struct.Struct('>i').pack
+_int8 = struct.Struct('>iq').pack
+_int4 = struct.Struct('>ii').pack
+_int2 = struct.Struct('>ih').pack
+_TRUE = struct.pack('>ib', 1, 1)
+_FALSE = struct.pack('>ib', 1, 0)
+
+_INTEGER_TYPES = {'bigint': (_int8, 8), 'integer': (_int4, 4), 'smallint': (_int2, 2)}
+_TEXT_TYPES = ('text', 'character varying')
+
+# table -> {column: data_type}
+_column_types = dict()
+
+
+def get_column_types(db, table: str):
+    if table not in _column_types:
+        with db.engine.connect() as conn:
+            # the table is written unqualified, in the current schema: a table of the same name
+            # in another schema would mix its columns in
+            rows = conn.execute(text("""SELECT column_name, data_type
+                                        FROM information_schema.columns
+                                        WHERE table_schema = current_schema()
+                                          AND table_name = :table"""), {'table': table}).fetchall()
+        _column_types[table] = {r[0]: r[1] for r in rows}
+    return _column_types[table]
+
+
+def _encode_column(values: list, pg_type: str):
+    """
+    :return: the binary COPY field (length + data) of each value
+    """
+    if pg_type in _INTEGER_TYPES:
+        pack, size = _INTEGER_TYPES[pg_type]
+        return [_NULL if v is None or v is pd.NA else pack(size, v) for v in values]
+    if pg_type == 'boolean':
+        return [_NULL if v is None or v is pd.NA else _TRUE if v else _FALSE for v in values]
+    fields = []
+    for v in values:
+        if v is None or v is pd.NA:
+            fields.append(_NULL)
+        else:
+            v = str(v).encode('utf-8')
+            fields.append(_length(len(v)) + v)
+    return fields
+
+
+def to_binary_copy(df, column_types: dict):
+    """
+    Encodes the DataFrame in the binary format of COPY, column by column
+    :return: the COPY payload, or None if a column has a type that isn't supported
+    """
+    encoded = []
+    for column in df.columns:
+        pg_type = column_types.get(column)
+        if pg_type not in _INTEGER_TYPES and pg_type != 'boolean' and pg_type not in _TEXT_TYPES:
+            return None
+        encoded.append(_encode_column(df[column].tolist(), pg_type))
+    rows = chain.from_iterable(zip(repeat(_field_count(len(encoded)), len(df)), *encoded))
+    return b''.join(chain((_HEADER,), rows, (_TRAILER,)))
+
+
+def _copy(cursor, df, table: str, column_types: dict):
+    payload = to_binary_copy(df, column_types)
+    if payload is None:
+        return False
+    cursor.copy_expert(f"COPY {table} ({','.join(df.columns)}) FROM STDIN WITH (FORMAT binary)", io.BytesIO(payload))
+    return True
+
+
+def insert_to_postgres_to_sql(db, df, table: str):
     df.to_sql(table, db.engine, if_exists='append', index=False)
+
+
+def insert_to_postgres(db, df, table: str):
+    raw_connection = db.engine.raw_connection()
+    try:
+        with raw_connection.cursor() as cursor:
+            copied = _copy(cursor, df, table, get_column_types(db, table))
+        raw_connection.commit()
+    finally:
+        raw_connection.close()
+    if not copied:
+        print(f'[WARN] {table} has columns that binary COPY does not support, using INSERT')
+        insert_to_postgres_to_sql(db, df, table)
+
+
+def update_postgres(db, df, table: str):
+    """
+    Loads the rows into a temporary table and updates the table from it, matching them by sessionid
+    """
+    staging = f'{table}_staging'
+    columns = [c for c in df.columns if c != 'sessionid']
+    raw_connection = db.engine.raw_connection()
+    try:
+        with raw_connection.cursor() as cursor:
+            cursor.execute(f"CREATE TEMPORARY TABLE {staging} (LIKE {table}) ON COMMIT DROP")
+            if not _copy(cursor, df, staging, get_column_types(db, table)):
+                raise ValueError(f'{table} has columns that binary COPY does not support')
+            cursor.execute(f"""UPDATE {table}
+                               SET {','.join([f'{c} = {staging}.{c}' for c in columns])}
+                               FROM {staging}
+                               WHERE {table}.sessionid = {staging}.sessionid""")
+        raw_connection.commit()
+    except Exception:
+        raw_connection.rollback()
+        raise
+    finally:
+        raw_connection.close()
@@ -17,3 +17,20 @@ def insert_df(pr, df, table):
                           redshift_table_name=table,
                           append=True,
                           delimiter='|')
+
+
+def transit_update_redshift(db, df, table):
+    """
+    Loads the rows into a temporary table (through S3, like the inserts) and updates the table from it
+    """
+    staging = f'{table}_staging'
+    columns = [c for c in df.columns if c != 'sessionid']
+    db.pdredshift.exec_commit(f"CREATE TEMPORARY TABLE {staging} (LIKE {table});")
+    try:
+        insert_df(db.pdredshift, df, staging)
+        db.pdredshift.exec_commit(f"""UPDATE {table}
+                                      SET {','.join([f'{c} = {staging}.{c}' for c in columns])}
+                                      FROM {staging}
+                                      WHERE {table}.sessionid = {staging}.sessionid;""")
+    finally:
+        db.pdredshift.exec_commit(f"DROP TABLE IF EXISTS {staging};")
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from db.models import DetailedEvent, Event, Session, DATABASE
 
@@ -183,18 +184,117 @@ for col in Session.__dict__:
         sessions_col.append(col)
 
 
-def get_df_from_batch(batch, level):
-    if level == 'normal':
-        df = pd.DataFrame([b.__dict__ for b in batch], columns=events_col)
-    if level == 'detailed':
-        df = pd.DataFrame([b.__dict__ for b in batch], columns=detailed_events_col)
-    if level == 'sessions':
-        df = pd.DataFrame([b.__dict__ for b in batch], columns=sessions_col)
+columns_by_level = {'normal': events_col, 'detailed': detailed_events_col, 'sessions': sessions_col}
+dtypes_by_level = {'normal': dtypes_events, 'detailed': dtypes_detailed_events, 'sessions': dtypes_sessions}
+
+
+class _Row:
+    """
+    Values set by the handlers, without the SQLAlchemy instrumentation of the models.
+    As for a new model instance, the columns that were not set read as None.
+    """
+
+    def __init__(self, **values):
+        self.__dict__.update(values)
+
+
+EventRow = type('EventRow', (_Row,), dict.fromkeys(events_col))
+DetailedEventRow = type('DetailedEventRow', (_Row,), dict.fromkeys(detailed_events_col))
+SessionRow = type('SessionRow', (_Row,), dict.fromkeys(sessions_col))
+
+
+class ColumnarBatch:
+    """
+    Rows of a table stored by column, with the columns of the model and the types of the dtypes_* dicts.
+    Only the values that are set are kept, as (row indexes, values) per column, so appending a row costs
+    the number of attributes the handler set and the typed arrays are built once per column in to_df.
+    Batches are plain lists, they are cheap to pickle between processes and to concatenate (extend).
+    """
 
-    try:
-        df = df.drop('_sa_instance_state', axis=1)
-    except KeyError:
-        pass
+    def __init__(self, level):
+        self.level = level
+        self.columns = {column: ([], []) for column in columns_by_level[level]}
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, row):
+        """
+        :param row: dict or row object (EventRow, DetailedEventRow, SessionRow), keys that are not columns are ignored
+        """
+        i = self.size
+        columns = self.columns
+        for key, value in (row if isinstance(row, dict) else row.__dict__).items():
+            if value is None:
+                continue
+            column = columns.get(key)
+            if column is not None:
+                column[0].append(i)
+                column[1].append(value)
+        self.size += 1
+
+    def extend(self, batch):
+        offset = self.size
+        for key, (indexes, values) in batch.columns.items():
+            column = self.columns[key]
+            column[0].extend([i + offset for i in indexes] if offset else indexes)
+            column[1].extend(values)
+        self.size += batch.size
+
+    @classmethod
+    def from_rows(cls, level, rows):
+        batch = cls(level)
+        for row in rows:
+            batch.append(row)
+        return batch
+
+    def to_rows(self, start=0):
+        """
+        :param start: index of the first row to return
+        :return: one dict per row with the columns that are set
+        """
+        rows = [{} for _ in range(self.size - start)]
+        for key, (indexes, values) in self.columns.items():
+            for i, value in zip(indexes, values):
+                if i >= start:
+                    rows[i - start][key] = value
+        return rows
+
+    def __get_array(self, key, dtype):
+        indexes, values = self.columns[key]
+        if dtype == "Int64" or dtype == "boolean":
+            data = np.zeros(self.size, dtype=np.int64 if dtype == "Int64" else np.bool_)
+            mask = np.ones(self.size, dtype=np.bool_)
+            try:
+                data[indexes] = values
+            except (TypeError, ValueError, OverflowError):
+                # unexpected values, let pandas convert them (or raise) like astype would
+                return pd.array(self.__get_objects(indexes, values), dtype=dtype)
+            mask[indexes] = False
+            if dtype == "Int64":
+                return pd.arrays.IntegerArray(data, mask)
+            return pd.arrays.BooleanArray(data, mask)
+        objects = self.__get_objects(indexes, values)
+        if dtype == "string":
+            return pd.array(objects, dtype=dtype)
+        return objects
+
+    def __get_objects(self, indexes, values):
+        objects = np.full(self.size, None, dtype=object)
+        objects[indexes] = values
+        return objects
+
+    def to_df(self):
+        types = dtypes_by_level[self.level]
+        return pd.DataFrame({key: self.__get_array(key, types.get(key)) for key in self.columns},
+                            columns=columns_by_level[self.level])
+
+
+def get_df_from_batch(batch, level):
+    if not isinstance(batch, ColumnarBatch):
+        batch = ColumnarBatch.from_rows(level, batch)
+    df = batch.to_df()
 
     if level == 'normal':
         current_types = dtypes_events
@@ -216,8 +316,10 @@ def get_df_from_batch(batch, level):
     df = df.astype(current_types)
 
     if DATABASE == 'clickhouse' and level == 'sessions':
-        df['issues'] = df['issues'].fillna('')
-        df['urls'] = df['urls'].fillna('')
+        # not in the model, the arrays take their default value if the columns are missing
+        for x in ('issues', 'urls'):
+            if x in df.columns:
+                df[x] = df[x].fillna('')
 
     for x in df.columns:
         try:
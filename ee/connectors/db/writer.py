@@ -3,16 +3,15 @@ from decouple import config
 DATABASE = config('CLOUD_SERVICE')
 
 from db.api import DBConnection
-from db.utils import get_df_from_batch, dtypes_sessions
+from db.utils import get_df_from_batch
 from db.tables import *
 
 if DATABASE == 'redshift':
-    from db.loaders.redshift_loader import transit_insert_to_redshift
-    import pandas as pd
+    from db.loaders.redshift_loader import transit_insert_to_redshift, transit_update_redshift
 elif DATABASE == 'clickhouse':
     from db.loaders.clickhouse_loader import insert_to_clickhouse
 elif DATABASE == 'pg':
-    from db.loaders.postgres_loader import insert_to_postgres
+    from db.loaders.postgres_loader import insert_to_postgres, update_postgres
 elif DATABASE == 'bigquery':
     from db.loaders.bigquery_loader import insert_to_bigquery
     from bigquery_utils.create_table import create_tables_bigquery
@@ -70,23 +69,9 @@ def update_batch(db: DBConnection, batch, table):
     if len(batch) == 0:
         return
     df = get_df_from_batch(batch, level='sessions')
-    base_query = f"UPDATE {table} SET"
-    for column_name, column_type in dtypes_sessions.items():
-        if column_name == 'sessionid':
-            continue
-        elif column_type == 'string':
-            df[column_name] = df[column_name].fillna('NULL')
-            base_query += f" {column_name} = " + "'{" + f"{column_name}" + "}',"
-        else:
-            df[column_name] = df[column_name].fillna(0)
-            base_query += f" {column_name} = " + "{" + f"{column_name}" + "},"
-    base_query = base_query[:-1] + " WHERE sessionid = {sessionid};"
-    for i in range(len(df)):
-        if db.config == 'redshift':
-            params = dict(df.iloc[i])
-            query = base_query.format(**params)
-            try:
-                db.pdredshift.exec_commit(query)
-            except Exception as e:
-                print('[ERROR] Error while executing query')
-                print(repr(e))
+
+    if db.config == 'redshift':
+        transit_update_redshift(db=db, df=df, table=table)
+
+    if db.config == 'pg':
+        update_postgres(db=db, df=df, table=table)
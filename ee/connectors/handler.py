@@ -1,12 +1,12 @@
 from typing import Optional, Union
 
-from db.models import Event, DetailedEvent, Session
+from db.utils import DetailedEventRow, EventRow, SessionRow
 from messages import *
 
 
-def handle_normal_message(message: Message) -> Optional[Event]:
+def handle_normal_message(message: Message) -> Optional[EventRow]:
 
-    n = Event()
+    n = EventRow()
 
     if isinstance(message, ConnectionInformation):
         n.connectioninformation_downlink = message.downlink
@@ -95,10 +95,10 @@ def handle_normal_message(message: Message) -> Optional[Event]:
         return n
 
 
-def handle_session(n: Session, message: Message) -> Optional[Session]:
+def handle_session(n: SessionRow, message: Message) -> Optional[SessionRow]:
 
     if not n:
-        n = Session()
+        n = SessionRow()
 
     if isinstance(message, SessionStart):
         n.session_start_timestamp = message.timestamp
@@ -124,12 +124,6 @@ def handle_session(n: Session, message: Message) -> Optional[Session]:
             pass
         return n
 
-    if isinstance(message, BatchMeta):
-        n.batchmeta_page_no = message.page_no
-        n.batchmeta_first_index = message.first_index
-        n.batchmeta_timestamp = message.timestamp
-        return n
-
     if isinstance(message, BatchMetadata):
         n.batchmetadata_version = message.version
         n.batchmetadata_page_no = message.page_no
@@ -199,7 +193,7 @@ def handle_session(n: Session, message: Message) -> Optional[Session]:
         n.user_anonymous_id = message.id
         return n
 
-    if isinstance(message, JSException) or isinstance(message, JSExceptionDeprecated):
+    if isinstance(message, JSException):
         try:
             n.js_exceptions_count += 1
         except TypeError:
@@ -238,7 +232,7 @@ def handle_session(n: Session, message: Message) -> Optional[Session]:
             n.clicks_count = 1
         return n
 
-    if isinstance(message, IssueEvent) or isinstance(message, IssueEventDeprecated):
+    if isinstance(message, IssueEvent):
         try:
             n.issues_count += 1
         except TypeError:
@@ -251,8 +245,8 @@ def handle_session(n: Session, message: Message) -> Optional[Session]:
         return n
 
 
-def handle_message(message: Message) -> Optional[DetailedEvent]:
-    n = DetailedEvent()
+def handle_message(message: Message) -> Optional[DetailedEventRow]:
+    n = DetailedEventRow()
 
     # if isinstance(message, SessionEnd):
     #     n.sessionend = True
@@ -360,12 +354,6 @@ def handle_message(message: Message) -> Optional[DetailedEvent]:
         n.metadata_value = message.value
         return n
 
-    if isinstance(message, BatchMeta):
-        n.batchmeta_page_no = message.page_no
-        n.batchmeta_first_index = message.first_index
-        n.batchmeta_timestamp = message.timestamp
-        return n
-
     if isinstance(message, BatchMetadata):
         n.batchmetadata_version = message.version
         n.batchmetadata_page_no = message.page_no
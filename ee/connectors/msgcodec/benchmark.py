@@ -0,0 +1,200 @@
+"""
+Decoding throughput of the message codecs on Kafka batches.
+
+    python3 benchmark.py                                   # synthetic batches
+    python3 benchmark.py --record batches.bin --count 5000  # records batches from the TOPICS (KAFKA_* env variables)
+    python3 benchmark.py --batches batches.bin              # replays recorded batches
+
+Run it from the msgcodec directory; if the modules were built in place (build_modules.sh without the install/cleanup
+steps) the compiled versions are picked up instead of the .py ones.
+Recorded batches are stored as <uint32 little endian length><kafka message value>.
+"""
+import argparse
+import importlib.machinery
+import importlib.util
+import os
+import random
+import string
+import struct
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+import codec as py_codec
+import messages
+
+# msgcodec.py uses the package imports
+sys.modules.setdefault("msgcodec.codec", py_codec)
+sys.modules.setdefault("msgcodec.messages", messages)
+
+import fastcodec
+
+DEFAULT_SELECTOR = [1, 4, 21, 22, 25, 27, 28, 29, 30, 31, 32, 39, 48, 54, 56, 59, 62, 64, 69, 78, 125, 126]
+
+
+def load_source_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def is_compiled(module):
+    return any(module.__file__.endswith(s) for s in importlib.machinery.EXTENSION_SUFFIXES)
+
+
+def get_codecs(selector):
+    codecs = []
+    legacy = load_source_module("legacy_msgcodec", os.path.join(HERE, "msgcodec.py"))
+    codecs.append(("msgcodec.py", legacy))
+    compiled = importlib.import_module("msgcodec")
+    if is_compiled(compiled):
+        codecs.append(("msgcodec.pyx", compiled))
+    result = []
+    for name, module in codecs:
+        result.append((name, module.MessageCodec(list(selector))))
+    result.append((f"fastcodec{' (compiled)' if is_compiled(fastcodec) else ''}",
+                   fastcodec.FastMessageCodec(selector)))
+    return result
+
+
+def write_uint(out: bytearray, x: int):
+    while x >= 0x80:
+        out.append(x & 0x7f | 0x80)
+        x >>= 7
+    out.append(x)
+
+
+def write_int(out: bytearray, x: int):
+    write_uint(out, x << 1 if x >= 0 else (~x << 1) | 1)
+
+
+def write_string(out: bytearray, x: str):
+    b = x.encode("utf-8")
+    write_uint(out, len(b))
+    out += b
+
+
+def write_boolean(out: bytearray, x: bool):
+    out.append(1 if x else 0)
+
+
+WRITERS = {"uint": write_uint, "int": write_int, "string": write_string, "boolean": write_boolean}
+GENERATORS = {"uint": lambda: random.choice([random.randint(0, 127), random.randint(0, 2 ** 42)]),
+              "int": lambda: random.randint(-2 ** 31, 2 ** 31),
+              "string": lambda: "".join(random.choices(string.ascii_letters + "/.:-_",
+                                                       k=random.choice([0, 8, 24, 120]))),
+              "boolean": lambda: random.random() > 0.5}
+
+
+def encode_message(message_id, with_size: bool) -> bytearray:
+    payload = bytearray()
+    for t in fastcodec.MESSAGES[message_id][3]:
+        WRITERS[t](payload, GENERATORS[t]())
+    out = bytearray()
+    write_uint(out, message_id)
+    if with_size:
+        out += len(payload).to_bytes(3, "little")
+    out += payload
+    return out
+
+
+def synthetic_batches(count, messages_per_batch):
+    ids = [i for i in fastcodec.MESSAGES.keys() if i != messages.BatchMetadata.__id__]
+    batches = []
+    for _ in range(count):
+        b = bytearray()
+        write_uint(b, messages.BatchMetadata.__id__)
+        for v, t in zip([1, 0, 0, int(time.time() * 1000), "https://example.com/page"],
+                        fastcodec.MESSAGES[messages.BatchMetadata.__id__][3]):
+            WRITERS[t](b, v)
+        for _ in range(messages_per_batch):
+            b += encode_message(random.choice(ids), with_size=True)
+        batches.append(bytes(b))
+    return batches
+
+
+def record_batches(path, count):
+    from confluent_kafka import Consumer
+    from decouple import config
+
+    settings = {"bootstrap.servers": config("KAFKA_SERVERS"),
+                "group.id": "connector_benchmark",
+                "auto.offset.reset": "earliest",
+                "enable.auto.commit": False}
+    if config("KAFKA_USE_SSL", default=True, cast=bool):
+        settings["security.protocol"] = "SSL"
+    consumer = Consumer(settings)
+    consumer.subscribe(config("TOPICS", default="saas-raw").split(","))
+    recorded = 0
+    with open(path, "wb") as f:
+        while recorded < count:
+            msg = consumer.poll(1.0)
+            if msg is None or msg.error():
+                continue
+            f.write(struct.pack("<I", len(msg.value())))
+            f.write(msg.value())
+            recorded += 1
+    consumer.close()
+    print(f"{recorded} batches recorded in {path}")
+
+
+def read_batches(path):
+    batches = []
+    with open(path, "rb") as f:
+        while header := f.read(4):
+            batches.append(f.read(struct.unpack("<I", header)[0]))
+    return batches
+
+
+def as_values(m):
+    return m.__id__, tuple(getattr(m, c) for c in fastcodec.MESSAGES[m.__id__][2])
+
+
+def run(batches, selector, repeat):
+    total_bytes = sum(len(b) for b in batches)
+    print(f"{len(batches)} batches, {total_bytes / 1024 / 1024:.1f}MB, selector: {len(selector)} message types")
+    reference = None
+    for name, c in get_codecs(selector):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            decoded = [c.decode_detailed(b) for b in batches]
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        n = sum(len(d) for d in decoded)
+        values = [[as_values(m) for m in d] for d in decoded]
+        if reference is None:
+            reference = values
+            diff = ""
+        else:
+            diff = f", {sum(x != y for r, v in zip(reference, values) for x, y in zip(r, v))} messages differ"
+        print(f"{name:<24} decode_detailed: {best:8.3f}s {total_bytes / best / 1024 / 1024:8.1f}MB/s "
+              f"{n} messages{diff}")
+        if isinstance(c, fastcodec.FastMessageCodec):
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                c.decode_batch(enumerate(batches))
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            print(f"{name:<24} decode_batch:    {best:8.3f}s {total_bytes / best / 1024 / 1024:8.1f}MB/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batches", help="file of recorded batches")
+    parser.add_argument("--record", help="record batches from kafka into this file and exit")
+    parser.add_argument("--count", type=int, default=2000, help="number of batches to record/generate")
+    parser.add_argument("--messages", type=int, default=200, help="messages per generated batch")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--selector", help="comma separated message ids to decode")
+    args = parser.parse_args()
+    if args.record:
+        record_batches(args.record, args.count)
+        sys.exit(0)
+    selector = DEFAULT_SELECTOR if args.selector is None else [int(i) for i in args.selector.split(",")]
+    run(batches=read_batches(args.batches) if args.batches else synthetic_batches(args.count, args.messages),
+        selector=selector, repeat=args.repeat)
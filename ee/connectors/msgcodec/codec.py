@@ -8,7 +8,7 @@ class Codec:
     @staticmethod
     def read_boolean(reader: io.BytesIO):
         b = reader.read(1)
-        return b == 1
+        return b == b'\x01'
 
     @staticmethod
     def read_uint(reader: io.BytesIO):
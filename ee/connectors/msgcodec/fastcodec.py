@@ -0,0 +1,2251 @@
+# Auto-generated, do not edit
+
+from messages import *
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def read_uint(view, pos: int) -> Tuple[int, int]:
+    b = view[pos]
+    if b < 0x80:
+        return b, pos + 1
+    x = b & 0x7f
+    s = 7
+    pos += 1
+    while True:
+        b = view[pos]
+        pos += 1
+        if b < 0x80:
+            if s > 63:
+                raise OverflowError()
+            return x | b << s, pos
+        x |= (b & 0x7f) << s
+        s += 7
+
+
+def read_int(view, pos: int) -> Tuple[int, int]:
+    ux, pos = read_uint(view, pos)
+    x = ux >> 1
+    if ux & 1 != 0:
+        x = - x - 1
+    return x, pos
+
+
+def read_boolean(view, pos: int) -> Tuple[bool, int]:
+    return view[pos] == 1, pos + 1
+
+
+def read_string(view, pos: int) -> Tuple[str, int]:
+    length, pos = read_uint(view, pos)
+    end = pos + length
+    if end > len(view):
+        raise IndexError('bytes out of range')
+    return str(view[pos:end], "utf-8", "replace").replace("\x00", "\uFFFD"), end
+
+
+def read_size(view, pos: int) -> Tuple[int, int]:
+    if pos + 3 > len(view):
+        raise IndexError('bytes out of range')
+    return view[pos] | view[pos + 1] << 8 | view[pos + 2] << 16, pos + 3
+
+
+def read_0(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    return (v0,), pos
+
+
+def read_1(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    v4, pos = read_string(view, pos)
+    v5, pos = read_string(view, pos)
+    v6, pos = read_string(view, pos)
+    v7, pos = read_string(view, pos)
+    v8, pos = read_string(view, pos)
+    v9, pos = read_string(view, pos)
+    v10, pos = read_string(view, pos)
+    v11, pos = read_string(view, pos)
+    v12 = view[pos]
+    if v12 < 0x80:
+        pos += 1
+    else:
+        v12, pos = read_uint(view, pos)
+    v13 = view[pos]
+    if v13 < 0x80:
+        pos += 1
+    else:
+        v13, pos = read_uint(view, pos)
+    v14, pos = read_string(view, pos)
+    v15, pos = read_string(view, pos)
+    return (v0, v1, v2, v3, v4, v5, v6, v7, v8, v9, v10, v11, v12, v13, v14, v15,), pos
+
+
+def read_4(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1, pos = read_string(view, pos)
+    v2 = view[pos]
+    if v2 < 0x80:
+        pos += 1
+    else:
+        v2, pos = read_uint(view, pos)
+    return (v0, v1, v2,), pos
+
+
+def read_5(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    return (v0, v1,), pos
+
+
+def read_6(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_int(view, pos)
+    v1, pos = read_int(view, pos)
+    return (v0, v1,), pos
+
+
+def read_7(view, pos: int) -> Tuple[tuple, int]:
+    return (), pos
+
+
+def read_8(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2 = view[pos]
+    if v2 < 0x80:
+        pos += 1
+    else:
+        v2, pos = read_uint(view, pos)
+    v3, pos = read_string(view, pos)
+    v4 = view[pos] == 1
+    pos += 1
+    return (v0, v1, v2, v3, v4,), pos
+
+
+def read_9(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2 = view[pos]
+    if v2 < 0x80:
+        pos += 1
+    else:
+        v2, pos = read_uint(view, pos)
+    return (v0, v1, v2,), pos
+
+
+def read_10(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2 = view[pos]
+    if v2 < 0x80:
+        pos += 1
+    else:
+        v2, pos = read_uint(view, pos)
+    return (v0, v1, v2,), pos
+
+
+def read_11(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    return (v0,), pos
+
+
+def read_12(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1, pos = read_string(view, pos)
+    v2, pos = read_string(view, pos)
+    return (v0, v1, v2,), pos
+
+
+def read_13(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1, pos = read_string(view, pos)
+    return (v0, v1,), pos
+
+
+def read_14(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1, pos = read_string(view, pos)
+    return (v0, v1,), pos
+
+
+def read_15(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1, pos = read_string(view, pos)
+    return (v0, v1,), pos
+
+
+def read_16(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1, pos = read_int(view, pos)
+    v2, pos = read_int(view, pos)
+    return (v0, v1, v2,), pos
+
+
+def read_17(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1, pos = read_string(view, pos)
+    return (v0, v1,), pos
+
+
+def read_18(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1, pos = read_string(view, pos)
+    v2, pos = read_int(view, pos)
+    return (v0, v1, v2,), pos
+
+
+def read_19(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos] == 1
+    pos += 1
+    return (v0, v1,), pos
+
+
+def read_20(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    return (v0, v1,), pos
+
+
+def read_21(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1, pos = read_string(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    v4, pos = read_string(view, pos)
+    v5 = view[pos]
+    if v5 < 0x80:
+        pos += 1
+    else:
+        v5, pos = read_uint(view, pos)
+    v6 = view[pos]
+    if v6 < 0x80:
+        pos += 1
+    else:
+        v6, pos = read_uint(view, pos)
+    v7 = view[pos]
+    if v7 < 0x80:
+        pos += 1
+    else:
+        v7, pos = read_uint(view, pos)
+    return (v0, v1, v2, v3, v4, v5, v6, v7,), pos
+
+
+def read_22(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1, pos = read_string(view, pos)
+    return (v0, v1,), pos
+
+
+def read_23(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2 = view[pos]
+    if v2 < 0x80:
+        pos += 1
+    else:
+        v2, pos = read_uint(view, pos)
+    v3 = view[pos]
+    if v3 < 0x80:
+        pos += 1
+    else:
+        v3, pos = read_uint(view, pos)
+    v4 = view[pos]
+    if v4 < 0x80:
+        pos += 1
+    else:
+        v4, pos = read_uint(view, pos)
+    v5 = view[pos]
+    if v5 < 0x80:
+        pos += 1
+    else:
+        v5, pos = read_uint(view, pos)
+    v6 = view[pos]
+    if v6 < 0x80:
+        pos += 1
+    else:
+        v6, pos = read_uint(view, pos)
+    v7 = view[pos]
+    if v7 < 0x80:
+        pos += 1
+    else:
+        v7, pos = read_uint(view, pos)
+    v8 = view[pos]
+    if v8 < 0x80:
+        pos += 1
+    else:
+        v8, pos = read_uint(view, pos)
+    return (v0, v1, v2, v3, v4, v5, v6, v7, v8,), pos
+
+
+def read_24(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2 = view[pos]
+    if v2 < 0x80:
+        pos += 1
+    else:
+        v2, pos = read_uint(view, pos)
+    return (v0, v1, v2,), pos
+
+
+def read_26(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1, pos = read_string(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    v4, pos = read_string(view, pos)
+    return (v0, v1, v2, v3, v4,), pos
+
+
+def read_27(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1, pos = read_string(view, pos)
+    return (v0, v1,), pos
+
+
+def read_28(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    return (v0,), pos
+
+
+def read_29(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    return (v0,), pos
+
+
+def read_30(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1, pos = read_string(view, pos)
+    return (v0, v1,), pos
+
+
+def read_31(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    v4 = view[pos] == 1
+    pos += 1
+    v5 = view[pos]
+    if v5 < 0x80:
+        pos += 1
+    else:
+        v5, pos = read_uint(view, pos)
+    v6 = view[pos]
+    if v6 < 0x80:
+        pos += 1
+    else:
+        v6, pos = read_uint(view, pos)
+    v7 = view[pos]
+    if v7 < 0x80:
+        pos += 1
+    else:
+        v7, pos = read_uint(view, pos)
+    v8 = view[pos]
+    if v8 < 0x80:
+        pos += 1
+    else:
+        v8, pos = read_uint(view, pos)
+    v9 = view[pos]
+    if v9 < 0x80:
+        pos += 1
+    else:
+        v9, pos = read_uint(view, pos)
+    v10 = view[pos]
+    if v10 < 0x80:
+        pos += 1
+    else:
+        v10, pos = read_uint(view, pos)
+    v11 = view[pos]
+    if v11 < 0x80:
+        pos += 1
+    else:
+        v11, pos = read_uint(view, pos)
+    v12 = view[pos]
+    if v12 < 0x80:
+        pos += 1
+    else:
+        v12, pos = read_uint(view, pos)
+    v13 = view[pos]
+    if v13 < 0x80:
+        pos += 1
+    else:
+        v13, pos = read_uint(view, pos)
+    v14 = view[pos]
+    if v14 < 0x80:
+        pos += 1
+    else:
+        v14, pos = read_uint(view, pos)
+    v15 = view[pos]
+    if v15 < 0x80:
+        pos += 1
+    else:
+        v15, pos = read_uint(view, pos)
+    v16 = view[pos]
+    if v16 < 0x80:
+        pos += 1
+    else:
+        v16, pos = read_uint(view, pos)
+    return (v0, v1, v2, v3, v4, v5, v6, v7, v8, v9, v10, v11, v12, v13, v14, v15, v16,), pos
+
+
+def read_32(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    v3 = view[pos] == 1
+    pos += 1
+    v4, pos = read_string(view, pos)
+    return (v0, v1, v2, v3, v4,), pos
+
+
+def read_33(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    v4 = view[pos] == 1
+    pos += 1
+    v5 = view[pos]
+    if v5 < 0x80:
+        pos += 1
+    else:
+        v5, pos = read_uint(view, pos)
+    v6 = view[pos]
+    if v6 < 0x80:
+        pos += 1
+    else:
+        v6, pos = read_uint(view, pos)
+    v7 = view[pos]
+    if v7 < 0x80:
+        pos += 1
+    else:
+        v7, pos = read_uint(view, pos)
+    v8 = view[pos]
+    if v8 < 0x80:
+        pos += 1
+    else:
+        v8, pos = read_uint(view, pos)
+    v9 = view[pos]
+    if v9 < 0x80:
+        pos += 1
+    else:
+        v9, pos = read_uint(view, pos)
+    v10 = view[pos]
+    if v10 < 0x80:
+        pos += 1
+    else:
+        v10, pos = read_uint(view, pos)
+    v11 = view[pos]
+    if v11 < 0x80:
+        pos += 1
+    else:
+        v11, pos = read_uint(view, pos)
+    v12 = view[pos]
+    if v12 < 0x80:
+        pos += 1
+    else:
+        v12, pos = read_uint(view, pos)
+    v13 = view[pos]
+    if v13 < 0x80:
+        pos += 1
+    else:
+        v13, pos = read_uint(view, pos)
+    v14 = view[pos]
+    if v14 < 0x80:
+        pos += 1
+    else:
+        v14, pos = read_uint(view, pos)
+    v15 = view[pos]
+    if v15 < 0x80:
+        pos += 1
+    else:
+        v15, pos = read_uint(view, pos)
+    v16 = view[pos]
+    if v16 < 0x80:
+        pos += 1
+    else:
+        v16, pos = read_uint(view, pos)
+    v17, pos = read_string(view, pos)
+    return (v0, v1, v2, v3, v4, v5, v6, v7, v8, v9, v10, v11, v12, v13, v14, v15, v16, v17,), pos
+
+
+def read_34(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1, pos = read_string(view, pos)
+    return (v0, v1,), pos
+
+
+def read_35(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2 = view[pos]
+    if v2 < 0x80:
+        pos += 1
+    else:
+        v2, pos = read_uint(view, pos)
+    return (v0, v1, v2,), pos
+
+
+def read_40(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    return (v0, v1, v2, v3,), pos
+
+
+def read_41(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1, pos = read_string(view, pos)
+    return (v0, v1,), pos
+
+
+def read_42(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    return (v0,), pos
+
+
+def read_44(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1, pos = read_string(view, pos)
+    v2 = view[pos]
+    if v2 < 0x80:
+        pos += 1
+    else:
+        v2, pos = read_uint(view, pos)
+    return (v0, v1, v2,), pos
+
+
+def read_45(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1, pos = read_string(view, pos)
+    return (v0, v1,), pos
+
+
+def read_46(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1, pos = read_string(view, pos)
+    return (v0, v1,), pos
+
+
+def read_47(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1, pos = read_string(view, pos)
+    v2 = view[pos]
+    if v2 < 0x80:
+        pos += 1
+    else:
+        v2, pos = read_uint(view, pos)
+    return (v0, v1, v2,), pos
+
+
+def read_48(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1, pos = read_string(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    v4, pos = read_int(view, pos)
+    return (v0, v1, v2, v3, v4,), pos
+
+
+def read_49(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_int(view, pos)
+    v1, pos = read_int(view, pos)
+    v2 = view[pos]
+    if v2 < 0x80:
+        pos += 1
+    else:
+        v2, pos = read_uint(view, pos)
+    v3 = view[pos]
+    if v3 < 0x80:
+        pos += 1
+    else:
+        v3, pos = read_uint(view, pos)
+    return (v0, v1, v2, v3,), pos
+
+
+def read_50(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1, pos = read_string(view, pos)
+    return (v0, v1,), pos
+
+
+def read_51(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2 = view[pos]
+    if v2 < 0x80:
+        pos += 1
+    else:
+        v2, pos = read_uint(view, pos)
+    return (v0, v1, v2,), pos
+
+
+def read_43(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1, pos = read_string(view, pos)
+    return (v0, v1,), pos
+
+
+def read_52(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1, pos = read_string(view, pos)
+    v2, pos = read_string(view, pos)
+    return (v0, v1, v2,), pos
+
+
+def read_53(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2 = view[pos]
+    if v2 < 0x80:
+        pos += 1
+    else:
+        v2, pos = read_uint(view, pos)
+    v3 = view[pos]
+    if v3 < 0x80:
+        pos += 1
+    else:
+        v3, pos = read_uint(view, pos)
+    v4 = view[pos]
+    if v4 < 0x80:
+        pos += 1
+    else:
+        v4, pos = read_uint(view, pos)
+    v5 = view[pos]
+    if v5 < 0x80:
+        pos += 1
+    else:
+        v5, pos = read_uint(view, pos)
+    v6, pos = read_string(view, pos)
+    v7, pos = read_string(view, pos)
+    return (v0, v1, v2, v3, v4, v5, v6, v7,), pos
+
+
+def read_54(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1, pos = read_string(view, pos)
+    return (v0, v1,), pos
+
+
+def read_55(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos] == 1
+    pos += 1
+    return (v0,), pos
+
+
+def read_56(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2 = view[pos]
+    if v2 < 0x80:
+        pos += 1
+    else:
+        v2, pos = read_uint(view, pos)
+    v3 = view[pos]
+    if v3 < 0x80:
+        pos += 1
+    else:
+        v3, pos = read_uint(view, pos)
+    v4 = view[pos]
+    if v4 < 0x80:
+        pos += 1
+    else:
+        v4, pos = read_uint(view, pos)
+    v5 = view[pos]
+    if v5 < 0x80:
+        pos += 1
+    else:
+        v5, pos = read_uint(view, pos)
+    v6 = view[pos]
+    if v6 < 0x80:
+        pos += 1
+    else:
+        v6, pos = read_uint(view, pos)
+    v7 = view[pos]
+    if v7 < 0x80:
+        pos += 1
+    else:
+        v7, pos = read_uint(view, pos)
+    v8 = view[pos]
+    if v8 < 0x80:
+        pos += 1
+    else:
+        v8, pos = read_uint(view, pos)
+    v9 = view[pos]
+    if v9 < 0x80:
+        pos += 1
+    else:
+        v9, pos = read_uint(view, pos)
+    v10 = view[pos]
+    if v10 < 0x80:
+        pos += 1
+    else:
+        v10, pos = read_uint(view, pos)
+    v11 = view[pos]
+    if v11 < 0x80:
+        pos += 1
+    else:
+        v11, pos = read_uint(view, pos)
+    v12 = view[pos]
+    if v12 < 0x80:
+        pos += 1
+    else:
+        v12, pos = read_uint(view, pos)
+    v13 = view[pos]
+    if v13 < 0x80:
+        pos += 1
+    else:
+        v13, pos = read_uint(view, pos)
+    return (v0, v1, v2, v3, v4, v5, v6, v7, v8, v9, v10, v11, v12, v13,), pos
+
+
+def read_57(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1, pos = read_string(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    return (v0, v1, v2, v3,), pos
+
+
+def read_58(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_int(view, pos)
+    return (v0,), pos
+
+
+def read_60(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1, pos = read_string(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    return (v0, v1, v2, v3,), pos
+
+
+def read_61(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1, pos = read_string(view, pos)
+    v2, pos = read_string(view, pos)
+    return (v0, v1, v2,), pos
+
+
+def read_63(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1, pos = read_string(view, pos)
+    return (v0, v1,), pos
+
+
+def read_64(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1, pos = read_string(view, pos)
+    return (v0, v1,), pos
+
+
+def read_66(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    return (v0,), pos
+
+
+def read_68(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    v4 = view[pos]
+    if v4 < 0x80:
+        pos += 1
+    else:
+        v4, pos = read_uint(view, pos)
+    v5 = view[pos]
+    if v5 < 0x80:
+        pos += 1
+    else:
+        v5, pos = read_uint(view, pos)
+    return (v0, v1, v2, v3, v4, v5,), pos
+
+
+def read_69(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    return (v0, v1, v2, v3,), pos
+
+
+def read_70(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    return (v0, v1,), pos
+
+
+def read_71(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1, pos = read_string(view, pos)
+    v2, pos = read_string(view, pos)
+    return (v0, v1, v2,), pos
+
+
+def read_72(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1, pos = read_string(view, pos)
+    return (v0, v1,), pos
+
+
+def read_73(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1, pos = read_string(view, pos)
+    v2 = view[pos]
+    if v2 < 0x80:
+        pos += 1
+    else:
+        v2, pos = read_uint(view, pos)
+    v3, pos = read_string(view, pos)
+    return (v0, v1, v2, v3,), pos
+
+
+def read_74(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1, pos = read_string(view, pos)
+    v2 = view[pos]
+    if v2 < 0x80:
+        pos += 1
+    else:
+        v2, pos = read_uint(view, pos)
+    return (v0, v1, v2,), pos
+
+
+def read_75(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    return (v0, v1,), pos
+
+
+def read_76(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    return (v0, v1,), pos
+
+
+def read_77(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    return (v0, v1,), pos
+
+
+def read_78(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1, pos = read_string(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    return (v0, v1, v2, v3,), pos
+
+
+def read_79(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1, pos = read_string(view, pos)
+    return (v0, v1,), pos
+
+
+def read_81(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2 = view[pos]
+    if v2 < 0x80:
+        pos += 1
+    else:
+        v2, pos = read_uint(view, pos)
+    v3, pos = read_int(view, pos)
+    v4, pos = read_string(view, pos)
+    return (v0, v1, v2, v3, v4,), pos
+
+
+def read_82(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    return (v0, v1,), pos
+
+
+def read_83(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1, pos = read_string(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    v4, pos = read_string(view, pos)
+    v5 = view[pos]
+    if v5 < 0x80:
+        pos += 1
+    else:
+        v5, pos = read_uint(view, pos)
+    v6 = view[pos]
+    if v6 < 0x80:
+        pos += 1
+    else:
+        v6, pos = read_uint(view, pos)
+    v7 = view[pos]
+    if v7 < 0x80:
+        pos += 1
+    else:
+        v7, pos = read_uint(view, pos)
+    v8 = view[pos]
+    if v8 < 0x80:
+        pos += 1
+    else:
+        v8, pos = read_uint(view, pos)
+    return (v0, v1, v2, v3, v4, v5, v6, v7, v8,), pos
+
+
+def read_84(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1, pos = read_string(view, pos)
+    v2, pos = read_string(view, pos)
+    v3 = view[pos]
+    if v3 < 0x80:
+        pos += 1
+    else:
+        v3, pos = read_uint(view, pos)
+    v4, pos = read_string(view, pos)
+    v5, pos = read_string(view, pos)
+    return (v0, v1, v2, v3, v4, v5,), pos
+
+
+def read_112(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1, pos = read_string(view, pos)
+    v2 = view[pos] == 1
+    pos += 1
+    v3, pos = read_string(view, pos)
+    v4, pos = read_int(view, pos)
+    v5, pos = read_int(view, pos)
+    return (v0, v1, v2, v3, v4, v5,), pos
+
+
+def read_113(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    return (v0, v1, v2,), pos
+
+
+def read_114(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    return (v0,), pos
+
+
+def read_115(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    return (v0,), pos
+
+
+def read_116(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2 = view[pos]
+    if v2 < 0x80:
+        pos += 1
+    else:
+        v2, pos = read_uint(view, pos)
+    v3 = view[pos]
+    if v3 < 0x80:
+        pos += 1
+    else:
+        v3, pos = read_uint(view, pos)
+    v4 = view[pos]
+    if v4 < 0x80:
+        pos += 1
+    else:
+        v4, pos = read_uint(view, pos)
+    v5 = view[pos]
+    if v5 < 0x80:
+        pos += 1
+    else:
+        v5, pos = read_uint(view, pos)
+    v6, pos = read_string(view, pos)
+    v7, pos = read_string(view, pos)
+    v8 = view[pos]
+    if v8 < 0x80:
+        pos += 1
+    else:
+        v8, pos = read_uint(view, pos)
+    v9 = view[pos] == 1
+    pos += 1
+    return (v0, v1, v2, v3, v4, v5, v6, v7, v8, v9,), pos
+
+
+def read_117(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    return (v0,), pos
+
+
+def read_118(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    return (v0,), pos
+
+
+def read_119(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    return (v0, v1,), pos
+
+
+def read_120(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_int(view, pos)
+    return (v0,), pos
+
+
+def read_121(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1, pos = read_string(view, pos)
+    v2 = view[pos]
+    if v2 < 0x80:
+        pos += 1
+    else:
+        v2, pos = read_uint(view, pos)
+    v3 = view[pos]
+    if v3 < 0x80:
+        pos += 1
+    else:
+        v3, pos = read_uint(view, pos)
+    return (v0, v1, v2, v3,), pos
+
+
+def read_122(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1, pos = read_string(view, pos)
+    v2 = view[pos]
+    if v2 < 0x80:
+        pos += 1
+    else:
+        v2, pos = read_uint(view, pos)
+    v3, pos = read_string(view, pos)
+    return (v0, v1, v2, v3,), pos
+
+
+def read_123(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1, pos = read_string(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    v4 = view[pos]
+    if v4 < 0x80:
+        pos += 1
+    else:
+        v4, pos = read_uint(view, pos)
+    return (v0, v1, v2, v3, v4,), pos
+
+
+def read_124(view, pos: int) -> Tuple[tuple, int]:
+    v0, pos = read_string(view, pos)
+    v1, pos = read_string(view, pos)
+    return (v0, v1,), pos
+
+
+def read_125(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    v4, pos = read_string(view, pos)
+    v5, pos = read_string(view, pos)
+    v6, pos = read_string(view, pos)
+    return (v0, v1, v2, v3, v4, v5, v6,), pos
+
+
+def read_126(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1, pos = read_string(view, pos)
+    return (v0, v1,), pos
+
+
+def read_127(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    return (v0, v1,), pos
+
+
+def read_90(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    v4, pos = read_string(view, pos)
+    v5, pos = read_string(view, pos)
+    v6, pos = read_string(view, pos)
+    v7, pos = read_string(view, pos)
+    v8, pos = read_string(view, pos)
+    v9, pos = read_string(view, pos)
+    return (v0, v1, v2, v3, v4, v5, v6, v7, v8, v9,), pos
+
+
+def read_91(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    return (v0,), pos
+
+
+def read_92(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    return (v0, v1, v2, v3,), pos
+
+
+def read_93(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    return (v0, v1, v2, v3,), pos
+
+
+def read_94(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    return (v0, v1, v2,), pos
+
+
+def read_95(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    return (v0, v1, v2,), pos
+
+
+def read_96(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2 = view[pos]
+    if v2 < 0x80:
+        pos += 1
+    else:
+        v2, pos = read_uint(view, pos)
+    v3 = view[pos]
+    if v3 < 0x80:
+        pos += 1
+    else:
+        v3, pos = read_uint(view, pos)
+    v4 = view[pos]
+    if v4 < 0x80:
+        pos += 1
+    else:
+        v4, pos = read_uint(view, pos)
+    v5 = view[pos]
+    if v5 < 0x80:
+        pos += 1
+    else:
+        v5, pos = read_uint(view, pos)
+    return (v0, v1, v2, v3, v4, v5,), pos
+
+
+def read_97(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    v4, pos = read_string(view, pos)
+    return (v0, v1, v2, v3, v4,), pos
+
+
+def read_98(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    v4 = view[pos] == 1
+    pos += 1
+    return (v0, v1, v2, v3, v4,), pos
+
+
+def read_100(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    v3 = view[pos]
+    if v3 < 0x80:
+        pos += 1
+    else:
+        v3, pos = read_uint(view, pos)
+    v4 = view[pos]
+    if v4 < 0x80:
+        pos += 1
+    else:
+        v4, pos = read_uint(view, pos)
+    return (v0, v1, v2, v3, v4,), pos
+
+
+def read_101(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    v3 = view[pos] == 1
+    pos += 1
+    v4, pos = read_string(view, pos)
+    return (v0, v1, v2, v3, v4,), pos
+
+
+def read_102(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    v3 = view[pos]
+    if v3 < 0x80:
+        pos += 1
+    else:
+        v3, pos = read_uint(view, pos)
+    return (v0, v1, v2, v3,), pos
+
+
+def read_103(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    return (v0, v1, v2, v3,), pos
+
+
+def read_104(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    return (v0, v1, v2,), pos
+
+
+def read_105(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    v4, pos = read_string(view, pos)
+    v5, pos = read_string(view, pos)
+    v6, pos = read_string(view, pos)
+    v7 = view[pos]
+    if v7 < 0x80:
+        pos += 1
+    else:
+        v7, pos = read_uint(view, pos)
+    v8 = view[pos]
+    if v8 < 0x80:
+        pos += 1
+    else:
+        v8, pos = read_uint(view, pos)
+    return (v0, v1, v2, v3, v4, v5, v6, v7, v8,), pos
+
+
+def read_106(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2, pos = read_string(view, pos)
+    v3 = view[pos]
+    if v3 < 0x80:
+        pos += 1
+    else:
+        v3, pos = read_uint(view, pos)
+    v4 = view[pos]
+    if v4 < 0x80:
+        pos += 1
+    else:
+        v4, pos = read_uint(view, pos)
+    v5, pos = read_string(view, pos)
+    return (v0, v1, v2, v3, v4, v5,), pos
+
+
+def read_107(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2 = view[pos]
+    if v2 < 0x80:
+        pos += 1
+    else:
+        v2, pos = read_uint(view, pos)
+    return (v0, v1, v2,), pos
+
+
+def read_110(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1 = view[pos]
+    if v1 < 0x80:
+        pos += 1
+    else:
+        v1, pos = read_uint(view, pos)
+    v2 = view[pos]
+    if v2 < 0x80:
+        pos += 1
+    else:
+        v2, pos = read_uint(view, pos)
+    v3 = view[pos]
+    if v3 < 0x80:
+        pos += 1
+    else:
+        v3, pos = read_uint(view, pos)
+    v4 = view[pos]
+    if v4 < 0x80:
+        pos += 1
+    else:
+        v4, pos = read_uint(view, pos)
+    v5 = view[pos]
+    if v5 < 0x80:
+        pos += 1
+    else:
+        v5, pos = read_uint(view, pos)
+    v6 = view[pos]
+    if v6 < 0x80:
+        pos += 1
+    else:
+        v6, pos = read_uint(view, pos)
+    v7 = view[pos]
+    if v7 < 0x80:
+        pos += 1
+    else:
+        v7, pos = read_uint(view, pos)
+    v8 = view[pos]
+    if v8 < 0x80:
+        pos += 1
+    else:
+        v8, pos = read_uint(view, pos)
+    v9 = view[pos]
+    if v9 < 0x80:
+        pos += 1
+    else:
+        v9, pos = read_uint(view, pos)
+    v10 = view[pos]
+    if v10 < 0x80:
+        pos += 1
+    else:
+        v10, pos = read_uint(view, pos)
+    v11 = view[pos]
+    if v11 < 0x80:
+        pos += 1
+    else:
+        v11, pos = read_uint(view, pos)
+    v12 = view[pos]
+    if v12 < 0x80:
+        pos += 1
+    else:
+        v12, pos = read_uint(view, pos)
+    v13 = view[pos]
+    if v13 < 0x80:
+        pos += 1
+    else:
+        v13, pos = read_uint(view, pos)
+    return (v0, v1, v2, v3, v4, v5, v6, v7, v8, v9, v10, v11, v12, v13,), pos
+
+
+def read_111(view, pos: int) -> Tuple[tuple, int]:
+    v0 = view[pos]
+    if v0 < 0x80:
+        pos += 1
+    else:
+        v0, pos = read_uint(view, pos)
+    v1, pos = read_string(view, pos)
+    v2, pos = read_string(view, pos)
+    v3, pos = read_string(view, pos)
+    v4, pos = read_string(view, pos)
+    return (v0, v1, v2, v3, v4,), pos
+
+
+# message id -> (reader, message class, column names, column types)
+MESSAGES = {
+    0: (read_0, Timestamp,
+        ('timestamp',),
+        ('uint',)),
+    1: (read_1, SessionStart,
+        ('timestamp', 'project_id', 'tracker_version', 'rev_id', 'user_uuid', 'user_agent', 'user_os', 'user_os_version', 'user_browser', 'user_browser_version', 'user_device', 'user_device_type', 'user_device_memory_size', 'user_device_heap_size', 'user_country', 'user_id',),
+        ('uint', 'uint', 'string', 'string', 'string', 'string', 'string', 'string', 'string', 'string', 'string', 'string', 'uint', 'uint', 'string', 'string',)),
+    4: (read_4, SetPageLocationDeprecated,
+        ('url', 'referrer', 'navigation_start',),
+        ('string', 'string', 'uint',)),
+    5: (read_5, SetViewportSize,
+        ('width', 'height',),
+        ('uint', 'uint',)),
+    6: (read_6, SetViewportScroll,
+        ('x', 'y',),
+        ('int', 'int',)),
+    7: (read_7, CreateDocument,
+        (),
+        ()),
+    8: (read_8, CreateElementNode,
+        ('id', 'parent_id', 'index', 'tag', 'svg',),
+        ('uint', 'uint', 'uint', 'string', 'boolean',)),
+    9: (read_9, CreateTextNode,
+        ('id', 'parent_id', 'index',),
+        ('uint', 'uint', 'uint',)),
+    10: (read_10, MoveNode,
+        ('id', 'parent_id', 'index',),
+        ('uint', 'uint', 'uint',)),
+    11: (read_11, RemoveNode,
+        ('id',),
+        ('uint',)),
+    12: (read_12, SetNodeAttribute,
+        ('id', 'name', 'value',),
+        ('uint', 'string', 'string',)),
+    13: (read_13, RemoveNodeAttribute,
+        ('id', 'name',),
+        ('uint', 'string',)),
+    14: (read_14, SetNodeData,
+        ('id', 'data',),
+        ('uint', 'string',)),
+    15: (read_15, SetCSSData,
+        ('id', 'data',),
+        ('uint', 'string',)),
+    16: (read_16, SetNodeScroll,
+        ('id', 'x', 'y',),
+        ('uint', 'int', 'int',)),
+    17: (read_17, SetInputTarget,
+        ('id', 'label',),
+        ('uint', 'string',)),
+    18: (read_18, SetInputValue,
+        ('id', 'value', 'mask',),
+        ('uint', 'string', 'int',)),
+    19: (read_19, SetInputChecked,
+        ('id', 'checked',),
+        ('uint', 'boolean',)),
+    20: (read_20, MouseMove,
+        ('x', 'y',),
+        ('uint', 'uint',)),
+    21: (read_21, NetworkRequestDeprecated,
+        ('type', 'method', 'url', 'request', 'response', 'status', 'timestamp', 'duration',),
+        ('string', 'string', 'string', 'string', 'string', 'uint', 'uint', 'uint',)),
+    22: (read_22, ConsoleLog,
+        ('level', 'value',),
+        ('string', 'string',)),
+    23: (read_23, PageLoadTiming,
+        ('request_start', 'response_start', 'response_end', 'dom_content_loaded_event_start', 'dom_content_loaded_event_end', 'load_event_start', 'load_event_end', 'first_paint', 'first_contentful_paint',),
+        ('uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint',)),
+    24: (read_24, PageRenderTiming,
+        ('speed_index', 'visually_complete', 'time_to_interactive',),
+        ('uint', 'uint', 'uint',)),
+    26: (read_26, IntegrationEvent,
+        ('timestamp', 'source', 'name', 'message', 'payload',),
+        ('uint', 'string', 'string', 'string', 'string',)),
+    27: (read_27, CustomEvent,
+        ('name', 'payload',),
+        ('string', 'string',)),
+    28: (read_28, UserID,
+        ('id',),
+        ('string',)),
+    29: (read_29, UserAnonymousID,
+        ('id',),
+        ('string',)),
+    30: (read_30, Metadata,
+        ('key', 'value',),
+        ('string', 'string',)),
+    31: (read_31, PageEventDeprecated,
+        ('message_id', 'timestamp', 'url', 'referrer', 'loaded', 'request_start', 'response_start', 'response_end', 'dom_content_loaded_event_start', 'dom_content_loaded_event_end', 'load_event_start', 'load_event_end', 'first_paint', 'first_contentful_paint', 'speed_index', 'visually_complete', 'time_to_interactive',),
+        ('uint', 'uint', 'string', 'string', 'boolean', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint',)),
+    32: (read_32, InputEvent,
+        ('message_id', 'timestamp', 'value', 'value_masked', 'label',),
+        ('uint', 'uint', 'string', 'boolean', 'string',)),
+    33: (read_33, PageEvent,
+        ('message_id', 'timestamp', 'url', 'referrer', 'loaded', 'request_start', 'response_start', 'response_end', 'dom_content_loaded_event_start', 'dom_content_loaded_event_end', 'load_event_start', 'load_event_end', 'first_paint', 'first_contentful_paint', 'speed_index', 'visually_complete', 'time_to_interactive', 'web_vitals',),
+        ('uint', 'uint', 'string', 'string', 'boolean', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'string',)),
+    34: (read_34, StringDictGlobal,
+        ('key', 'value',),
+        ('uint', 'string',)),
+    35: (read_35, SetNodeAttributeDictGlobal,
+        ('id', 'name', 'value',),
+        ('uint', 'uint', 'uint',)),
+    40: (read_40, Profiler,
+        ('name', 'duration', 'args', 'result',),
+        ('string', 'uint', 'string', 'string',)),
+    41: (read_41, OTable,
+        ('key', 'value',),
+        ('string', 'string',)),
+    42: (read_42, StateAction,
+        ('type',),
+        ('string',)),
+    44: (read_44, ReduxDeprecated,
+        ('action', 'state', 'duration',),
+        ('string', 'string', 'uint',)),
+    45: (read_45, Vuex,
+        ('mutation', 'state',),
+        ('string', 'string',)),
+    46: (read_46, MobX,
+        ('type', 'payload',),
+        ('string', 'string',)),
+    47: (read_47, NgRx,
+        ('action', 'state', 'duration',),
+        ('string', 'string', 'uint',)),
+    48: (read_48, GraphQLDeprecated,
+        ('operation_kind', 'operation_name', 'variables', 'response', 'duration',),
+        ('string', 'string', 'string', 'string', 'int',)),
+    49: (read_49, PerformanceTrack,
+        ('frames', 'ticks', 'total_js_heap_size', 'used_js_heap_size',),
+        ('int', 'int', 'uint', 'uint',)),
+    50: (read_50, StringDictDeprecated,
+        ('key', 'value',),
+        ('uint', 'string',)),
+    51: (read_51, SetNodeAttributeDictDeprecated,
+        ('id', 'name_key', 'value_key',),
+        ('uint', 'uint', 'uint',)),
+    43: (read_43, StringDict,
+        ('key', 'value',),
+        ('string', 'string',)),
+    52: (read_52, SetNodeAttributeDict,
+        ('id', 'name', 'value',),
+        ('uint', 'string', 'string',)),
+    53: (read_53, ResourceTimingDeprecated,
+        ('timestamp', 'duration', 'ttfb', 'header_size', 'encoded_body_size', 'decoded_body_size', 'url', 'initiator',),
+        ('uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'string', 'string',)),
+    54: (read_54, ConnectionInformation,
+        ('downlink', 'type',),
+        ('uint', 'string',)),
+    55: (read_55, SetPageVisibility,
+        ('hidden',),
+        ('boolean',)),
+    56: (read_56, PerformanceTrackAggr,
+        ('timestamp_start', 'timestamp_end', 'min_fps', 'avg_fps', 'max_fps', 'min_cpu', 'avg_cpu', 'max_cpu', 'min_total_js_heap_size', 'avg_total_js_heap_size', 'max_total_js_heap_size', 'min_used_js_heap_size', 'avg_used_js_heap_size', 'max_used_js_heap_size',),
+        ('uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint',)),
+    57: (read_57, LoadFontFace,
+        ('parent_id', 'family', 'source', 'descriptors',),
+        ('uint', 'string', 'string', 'string',)),
+    58: (read_58, SetNodeFocus,
+        ('id',),
+        ('int',)),
+    60: (read_60, SetNodeAttributeURLBased,
+        ('id', 'name', 'value', 'base_url',),
+        ('uint', 'string', 'string', 'string',)),
+    61: (read_61, SetCSSDataURLBased,
+        ('id', 'data', 'base_url',),
+        ('uint', 'string', 'string',)),
+    63: (read_63, TechnicalInfo,
+        ('type', 'value',),
+        ('string', 'string',)),
+    64: (read_64, CustomIssue,
+        ('name', 'payload',),
+        ('string', 'string',)),
+    66: (read_66, AssetCache,
+        ('url',),
+        ('string',)),
+    68: (read_68, MouseClick,
+        ('id', 'hesitation_time', 'label', 'selector', 'normalized_x', 'normalized_y',),
+        ('uint', 'uint', 'string', 'string', 'uint', 'uint',)),
+    69: (read_69, MouseClickDeprecated,
+        ('id', 'hesitation_time', 'label', 'selector',),
+        ('uint', 'uint', 'string', 'string',)),
+    70: (read_70, CreateIFrameDocument,
+        ('frame_id', 'id',),
+        ('uint', 'uint',)),
+    71: (read_71, AdoptedSSReplaceURLBased,
+        ('sheet_id', 'text', 'base_url',),
+        ('uint', 'string', 'string',)),
+    72: (read_72, AdoptedSSReplace,
+        ('sheet_id', 'text',),
+        ('uint', 'string',)),
+    73: (read_73, AdoptedSSInsertRuleURLBased,
+        ('sheet_id', 'rule', 'index', 'base_url',),
+        ('uint', 'string', 'uint', 'string',)),
+    74: (read_74, AdoptedSSInsertRule,
+        ('sheet_id', 'rule', 'index',),
+        ('uint', 'string', 'uint',)),
+    75: (read_75, AdoptedSSDeleteRule,
+        ('sheet_id', 'index',),
+        ('uint', 'uint',)),
+    76: (read_76, AdoptedSSAddOwner,
+        ('sheet_id', 'id',),
+        ('uint', 'uint',)),
+    77: (read_77, AdoptedSSRemoveOwner,
+        ('sheet_id', 'id',),
+        ('uint', 'uint',)),
+    78: (read_78, JSException,
+        ('name', 'message', 'payload', 'metadata',),
+        ('string', 'string', 'string', 'string',)),
+    79: (read_79, Zustand,
+        ('mutation', 'state',),
+        ('string', 'string',)),
+    81: (read_81, BatchMetadata,
+        ('version', 'page_no', 'first_index', 'timestamp', 'location',),
+        ('uint', 'uint', 'uint', 'int', 'string',)),
+    82: (read_82, PartitionedMessage,
+        ('part_no', 'part_total',),
+        ('uint', 'uint',)),
+    83: (read_83, NetworkRequest,
+        ('type', 'method', 'url', 'request', 'response', 'status', 'timestamp', 'duration', 'transferred_body_size',),
+        ('string', 'string', 'string', 'string', 'string', 'uint', 'uint', 'uint', 'uint',)),
+    84: (read_84, WSChannel,
+        ('ch_type', 'channel_name', 'data', 'timestamp', 'dir', 'message_type',),
+        ('string', 'string', 'string', 'uint', 'string', 'string',)),
+    112: (read_112, InputChange,
+        ('id', 'value', 'value_masked', 'label', 'hesitation_time', 'input_duration',),
+        ('uint', 'string', 'boolean', 'string', 'int', 'int',)),
+    113: (read_113, SelectionChange,
+        ('selection_start', 'selection_end', 'selection',),
+        ('uint', 'uint', 'string',)),
+    114: (read_114, MouseThrashing,
+        ('timestamp',),
+        ('uint',)),
+    115: (read_115, UnbindNodes,
+        ('total_removed_percent',),
+        ('uint',)),
+    116: (read_116, ResourceTiming,
+        ('timestamp', 'duration', 'ttfb', 'header_size', 'encoded_body_size', 'decoded_body_size', 'url', 'initiator', 'transferred_size', 'cached',),
+        ('uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'string', 'string', 'uint', 'boolean',)),
+    117: (read_117, TabChange,
+        ('tab_id',),
+        ('string',)),
+    118: (read_118, TabData,
+        ('tab_id',),
+        ('string',)),
+    119: (read_119, CanvasNode,
+        ('node_id', 'timestamp',),
+        ('string', 'uint',)),
+    120: (read_120, TagTrigger,
+        ('tag_id',),
+        ('int',)),
+    121: (read_121, Redux,
+        ('action', 'state', 'duration', 'action_time',),
+        ('string', 'string', 'uint', 'uint',)),
+    122: (read_122, SetPageLocation,
+        ('url', 'referrer', 'navigation_start', 'document_title',),
+        ('string', 'string', 'uint', 'string',)),
+    123: (read_123, GraphQL,
+        ('operation_kind', 'operation_name', 'variables', 'response', 'duration',),
+        ('string', 'string', 'string', 'string', 'uint',)),
+    124: (read_124, WebVitals,
+        ('name', 'value',),
+        ('string', 'string',)),
+    125: (read_125, IssueEvent,
+        ('message_id', 'timestamp', 'type', 'context_string', 'context', 'payload', 'url',),
+        ('uint', 'uint', 'string', 'string', 'string', 'string', 'string',)),
+    126: (read_126, SessionEnd,
+        ('timestamp', 'encryption_key',),
+        ('uint', 'string',)),
+    127: (read_127, SessionSearch,
+        ('timestamp', 'partition',),
+        ('uint', 'uint',)),
+    90: (read_90, MobileSessionStart,
+        ('timestamp', 'project_id', 'tracker_version', 'rev_id', 'user_uuid', 'user_os', 'user_os_version', 'user_device', 'user_device_type', 'user_country',),
+        ('uint', 'uint', 'string', 'string', 'string', 'string', 'string', 'string', 'string', 'string',)),
+    91: (read_91, MobileSessionEnd,
+        ('timestamp',),
+        ('uint',)),
+    92: (read_92, MobileMetadata,
+        ('timestamp', 'length', 'key', 'value',),
+        ('uint', 'uint', 'string', 'string',)),
+    93: (read_93, MobileEvent,
+        ('timestamp', 'length', 'name', 'payload',),
+        ('uint', 'uint', 'string', 'string',)),
+    94: (read_94, MobileUserID,
+        ('timestamp', 'length', 'id',),
+        ('uint', 'uint', 'string',)),
+    95: (read_95, MobileUserAnonymousID,
+        ('timestamp', 'length', 'id',),
+        ('uint', 'uint', 'string',)),
+    96: (read_96, MobileScreenChanges,
+        ('timestamp', 'length', 'x', 'y', 'width', 'height',),
+        ('uint', 'uint', 'uint', 'uint', 'uint', 'uint',)),
+    97: (read_97, MobileCrash,
+        ('timestamp', 'length', 'name', 'reason', 'stacktrace',),
+        ('uint', 'uint', 'string', 'string', 'string',)),
+    98: (read_98, MobileViewComponentEvent,
+        ('timestamp', 'length', 'screen_name', 'view_name', 'visible',),
+        ('uint', 'uint', 'string', 'string', 'boolean',)),
+    100: (read_100, MobileClickEvent,
+        ('timestamp', 'length', 'label', 'x', 'y',),
+        ('uint', 'uint', 'string', 'uint', 'uint',)),
+    101: (read_101, MobileInputEvent,
+        ('timestamp', 'length', 'value', 'value_masked', 'label',),
+        ('uint', 'uint', 'string', 'boolean', 'string',)),
+    102: (read_102, MobilePerformanceEvent,
+        ('timestamp', 'length', 'name', 'value',),
+        ('uint', 'uint', 'string', 'uint',)),
+    103: (read_103, MobileLog,
+        ('timestamp', 'length', 'severity', 'content',),
+        ('uint', 'uint', 'string', 'string',)),
+    104: (read_104, MobileInternalError,
+        ('timestamp', 'length', 'content',),
+        ('uint', 'uint', 'string',)),
+    105: (read_105, MobileNetworkCall,
+        ('timestamp', 'length', 'type', 'method', 'url', 'request', 'response', 'status', 'duration',),
+        ('uint', 'uint', 'string', 'string', 'string', 'string', 'string', 'uint', 'uint',)),
+    106: (read_106, MobileSwipeEvent,
+        ('timestamp', 'length', 'label', 'x', 'y', 'direction',),
+        ('uint', 'uint', 'string', 'uint', 'uint', 'string',)),
+    107: (read_107, MobileBatchMeta,
+        ('timestamp', 'length', 'first_index',),
+        ('uint', 'uint', 'uint',)),
+    110: (read_110, MobilePerformanceAggregated,
+        ('timestamp_start', 'timestamp_end', 'min_fps', 'avg_fps', 'max_fps', 'min_cpu', 'avg_cpu', 'max_cpu', 'min_memory', 'avg_memory', 'max_memory', 'min_battery', 'avg_battery', 'max_battery',),
+        ('uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint', 'uint',)),
+    111: (read_111, MobileIssueEvent,
+        ('timestamp', 'type', 'context_string', 'context', 'payload',),
+        ('uint', 'string', 'string', 'string', 'string',)),
+}
+
+
+class FastMessageCodec:
+    """
+    Decodes a whole batch from a buffer (bytes, bytearray or memoryview) using offsets,
+    without copying it and without creating a reader per byte.
+    In batches with the message-length prefix, the messages that are not in msg_selector
+    are skipped without being decoded.
+    """
+
+    def __init__(self, msg_selector: Iterable[int] = ()):
+        self.msg_selector = frozenset(msg_selector)
+
+    @staticmethod
+    def decode_key(b) -> int:
+        """
+        Decode the message key (encoded with little endian)
+        """
+        try:
+            decoded = int.from_bytes(b, "little", signed=False)
+        except Exception as e:
+            raise UnicodeDecodeError(f"Error while decoding message key (SessionID) from {b}\n{e}")
+        return decoded
+
+    def __read_mode(self, view) -> Tuple[Optional[int], tuple, int, int]:
+        """
+        Reads the first message of the batch, it tells if the messages have a length prefix (mode 1) or not (mode 0)
+        :return: mode (None if the batch contains a single message), first message id, first message values, position
+        """
+        message_id, pos = read_uint(view, 0)
+        reader = MESSAGES.get(message_id)
+        if reader is None:
+            raise IOError(f"unknown message id {message_id}")
+        values, pos = reader[0](view, pos)
+        if message_id != BatchMetadata.__id__:
+            return None, message_id, values, pos
+        # values[0] is BatchMetadata.version
+        return (0 if values[0] == 0 else 1), message_id, values, pos
+
+    def iter_values(self, b):
+        """
+        Yields (message id, values) for each decoded message of the batch,
+        values are in the same order as the message's attributes
+        """
+        # indexing bytes is faster than indexing a memoryview, neither copies the buffer
+        view = b if isinstance(b, bytes) else memoryview(b)
+        try:
+            mode, message_id, values, pos = self.__read_mode(view)
+        except IndexError:
+            print('[WARN] Broken batch')
+            return
+        yield message_id, values
+        if mode is None:
+            return
+        end = len(view)
+        selector = self.msg_selector
+        try:
+            while pos < end:
+                message_id = view[pos]
+                if message_id < 0x80:
+                    pos += 1
+                else:
+                    message_id, pos = read_uint(view, pos)
+                if mode == 1:
+                    # same as read_size
+                    size = view[pos] | view[pos + 1] << 8 | view[pos + 2] << 16
+                    pos += 3
+                    if message_id not in selector:
+                        pos += size
+                        continue
+                reader = MESSAGES.get(message_id)
+                if reader is None:
+                    raise IOError(f"unknown message id {message_id}")
+                values, pos = reader[0](view, pos)
+                yield message_id, values
+        except IndexError:
+            # truncated trailing message
+            return
+
+    def decode_detailed(self, b) -> List[Message]:
+        """
+        Same result as MessageCodec.decode_detailed
+        """
+        return [MESSAGES[message_id][1](*values) for message_id, values in self.iter_values(b)]
+
+    def decode_columns(self, b, session_id: Optional[int] = None,
+                       columns: Optional[Dict[int, Dict[str, list]]] = None) -> Dict[int, Dict[str, list]]:
+        """
+        Decodes the batch into one set of columns per message type: {message_id: {attribute: [values]}},
+        without creating any message object. If session_id is provided, it's appended to a 'session_id' column.
+        Pass the result of a previous call as columns to accumulate several batches.
+        """
+        columns = {} if columns is None else columns
+        for message_id, values in self.iter_values(b):
+            table = columns.get(message_id)
+            if table is None:
+                names = MESSAGES[message_id][2]
+                if session_id is not None:
+                    names = names + ('session_id',)
+                table = columns[message_id] = {name: [] for name in names}
+            for column, value in zip(table.values(), values):
+                column.append(value)
+            if session_id is not None:
+                table['session_id'].append(session_id)
+        return columns
+
+    def decode_batch(self, batch: Iterable[Tuple[int, bytes]]) -> Dict[int, Dict[str, list]]:
+        """
+        Decodes a list of (session_id, kafka message value) into columns, see decode_columns
+        """
+        columns = {}
+        for session_id, b in batch:
+            self.decode_columns(b, session_id=session_id, columns=columns)
+        return columns
@@ -54,10 +54,7 @@ class MessageCodec(Codec):
         except IndexError:
             print('[WARN] Broken batch')
             return list()
-        if isinstance(messages_list[0], BatchMeta):
-            # Old BatchMeta
-            mode = 0
-        elif isinstance(messages_list[0], BatchMetadata):
+        if isinstance(messages_list[0], BatchMetadata):
             # New BatchMeta
             if messages_list[0].version == 0:
                 mode = 0
@@ -0,0 +1,9 @@
+#from setuptools import setup
+from distutils.core import setup
+from Cython.Build import cythonize
+
+setup(
+    ext_modules = cythonize("fastcodec.py"),
+    include_package_data=True,
+    package_data={"": ["*.pxd"]},
+)
@@ -0,0 +1,154 @@
+import io
+import pickle
+import zlib
+from time import time
+
+from decouple import config
+
+CHECKPOINT_NAME = 'checkpoint_v2'
+# A full checkpoint is written after this many deltas, or when the deltas are bigger than the last full one
+COMPACTION_INTERVAL = config('CHECKPOINT_COMPACTION_INTERVAL', default=30, cast=int)
+
+
+class _SafeUnpickler(pickle.Unpickler):
+    """
+    Checkpoints only contain builtin types (dict, list, tuple, str, int, float, bool, None)
+    """
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f'{module}.{name} is not allowed in a checkpoint')
+
+
+def dumps(state: dict) -> bytes:
+    return zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+
+def loads(data: bytes) -> dict:
+    return _SafeUnpickler(io.BytesIO(zlib.decompress(data))).load()
+
+
+class Checkpoint:
+    """
+    Incremental checkpoint of the WorkerPool state.
+    A full checkpoint (CHECKPOINT_NAME) is followed by deltas (CHECKPOINT_NAME.<sequence>) that only contain
+    the sessions changed or deleted since the previous save, the changes of the cached sessions
+    and the events appended to the pending batch, so the cost of a save follows the churn, not the total state.
+    The deltas of a full checkpoint share its generation, deltas of another generation are ignored when loading.
+    """
+
+    def __init__(self):
+        self.generation = None
+        self.sequence = 0
+        self.full_size = 0
+        self.deltas_size = 0
+        self.changed_sessions = set()
+        self.deleted_sessions = set()
+        self.saved_cached_sessions = dict()
+        self.saved_events_batch = None
+        self.saved_events = 0
+
+    def changed(self, session_id: int):
+        self.changed_sessions.add(session_id)
+        self.deleted_sessions.discard(session_id)
+
+    def deleted(self, session_id: int):
+        self.deleted_sessions.add(session_id)
+        self.changed_sessions.discard(session_id)
+
+    def __needs_compaction(self):
+        return self.generation is None or self.sequence >= COMPACTION_INTERVAL or self.deltas_size > self.full_size
+
+    def prepare(self, sessions: dict, cached_sessions: dict, sessions_update_batch: list,
+                sessions_insert_batch: list, events_batch) -> dict:
+        """
+        Serializes the current state, to be written by write once the positions it follows are committed.
+        The snapshots must be written in the order they were prepared, a snapshot that is never written
+        discards the following ones (their deltas would be applied on a missing one).
+        :param sessions: session_id -> session (SessionRow)
+        :param events_batch: pending ColumnarBatch of events
+        """
+        full = self.__needs_compaction()
+        state = {'version': 'v2.0',
+                 'sessions_update_batch': sessions_update_batch,
+                 'sessions_insert_batch': sessions_insert_batch}
+        previous_sequence = self.sequence
+        if full:
+            self.generation = int(time() * 1000)
+            state['sessions'] = {session_id: vars(session) for session_id, session in sessions.items()}
+            state['deleted_sessions'] = []
+            state['cached_sessions'] = dict(cached_sessions)
+            state['deleted_cached_sessions'] = []
+            state['events_offset'] = 0
+        else:
+            state['sessions'] = {session_id: vars(sessions[session_id]) for session_id in self.changed_sessions
+                                 if session_id in sessions}
+            state['deleted_sessions'] = list(self.deleted_sessions)
+            state['cached_sessions'] = {k: v for k, v in cached_sessions.items()
+                                        if self.saved_cached_sessions.get(k) != v}
+            state['deleted_cached_sessions'] = [k for k in self.saved_cached_sessions if k not in cached_sessions]
+            # the batch is replaced after each upload, its rows are all new then
+            state['events_offset'] = self.saved_events if events_batch is self.saved_events_batch else 0
+        state['events_batch'] = events_batch.to_rows(start=state['events_offset'])
+        state['generation'] = self.generation
+        state['sequence'] = 0 if full else self.sequence + 1
+
+        data = dumps(state)
+        if full:
+            self.full_size = len(data)
+            self.deltas_size = 0
+        else:
+            self.deltas_size += len(data)
+        self.sequence = state['sequence']
+        self.changed_sessions = set()
+        self.deleted_sessions = set()
+        self.saved_cached_sessions = dict(cached_sessions)
+        self.saved_events_batch = events_batch
+        self.saved_events = len(events_batch)
+        return {'data': data, 'sequence': state['sequence'], 'previous_sequence': previous_sequence}
+
+    @staticmethod
+    def write(database_api, snapshot: dict):
+        if snapshot['sequence'] == 0:
+            database_api.save_binary(binary_data=snapshot['data'], name=CHECKPOINT_NAME)
+            # the deltas of the previous generation
+            for sequence in range(1, snapshot['previous_sequence'] + 1):
+                database_api.delete_binary(name=f'{CHECKPOINT_NAME}.{sequence}')
+        else:
+            database_api.save_binary(binary_data=snapshot['data'], name=f'{CHECKPOINT_NAME}.{snapshot["sequence"]}')
+
+    @staticmethod
+    def __read(database_api, name):
+        file = database_api.load_binary(name=name)
+        if file is None:
+            return None
+        try:
+            return loads(file.getvalue())
+        finally:
+            file.close()
+
+    def load(self, database_api):
+        """
+        :return: the state of the last save, None if there is no checkpoint in this format
+        """
+        state = self.__read(database_api, CHECKPOINT_NAME)
+        if state is None:
+            return None
+        sequence = 1
+        while (delta := self.__read(database_api, f'{CHECKPOINT_NAME}.{sequence}')) is not None:
+            if delta['generation'] != state['generation']:
+                break
+            for session_id in delta['deleted_sessions']:
+                state['sessions'].pop(session_id, None)
+            state['sessions'].update(delta['sessions'])
+            for k in delta['deleted_cached_sessions']:
+                state['cached_sessions'].pop(k, None)
+            state['cached_sessions'].update(delta['cached_sessions'])
+            del state['events_batch'][delta['events_offset']:]
+            state['events_batch'] += delta['events_batch']
+            state['sessions_update_batch'] = delta['sessions_update_batch']
+            state['sessions_insert_batch'] = delta['sessions_insert_batch']
+            sequence += 1
+        # the next save writes a full checkpoint, and removes the deltas that were loaded
+        self.generation = None
+        self.sequence = sequence - 1
+        return state
@@ -1,8 +1,19 @@
+from collections import deque
 from datetime import datetime
+from multiprocessing import Process, Queue
+from queue import Empty
+from db.api import DBConnection
 from db.writer import insert_batch, update_batch
+from decouple import config
 from psycopg2 import InterfaceError
 from time import sleep
 
+# Uploads waiting for a free uploader, per table. When full, the main loop (and then the reader) waits
+UPLOAD_QUEUE_SIZE = config('UPLOAD_QUEUE_SIZE', default=2, cast=int)
+# Parallel uploads into the events table. Sessions are uploaded by a single process, in order,
+# so that an update never runs before the insert of the same session
+EVENTS_UPLOAD_WORKERS = config('EVENTS_UPLOAD_WORKERS', default=2, cast=int)
+
 
 def insertBatch(events_batch, sessions_insert_batch, sessions_update_batch, db, sessions_table_name, table_name, EVENT_TYPE):
     t1 = datetime.now().timestamp()
@@ -32,9 +43,13 @@ def attempt_session_insert(sess_batch, db, sessions_table_name, try_=0):
             if try_ < 3:
                 try_ += 1
                 sleep(try_*2)
-                attempt_session_insert(sess_batch, db, sessions_table_name, try_)
+                return attempt_session_insert(sess_batch, db, sessions_table_name, try_)
         except Exception as e:
             print(repr(e))
+        else:
+            return True
+        return False
+    return True
 
 
 def attempt_session_update(sess_batch, db, sessions_table_name):
@@ -52,6 +67,10 @@ def attempt_session_update(sess_batch, db, sessions_table_name):
             print(repr(e))
         except Exception as e:
             print(repr(e))
+        else:
+            return True
+        return False
+    return True
 
 
 def attempt_batch_insert(events_batch, db, table_name, EVENT_TYPE, try_=0):
@@ -67,13 +86,136 @@ def attempt_batch_insert(events_batch, db, table_name, EVENT_TYPE, try_=0):
         if try_ < 3:
             try_ += 1
             sleep(try_*2)
-            attempt_batch_insert(events_batch, db, table_name, EVENT_TYPE, try_)
+            return attempt_batch_insert(events_batch, db, table_name, EVENT_TYPE, try_)
         elif try_ == 3:
             db.restart()
             sleep(2)
-            attempt_batch_insert(events_batch, db, table_name, EVENT_TYPE, try_ + 1)
+            return attempt_batch_insert(events_batch, db, table_name, EVENT_TYPE, try_ + 1)
         else:
             print(repr(e))
     except Exception as e:
         print(repr(e))
+    else:
+        return True
+    return False
+
+
+def upload_loop(tasks: Queue, done: Queue, database: str):
+    """
+    Uploader process, it has its own connection to the warehouse
+    task: (upload_id, kind, batch, table, level), kind is one of 'sessions_insert', 'sessions_update', 'events'
+    """
+    db = DBConnection(database)
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        upload_id, kind, batch, table, level = task
+        t1 = datetime.now().timestamp()
+        try:
+            if kind == 'sessions_insert':
+                success = attempt_session_insert(batch, db, table)
+            elif kind == 'sessions_update':
+                success = attempt_session_update(batch, db, table)
+            else:
+                success = attempt_batch_insert(batch, db, table, level)
+        except Exception as e:
+            print(f'[UPLOADER Exception] {repr(e)}')
+            success = False
+        print(f'[UPLOADER-INFO] {kind}: {len(batch)} rows uploaded in {datetime.now().timestamp() - t1:.2f} seconds'
+              if success else f'[UPLOADER-WARN] {kind}: upload of {len(batch)} rows failed')
+        done.put((upload_id, success))
+    db.close()
+
+
+class UploadStage:
+    """
+    Uploads the batches in background processes while the main loop keeps reading and decoding.
+    Each upload carries the Kafka positions of the messages it contains and the checkpoint of the state
+    after them, both are returned by collect once the upload and all the previous ones succeeded:
+    the positions are committed, then the checkpoint is written.
+    """
+
+    def __init__(self, database: str, sessions_table_name: str, table_name: str, event_type: str):
+        self.sessions_table_name = sessions_table_name
+        self.table_name = table_name
+        self.event_type = event_type
+        self.sessions_tasks = Queue(maxsize=UPLOAD_QUEUE_SIZE)
+        self.events_tasks = Queue(maxsize=UPLOAD_QUEUE_SIZE)
+        self.done = Queue()
+        self.processes = [Process(target=upload_loop, args=(self.sessions_tasks, self.done, database))]
+        self.processes += [Process(target=upload_loop, args=(self.events_tasks, self.done, database))
+                           for _ in range(EVENTS_UPLOAD_WORKERS)]
+        for process in self.processes:
+            process.start()
+        self.next_id = 0
+        # upload_id -> [remaining tasks, success, kafka positions, checkpoint], in submission order
+        self.pending = dict()
+        self.order = deque()
+        # an upload failed (after the retries of the attempt_* functions), nothing after it is committed
+        self.failed = False
+
+    def submit(self, events_batch, sessions_insert_batch, sessions_update_batch, positions, checkpoint=None):
+        """
+        Queues the upload, blocks while the queue of one of the tables is full
+        """
+        upload_id = self.next_id
+        self.next_id += 1
+        tasks = list()
+        if sessions_insert_batch:
+            tasks.append((self.sessions_tasks, (upload_id, 'sessions_insert', list(sessions_insert_batch),
+                                                self.sessions_table_name, 'sessions')))
+        if sessions_update_batch:
+            tasks.append((self.sessions_tasks, (upload_id, 'sessions_update', list(sessions_update_batch),
+                                                self.sessions_table_name, 'sessions')))
+        if events_batch:
+            tasks.append((self.events_tasks, (upload_id, 'events', events_batch, self.table_name, self.event_type)))
+        print(f'[BG-INFO] Number of events to add {len(events_batch)}, '
+              f'number of sessions to add {len(sessions_insert_batch)}, '
+              f'number of sessions to update {len(sessions_update_batch)}')
+        self.pending[upload_id] = [len(tasks), True, positions, checkpoint]
+        self.order.append(upload_id)
+        for queue, task in tasks:
+            queue.put(task)
+
+    def collect(self, wait: bool = False):
+        """
+        :param wait: wait for all the submitted uploads
+        :return: (positions, checkpoints) the Kafka positions of the last upload of the contiguous prefix of
+        successful uploads finished since the previous call (None if there is none), and their checkpoints
+        in submission order. Nothing is returned after a failed upload: its messages are read again
+        from the last committed positions after a restart.
+        """
+        outstanding = sum(remaining for remaining, _, _, _ in self.pending.values())
+        while outstanding > 0:
+            try:
+                upload_id, success = self.done.get() if wait else self.done.get_nowait()
+            except Empty:
+                break
+            outstanding -= 1
+            self.pending[upload_id][0] -= 1
+            self.pending[upload_id][1] &= success
+        positions = None
+        checkpoints = list()
+        while not self.failed and self.order and self.pending[self.order[0]][0] == 0:
+            _, success, upload_positions, checkpoint = self.pending.pop(self.order.popleft())
+            if not success:
+                print('[UPLOADER-ERROR] Upload failed, the following Kafka positions are not committed')
+                self.failed = True
+                break
+            positions = upload_positions
+            if checkpoint is not None:
+                checkpoints.append(checkpoint)
+        return positions, checkpoints
 
+    def close(self):
+        """
+        Waits for the submitted uploads and stops the uploaders
+        :return: the Kafka positions to commit and the checkpoints to write, see collect
+        """
+        collected = self.collect(wait=True)
+        for queue in [self.sessions_tasks] + [self.events_tasks] * EVENTS_UPLOAD_WORKERS:
+            queue.put(None)
+        for process in self.processes:
+            process.join()
+        return collected
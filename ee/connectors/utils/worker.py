@@ -1,20 +1,24 @@
-from multiprocessing import Pool, Process, Pipe, TimeoutError
+from multiprocessing import Pool, Process, Pipe, TimeoutError, resource_tracker
 from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
 from db.api import DBConnection
 from msgcodec import MessageCodec
 from messages import SessionEnd
-from utils.uploader import insertBatch
+from utils.uploader import UploadStage
+from utils.checkpoint import Checkpoint
 from utils.cache import CachedSessions
-from db.models import DetailedEvent, Event, Session, events_detailed_table_name, events_table_name, sessions_table_name
+from db.models import events_detailed_table_name, events_table_name, sessions_table_name
+from db.utils import ColumnarBatch, DetailedEventRow, EventRow, SessionRow
 from handler import handle_normal_message, handle_message, handle_session
 from datetime import datetime
 from decouple import config
 from utils import pg_client
 from utils.signal_handler import signal_handler
-from copy import deepcopy
-from confluent_kafka import Consumer
+from copy import copy
+from confluent_kafka import Consumer, TopicPartition
 import pandas as pd
 from time import time
+from array import array
 import logging
 import json
 import asyncio
@@ -46,6 +50,8 @@ elif EVENT_TYPE == 'detailed':
 allowed_messages = list(set(session_messages + events_messages))
 codec = MessageCodec(allowed_messages)
 max_kafka_read = config('MAX_KAFKA_READ', default=60000, cast=int)
+# Initial size of the shared memory segments holding the messages of a loop, they grow if a loop reads more
+shm_arena_size = config('SHM_ARENA_SIZE', default=32 * 1024 * 1024, cast=int)
 
 
 def init_consumer():
@@ -60,38 +66,27 @@ def close_consumer(consumer):
     consumer.close()
 
 
-def session_to_dict(sess: Session):
-    _dict = sess.__dict__
-    try:
-        del _dict['_sa_instance_state']
-    except KeyError:
-        ...
-    return _dict
+def get_positions(consumer):
+    """
+    :return: (topic, partition, offset) of the next message to read in each assigned partition
+    """
+    return [(tp.topic, tp.partition, tp.offset) for tp in consumer.position(consumer.assignment()) if tp.offset >= 0]
 
 
-def dict_to_session(session_dict: dict):
-    n = Session()
-    n.__dict__ |= session_dict
-    return n
+def commit_positions(consumer, positions):
+    try:
+        consumer.commit(offsets=[TopicPartition(topic, partition, offset) for topic, partition, offset in positions],
+                        asynchronous=False)
+    except Exception as e:
+        print('[WORKER Exception] Error while committing offsets', repr(e))
 
 
-def event_to_dict(event: Event | DetailedEvent):
-    _dict = event.__dict__
-    try:
-        del _dict['_sa_instance_state']
-    except KeyError:
-        ...
-    return _dict
+def session_to_dict(sess: SessionRow):
+    return sess.__dict__
 
 
-def dict_to_event(event_dict: dict):
-    global EVENT_TYPE
-    if EVENT_TYPE == 'detailed':
-        n = DetailedEvent()
-    else:
-        n = Event()
-    n.__dict__ |= event_dict
-    return n
+def dict_to_session(session_dict: dict):
+    return SessionRow(**session_dict)
 
 class ProjectFilter:
     def __init__(self, project_filter):
@@ -148,11 +143,56 @@ class ProjectFilter:
                                              self.max_lifespan > current_timestamp - start_timestamp}
 
 
+class MessageArena:
+    """
+    Shared memory where the reader copies the messages of a loop, the decoders read them by offset.
+    Two segments are used alternately: the reader fills one while the decoders read the previous one,
+    a segment is only rewritten once the main process confirmed (CONTINUE) that its messages were decoded.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.segments = [None, None]
+        self.current = 0
+
+    def write(self, values: list[bytes]):
+        """
+        :return: name of the segment, end offset of each value
+        """
+        self.current ^= 1
+        total = sum(len(v) for v in values)
+        segment = self.segments[self.current]
+        if segment is None or segment.size < total:
+            if segment is not None:
+                segment.close()
+                segment.unlink()
+            segment = SharedMemory(create=True, size=max(self.size, total + total // 2))
+            self.segments[self.current] = segment
+        buffer = segment.buf
+        offsets = array('Q')
+        position = 0
+        for v in values:
+            end = position + len(v)
+            buffer[position:end] = v
+            offsets.append(end)
+            position = end
+        del buffer
+        return segment.name, offsets
+
+    def close(self):
+        for segment in self.segments:
+            if segment is not None:
+                segment.close()
+                segment.unlink()
+        self.segments = [None, None]
+
+
 def read_from_kafka(pipe: Connection, params: dict):
-    global UPLOAD_RATE, max_kafka_read
+    global UPLOAD_RATE, max_kafka_read, shm_arena_size
     # try:
     # asyncio.run(pg_client.init())
     kafka_consumer = init_consumer()
+    arena = MessageArena(shm_arena_size)
     project_filter = params['project_filter']
     capture_messages = list()
     capture_sessions = list()
@@ -198,14 +238,18 @@ def read_from_kafka(pipe: Connection, params: dict):
         else:
             print('[WORKER WARN-bg] No messages read')
         non_valid_updated = project_filter.non_valid_sessions_cache
-        pipe.send((non_valid_updated, sessionIds, to_decode))
-        continue_signal = pipe.recv()
+        arena_name, offsets = arena.write(to_decode)
+        pipe.send((non_valid_updated, sessionIds, arena_name, offsets, get_positions(kafka_consumer)))
+        # the main process answers once the messages were decoded, with the positions of the uploaded ones
+        continue_signal, positions = pipe.recv()
+        if positions:
+            commit_positions(kafka_consumer, positions)
         if continue_signal == 'CLOSE':
             print('[WORKER SHUTDOWN-reader] Reader shutting down')
             break
-        kafka_consumer.commit()
     print('[WORKER INFO] Closing consumer')
     close_consumer(kafka_consumer)
+    arena.close()
     print('[WORKER INFO] Closing pg connection')
     # asyncio.run(pg_client.terminate())
     print('[WORKER INFO] Successfully closed reader task')
@@ -213,7 +257,7 @@ def read_from_kafka(pipe: Connection, params: dict):
     #     print('[WARN]', repr(e))
 
 
-def into_batch(batch: list[Event | DetailedEvent], session_id: int, n: Session):
+def into_batch(batch: ColumnarBatch, session_id: int, n: EventRow | DetailedEventRow):
     n.sessionid = session_id
     n.received_at = int(datetime.now().timestamp() * 1000)
     n.batch_order_number = len(batch)
@@ -261,15 +305,20 @@ def project_from_sessions(sessionIds: list[int]):
     return [(e['project_id'], e['session_id']) for e in response]
 
 
-def decode_message(params: dict):
+def decode_message(memory: dict, buffer, encoded_messages: list):
+    """
+    :param memory: sessions owned by the worker, updated in place
+    :param buffer: shared memory segment holding the messages
+    :param encoded_messages: list of (session_id, start, end) of each message in buffer
+    :return: events, sessions of the decoded messages (as dict), ended sessions
+    """
     global codec, session_messages, events_messages, EVENT_TYPE
-    if len(params['message']) == 0:
-        return list(), None, list()
-    memory = {sessId: dict_to_session(sessObj) for sessId, sessObj in params['memory'].items()}
-    events_worker_batch = list()
+    events_worker_batch = ColumnarBatch(EVENT_TYPE)
     sessionid_ended = list()
-    for session_id, encoded_message in params['message']:
-        messages = codec.decode_detailed(encoded_message)
+    decoded_sessions = set()
+    for session_id, start, end in encoded_messages:
+        decoded_sessions.add(session_id)
+        messages = codec.decode_detailed(bytes(buffer[start:end]))
         if messages is None:
             continue
         for message in messages:
@@ -292,8 +341,42 @@ def decode_message(params: dict):
                 memory[session_id].sessionid = session_id
                 if isinstance(message, SessionEnd):
                     sessionid_ended.append(session_id)
-    memory = {sessId: session_to_dict(sessObj) for sessId, sessObj in memory.items()}
-    return events_worker_batch, memory, sessionid_ended
+    updated_sessions = {sessId: session_to_dict(memory[sessId]) for sessId in decoded_sessions if sessId in memory}
+    return events_worker_batch, updated_sessions, sessionid_ended
+
+
+def decoder_loop(conn: Connection):
+    """
+    Decoding process, it keeps the sessions assigned to it by WorkerPool.get_worker between loops
+    task: {'arena': segment name, 'message': [(session_id, start, end)], 'memory': {session_id: session dict},
+           'forget': [session_id]}
+    """
+    memory = dict()
+    segments = dict()
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        try:
+            for session_id in task['forget']:
+                memory.pop(session_id, None)
+            for session_id, session_dict in task['memory'].items():
+                memory[session_id] = dict_to_session(session_dict)
+            segment = segments.get(task['arena'])
+            if segment is None and task['message']:
+                segment = segments[task['arena']] = SharedMemory(name=task['arena'])
+                # the reader alternates between two segments, the older ones were replaced
+                while len(segments) > 2:
+                    segments.pop(next(iter(segments))).close()
+            result = decode_message(memory, segment.buf if segment else b'', task['message'])
+            conn.send(('ok', result))
+        except Exception as e:
+            conn.send(('error', repr(e)))
+    for segment in segments.values():
+        segment.close()
 
 
 def fix_missing_redshift():
@@ -369,23 +452,58 @@ def fix_missing_redshift():
 
 def work_assigner(params):
     flag = params.pop('flag')
-    if flag == 'decoder':
-        return {'flag': 'decoder', 'value': decode_message(params)}
-    elif flag == 'fix':
+    if flag == 'fix':
         return {'flag': 'fix', 'value': fix_missing_redshift()}
 
 
+class DecoderWorker:
+    def __init__(self):
+        self.conn, worker_conn = Pipe()
+        self.process = Process(target=decoder_loop, args=(worker_conn,), daemon=True)
+        self.process.start()
+        worker_conn.close()
+
+    def send(self, task: dict):
+        self.conn.send(task)
+
+    def recv(self, timeout: float):
+        if not self.conn.poll(timeout):
+            raise TimeoutError()
+        status, value = self.conn.recv()
+        if status == 'error':
+            raise Exception(value)
+        return value
+
+    def terminate(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            ...
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+
+
 class WorkerPool:
     def __init__(self, n_workers: int, project_filter: list[int]):
-        self.pool = Pool(n_workers)
+        # the shared memory segments are registered in a single tracker, started before any child process
+        resource_tracker.ensure_running()
+        self.pool = Pool(1)
+        self.workers = [DecoderWorker() for _ in range(n_workers)]
         self.sessions = dict()
         self.assigned_worker = dict()
+        # sessions whose state is already in the worker they are assigned to
+        self.resident_sessions = set()
+        # sessions that each worker must drop, sent with its next task
+        self.forget_sessions = [list() for _ in range(n_workers)]
         self.pointer = 0
         self.n_workers = n_workers
         self.project_filter_class = ProjectFilter(project_filter)
         self.sessions_update_batch = dict()
         self.sessions_insert_batch = dict()
-        self.events_batch = list()
+        self.events_batch = ColumnarBatch(EVENT_TYPE)
+        self.checkpoint = Checkpoint()
         self.n_of_loops = config('LOOPS_BEFORE_UPLOAD', default=4, cast=int)
 
     def get_worker(self, session_id: int) -> int:
@@ -397,34 +515,40 @@ class WorkerPool:
             self.assigned_worker[session_id] = worker_id
         return worker_id
 
+    def restart_worker(self, worker_id: int):
+        print(f'[WORKER-INFO] Restarting decoder {worker_id}')
+        self.workers[worker_id].terminate()
+        self.workers[worker_id] = DecoderWorker()
+        self.forget_sessions[worker_id] = list()
+        self.resident_sessions -= {session_id for session_id, w in self.assigned_worker.items() if w == worker_id}
+
     def _pool_response_handler(self, pool_results):
         count = 0
         for js_response in pool_results:
             flag = js_response.pop('flag')
             if flag == 'decoder':
                 worker_events, worker_memory, end_sessions = js_response['value']
-                if worker_memory is None:
-                    continue
-                self.events_batch += worker_events
+                self.events_batch.extend(worker_events)
                 for session_id in worker_memory.keys():
                     self.sessions[session_id] = dict_to_session(worker_memory[session_id])
+                    self.checkpoint.changed(session_id)
                     self.project_filter_class.sessions_lifespan.add(session_id)
                 for session_id in end_sessions:
                     if self.sessions[session_id].session_start_timestamp:
                         old_status = self.project_filter_class.sessions_lifespan.close(session_id)
                         if (old_status == 'UPDATE' or old_status == 'CLOSE') and session_id not in self.sessions_insert_batch.keys():
-                            self.sessions_update_batch[session_id] = deepcopy(self.sessions[session_id])
+                            self.sessions_update_batch[session_id] = copy(self.sessions[session_id])
                         elif (old_status == 'UPDATE' or old_status == 'CLOSE') and session_id in self.sessions_insert_batch.keys():
-                            self.sessions_insert_batch[session_id] = deepcopy(self.sessions[session_id])
+                            self.sessions_insert_batch[session_id] = copy(self.sessions[session_id])
                         elif old_status == 'OPEN':
-                            self.sessions_insert_batch[session_id] = deepcopy(self.sessions[session_id])
+                            self.sessions_insert_batch[session_id] = copy(self.sessions[session_id])
                         else:
                             print(f'[WORKER Exception] Unknown session status: {old_status}')
             elif flag == 'reader':
                 count += 1
                 if count > 1:
                     raise Exception('Pool only accepts one reader task')
-                non_valid_updated, session_ids, messages = js_response['value']
+                non_valid_updated, session_ids, arena_name, offsets, positions = js_response['value']
                 self.project_filter_class.non_valid_sessions_cache = non_valid_updated
 
         self.project_filter_class.handle_clean()
@@ -432,18 +556,22 @@ class WorkerPool:
         for sess_id in sessions_to_delete:
             try:
                 del self.sessions[sess_id]
+                self.checkpoint.deleted(sess_id)
             except KeyError:
                 ...
             try:
-                del self.assigned_worker[sess_id]
+                self.forget_sessions[self.assigned_worker.pop(sess_id)].append(sess_id)
             except KeyError:
                 ...
-        return session_ids, messages
+            self.resident_sessions.discard(sess_id)
+        return session_ids, (arena_name, offsets), positions
 
     def run_workers(self, database_api):
         global sessions_table_name, table_name, EVENT_TYPE
         session_ids = list()
-        messages = list()
+        arena_name, offsets = None, list()
+        positions = None
+        upload_stage = UploadStage(DATABASE, sessions_table_name, table_name, EVENT_TYPE)
         main_conn, reader_conn = Pipe()
         kafka_task_params = {'flag': 'reader',
                               'project_filter': self.project_filter_class}
@@ -451,6 +579,8 @@ class WorkerPool:
         kafka_reader_process.start()
         current_loop_number = 0
         n_kafka_restarts = 0
+        # checkpoints of the uploads whose positions were sent to the reader, written once it committed them
+        committing = list()
         while signal_handler.KEEP_PROCESSING:
             current_loop_number = (current_loop_number + 1) % self.n_of_loops
             # Setup of parameters for workers
@@ -462,55 +592,106 @@ class WorkerPool:
                 kafka_reader_process = Process(target=read_from_kafka, args=(reader_conn, kafka_task_params))
                 kafka_reader_process.start()
                 n_kafka_restarts += 1
-            decoding_params = [{'flag': 'decoder',
+            # Workers only receive the offsets of the messages in the shared memory written by the reader,
+            # and the state of the sessions they don't hold yet
+            decoding_params = [{'arena': arena_name,
                                 'message': list(),
-                                'memory': dict()} for _ in range(self.n_workers)
+                                'memory': dict(),
+                                'forget': self.forget_sessions[worker_id]} for worker_id in range(self.n_workers)
                                ]
             for i in range(len(session_ids)):
                 session_id = session_ids[i]
                 worker_id = self.get_worker(session_id)
-                decoding_params[worker_id]['message'].append([session_id, messages[i]])
-                if session_id not in decoding_params[worker_id]['memory'].keys():
+                decoding_params[worker_id]['message'].append((session_id, offsets[i - 1] if i > 0 else 0, offsets[i]))
+                if session_id not in self.resident_sessions:
+                    self.resident_sessions.add(session_id)
                     try:
                         decoding_params[worker_id]['memory'][session_id] = session_to_dict(self.sessions[session_id])
                     except KeyError:
                         ...
+            # Kafka positions after the messages decoded in this loop
+            decoded_positions = positions
             # Hand tasks to workers
-            async_results = list()
-            for params in decoding_params:
-                if params['message']:
-                    async_results.append(self.pool.apply_async(work_assigner, args=[params]))
+            busy_workers = list()
+            # messages of a failed worker are lost, the positions read after them must not be committed
+            lost_messages = False
+            for worker_id, params in enumerate(decoding_params):
+                if params['message'] or params['forget']:
+                    self.forget_sessions[worker_id] = list()
+                    try:
+                        self.workers[worker_id].send(params)
+                        busy_workers.append(worker_id)
+                    except (BrokenPipeError, OSError) as e:
+                        print(f'[Exception] {e}')
+                        self.restart_worker(worker_id)
+                        lost_messages = True
             results = [{'flag': 'reader', 'value': main_conn.recv()}]
-            async_results.append(self.pool.apply_async(work_assigner, args=[{'flag': 'fix'}]))
-            for async_result in async_results:
+            # the reader commits the positions it receives before reading again
+            self.write_snapshots(database_api, committing)
+            committing = list()
+            fix_result = self.pool.apply_async(work_assigner, args=[{'flag': 'fix'}])
+            for worker_id in busy_workers:
                 try:
-                    results.append(async_result.get(timeout=32 * UPLOAD_RATE))
+                    results.append({'flag': 'decoder', 'value': self.workers[worker_id].recv(timeout=32 * UPLOAD_RATE)})
                 except TimeoutError as e:
                     print('[WORKER-TimeoutError] Decoding of messages is taking longer than expected')
                     raise e
                 except Exception as e:
                     print(f'[Exception] {e}')
-                    self.sessions_update_batch = dict()
-                    self.sessions_insert_batch = dict()
-                    self.events_batch = list()
-                    continue
-            session_ids, messages = self._pool_response_handler(
+                    if isinstance(e, (EOFError, OSError)):
+                        self.restart_worker(worker_id)
+                    lost_messages = True
+            try:
+                results.append(fix_result.get(timeout=32 * UPLOAD_RATE))
+            except Exception as e:
+                print(f'[Exception] {e}')
+            if lost_messages:
+                # messages from the last committed positions are read again after a restart
+                print('[WORKER-ERROR] Messages were lost by a decoder, stopping before committing their positions')
+                break
+            session_ids, (arena_name, offsets), positions = self._pool_response_handler(
                 pool_results=results)
             if current_loop_number == 0:
-                insertBatch(self.events_batch, self.sessions_insert_batch.values(), self.sessions_update_batch.values(),
-                            database_api, sessions_table_name, table_name, EVENT_TYPE)
+                # waits here (and so does the reader) while the upload queue is full
+                events_batch, sessions_insert_batch, sessions_update_batch = \
+                    self.events_batch, self.sessions_insert_batch.values(), self.sessions_update_batch.values()
                 self.sessions_update_batch = dict()
                 self.sessions_insert_batch = dict()
-                self.events_batch = list()
-            self.save_snapshot(database_api)
-            main_conn.send('CONTINUE')
+                self.events_batch = ColumnarBatch(EVENT_TYPE)
+                # state after the messages up to decoded_positions, all of them in this upload
+                upload_stage.submit(events_batch, sessions_insert_batch, sessions_update_batch,
+                                    positions=decoded_positions, checkpoint=self.prepare_snapshot())
+            uploaded_positions, checkpoints = upload_stage.collect()
+            if upload_stage.failed:
+                # messages from the last committed positions are read again after a restart
+                break
+            committing += checkpoints
+            main_conn.send(('CONTINUE', uploaded_positions))
+        print('[WORKER-INFO] Waiting for the uploads in progress')
+        uploaded_positions, checkpoints = upload_stage.close()
         print('[WORKER-INFO] Sending close signal')
-        main_conn.send('CLOSE')
+        main_conn.send(('CLOSE', uploaded_positions))
+        kafka_reader_process.join(timeout=32 * UPLOAD_RATE)
+        if kafka_reader_process.is_alive():
+            kafka_reader_process.terminate()
+        else:
+            self.write_snapshots(database_api, committing + checkpoints)
         self.terminate(database_api)
-        kafka_reader_process.terminate()
         print('[WORKER-SHUTDOWN] Process terminated')
 
     def load_checkpoint(self, database_api):
+        state = self.checkpoint.load(database_api)
+        if state is not None:
+            self.sessions = {sessionId: dict_to_session(session_dict)
+                             for sessionId, session_dict in state['sessions'].items()}
+            self.project_filter_class.sessions_lifespan.session_project = state['cached_sessions']
+            self.sessions_update_batch = {sessionId: self.sessions[sessionId]
+                                          for sessionId in state['sessions_update_batch'] if sessionId in self.sessions}
+            self.sessions_insert_batch = {sessionId: self.sessions[sessionId]
+                                          for sessionId in state['sessions_insert_batch'] if sessionId in self.sessions}
+            self.events_batch = ColumnarBatch.from_rows(EVENT_TYPE, state['events_batch'])
+            return
+        # checkpoints written before the incremental format
         file = database_api.load_binary(name='checkpoint')
         checkpoint = json.loads(file.getvalue().decode('utf-8'))
         file.close()
@@ -538,25 +719,24 @@ class WorkerPool:
                     self.sessions_insert_batch[sessionId] = self.sessions[sessionId]
                 except Exception:
                     continue
-            self.events_batch = [dict_to_event(event) for event in checkpoint['events_batch']]
+            self.events_batch = ColumnarBatch.from_rows(EVENT_TYPE, checkpoint['events_batch'])
         else:
             raise Exception('Error in version of snapshot')
 
     def terminate(self, database_api):
+        for worker in self.workers:
+            worker.terminate()
         self.pool.close()
-        self.save_snapshot(database_api)
         database_api.close()
 
-    def save_snapshot(self, database_api):
-        session_snapshot = list()
-        for sessionId, session in self.sessions.items():
-            session_snapshot.append([sessionId, session_to_dict(session)])
-        checkpoint = {
-            'version': 'v1.1',
-            'sessions': session_snapshot,
-            'cached_sessions': self.project_filter_class.sessions_lifespan.session_project,
-            'sessions_update_batch': list(self.sessions_update_batch.keys()),
-            'sessions_insert_batch': list(self.sessions_insert_batch.keys()),
-            'events_batch': [event_to_dict(event) for event in self.events_batch]
-        }
-        database_api.save_binary(binary_data=json.dumps(checkpoint).encode('utf-8'), name='checkpoint')
+    def prepare_snapshot(self):
+        return self.checkpoint.prepare(sessions=self.sessions,
+                                       cached_sessions=self.project_filter_class.sessions_lifespan.session_project,
+                                       sessions_update_batch=list(self.sessions_update_batch.keys()),
+                                       sessions_insert_batch=list(self.sessions_insert_batch.keys()),
+                                       events_batch=self.events_batch)
+
+    @staticmethod
+    def write_snapshots(database_api, snapshots):
+        for snapshot in snapshots:
+            Checkpoint.write(database_api, snapshot)
@@ -45,6 +45,20 @@ UPDATE public.metrics
 SET view_type='chart'
 WHERE metric_type = 'funnel';
 
+ALTER TABLE IF EXISTS public.autocomplete
+    ADD COLUMN IF NOT EXISTS created_at timestamp without time zone NOT NULL DEFAULT (now() at time zone 'utc');
+
+CREATE INDEX IF NOT EXISTS autocomplete_project_id_created_at_idx ON public.autocomplete (project_id, created_at);
+
+CREATE INDEX IF NOT EXISTS assist_events_timestamp_idx ON public.assist_events (timestamp);
+
+DELETE
+FROM public.assist_events_aggregates
+WHERE ctid NOT IN (SELECT MAX(ctid)
+                   FROM public.assist_events_aggregates
+                   GROUP BY timestamp, project_id, agent_id);
+CREATE UNIQUE INDEX IF NOT EXISTS assist_events_aggregates_timestamp_project_id_agent_id_key ON public.assist_events_aggregates (timestamp, project_id, agent_id);
+
 COMMIT;
 
 \elif :is_next
@@ -143,6 +143,65 @@ CREATE TABLE IF NOT EXISTS experimental.sessions
       TTL datetime + INTERVAL 1 MONTH
       SETTINGS index_granularity = 512;
 
+-- Sessions and users counts per project, per minute/hour/day and per session dimensions,
+-- maintained by the sessions rollups cron for the timeseries cards
+CREATE TABLE IF NOT EXISTS experimental.sessions_rollup_1m
+(
+    project_id       UInt16,
+    bucket           DateTime,
+    user_device_type LowCardinality(String),
+    user_country     LowCardinality(String),
+    user_browser     LowCardinality(String),
+    user_os          LowCardinality(String),
+    sessions         UInt64,
+    users            AggregateFunction(uniqCombined, String),
+    _timestamp       DateTime DEFAULT now()
+) ENGINE = ReplacingMergeTree(_timestamp)
+      PARTITION BY toYYYYMMDD(bucket)
+      ORDER BY (project_id, bucket, user_device_type, user_country, user_browser, user_os)
+      TTL bucket + INTERVAL 10 DAY;
+
+CREATE TABLE IF NOT EXISTS experimental.sessions_rollup_1h
+(
+    project_id       UInt16,
+    bucket           DateTime,
+    user_device_type LowCardinality(String),
+    user_country     LowCardinality(String),
+    user_browser     LowCardinality(String),
+    user_os          LowCardinality(String),
+    sessions         UInt64,
+    users            AggregateFunction(uniqCombined, String),
+    _timestamp       DateTime DEFAULT now()
+) ENGINE = ReplacingMergeTree(_timestamp)
+      PARTITION BY toYYYYMM(bucket)
+      ORDER BY (project_id, bucket, user_device_type, user_country, user_browser, user_os)
+      TTL bucket + INTERVAL 1 MONTH;
+
+CREATE TABLE IF NOT EXISTS experimental.sessions_rollup_1d
+(
+    project_id       UInt16,
+    bucket           DateTime,
+    user_device_type LowCardinality(String),
+    user_country     LowCardinality(String),
+    user_browser     LowCardinality(String),
+    user_os          LowCardinality(String),
+    sessions         UInt64,
+    users            AggregateFunction(uniqCombined, String),
+    _timestamp       DateTime DEFAULT now()
+) ENGINE = ReplacingMergeTree(_timestamp)
+      PARTITION BY toYYYYMM(bucket)
+      ORDER BY (project_id, bucket, user_device_type, user_country, user_browser, user_os)
+      TTL bucket + INTERVAL 1 MONTH;
+
+CREATE TABLE IF NOT EXISTS experimental.sessions_rollup_state
+(
+    watermark  DateTime,
+    since      DateTime,
+    _timestamp DateTime DEFAULT now()
+) ENGINE = ReplacingMergeTree(watermark)
+      ORDER BY tuple()
+      TTL _timestamp + INTERVAL 1 MONTH;
+
 CREATE TABLE IF NOT EXISTS experimental.issues
 (
     project_id     UInt16,
@@ -338,11 +397,22 @@ CREATE TABLE IF NOT EXISTS product_analytics.events
     issue_type                  Enum8(''=0,'click_rage'=1,'dead_click'=2,'excessive_scrolling'=3,'bad_request'=4,'missing_resource'=5,'memory'=6,'cpu'=7,'slow_resource'=8,'slow_page_load'=9,'crash'=10,'ml_cpu'=11,'ml_memory'=12,'ml_dead_click'=13,'ml_click_rage'=14,'ml_mouse_thrashing'=15,'ml_excessive_scrolling'=16,'ml_slow_resources'=17,'custom'=18,'js_exception'=19,'mouse_thrashing'=20,'app_crash'=21) DEFAULT '',
     issue_id                    String DEFAULT '',
     error_id                    String DEFAULT '',
+    -- the $properties frequently filtered on, keep in sync with exp_ch_helper.MATERIALIZED_PROPERTIES
+    prop_source                 LowCardinality(String) MATERIALIZED JSONExtractString(toString("$properties"), 'source'),
+    prop_message                String MATERIALIZED JSONExtractString(toString("$properties"), 'message'),
+    prop_name                   String MATERIALIZED JSONExtractString(toString("$properties"), 'name'),
+    prop_error_id               String MATERIALIZED JSONExtractString(toString("$properties"), 'error_id'),
+    prop_url_path               String MATERIALIZED JSONExtractString(toString("$properties"), 'url_path'),
+    prop_label                  String MATERIALIZED JSONExtractString(toString("$properties"), 'label'),
+    prop_normalized_x           Nullable(Float64) MATERIALIZED JSONExtract(toString("$properties"), 'normalized_x', 'Nullable(Float64)'),
+    prop_normalized_y           Nullable(Float64) MATERIALIZED JSONExtract(toString("$properties"), 'normalized_y', 'Nullable(Float64)'),
     -- Created by the backend
     "$tags"                     Array(String) DEFAULT [] COMMENT 'tags are used to filter events',
     "$import"                   BOOL DEFAULT FALSE,
     _deleted_at                 DateTime DEFAULT '1970-01-01 00:00:00',
-    _timestamp                  DateTime DEFAULT now()
+    _timestamp                  DateTime DEFAULT now(),
+    INDEX prop_error_id_idx prop_error_id TYPE bloom_filter(0.01) GRANULARITY 4,
+    INDEX prop_url_path_idx prop_url_path TYPE bloom_filter(0.01) GRANULARITY 4
 ) ENGINE = ReplacingMergeTree(_timestamp)
       ORDER BY (project_id, "$event_name", created_at, session_id)
       TTL _timestamp + INTERVAL 1 MONTH ,
@@ -531,3 +601,30 @@ CREATE TABLE IF NOT EXISTS product_analytics.all_properties
     _timestamp        DateTime DEFAULT now()
 ) ENGINE = ReplacingMergeTree(_timestamp)
       ORDER BY (project_id, property_name, is_event_property);
+
+-- The $properties frequently filtered on, materialized as typed columns that are read instead of
+-- parsing the JSON of each scanned event; keep in sync with exp_ch_helper.MATERIALIZED_PROPERTIES
+ALTER TABLE product_analytics.events
+    ADD COLUMN IF NOT EXISTS prop_source LowCardinality(String) MATERIALIZED JSONExtractString(toString("$properties"), 'source'),
+    ADD COLUMN IF NOT EXISTS prop_message String MATERIALIZED JSONExtractString(toString("$properties"), 'message'),
+    ADD COLUMN IF NOT EXISTS prop_name String MATERIALIZED JSONExtractString(toString("$properties"), 'name'),
+    ADD COLUMN IF NOT EXISTS prop_error_id String MATERIALIZED JSONExtractString(toString("$properties"), 'error_id'),
+    ADD COLUMN IF NOT EXISTS prop_url_path String MATERIALIZED JSONExtractString(toString("$properties"), 'url_path'),
+    ADD COLUMN IF NOT EXISTS prop_label String MATERIALIZED JSONExtractString(toString("$properties"), 'label'),
+    ADD COLUMN IF NOT EXISTS prop_normalized_x Nullable(Float64) MATERIALIZED JSONExtract(toString("$properties"), 'normalized_x', 'Nullable(Float64)'),
+    ADD COLUMN IF NOT EXISTS prop_normalized_y Nullable(Float64) MATERIALIZED JSONExtract(toString("$properties"), 'normalized_y', 'Nullable(Float64)'),
+    ADD INDEX IF NOT EXISTS prop_error_id_idx prop_error_id TYPE bloom_filter(0.01) GRANULARITY 4,
+    ADD INDEX IF NOT EXISTS prop_url_path_idx prop_url_path TYPE bloom_filter(0.01) GRANULARITY 4;
+
+-- computes the new columns and indexes of the existing events
+ALTER TABLE product_analytics.events
+    MATERIALIZE COLUMN prop_source,
+    MATERIALIZE COLUMN prop_message,
+    MATERIALIZE COLUMN prop_name,
+    MATERIALIZE COLUMN prop_error_id,
+    MATERIALIZE COLUMN prop_url_path,
+    MATERIALIZE COLUMN prop_label,
+    MATERIALIZE COLUMN prop_normalized_x,
+    MATERIALIZE COLUMN prop_normalized_y,
+    MATERIALIZE INDEX prop_error_id_idx,
+    MATERIALIZE INDEX prop_url_path_idx;
@@ -45,6 +45,11 @@ UPDATE public.metrics
 SET view_type='chart'
 WHERE metric_type = 'funnel';
 
+ALTER TABLE IF EXISTS public.autocomplete
+    ADD COLUMN IF NOT EXISTS created_at timestamp without time zone NOT NULL DEFAULT (now() at time zone 'utc');
+
+CREATE INDEX IF NOT EXISTS autocomplete_project_id_created_at_idx ON public.autocomplete (project_id, created_at);
+
 COMMIT;
 
 \elif :is_next
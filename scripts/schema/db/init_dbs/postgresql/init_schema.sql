@@ -734,14 +734,16 @@ CREATE INDEX performance_avg_used_js_heap_size_gt0_idx ON events.performance (av
 
 CREATE TABLE public.autocomplete
 (
-    value      text    NOT NULL,
-    type       text    NOT NULL,
-    project_id integer NOT NULL REFERENCES public.projects (project_id) ON DELETE CASCADE
+    value      text                        NOT NULL,
+    type       text                        NOT NULL,
+    project_id integer                     NOT NULL REFERENCES public.projects (project_id) ON DELETE CASCADE,
+    created_at timestamp without time zone NOT NULL DEFAULT (now() at time zone 'utc')
 );
 
 CREATE UNIQUE INDEX autocomplete_unique_project_id_md5value_type_idx ON public.autocomplete (project_id, md5(value), type);
 CREATE INDEX autocomplete_project_id_idx ON public.autocomplete (project_id);
 CREATE INDEX autocomplete_type_idx ON public.autocomplete (type);
+CREATE INDEX autocomplete_project_id_created_at_idx ON public.autocomplete (project_id, created_at);
 
 CREATE INDEX autocomplete_value_clickonly_gin_idx ON public.autocomplete USING GIN (value gin_trgm_ops) WHERE type = 'CLICK';
 CREATE INDEX autocomplete_value_customonly_gin_idx ON public.autocomplete USING GIN (value gin_trgm_ops) WHERE type = 'CUSTOM';